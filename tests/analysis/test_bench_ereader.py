@@ -0,0 +1,29 @@
+import importlib
+import struct
+
+from tomic.ibapi.framing import MessageFramer
+
+
+def test_framer_keeps_partial_messages():
+    framer = MessageFramer(compact_threshold=0)
+    first = struct.pack("!I", 3) + b"abc"
+    second = struct.pack("!I", 4) + b"defg"
+
+    assert framer.feed_and_drain(first + second[:2]) == [b"abc"]
+    assert len(framer) == 2
+    assert framer.feed_and_drain(second[2:5]) == []
+    assert framer.feed_and_drain(second[5:]) == [b"defg"]
+    assert len(framer) == 0
+
+
+def test_compare_matches_legacy_reader():
+    mod = importlib.import_module("tomic.analysis.bench_ereader")
+    stream = mod.synthetic_stream(300, contracts=7)
+
+    for chunk in (1, 13, 4096):
+        chunks = mod.chunk_stream(stream, chunk)
+        assert mod.framer_frames(chunks) == mod.legacy_frames(chunks)
+
+    rows = mod.compare(stream, chunk_size=1000, runs=1)
+    assert [row["mode"] for row in rows] == ["legacy", "framer"]
+    assert all(row["messages"] == 300 for row in rows)
@@ -0,0 +1,74 @@
+import json
+import socket
+import struct
+import subprocess
+import sys
+from pathlib import Path
+
+from tomic.api.fake_tws import ChainFixture, FakeTWS
+from tomic.ibapi.framing import MessageFramer
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _frame(*fields):
+    payload = "".join(f"{value}\0" for value in fields).encode("ascii")
+    return struct.pack("!I", len(payload)) + payload
+
+
+def _read(sock, framer, count):
+    messages = []
+    while len(messages) < count:
+        messages.extend(framer.feed_and_drain(sock.recv(4096)))
+    return [msg.decode().split("\0")[:-1] for msg in messages]
+
+
+def test_fake_tws_speaks_wire_protocol():
+    fixture = ChainFixture.synthetic("xyz", spot=50.0, expiries=2, strikes_per_side=2)
+    expiry = fixture.expiries[0]
+    with FakeTWS(fixture, max_msg_rate=1) as server:
+        with socket.create_connection(server.address, timeout=5) as sock:
+            framer = MessageFramer()
+            sock.sendall(b"API\0" + struct.pack("!I", 9) + b"v100..200")
+            [(version, _stamp)] = _read(sock, framer, 1)
+            assert version == "200"
+
+            sock.sendall(_frame(71, 2, 7, ""))
+            next_id, accounts = _read(sock, framer, 2)
+            assert next_id[0] == "9" and accounts[0] == "15"
+
+            option = [1, "XYZ", "OPT", expiry, 50, "P", "100", "SMART", "", "USD", "", "XYZ"]
+            sock.sendall(_frame(9, 8, 11, *option, 0, "", "", ""))
+            details, end = _read(sock, framer, 2)
+            assert details[0] == "10" and details[2:4] == ["XYZ", "OPT"]
+            assert int(details[13]) == fixture.option_con_id(expiry, 50, "P")
+            assert end[:3] == ["52", "1", "11"]
+
+            # Second request within the same second exceeds the pacing limit.
+            sock.sendall(_frame(9, 8, 12, *option, 0, "", "", ""))
+            [error] = _read(sock, framer, 1)
+            assert error[:4] == ["4", "12", "100", "Max rate of messages per second has been exceeded"]
+    assert server.stats.pacing_errors == 1
+
+
+def test_benchmark_runs_against_fake_tws(tmp_path):
+    # ``tests/conftest.py`` replaces ``ibapi`` with stubs; run the real client
+    # stack in a separate interpreter.
+    out = tmp_path / "results.json"
+    subprocess.run(
+        [
+            sys.executable, "-m", "tomic.analysis.bench_ib_throughput",
+            "--expiries", "5", "--strikes", "3", "--proposals", "4",
+            "--rounds", "2", "--timeout", "20", "--json", str(out),
+        ],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        timeout=120,
+    )
+    rows = {row["mode"]: row for row in json.loads(out.read_text())}
+
+    assert rows["chain"]["ok"]
+    assert rows["chain"]["complete"] == rows["chain"]["contracts"] > 0
+    assert rows["quotes"]["complete"] == rows["quotes"]["proposals"] == 4
+    assert rows["quotes"]["pacing_errors"] == 0
@@ -0,0 +1,15 @@
+import importlib
+
+
+def test_run_mode_reports_memory_stats():
+    mod = importlib.import_module("tomic.analysis.bench_pipeline_memory")
+
+    shared = mod.run_mode("shared", runs=1, strikes_per_side=15)
+    copied = mod.run_mode("copy", runs=1, strikes_per_side=15)
+
+    assert shared["options"] == copied["options"] == 3 * 31 * 2
+    assert shared["proposals"] > 0
+    assert shared["proposals"] == copied["proposals"]
+    for row in (shared, copied):
+        assert row["runs"] == 1
+        assert row["peak_traced_kb"] > 0
@@ -0,0 +1,32 @@
+import importlib
+
+
+def test_python_backend_hides_numpy_and_restores_it():
+    mod = importlib.import_module("tomic.analysis.bench_vol_helpers")
+    saved = mod.metrics.np, mod.vol_helpers.np
+    data = mod.synthetic_series(60)
+
+    rows = mod.compare(data, runs=1)
+
+    assert rows[0]["backend"] == "python"
+    assert rows[0]["days"] == 60
+    assert set(rows[0]["best_s"]) == {
+        "historical_volatility",
+        "average_true_range",
+        "rolling_hv",
+        "iv_rank",
+        "iv_percentile",
+        "iv_rank_many",
+        "iv_percentile_many",
+    }
+    assert (mod.metrics.np, mod.vol_helpers.np) == saved
+
+
+def test_main_prints_each_case(capsys, tmp_path):
+    mod = importlib.import_module("tomic.analysis.bench_vol_helpers")
+    out = tmp_path / "bench.json"
+
+    mod.main(["--days", "40", "--runs", "1", "--json", str(out)])
+
+    assert "rolling_hv" in capsys.readouterr().out
+    assert out.exists()
@@ -0,0 +1,135 @@
+import copy
+from dataclasses import fields
+
+from tomic.analysis import scoring
+from tomic.analysis.incremental_scoring import ProposalReevaluator
+from tomic.strategy_candidates import StrategyProposal
+
+
+def _leg(strike, right, position, bid, ask, delta):
+    return {
+        "symbol": "XYZ",
+        "expiry": "2026-12-18",
+        "strike": strike,
+        "type": right,
+        "position": position,
+        "qty": 1,
+        "bid": bid,
+        "ask": ask,
+        "mid": round((bid + ask) / 2, 4),
+        "mid_source": "true",
+        "delta": delta,
+        "iv": 0.25,
+        "gamma": 0.01,
+        "vega": 0.1,
+        "theta": -0.02,
+        "volume": 500,
+        "open_interest": 2000,
+        "edge": 0.1,
+        "model": round((bid + ask) / 2, 4),
+    }
+
+
+def _proposal():
+    return StrategyProposal(
+        strategy="iron_condor",
+        legs=[
+            _leg(110, "call", -1, 1.9, 2.1, 0.2),
+            _leg(115, "call", 1, 0.9, 1.1, 0.1),
+            _leg(90, "put", -1, 1.9, 2.1, -0.2),
+            _leg(85, "put", 1, 0.9, 1.1, -0.1),
+        ],
+    )
+
+
+def _set_quote(leg, bid, ask):
+    leg["bid"] = bid
+    leg["ask"] = ask
+    leg["mid"] = round((bid + ask) / 2, 4)
+
+
+def _assert_same_metrics(left, right):
+    for item in fields(StrategyProposal):
+        assert getattr(left, item.name) == getattr(right, item.name), item.name
+
+
+def test_unchanged_proposal_is_skipped():
+    reevaluator = ProposalReevaluator()
+    proposal = _proposal()
+
+    first = reevaluator.reevaluate(proposal, spot=100.0)
+    second = reevaluator.reevaluate(proposal, spot=100.0)
+
+    assert first.mode == "full"
+    assert second.mode == "skipped"
+    assert second.score == first.score
+
+
+def test_quote_update_matches_full_rescore():
+    reevaluator = ProposalReevaluator()
+    proposal = _proposal()
+    reevaluator.reevaluate(proposal, spot=100.0)
+
+    _set_quote(proposal.legs[0], 2.2, 2.4)
+    _set_quote(proposal.legs[2], 1.5, 1.7)
+    expected = copy.deepcopy(proposal)
+    score, reasons = scoring.calculate_score(expected.strategy, expected, 100.0)
+
+    result = reevaluator.reevaluate(proposal, spot=100.0)
+
+    assert result.mode == "quotes"
+    assert result.changed_legs == (0, 2)
+    assert result.score == score
+    assert result.reasons == reasons
+    _assert_same_metrics(proposal, expected)
+
+
+def test_greek_update_rebuilds_greek_totals():
+    reevaluator = ProposalReevaluator()
+    proposal = _proposal()
+    reevaluator.reevaluate(proposal, spot=100.0)
+
+    proposal.legs[1]["delta"] = 0.15
+    expected = copy.deepcopy(proposal)
+    scoring.calculate_score(expected.strategy, expected, 100.0)
+
+    result = reevaluator.reevaluate(proposal, spot=100.0)
+
+    assert result.mode == "quotes"
+    assert proposal.greeks == expected.greeks
+    _assert_same_metrics(proposal, expected)
+
+
+def test_structural_or_spot_change_triggers_full_rescore():
+    reevaluator = ProposalReevaluator()
+    proposal = _proposal()
+    reevaluator.reevaluate(proposal, spot=100.0)
+
+    proposal.legs[1]["strike"] = 120.0
+    assert reevaluator.reevaluate(proposal, spot=100.0).mode == "full"
+    assert reevaluator.reevaluate(proposal, spot=101.0).mode == "full"
+    assert reevaluator.stats == {"skipped": 0, "quotes": 0, "full": 3}
+
+
+def test_repeated_ib_snapshot_with_same_quotes_is_skipped():
+    from tomic.services.ib_marketdata import IBMarketDataService
+
+    service = IBMarketDataService()
+    reevaluator = ProposalReevaluator()
+    proposal = _proposal()
+    reevaluator.reevaluate(proposal, spot=100.0)
+
+    def refresh(age):
+        for leg in proposal.legs:
+            quote = {"bid": leg["bid"], "ask": leg["ask"], "quote_age_sec": age}
+            service._apply_snapshot(leg, quote, trigger="manual")
+
+    refresh(0.5)
+    assert reevaluator.reevaluate(proposal, spot=100.0).mode == "quotes"
+
+    refresh(3.0)
+    result = reevaluator.reevaluate(proposal, spot=100.0)
+
+    assert result.mode == "skipped"
+    assert proposal.legs[0]["quote_age_sec"] == 3.0
+    assert reevaluator.stats == {"skipped": 1, "quotes": 1, "full": 1}
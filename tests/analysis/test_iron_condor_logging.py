@@ -84,6 +84,7 @@ def test_iron_condor_logging(monkeypatch):
     monkeypatch.setattr(iron_condor, "calculate_score", fake_score)
     capture_logger = SimpleNamespace(info=lambda m: messages.append(m))
     monkeypatch.setattr(logutils, "logger", capture_logger)
+    monkeypatch.setattr(logutils.combo_recorder, "verbose", True)
     monkeypatch.setattr("tomic.strategies.utils.logger", capture_logger)
 
     iron_condor.generate("AAA", chain, cfg, 100.0, 1.0)
@@ -99,6 +100,30 @@ def test_iron_condor_logging(monkeypatch):
     assert any("short optie ontbreekt" in m and "expiry=2025-01-01" in m for m in messages)
 
 
+def test_iron_condor_evaluations_render_on_demand(monkeypatch):
+    monkeypatch.setenv("TOMIC_TODAY", "2024-06-01")
+    messages: list[str] = []
+    capture_logger = SimpleNamespace(info=lambda m: messages.append(m))
+    recorder = logutils.ComboEvaluationRecorder(capacity=50)
+    monkeypatch.setattr(logutils, "logger", capture_logger)
+    monkeypatch.setattr(logutils, "combo_recorder", recorder)
+
+    chain_fail = [c for c in _chain() if c["type"] == "call"]
+    cfg = {
+        "strike_to_strategy_config": {
+            "short_call_delta_range": [0.35, 0.45],
+            "short_put_delta_range": [-0.35, -0.25],
+            "wing_sigma_multiple": 0.6,
+            "use_ATR": False,
+        }
+    }
+    iron_condor.generate("AAA", chain_fail, cfg, 100.0, 1.0)
+
+    assert messages == []
+    assert recorder.reason_counts().get("short optie ontbreekt", 0) > 0
+    assert any("expiry=2025-01-01" in line for line in recorder.render())
+
+
 def test_other_strategies_log_policies(monkeypatch):
     monkeypatch.setenv("TOMIC_TODAY", "2024-06-01")
     chain = _chain()
@@ -1,6 +1,17 @@
+import json
 import math
+import random
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
-from tomic.analysis.metrics import historical_volatility, average_true_range
+from tomic.analysis import metrics
+from tomic.analysis.metrics import (
+    historical_volatility,
+    average_true_range,
+    rolling_historical_volatility,
+)
 from tomic.metrics import (
     MidPriceResolver,
     calculate_edge,
@@ -22,6 +33,58 @@ def test_historical_volatility_constant():
     assert math.isclose(historical_volatility(closes), 0.0, abs_tol=1e-10)
 
 
+def _random_walk(n, seed=7):
+    rng = random.Random(seed)
+    closes = [100.0]
+    for _ in range(n - 1):
+        closes.append(closes[-1] * math.exp(rng.gauss(0, 0.02)))
+    closes[40] = 0.0  # skipped pairs must not shift the windows
+    return closes
+
+
+def _assert_matches_prefix_hv(closes, result):
+    for window, series in result.items():
+        assert len(series) == len(closes)
+        for idx in range(len(closes)):
+            expected = historical_volatility(closes[: idx + 1], window=window)
+            if expected is None:
+                assert series[idx] is None
+            else:
+                assert math.isclose(series[idx], expected, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_rolling_historical_volatility_matches_prefix_calls(monkeypatch):
+    monkeypatch.setattr(metrics, "np", None)
+    closes = _random_walk(300)
+    _assert_matches_prefix_hv(closes, rolling_historical_volatility(closes, (1, 20, 90)))
+    assert rolling_historical_volatility([], (20,)) == {20: []}
+
+
+def test_rolling_historical_volatility_numpy_backend():
+    """The NumPy path runs in a clean interpreter: tests stub ``numpy``."""
+
+    code = (
+        "import json, sys\n"
+        "import numpy\n"
+        "from tomic.analysis.metrics import rolling_historical_volatility\n"
+        "closes = json.load(sys.stdin)\n"
+        "print(json.dumps(rolling_historical_volatility(closes, (1, 20, 90))))\n"
+    )
+    closes = _random_walk(300)
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        input=json.dumps(closes),
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    if "No module named 'numpy'" in proc.stderr:
+        pytest.skip("numpy not installed")
+    assert proc.returncode == 0, proc.stderr
+    result = {int(w): series for w, series in json.loads(proc.stdout).items()}
+    _assert_matches_prefix_hv(closes, result)
+
+
 def test_average_true_range_simple():
     highs = [i + 1 for i in range(15)]
     lows = [i for i in range(15)]
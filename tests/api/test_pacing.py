@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+from tomic.api.pacing import (
+    IBPacingScheduler,
+    PacingLimits,
+    PacingTimeout,
+    Priority,
+    pacing_priority,
+)
+
+
+def _start(target):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_message_rate_is_enforced_after_burst():
+    pacer = IBPacingScheduler(PacingLimits(messages_per_second=50, message_burst=5))
+    start = time.monotonic()
+    for _ in range(15):
+        pacer.acquire_message()
+    elapsed = time.monotonic() - start
+
+    # 5 tokens up front, the remaining 10 at 50/s.
+    assert elapsed >= 0.18
+    assert pacer.stats.messages == 15
+    assert pacer.stats.message_wait > 0
+
+
+def test_lines_are_granted_by_priority_then_fifo():
+    pacer = IBPacingScheduler(PacingLimits(market_data_lines=1))
+    owner = object()
+    pacer.open_line(owner, 1)
+    order = []
+
+    def waiter(req_id, level):
+        with pacing_priority(level):
+            pacer.open_line(owner, req_id)
+        order.append(req_id)
+        pacer.close_line(owner, req_id)
+
+    threads = [_start(lambda: waiter(2, Priority.LOW))]
+    _wait_for(lambda: pacer.waiting()["lines"] == 1)
+    threads.append(_start(lambda: waiter(3, Priority.NORMAL)))
+    _wait_for(lambda: pacer.waiting()["lines"] == 2)
+    threads.append(_start(lambda: waiter(4, Priority.HIGH)))
+    _wait_for(lambda: pacer.waiting()["lines"] == 3)
+
+    assert pacer.utilization()["lines"] == 1.0
+    pacer.close_line(owner, 1)
+    for thread in threads:
+        thread.join(2)
+    assert order == [4, 3, 2]
+    assert pacer.active_lines() == 0
+
+
+def test_reader_thread_lines_overcommit_and_snapshots_expire():
+    pacer = IBPacingScheduler(PacingLimits(market_data_lines=1, snapshot_line_seconds=0.05))
+    owner = object()
+    pacer.open_line(owner, 1, snapshot=True)
+    assert pacer.open_line(owner, 2, block=False) == 0.0
+    assert pacer.stats.lines_overcommitted == 1
+
+    pacer.release_owner(owner)
+    pacer.open_line(owner, 3, snapshot=True)
+    waited = pacer.open_line(owner, 4)
+    assert 0.02 <= waited < 1.0
+
+
+class _Streamer:
+    pass
+
+
+def test_line_wait_times_out_when_streams_hold_every_line():
+    pacer = IBPacingScheduler(PacingLimits(market_data_lines=2, line_wait_timeout=0.05))
+    streamer = _Streamer()
+    pacer.open_line(streamer, 1)
+    pacer.open_line(streamer, 2)
+
+    start = time.monotonic()
+    with pytest.raises(PacingTimeout, match="_Streamer: 2 stream"):
+        pacer.open_line(object(), 3)
+    assert time.monotonic() - start < 1.0
+    assert pacer.waiting()["lines"] == 0
+    assert pacer.line_holders() == {"_Streamer": {"stream": 2, "snapshot": 0}}
+
+    pacer.release_owner(streamer)
+    assert pacer.open_line(object(), 4) < 0.05
+
+
+def test_historical_identical_requests_and_violations_back_off():
+    pacer = IBPacingScheduler(
+        PacingLimits(historical_identical_interval=0.1, violation_backoff=0.1)
+    )
+    assert pacer.acquire_historical(("XYZ", "1 D")) < 0.05
+    assert pacer.acquire_historical(("ABC", "1 D")) < 0.05
+    assert pacer.acquire_historical(("XYZ", "1 D")) >= 0.05
+
+    pacer.report_violation(100)
+    assert pacer.acquire_message() >= 0.05
+    assert pacer.stats.violations == {"messages": 1}
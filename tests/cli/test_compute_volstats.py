@@ -9,6 +9,8 @@ def test_compute_volstats_main(monkeypatch):
     monkeypatch.setattr(mod, "cfg_get", lambda name, default=None: ["ABC"] if name == "DEFAULT_SYMBOLS" else default)
 
     monkeypatch.setattr(mod, "_get_closes", lambda sym: [1.0] * 100)
+    # Keep the lookup away from the repository's price data directory.
+    monkeypatch.setattr(mod._vol_service, "_load_latest_close", lambda sym, **kw: "2024-01-02")
 
     # Stub computations
     monkeypatch.setattr(mod, "fetch_iv30d", lambda sym: 0.25)
@@ -132,6 +132,35 @@ def test_fetch_polygon_price_history_stores_data(monkeypatch, tmp_path):
     assert meta_store["ABC"]["fetched_at"].startswith("2024-01-01T12:00:00")
 
 
+def test_corrupt_history_skips_only_its_symbol(monkeypatch, tmp_path):
+    svc = importlib.import_module("tomic.cli.services.price_history_polygon")
+
+    base_dir = tmp_path / "prices"
+    base_dir.mkdir()
+    (base_dir / "BBB.json").write_text("{not json")
+    settings = {"PRICE_HISTORY_DIR": str(base_dir), "POLYGON_SLEEP_BETWEEN": 0}
+    monkeypatch.setattr(svc, "cfg_get", lambda name, default=None: settings.get(name, default))
+    monkeypatch.setattr(svc, "PolygonClient", lambda: SimpleNamespace(connect=lambda: None, disconnect=lambda: None))
+    monkeypatch.setattr(
+        svc,
+        "request_bars",
+        lambda client, sym: ([{"symbol": sym, "date": "2024-01-02", "close": 1.0}], True),
+    )
+    saved: list[dict] = []
+    monkeypatch.setattr(svc, "load_price_meta", dict)
+    monkeypatch.setattr(svc, "save_price_meta", saved.append)
+    volstats: list[list[str]] = []
+    monkeypatch.setattr(svc, "compute_polygon_volatility_stats", volstats.append)
+
+    processed = svc.fetch_polygon_price_history(["AAA", "BBB", "CCC"])
+
+    assert processed == ["AAA", "CCC"]
+    assert (base_dir / "BBB.json").read_text() == "{not json"
+    assert json.loads((base_dir / "CCC.json").read_text())[0]["close"] == 1.0
+    assert sorted(saved[0]) == ["AAA", "CCC"]
+    assert volstats == [["AAA", "CCC"]]
+
+
 def test_fetch_polygon_price_history_no_data(monkeypatch, tmp_path):
     svc = importlib.import_module("tomic.cli.services.price_history_polygon")
 
@@ -397,3 +426,34 @@ def test_no_new_workday_skips_sleep(monkeypatch, tmp_path):
     assert processed == []
     assert sleep_calls == []
     assert meta_store == {}
+
+
+def test_fetch_concurrent_skips_failed_symbols(monkeypatch):
+    svc = importlib.import_module("tomic.cli.services.price_history_polygon")
+    async_mod = importlib.import_module("tomic.integrations.polygon.async_client")
+
+    clients = []
+
+    class FakeAsyncClient:
+        def __init__(self, *, concurrency):
+            self.concurrency = concurrency
+            clients.append(self)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *_exc):
+            pass
+
+    async def fake_request(client, sym):
+        if sym == "BAD":
+            raise RuntimeError("boom")
+        return [{"symbol": sym, "date": "2024-01-02", "close": 1.0}], True
+
+    monkeypatch.setattr(async_mod, "AsyncPolygonClient", FakeAsyncClient)
+    monkeypatch.setattr(svc, "request_bars_async", fake_request)
+
+    fetched = svc._fetch_concurrent(["ABC", "BAD", "XYZ"], 3)
+
+    assert [sym for sym, _ in fetched] == ["ABC", "XYZ"]
+    assert clients[0].concurrency == 3
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import csv
+import ftplib
+import io
+import json
+import random
+import subprocess
+import sys
+import zipfile
+from datetime import datetime
+from math import isclose
+from pathlib import Path
+
+import pytest
+
+from tomic.cli import orats_backfill_flow
+from tomic.cli.services import orats_pipeline
+from tomic.cli.services.vol_helpers import iv_percentile, iv_rank
+from tomic.utils import _is_third_friday
+
+HEADER = [
+    "ticker", "cOpra", "pOpra", "stkPx", "expirDate", "yte", "strike", "cVolu",
+    "cOi", "pVolu", "pOi", "cBidPx", "cValue", "cAskPx", "pBidPx", "pValue",
+    "pAskPx", "cBidIv", "cMidIv", "cAskIv", "smvVol", "pBidIv", "pMidIv",
+    "pAskIv", "iRate", "divRate", "residualRateData", "cDelta", "pDelta",
+    "gamma", "theta", "vega", "trade_date",
+]  # fmt: skip
+
+THIRD_FRIDAYS = ["2024-01-19", "2024-02-16", "2024-03-15", "2024-04-19"]
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+def _rows(ticker, spot, trade_date, expiries, rng, *, deltas=True, noise=True):
+    rows = []
+    for exp in expiries:
+        for k in range(-8, 9):
+            strike = round(spot * (1 + 0.025 * k), 1)
+            m = (strike - spot) / spot
+            c_delta = max(0.01, min(0.99, 0.5 - 2.2 * m + rng.uniform(-0.02, 0.02)))
+            row = dict.fromkeys(HEADER, "0")
+            row.update(
+                ticker=ticker,
+                stkPx=str(spot),
+                expirDate=exp,
+                strike=str(strike),
+                cMidIv=f"{0.2 + 0.3 * m * m + 0.05 * rng.random():.4f}",
+                pMidIv=f"{0.22 + 0.4 * m * m + 0.05 * rng.random():.4f}",
+                cDelta=f"{c_delta:.4f}" if deltas else "",
+                pDelta=f"{c_delta - 1:.4f}" if deltas else "",
+                trade_date=trade_date,
+            )
+            if noise and rng.random() < 0.15:
+                row[rng.choice(["cMidIv", "pMidIv", "cDelta", "pDelta"])] = rng.choice(["null", ""])
+            rows.append(row)
+            if noise and rng.random() < 0.1:
+                rows.append({**row, "cMidIv": f"{0.25 + 0.05 * rng.random():.4f}"})
+    return rows
+
+
+def _write_zip(path: Path, day: datetime, *, delimiter=",", seed=1) -> Path:
+    rng = random.Random(seed)
+    trade_date = day.strftime("%Y-%m-%d" if day.day % 2 else "%m/%d/%Y")
+    rows = (
+        _rows("ZZZ", 50.0, trade_date, THIRD_FRIDAYS, rng)
+        + _rows("AAA", 101.3, trade_date, ["2024-02-09", *THIRD_FRIDAYS], rng)
+        + _rows("BBB", 42.0, trade_date, ["2023-12-15", *THIRD_FRIDAYS[2:]], rng)
+        + _rows("CCC", 10.0, trade_date, ["2024-02-09", "2024-03-08"], rng)
+        + _rows("DDD", 250.0, trade_date, THIRD_FRIDAYS, rng, deltas=False)
+    )
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=HEADER, delimiter=delimiter, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"ORATS_SMV_Strikes_{day:%Y%m%d}.csv", buffer.getvalue())
+    return path
+
+
+def _pipeline_metrics(zip_path):
+    return orats_pipeline.process_orats_zip(zip_path, SYMBOLS)
+
+
+def _number(value):
+    value = (value or "").strip()
+    return None if not value or value == "null" else float(value)
+
+
+def _date(value):
+    for fmt in ("%Y%m%d", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _atm_call(rows, spot):
+    best, best_err = None, float("inf")
+    for row in rows:
+        iv, delta = _number(row["cMidIv"]), _number(row["cDelta"])
+        if iv is None or (delta is not None and not 0.05 <= delta <= 0.95):
+            continue
+        err = abs(float(row["strike"]) - spot)
+        if err < best_err:
+            best, best_err = iv, err
+    return best
+
+
+def _skew(rows, spot):
+    picks = {}
+    for side, sign, target in (("c", 1, 1.15), ("p", -1, 0.85)):
+        delta_err = strike_err = float("inf")
+        for row in rows:
+            iv = _number(row[f"{side}MidIv"])
+            if iv is None:
+                continue
+            delta = _number(row[f"{side}Delta"])
+            if delta is not None and abs(delta - sign * 0.25) < delta_err:
+                delta_err = abs(delta - sign * 0.25)
+                picks[side] = iv
+            diff = abs(float(row["strike"]) - spot * target)
+            if diff < strike_err:
+                strike_err = diff
+                if delta_err == float("inf"):
+                    picks[side] = iv
+    if "c" in picks and "p" in picks:
+        return round((picks["p"] - picks["c"]) * 100, 2)
+    return None
+
+
+def _dedupe(rows):
+    seen = {}
+    for row in rows:
+        for side, kind in (("c", "call"), ("p", "put")):
+            if _number(row[f"{side}MidIv"]) is not None:
+                seen[(float(row["strike"]), kind)] = row
+    return list(seen.values())
+
+
+def _reference_record(rows):
+    """Row-by-row version of the rules ``chain_metrics`` vectorises."""
+
+    trade = _date(rows[0]["trade_date"])
+    spot = float(rows[0]["stkPx"])
+    groups, dte = {}, {}
+    for row in rows:
+        expiry = _date(row["expirDate"])
+        if expiry is None or (expiry - trade).days < 0 or not _is_third_friday(expiry.date()):
+            continue
+        groups.setdefault(row["expirDate"], []).append(row)
+        dte[row["expirDate"]] = (expiry - trade).days
+    if not groups:
+        return None
+    months = sorted(groups, key=dte.get)
+    front = next((e for e in months if 13 <= dte[e] <= 48), None)
+    front = front or next((e for e in months if dte[e] >= 7), None)
+    if front is None:
+        return None
+    chains = {e: _dedupe(groups[e]) for e in months}
+    index = months.index(front)
+    atm = _atm_call(chains[front], spot)
+    terms = []
+    for later in months[index + 1 : index + 3]:
+        iv = _atm_call(chains[later], spot)
+        terms.append(round((atm - iv) * 100, 2) if atm is not None and iv is not None else None)
+    terms += [None] * (2 - len(terms))
+    return {
+        "date": trade.strftime("%Y-%m-%d"),
+        "atm_iv": atm,
+        "term_m1_m2": terms[0],
+        "term_m1_m3": terms[1],
+        "skew": _skew(chains[front], spot),
+    }
+
+
+def _reference_metrics(zip_path):
+    with zipfile.ZipFile(zip_path) as zf:
+        text = zf.read(zf.namelist()[0]).decode()
+    by_ticker = {}
+    for row in csv.DictReader(io.StringIO(text)):
+        if row["ticker"] in SYMBOLS:
+            by_ticker.setdefault(row["ticker"], []).append(row)
+    records = {ticker: _reference_record(rows) for ticker, rows in by_ticker.items()}
+    return {ticker: record for ticker, record in records.items() if record is not None}
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_pipeline_matches_row_based_metrics(tmp_path, seed):
+    zip_path = _write_zip(tmp_path / "day.zip", datetime(2024, 1, 10), seed=seed)
+
+    expected = _reference_metrics(zip_path)
+
+    assert sorted(expected) == ["AAA", "BBB", "DDD"]
+    assert _pipeline_metrics(zip_path) == expected
+
+
+def test_reader_handles_tabs_and_non_leading_ticker_column(tmp_path):
+    zip_path = _write_zip(tmp_path / "day.zip", datetime(2024, 1, 11), delimiter="\t")
+    chains = orats_pipeline.read_orats_zip(zip_path, ["aaa"])
+    assert list(chains) == ["AAA"]
+    assert chains["AAA"].trade_date == "2024-01-11"
+
+    moved = tmp_path / "moved.zip"
+    with zipfile.ZipFile(zip_path) as src, zipfile.ZipFile(moved, "w") as dst:
+        lines = src.read(src.namelist()[0]).decode().splitlines()
+        rotated = ["\t".join(line.split("\t")[1:] + line.split("\t")[:1]) for line in lines]
+        dst.writestr("day.csv", "\n".join(rotated) + "\n")
+    assert orats_pipeline.process_orats_zip(moved, SYMBOLS) == orats_pipeline.process_orats_zip(
+        zip_path, SYMBOLS
+    )
+
+
+def test_numpy_backend_matches_python(tmp_path):
+    """The NumPy path runs in a clean interpreter: tests stub ``numpy``."""
+
+    zip_path = _write_zip(tmp_path / "day.zip", datetime(2024, 1, 10), seed=4)
+    code = (
+        "import json, sys\n"
+        "import numpy\n"
+        "from tests.cli.test_orats_backfill_flow import _pipeline_metrics\n"
+        "print(json.dumps(_pipeline_metrics(sys.argv[1])))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code, str(zip_path)],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    if "No module named 'numpy'" in proc.stderr:
+        pytest.skip("numpy not installed")
+    assert proc.returncode == 0, proc.stderr
+
+    assert json.loads(proc.stdout.strip().splitlines()[-1]) == _pipeline_metrics(zip_path)
+
+
+class _FakeFTP:
+    """FTP stand-in serving the files below ``root``."""
+
+    def __init__(self, root: Path, sessions: list):
+        self.root = root
+        self.closed = False
+        sessions.append(self)
+
+    def retrbinary(self, cmd, callback, blocksize=8192):
+        path = self.root / cmd.split(" ", 1)[1]
+        if not path.exists():
+            raise ftplib.error_perm(f"550 {path.name}: No such file")
+        data = path.read_bytes()
+        for start in range(0, len(data), blocksize):
+            callback(data[start : start + blocksize])
+
+    def voidcmd(self, cmd):
+        return "200 OK"
+
+    def quit(self):
+        self.closed = True
+
+
+def test_run_pipelines_downloads_and_batches_writes(tmp_path, monkeypatch, capsys):
+    remote, cache_dir, summary_dir = tmp_path / "ftp", tmp_path / "cache", tmp_path / "summary"
+    days = [datetime(2024, 1, 10), datetime(2024, 1, 11), datetime(2024, 1, 12)]
+    _write_zip(cache_dir / "2024" / "ORATS_SMV_Strikes_20240110.zip", days[0], seed=5)
+    _write_zip(remote / "smvstrikes" / "2024" / "ORATS_SMV_Strikes_20240112.zip", days[2], seed=6)
+    summary_dir.mkdir()
+    history = [{"date": f"2023-12-{d:02d}", "atm_iv": 0.18 + d / 100} for d in range(1, 21)]
+    (summary_dir / "AAA.json").write_text(json.dumps(history), encoding="utf-8")
+
+    paths = {"ORATS_CACHE_DIR": str(cache_dir), "IV_SUMMARY_DIR": str(summary_dir)}
+    monkeypatch.setattr(orats_backfill_flow.cfg, "get", lambda key, default=None: paths.get(key, default))
+    answers = iter(["10/01/2024", "12/01/2024", "AAA,BBB,CCC"])
+    monkeypatch.setattr(orats_backfill_flow, "prompt", lambda _: next(answers))
+    monkeypatch.setattr(orats_backfill_flow, "prompt_yes_no", lambda _q, default=True: _q.startswith("\n"))
+    monkeypatch.setattr(orats_backfill_flow.time, "sleep", lambda _s: None)
+    monkeypatch.chdir(tmp_path)  # validation report goes to tomic/logs
+
+    flow = orats_backfill_flow.OratsBackfillFlow()
+    flow.DOWNLOAD_DELAY = 0
+    flow.parse_workers = 2
+    sessions: list[_FakeFTP] = []
+    monkeypatch.setattr(flow, "_connect_ftp", lambda: _FakeFTP(remote, sessions))
+    writes: list[str] = []
+    merge = flow._merge_records
+    monkeypatch.setattr(flow, "_merge_records", lambda s, r: writes.append(s) or merge(s, r))
+
+    flow.run()
+
+    out = capsys.readouterr().out
+    assert "Failed downloads: 1" in out
+    assert sorted(writes) == ["AAA", "BBB"]
+    assert (cache_dir / "2024" / "ORATS_SMV_Strikes_20240112.zip").exists()
+    assert sessions and all(ftp.closed for ftp in sessions)
+    assert not (summary_dir / "CCC.json").exists()
+    assert len(list((tmp_path / "tomic" / "logs").glob("orats_validation_*.csv"))) == 1
+
+    stored = {r["date"]: r for r in json.loads((summary_dir / "AAA.json").read_text())}
+    new = {d: stored[d] for d in ("2024-01-10", "2024-01-12")}
+    for day, (date, record) in zip((days[0], days[2]), new.items()):
+        zip_path = flow._get_cache_path(day)
+        expected = orats_pipeline.process_orats_zip(zip_path, ["AAA"])["AAA"]
+        assert record["atm_iv"] == expected["atm_iv"]
+        assert record["skew"] == expected["skew"]
+
+    other = {"2024-01-10": "2024-01-12", "2024-01-12": "2024-01-10"}
+    for date, record in new.items():
+        series = [r["atm_iv"] * 100 for r in history] + [new[other[date]]["atm_iv"] * 100]
+        value = record["atm_iv"] * 100
+        assert isclose(record["iv_rank (IV)"], iv_rank(value, series) * 100)
+        assert isclose(record["iv_percentile (IV)"], iv_percentile(value, series) * 100)
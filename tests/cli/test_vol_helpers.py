@@ -0,0 +1,141 @@
+import json
+import math
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tomic.analysis import metrics
+from tomic.cli.services import vol_helpers
+
+
+def _series(n=400, seed=11):
+    rng = random.Random(seed)
+    closes, highs, lows = [100.0], [101.0], [99.0]
+    for _ in range(n - 1):
+        close = closes[-1] * math.exp(rng.gauss(0, 0.02))
+        closes.append(close)
+        highs.append(close * (1 + abs(rng.gauss(0, 0.01))))
+        lows.append(close * (1 - abs(rng.gauss(0, 0.01))))
+    closes[50] = 0.0  # pairs with a non-positive close are skipped
+    ivs = [round(15 + 10 * rng.random(), 2) for _ in range(n)]
+    return closes, highs, lows, ivs
+
+
+def _compute(closes, highs, lows, ivs):
+    points = [10.0, 15.0, ivs[3], 20.0, 30.0, float("nan")]
+    gappy = [10.0, None, 20.0, float("nan"), 30.0, "n/a", 25.0]
+    mixed = [15.0, None, float("nan"), 40.0]
+    return {
+        "hv": [
+            metrics.historical_volatility(closes, window=w) for w in (20, 30, 90, 252)
+        ],
+        "atr": [metrics.average_true_range(highs, lows, closes, period=p) for p in (1, 14)],
+        "rolling_hv": {w: vol_helpers.rolling_hv(closes, w) for w in (2, 30, 90)},
+        "rank": [vol_helpers.iv_rank(p, ivs) for p in points[:-1]],
+        "pct": [vol_helpers.iv_percentile(p, ivs) for p in points],
+        "rank_many": vol_helpers.iv_rank_many(points[:-1], ivs),
+        "pct_many": vol_helpers.iv_percentile_many(points, ivs),
+        "gappy": [
+            vol_helpers.iv_rank(15.0, gappy),
+            vol_helpers.iv_percentile(15.0, gappy),
+            vol_helpers.iv_rank(15.0, [*ivs, None, float("nan")]),
+            *vol_helpers.iv_rank_many(mixed, gappy),
+            *vol_helpers.iv_percentile_many(mixed, gappy),
+            *vol_helpers.iv_rank_many(mixed, ivs),
+            *vol_helpers.iv_percentile_many(mixed, ivs),
+        ],
+    }
+
+
+def _close(a, b):
+    if a is None or b is None:
+        return a is None and b is None
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def _assert_same(actual, expected):
+    for key in ("hv", "atr", "rank", "pct", "rank_many", "pct_many", "gappy"):
+        assert len(actual[key]) == len(expected[key]), key
+        assert all(_close(a, b) for a, b in zip(actual[key], expected[key])), key
+    for window, series in expected["rolling_hv"].items():
+        got = actual["rolling_hv"][window]
+        assert len(got) == len(series)
+        assert all(_close(a, b) for a, b in zip(got, series))
+
+
+def _python_backend(monkeypatch):
+    monkeypatch.setattr(metrics, "np", None)
+    monkeypatch.setattr(vol_helpers, "np", None)
+
+
+def test_many_variants_match_scalar_calls(monkeypatch):
+    _python_backend(monkeypatch)
+    *_, ivs = _series()
+    points = [10.0, ivs[0], "n/a", None, 30.0]
+    assert vol_helpers.iv_rank_many(points, ivs) == [
+        vol_helpers.iv_rank(p, ivs) for p in points
+    ]
+    assert vol_helpers.iv_percentile_many(points, ivs) == [
+        vol_helpers.iv_percentile(p, ivs) for p in points
+    ]
+    assert vol_helpers.iv_rank_many([1.0], [5.0, 5.0]) == [None]
+    assert vol_helpers.iv_percentile_many([1.0], []) == [None]
+
+
+def test_missing_and_nan_values_are_ignored(monkeypatch):
+    _python_backend(monkeypatch)
+    series = [10.0, None, 20.0, float("nan"), 30.0]
+    assert vol_helpers.iv_rank(15.0, series) == 0.25
+    assert vol_helpers.iv_percentile(15.0, series) == 1 / 3
+    assert vol_helpers.iv_percentile_many([15.0, None], series) == [1 / 3, None]
+
+
+def test_rolling_hv_matches_window_calls(monkeypatch):
+    _python_backend(monkeypatch)
+    closes, *_ = _series(120)
+    expected = [
+        hv
+        for idx in range(30, len(closes) + 1)
+        if (hv := metrics.historical_volatility(closes[:idx], window=29)) is not None
+    ]
+    actual = vol_helpers.rolling_hv(closes, 30)
+    assert len(actual) == len(expected)
+    assert all(_close(a, b) for a, b in zip(actual, expected))
+    # Without gaps a window holds the returns between its ``window`` closes.
+    clean = closes[60:]
+    assert _close(
+        vol_helpers.rolling_hv(clean, 30)[0],
+        metrics.historical_volatility(clean[:30], window=30),
+    )
+
+
+def test_numpy_backend_matches_python(monkeypatch):
+    """The NumPy paths run in a clean interpreter: tests stub ``numpy``."""
+
+    code = (
+        "import json, sys\n"
+        "import numpy\n"
+        "from tests.cli.test_vol_helpers import _compute\n"
+        "print(json.dumps(_compute(*json.load(sys.stdin))))\n"
+    )
+    data = _series()
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        input=json.dumps(data),
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    if "No module named 'numpy'" in proc.stderr:
+        pytest.skip("numpy not installed")
+    assert proc.returncode == 0, proc.stderr
+    actual = json.loads(proc.stdout)
+    actual["rolling_hv"] = {int(w): s for w, s in actual["rolling_hv"].items()}
+
+    _python_backend(monkeypatch)
+    _assert_same(actual, _compute(*data))
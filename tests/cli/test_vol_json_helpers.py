@@ -54,4 +54,5 @@ def test_append_to_iv_summary_corrupt(tmp_path, monkeypatch):
     append_to_iv_summary("AAA", {"date": "2024-01-01", "atm_iv": 0.2}, tmp_path)
     data = load_json(path)
     assert isinstance(data, list) and len(data) == 1
+    assert (tmp_path / "AAA.json.corrupt").read_text() == "{bad json"
 
@@ -0,0 +1,58 @@
+import pytest
+
+from tomic.core.data import ChainTable
+from tomic.core.data.chain_table import MISSING
+
+
+def _records():
+    return [
+        {"strike": 100.0, "type": "call", "mid": 1.0},
+        {"strike": 105.0, "type": "call"},
+    ]
+
+
+def test_overlay_columns_shadow_base_without_copying():
+    records = _records()
+    table = ChainTable(records).with_columns(
+        {"mid": [1.5, MISSING], "mid_source": ["true", "model"]}
+    )
+
+    assert table.records[0] is records[0]
+    assert table[0]["mid"] == 1.5
+    assert "mid" not in table[1]
+    assert table[1]["mid_source"] == "model"
+    assert table.column("mid") == [1.5, None]
+    assert records[0] == {"strike": 100.0, "type": "call", "mid": 1.0}
+
+
+def test_defaults_only_fill_missing_keys():
+    table = ChainTable([{"rate": 0.02}, {}]).with_defaults({"rate": 0.05})
+
+    assert table[0]["rate"] == 0.02
+    assert table[1]["rate"] == 0.05
+
+
+def test_row_writes_are_copy_on_write():
+    records = _records()
+    table = ChainTable(records)
+    row = table[1]
+
+    row["mid"] = 2.0
+    del row["type"]
+
+    assert dict(row) == {"strike": 105.0, "mid": 2.0}
+    assert records[1] == {"strike": 105.0, "type": "call"}
+    assert dict(table[1]) == {"strike": 105.0, "type": "call"}
+
+
+def test_row_equality_and_materialize_match_dicts():
+    table = ChainTable(_records()).with_columns({"edge": [0.1, 0.2]})
+
+    assert table[0] == {"strike": 100.0, "type": "call", "mid": 1.0, "edge": 0.1}
+    assert table.materialize()[1] == {"strike": 105.0, "type": "call", "edge": 0.2}
+    assert len(table[:1]) == 1
+
+
+def test_with_columns_rejects_length_mismatch():
+    with pytest.raises(ValueError):
+        ChainTable(_records()).with_columns({"mid": [1.0]})
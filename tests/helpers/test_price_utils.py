@@ -13,8 +13,8 @@ def test_load_latest_close_non_positive(monkeypatch, tmp_path):
 
     monkeypatch.setattr(
         price_utils,
-        "load_price_history",
-        lambda symbol: [{"date": "2024-01-01", "close": -1}],
+        "cfg_get",
+        lambda name, default=None: str(data_dir) if name == "PRICE_HISTORY_DIR" else default,
     )
     monkeypatch.setattr(
         price_utils,
@@ -0,0 +1,57 @@
+import json
+
+from tomic.helpers.stage_profiler import StageProfiler, active_profiler, profile_stage
+
+
+def test_nested_stages_are_keyed_by_parent():
+    profiler = StageProfiler("XYZ/iron_condor")
+    with profiler.stage("generation"):
+        for _ in range(3):
+            with profiler.stage("scoring"):
+                pass
+    with profiler.stage("generation"):
+        pass
+
+    assert [t.name for t in profiler.stages] == ["generation", "generation/scoring"]
+    assert profiler.get("generation").calls == 2
+    assert profiler.get("generation/scoring").calls == 3
+    assert profiler.total_s == profiler.get("generation").wall_s
+    rows = profiler.rows()
+    assert rows[0][0] == "generation"
+    assert rows[1][0] == "  scoring"
+
+
+def test_profile_stage_is_noop_without_active_profiler():
+    assert active_profiler() is None
+    with profile_stage("scoring") as timing:
+        assert timing is None
+
+    profiler = StageProfiler()
+    with profiler.activate():
+        assert active_profiler() is profiler
+        with profile_stage("scoring") as timing:
+            assert timing is not None
+    assert active_profiler() is None
+    assert profiler.get("scoring").calls == 1
+
+
+def test_merge_and_json_export(tmp_path):
+    first = StageProfiler()
+    with first.stage("csv_load"):
+        pass
+    second = StageProfiler()
+    with second.stage("csv_load"):
+        pass
+    with second.stage("selection"):
+        pass
+
+    merged = StageProfiler("run").merge(first).merge(second).merge(None)
+    assert merged.get("csv_load").calls == 2
+    assert merged.get("selection").calls == 1
+
+    target = tmp_path / "profiles" / "run.json"
+    merged.to_json(target)
+    data = json.loads(target.read_text())
+    assert data["label"] == "run"
+    assert [stage["name"] for stage in data["stages"]] == ["csv_load", "selection"]
+    assert {"calls", "wall_ms", "alloc_blocks", "alloc_bytes"} <= set(data["stages"][0])
@@ -0,0 +1,65 @@
+import json
+
+from tomic.infrastructure import series_index
+from tomic.infrastructure.series_index import INDEX_NAME, SeriesIndex
+from tomic.infrastructure.storage import merge_json_records, save_json, update_json_file
+
+
+def test_index_builds_entries_and_tracks_external_writes(tmp_path):
+    save_json([{"date": "2024-01-02", "close": 2}, {"date": "2024-01-01", "close": 1}], tmp_path / "AAA.json")
+    save_json([{"date": "2024-02-01", "close": 5}], tmp_path / "BBB.json")
+
+    index = SeriesIndex(tmp_path)
+    entries = index.entries()
+    assert sorted(entries) == ["AAA", "BBB"]
+    assert entries["AAA"]["latest"] == {"date": "2024-01-02", "close": 2}
+    assert entries["AAA"]["count"] == 2
+    assert (entries["AAA"]["first_date"], entries["AAA"]["last_date"]) == ("2024-01-01", "2024-01-02")
+    assert set(json.loads((tmp_path / INDEX_NAME).read_text())) == {"AAA", "BBB"}
+
+    (tmp_path / "AAA.json").write_text(json.dumps([{"date": "2024-03-01", "close": 9}]))
+    assert index.latest("AAA") == {"date": "2024-03-01", "close": 9}
+    assert index.entry("AAA")["count"] == 1
+
+    (tmp_path / "BBB.json").unlink()
+    assert index.entry("BBB") is None
+    assert "BBB" not in json.loads((tmp_path / INDEX_NAME).read_text())
+
+
+def test_writers_keep_index_current_without_rebuild(tmp_path, monkeypatch):
+    path = tmp_path / "AAA.json"
+    save_json([{"date": "2024-01-01", "close": 1}], path)
+    index = SeriesIndex(tmp_path)
+    index.entries()
+
+    monkeypatch.setattr(SeriesIndex, "_build", lambda *a: (_ for _ in ()).throw(AssertionError))
+    update_json_file(path, {"date": "2024-01-02", "close": 2}, ["date"])
+    update_json_file(path, {"date": "2024-01-02", "close": 2.5}, ["date"])
+    merge_json_records(path, [{"date": "2024-01-04", "close": 4}, {"date": "2024-01-03", "close": 3}])
+    entry = index.entry("AAA")
+    assert entry["latest"] == {"date": "2024-01-04", "close": 4}
+    assert entry["count"] == 4
+    assert (entry["first_date"], entry["last_date"]) == ("2024-01-01", "2024-01-04")
+
+    # An out-of-order write rewrites the file and the entry with it.
+    update_json_file(path, {"date": "2023-12-31", "close": 0.5}, ["date"])
+    entry = index.entry("AAA")
+    assert entry["count"] == 5
+    assert entry["first_date"] == "2023-12-31"
+
+
+def test_directories_without_index_are_not_indexed_by_writers(tmp_path):
+    update_json_file(tmp_path / "AAA.json", {"date": "2024-01-01"}, ["date"])
+    series_index.note_write(tmp_path / "AAA.json", None, records=[])
+    assert not (tmp_path / INDEX_NAME).exists()
+
+
+def test_entries_survive_an_unwritable_index(tmp_path, monkeypatch):
+    save_json([{"date": "2024-01-01", "close": 1}], tmp_path / "AAA.json")
+
+    def refuse(*_args, **_kwargs):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(series_index, "save_json", refuse)
+    assert SeriesIndex(tmp_path).latest("AAA") == {"date": "2024-01-01", "close": 1}
+    assert not (tmp_path / INDEX_NAME).exists()
@@ -0,0 +1,239 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from tomic.infrastructure import storage
+from tomic.infrastructure.storage import (
+    clear_json_cache,
+    json_cache_stats,
+    load_json,
+    merge_json_records,
+    save_json,
+    update_json_file,
+)
+
+
+def _rewrite(path, records):
+    reference = path.with_name("reference.json")
+    save_json(records, reference)
+    return reference.read_bytes()
+
+
+def test_update_appends_without_parsing_with_same_layout(tmp_path, monkeypatch):
+    path = tmp_path / "AAA.json"
+    records = [{"date": "2024-01-01", "close": 1.0}, {"date": "2024-01-02", "close": 2.0}]
+    save_json(records, path)
+    monkeypatch.setattr(storage, "load_json", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+
+    update_json_file(path, {"date": "2024-01-03", "close": 3.0, "meta": {"a": [1]}}, ["date"])
+    update_json_file(path, {"date": "2024-01-03", "close": 3.5}, ["date"])
+
+    expected = records + [{"date": "2024-01-03", "close": 3.5}]
+    assert path.read_bytes() == _rewrite(tmp_path, expected)
+
+
+def test_update_out_of_order_rewrites_sorted(tmp_path):
+    path = tmp_path / "AAA.json"
+    save_json([{"date": "2024-01-01"}, {"date": "2024-01-03"}], path)
+
+    update_json_file(path, {"date": "2024-01-02"}, ["date"])
+    update_json_file(path, {"date": "2024-01-01", "x": 1}, ["date"])
+
+    assert load_json(path) == [
+        {"date": "2024-01-01", "x": 1},
+        {"date": "2024-01-02"},
+        {"date": "2024-01-03"},
+    ]
+
+
+def test_merge_appends_newer_and_skips_known(tmp_path):
+    path = tmp_path / "AAA.json"
+    assert merge_json_records(path, [{"date": "2024-01-02"}, {"date": "2024-01-01"}]) == 2
+    assert merge_json_records(path, [{"date": "2024-01-04"}, {"date": "2024-01-03"}]) == 2
+    assert merge_json_records(path, [{"date": "2024-01-02"}, {"date": "2024-01-05"}]) == 1
+    assert merge_json_records(path, []) == 0
+
+    dates = [rec["date"] for rec in load_json(path)]
+    assert dates == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"]
+    assert path.read_bytes() == _rewrite(tmp_path, load_json(path))
+
+
+def test_append_writes_in_place(tmp_path):
+    path = tmp_path / "AAA.json"
+    save_json([{"date": "2024-01-01"}], path)
+    inode = path.stat().st_ino
+
+    update_json_file(path, {"date": "2024-01-02"}, ["date"])
+    merge_json_records(path, [{"date": "2024-01-03"}])
+
+    assert path.stat().st_ino == inode
+    assert [r["date"] for r in load_json(path)] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_interrupted_append_is_rolled_back(tmp_path):
+    path = tmp_path / "AAA.json"
+    save_json([{"date": "2024-01-01"}, {"date": "2024-01-02"}], path)
+    before = path.read_bytes()
+    offset = before.rindex(b"}") + 1
+    undo = storage._undo_path(path)
+    undo.write_bytes(f"{offset} {len(before) - offset}\n".encode() + before[offset:])
+    path.write_bytes(before[:offset] + b',\n  {\n    "da')
+
+    assert [r["date"] for r in load_json(path)] == ["2024-01-01", "2024-01-02"]
+    assert path.read_bytes() == before
+    assert not undo.exists()
+
+    # A writer that died while writing the undo file left the data alone.
+    undo.write_bytes(f"{offset} 99\n".encode())
+    update_json_file(path, {"date": "2024-01-03"}, ["date"])
+    assert [r["date"] for r in load_json(path)] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert not undo.exists()
+
+
+def test_readers_never_see_a_partial_append(tmp_path):
+    path = tmp_path / "AAA.json"
+    save_json([{"date": "2024-01-01"}], path)
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            storage._JSON_CACHE.discard(os.path.abspath(path))
+            try:
+                data = load_json(path)
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+                return
+            if not data:
+                errors.append("empty")
+                return
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for day in range(2, 29):
+            update_json_file(path, {"date": f"2024-01-{day:02d}"}, ["date"])
+    finally:
+        done.set()
+        thread.join()
+
+    assert errors == []
+    assert len(load_json(path)) == 28
+
+
+def test_rewrite_refuses_to_replace_unparsable_file(tmp_path):
+    path = tmp_path / "AAA.json"
+    torn = b'[\n  {\n    "date": "2024-01-01"\n  }\n]\n  }\n]'
+    path.write_bytes(torn)
+
+    with pytest.raises(ValueError):
+        update_json_file(path, {"date": "2024-01-02"}, ["date"])
+    with pytest.raises(ValueError):
+        merge_json_records(path, [{"date": "2024-01-02"}])
+
+    assert path.read_bytes() == torn
+    path.write_bytes(b"")
+    update_json_file(path, {"date": "2024-01-02"}, ["date"])
+    assert load_json(path) == [{"date": "2024-01-02"}]
+
+
+def _writer(path, offset):
+    for day in range(offset, 29, 2):
+        update_json_file(path, {"date": f"2024-02-{day:02d}"}, ["date"])
+
+
+def test_update_is_safe_across_processes(tmp_path):
+    path = tmp_path / "AAA.json"
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_writer, args=(str(path), offset)) for offset in (1, 2)]
+    for proc in workers:
+        proc.start()
+    for proc in workers:
+        proc.join(30)
+
+    data = json.loads(path.read_text())
+    assert sorted(rec["date"] for rec in data) == [f"2024-02-{d:02d}" for d in range(1, 29)]
+
+
+def _age(path, stamp=None):
+    stamp = stamp or time.time_ns() - 10_000_000_000
+    os.utime(path, ns=(stamp, stamp))
+    return stamp
+
+
+def test_load_json_serves_unchanged_file_from_cache(tmp_path, monkeypatch):
+    clear_json_cache()
+    path = tmp_path / "meta.json"
+    path.write_text(json.dumps([{"date": "2024-01-01", "legs": [1, 2]}]))
+    _age(path)
+
+    first = load_json(path)
+    first[0]["legs"].append(3)
+    monkeypatch.setattr(storage.json, "load", lambda *_: (_ for _ in ()).throw(AssertionError))
+    assert load_json(path) == [{"date": "2024-01-01", "legs": [1, 2]}]
+    shared = load_json(path, copy=False)
+    assert shared is load_json(path, copy=False)
+    assert json_cache_stats()["hits"] == 3
+    assert json_cache_stats()["misses"] == 1
+
+
+def test_load_json_cache_invalidation(tmp_path):
+    clear_json_cache()
+    path = tmp_path / "meta.json"
+    save_json({"a": 1}, path)
+    stamp = _age(path)
+    assert load_json(path) == {"a": 1}
+
+    # Same size and mtime: only the in-process invalidation catches this.
+    save_json({"a": 2}, path)
+    _age(path, stamp)
+    assert load_json(path) == {"a": 2}
+
+    # Written by another process: the stamp changes.
+    path.write_text(json.dumps({"a": 333}))
+    _age(path, stamp + 1)
+    assert load_json(path) == {"a": 333}
+    assert json_cache_stats()["misses"] == 3
+
+
+def test_load_json_cache_is_bounded(tmp_path, monkeypatch):
+    clear_json_cache()
+    monkeypatch.setattr(storage._JsonReadCache, "_limit", staticmethod(lambda: 100))
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps({"pad": "x" * 30}))
+        _age(path)
+        load_json(path)
+    stats = json_cache_stats()
+    assert stats["files"] == 2
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 100
+
+
+def test_read_only_callers_share_the_cached_object(tmp_path, monkeypatch):
+    from tomic.cli.services import vol_helpers
+    from tomic.helpers import price_meta
+
+    clear_json_cache()
+    meta_path = tmp_path / "price_meta.json"
+    save_json({"AAA": "2024-01-02", "notes": {"x": [1]}}, meta_path)
+    closes_path = tmp_path / "AAA.json"
+    save_json([{"date": "2024-01-02", "close": 2}, {"date": "2024-01-01", "close": 1}], closes_path)
+    paths = {"PRICE_META_FILE": str(meta_path), "DEFAULT_SYMBOLS": []}
+    monkeypatch.setattr(price_meta, "cfg_get", lambda key, default=None: paths.get(key, default))
+    monkeypatch.setattr(vol_helpers, "load_price_history", lambda _s: [])
+    monkeypatch.setattr(vol_helpers, "price_cfg_get", lambda _k: str(tmp_path))
+    monkeypatch.setattr(storage, "_copy_json", lambda _d: (_ for _ in ()).throw(AssertionError))
+
+    meta = price_meta.load_price_meta()
+    meta["notes"]["x"].append(2)
+    meta["AAA"]["source"] = "polygon"
+    assert vol_helpers._get_closes("AAA") == [1.0, 2.0]
+
+    assert load_json(meta_path, copy=False) == {"AAA": "2024-01-02", "notes": {"x": [1]}}
+    assert load_json(closes_path, copy=False)[0]["date"] == "2024-01-02"
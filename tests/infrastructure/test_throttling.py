@@ -0,0 +1,138 @@
+import asyncio
+import math
+import threading
+import time
+
+import pytest
+
+from tomic.infrastructure.throttling import RateLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_burst_then_steady_rate():
+    clock = FakeClock()
+    limiter = RateLimiter(4, 2.0, burst=2, clock=clock, sleep=clock.sleep)
+
+    assert [limiter.wait() for _ in range(2)] == [0.0, 0.0]
+    assert math.isclose(limiter.utilization(), 1.0)
+    assert math.isclose(limiter.wait(), 0.5)
+    assert math.isclose(limiter.wait(), 0.5)
+
+    clock.now += 10
+    assert limiter.utilization() == 0.0
+    assert limiter.time_until_ready() == 0.0
+
+
+def test_no_window_exceeds_max_calls():
+    clock = FakeClock()
+    limiter = RateLimiter(5, 60.0, clock=clock, sleep=clock.sleep)
+    assert limiter.burst == RateLimiter(5, 60.0, burst=50).burst == 5
+
+    calls = []
+    for _ in range(23):
+        limiter.wait()
+        calls.append(clock.now)
+        clock.now += 1.0
+
+    assert calls[:5] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert all(later - earlier >= 60.0 for earlier, later in zip(calls, calls[5:]))
+    assert math.isclose(limiter.time_until_ready(), calls[-5] + 60.0 - clock.now)
+
+
+def test_record_and_log_message():
+    clock = FakeClock()
+    limiter = RateLimiter(1, 1.2, clock=clock, sleep=clock.sleep)
+    limiter.record()
+    assert math.isclose(limiter.time_until_ready(), 1.2)
+
+    messages: list[str] = []
+    waited = limiter.wait(log=messages.append, message="wacht {wait:.1f}s ({max_calls}/{period}s)")
+    assert math.isclose(waited, 1.2)
+    assert messages == ["wacht 1.2s (1/1.2s)"]
+
+
+def test_disabled_limiter_never_waits():
+    limiter = RateLimiter(1, 0, sleep=lambda s: pytest.fail("slept"))
+    assert [limiter.wait() for _ in range(5)] == [0.0] * 5
+    assert limiter.utilization() == 0.0
+
+
+def test_threads_are_served_fifo_without_exceeding_rate():
+    limiter = RateLimiter(20, 1.0, burst=1)
+    limiter.wait()
+    order: list[int] = []
+    lock = threading.Lock()
+
+    def worker(idx: int) -> None:
+        limiter.wait()
+        with lock:
+            order.append(idx)
+
+    threads = []
+    start = time.monotonic()
+    for idx in range(6):
+        thread = threading.Thread(target=worker, args=(idx,))
+        thread.start()
+        threads.append(thread)
+        deadline = time.monotonic() + 1
+        while limiter.waiting() < idx + 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+    assert limiter.utilization() > 1.0
+    for thread in threads:
+        thread.join(2)
+
+    assert order == list(range(6))
+    assert time.monotonic() - start >= 6 / 20 - 0.01
+
+
+def test_async_waiters_do_not_block_the_loop():
+    limiter = RateLimiter(10, 1.0, burst=1)
+
+    async def scenario() -> tuple[float, int]:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.wait_async() for _ in range(4)))
+        elapsed = time.monotonic() - start
+        tick_task.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(scenario())
+    assert elapsed >= 0.29
+    assert ticks >= 10
+
+
+def test_cancelled_async_waiter_returns_its_token():
+    clock = FakeClock()
+    limiter = RateLimiter(1, 1.0, clock=clock)
+
+    async def scenario() -> None:
+        limiter.record()
+        task = asyncio.create_task(limiter.wait_async())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert limiter.waiting() == 0
+    assert math.isclose(limiter.time_until_ready(), 1.0)
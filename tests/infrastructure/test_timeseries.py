@@ -0,0 +1,73 @@
+import json
+import os
+
+from tomic.infrastructure import timeseries
+from tomic.infrastructure.timeseries import TimeSeriesStore, read_latest, read_series
+
+
+def _write(path, records):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+
+def test_store_point_range_latest_and_append(tmp_path):
+    store = TimeSeriesStore(tmp_path / "ts.sqlite3")
+    store.append(
+        "spot_prices",
+        "AAA",
+        [
+            {"date": "2024-01-03", "close": 3},
+            {"date": "2024-01-01", "close": 1},
+            {"date": "2024-01-02", "close": 2},
+            {"close": 99},
+        ],
+    )
+    assert store.count("spot_prices", "AAA") == 3
+    assert store.get("spot_prices", "AAA", "2024-01-02") == {"date": "2024-01-02", "close": 2}
+    assert [r["close"] for r in store.range("spot_prices", "AAA", "2024-01-02")] == [2, 3]
+    assert [r["close"] for r in store.range("spot_prices", "AAA", end="2024-01-02")] == [1, 2]
+
+    store.append("spot_prices", "AAA", [{"date": "2024-01-03", "close": 30}])
+    assert store.latest("spot_prices", "AAA") == {"date": "2024-01-03", "close": 30}
+    assert store.latest("spot_prices", "BBB") is None
+    assert store.symbols("spot_prices") == ["AAA"]
+
+
+def test_json_roundtrip(tmp_path):
+    records = [{"date": "2024-01-01", "close": 1.5}, {"date": "2024-01-02", "close": 2.5}]
+    _write(tmp_path / "in" / "AAA.json", records)
+    store = TimeSeriesStore(tmp_path / "ts.sqlite3")
+
+    assert store.import_json_dir("spot_prices", tmp_path / "in") == 2
+    assert store.export_json_dir("spot_prices", tmp_path / "out") == 2
+    assert json.loads((tmp_path / "out" / "AAA.json").read_text()) == records
+
+
+def test_read_series_syncs_changed_json(tmp_path, monkeypatch):
+    store = TimeSeriesStore(tmp_path / "ts.sqlite3")
+    monkeypatch.setattr(timeseries, "get_timeseries_store", lambda: store)
+    path = tmp_path / "spot_prices" / "AAA.json"
+    _write(path, [{"date": "2024-01-02", "close": 2}, {"date": "2024-01-01", "close": 1}])
+
+    assert [r["close"] for r in read_series(path)] == [1, 2]
+    assert store.count("spot_prices", "AAA") == 2
+
+    _write(path, [{"date": "2024-01-01", "close": 1}, {"date": "2024-01-05", "close": 5}])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert read_latest(path) == {"date": "2024-01-05", "close": 5}
+    assert [r["date"] for r in read_series(path, start="2024-01-02")] == ["2024-01-05"]
+
+    path.unlink()
+    assert read_latest(path) == {"date": "2024-01-05", "close": 5}
+
+
+def test_read_series_without_store_parses_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(timeseries, "get_timeseries_store", lambda: None)
+    path = tmp_path / "spot_prices" / "AAA.json"
+    _write(path, [{"date": "2024-01-02", "close": 2}, {"date": "2024-01-01", "close": 1}])
+
+    assert [r["close"] for r in read_series(path)] == [1, 2]
+    assert read_latest(path) == {"date": "2024-01-02", "close": 2}
+    assert read_series(tmp_path / "spot_prices" / "MISSING.json") == []
+    assert read_latest(tmp_path / "spot_prices" / "MISSING.json") is None
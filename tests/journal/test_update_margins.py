@@ -0,0 +1,101 @@
+import importlib
+import json
+import sys
+import threading
+import types
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def margins(monkeypatch):
+    order_stub = types.ModuleType("ibapi.order")
+    order_stub.Order = type("Order", (), {})
+    monkeypatch.setitem(sys.modules, "ibapi.order", order_stub)
+    monkeypatch.delitem(sys.modules, "tomic.api.margin_calc", raising=False)
+    monkeypatch.delitem(sys.modules, "tomic.journal.update_margins", raising=False)
+    return importlib.import_module("tomic.journal.update_margins")
+
+
+def _trade(trade_id, legs, **extra):
+    return {"TradeID": trade_id, "Symbool": "XYZ", "Expiry": "2026-12-18", "Legs": legs, **extra}
+
+
+SPREAD = [
+    {"strike": 90.0, "type": "PUT", "action": "SELL", "qty": 1},
+    {"strike": 85.0, "type": "PUT", "action": "BUY", "qty": 1},
+]
+
+
+def test_update_all_margins_batches_dedupes_caches_and_estimates(margins, monkeypatch, tmp_path):
+    journal = tmp_path / "journal.json"
+    naked = [{"strike": 80.0, "type": "PUT", "action": "SELL", "qty": 1}]
+    journal.write_text(json.dumps([
+        _trade(1, SPREAD),
+        _trade(2, list(reversed(SPREAD))),
+        _trade(3, naked, Type="Naked Put", Premium=1.5),
+        {"TradeID": 4},
+    ]))
+    monkeypatch.setattr(margins, "JOURNAL_FILE", journal)
+    cache_file = tmp_path / "margin_cache.json"
+    cache_cls = margins.MarginCache
+    monkeypatch.setattr(margins, "MarginCache", lambda: cache_cls(cache_file, ttl=3600))
+    calls = []
+
+    def fake_batch(requests):
+        calls.append([legs for _sym, _exp, legs in requests])
+        return [420.0, None][: len(requests)]
+
+    monkeypatch.setattr(margins, "calculate_trade_margins", fake_batch)
+
+    margins.update_all_margins(batch=True)
+
+    data = json.loads(journal.read_text())
+    assert [t.get("InitMargin") for t in data] == [420.0, 420.0, 7850.0, None]
+    assert [t.get("InitMarginSource") for t in data] == [None, None, "estimate", None]
+    assert calls == [[SPREAD, naked]]
+    assert list(json.loads(cache_file.read_text()).values())[0]["margin"] == 420.0
+
+    margins.update_all_margins(batch=True)
+    assert calls[1] == [naked]
+
+
+def test_batch_app_matches_what_if_responses_by_order_id(margins):
+    from tomic.api.margin_calc import BatchMarginApp
+
+    app = BatchMarginApp()
+    what_if = SimpleNamespace(whatIf=True)
+
+    def respond():
+        app.openOrder(11, None, what_if, SimpleNamespace(initMarginChange="1250.5"))
+        app.openOrder(12, None, SimpleNamespace(whatIf=False), None)
+        app.error(13, 0, 201, "Order rejected")
+        app.openOrder(12, None, what_if, SimpleNamespace(initMarginChange="1.7976931348623157E308"))
+
+    threading.Timer(0.01, respond).start()
+    assert app.wait_for([11, 12, 13], timeout=2) == {11: 1250.5, 12: None, 13: None}
+    assert app.wait_for([11, 14], timeout=0.05) == {11: 1250.5}
+
+
+def test_ib_outage_keeps_stored_margins(margins, monkeypatch, tmp_path):
+    journal = tmp_path / "journal.json"
+    calendar = [
+        {"strike": 100.0, "type": "CALL", "action": "SELL", "qty": 1},
+        {"strike": 100.0, "type": "CALL", "action": "BUY", "qty": 1},
+    ]
+    journal.write_text(json.dumps([
+        _trade(1, SPREAD, InitMargin=500.0),
+        _trade(2, calendar, Type="Calendar", InitMargin=310.0),
+        _trade(3, [SPREAD[0]], Type="Mystery"),
+    ]))
+    monkeypatch.setattr(margins, "JOURNAL_FILE", journal)
+    cache_cls = margins.MarginCache
+    monkeypatch.setattr(margins, "MarginCache", lambda: cache_cls(tmp_path / "c.json", ttl=3600))
+    monkeypatch.setattr(margins, "calculate_trade_margins", lambda requests: [None] * len(requests))
+
+    margins.update_all_margins(batch=True)
+
+    data = json.loads(journal.read_text())
+    assert [t.get("InitMargin") for t in data] == [500.0, 310.0, None]
+    assert all("InitMarginSource" not in t for t in data)
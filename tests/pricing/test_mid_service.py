@@ -84,3 +84,21 @@ def test_mid_service_fallback_matrix(pricing_context):
     assert math.isclose(put_close.mid or 0.0, 0.5, rel_tol=1e-6)
     assert put_close.mid_source == "close"
     assert put_close.mid_fallback == "close"
+
+
+def test_enrich_chain_shares_records_without_mutation(pricing_context):
+    context, chain = pricing_context
+    snapshot = [dict(opt) for opt in chain]
+
+    enriched = context.enrich_chain()
+
+    assert len(enriched) == len(chain)
+    assert enriched.records[0] is chain[0]
+    first = enriched[0]
+    assert math.isclose(first["mid"], 1.1, rel_tol=1e-6)
+    assert first["mid_source"] == "true"
+    assert math.isclose(first["interest_rate"], 0.01)
+    assert first["interest_rate_source"] == "fixture"
+    first["mid"] = 2.0
+    assert math.isclose(enriched[0]["mid"], 1.1, rel_tol=1e-6)
+    assert chain == snapshot
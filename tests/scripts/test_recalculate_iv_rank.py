@@ -0,0 +1,70 @@
+import json
+import random
+
+from tomic.cli.services.vol_helpers import iv_percentile, iv_rank
+from tomic.scripts import recalculate_iv_rank as mod
+
+
+def _reference(record, records):
+    """Per-record recalculation as it was done before the rank engine."""
+
+    atm_iv = record.get("atm_iv")
+    if atm_iv is None:
+        return None, None
+    series = mod.get_historical_iv_values(records, exclude_date=record.get("date"))
+    if not series:
+        return None, None
+    try:
+        scaled = float(atm_iv) * 100 if float(atm_iv) < 1 else float(atm_iv)
+    except ValueError:
+        return None, None
+    rank = iv_rank(scaled, series)
+    pct = iv_percentile(scaled, series)
+    return (rank * 100 if rank is not None else None), pct * 100
+
+
+def _records(n=400, seed=3):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        iv = round(rng.uniform(0.15, 0.45), 3)
+        records.append({"date": f"2020-{i // 28 + 1:02d}-{i % 28 + 1:02d}", "atm_iv": iv})
+    records[5]["atm_iv"] = None
+    records[6]["atm_iv"] = "n/a"
+    records[7]["atm_iv"] = 31.0  # already a percentage
+    records[9]["atm_iv"] = records[10]["atm_iv"]  # ties
+    records.append({"date": records[20]["date"], "atm_iv": 0.5})  # duplicate date
+    records.append({"atm_iv": 0.2})  # no date
+    return records
+
+
+def test_engine_matches_per_record_recalculation():
+    records = _records()
+    engine = mod.IVRankEngine(records)
+    for record in records:
+        result = mod.recalculate_record(record, records, engine=engine)
+        assert (result["iv_rank (IV)"], result["iv_percentile (IV)"]) == _reference(record, records)
+
+
+def test_engine_handles_degenerate_series():
+    flat = [{"date": "2024-01-01", "atm_iv": 0.2}, {"date": "2024-01-02", "atm_iv": 0.2}]
+    assert mod.recalculate_record(flat[0], flat)["iv_rank (IV)"] is None
+    assert mod.recalculate_record(flat[0], flat)["iv_percentile (IV)"] == 0.0
+    single = [{"date": "2024-01-01", "atm_iv": 0.2}]
+    assert mod.recalculate_record(single[0], single)["iv_rank (IV)"] is None
+
+
+def test_main_processes_symbols_in_parallel(tmp_path, monkeypatch):
+    for symbol in ("AAA", "BBB", "CCC"):
+        (tmp_path / f"{symbol}.json").write_text(json.dumps(_records(60, seed=len(symbol))))
+    monkeypatch.setattr(
+        mod, "cfg_get", lambda name, default=None: str(tmp_path) if name == "IV_DAILY_SUMMARY_DIR" else default
+    )
+
+    mod.main(["--workers", "2"])
+
+    for symbol in ("AAA", "BBB"):
+        data = json.loads((tmp_path / f"{symbol}.json").read_text())
+        source = _records(60, seed=len(symbol))
+        source.sort(key=lambda r: r.get("date", ""))
+        assert [rec["iv_rank (IV)"] for rec in data] == [_reference(r, source)[0] for r in source]
@@ -0,0 +1,92 @@
+from datetime import date
+from types import SimpleNamespace
+
+from tomic.models import OptionContract
+from tomic.services import ib_marketdata as mod
+from tomic.services.contract_cache import ContractDetailsCache, make_key
+
+
+class _Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(path, clock=None, ttl=3600.0):
+    return ContractDetailsCache(
+        path, ttl=ttl, clock=clock or _Clock(), today=lambda: date(2026, 1, 5)
+    )
+
+
+def test_cache_is_shared_through_file(tmp_path):
+    path = tmp_path / "contracts.json"
+    writer = _cache(path)
+    key = make_key("xyz", "2026-01-16", 100, "call")
+    writer.put(key, con_id=123, trading_class="XYZ", primary_exchange="CBOE", min_tick=0.01)
+
+    reader = _cache(path)
+    entry = reader.get(make_key("XYZ", "20260116", 100.0, "C", "SMART"))
+    assert entry is not None
+    assert (entry.con_id, entry.trading_class, entry.primary_exchange) == (123, "XYZ", "CBOE")
+    assert entry.min_tick == 0.01
+
+    # A second process adding a contract does not drop entries of the first.
+    reader.put(make_key("XYZ", "20260116", 105, "P"), con_id=456)
+    writer.put(make_key("XYZ", "20260116", 110, "C"), con_id=789)
+    assert len(_cache(path)) == 3
+
+
+def test_cache_evicts_on_ttl_and_expiry(tmp_path):
+    clock = _Clock()
+    cache = _cache(tmp_path / "contracts.json", clock=clock)
+    fresh = make_key("XYZ", "20260116", 100, "C")
+    expired = make_key("XYZ", "20260102", 100, "C")
+    cache.put(fresh, con_id=1)
+    cache.put(expired, con_id=2)
+
+    assert cache.get(expired) is None
+    assert cache.get(fresh) is not None
+    clock.now += 3601
+    assert cache.get(fresh) is None
+    assert cache.prune() == 1
+    assert len(_cache(tmp_path / "contracts.json", clock=clock)) == 0
+
+
+def test_enrich_uses_cache_on_warm_refresh(tmp_path, monkeypatch):
+    class DetailsApp:
+        calls = 0
+
+        def request_contract_details(self, contract, timeout=5.0):
+            DetailsApp.calls += 1
+            return OptionContract(
+                "XYZ", "20260116", 100.0, "C",
+                trading_class="XYZW", primary_exchange="CBOE", con_id=555,
+            )
+
+    def fake_build(self, leg, **kwargs):
+        return SimpleNamespace(
+            symbol="XYZ",
+            lastTradeDateOrContractMonth="20260116",
+            strike=100.0,
+            right="C",
+            exchange="SMART",
+            conId=leg.get("conId"),
+        )
+
+    monkeypatch.setattr(mod.IBMarketDataService, "_build_contract", fake_build)
+    cache = _cache(tmp_path / "contracts.json")
+    service = mod.IBMarketDataService(contract_cache=cache)
+
+    cold = {"symbol": "XYZ", "expiry": "2026-01-16", "strike": 100.0, "type": "call"}
+    contract = service._maybe_enrich_contract(DetailsApp(), cold, fake_build(None, cold), 5.0)
+    assert contract.conId == 555
+
+    warm = {"symbol": "XYZ", "expiry": "2026-01-16", "strike": 100.0, "type": "call"}
+    service._maybe_enrich_contract(DetailsApp(), warm, fake_build(None, warm), 5.0)
+
+    assert DetailsApp.calls == 1
+    assert warm["conId"] == 555
+    assert warm["tradingClass"] == "XYZW"
+    assert warm["primaryExchange"] == "CBOE"
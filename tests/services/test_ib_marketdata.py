@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import math
+import threading
+import time
+from types import SimpleNamespace
 
 import pytest
 
+from tomic.api.pacing import PacingTimeout
 from tomic.services.ib_marketdata import (
     IBMarketDataService,
     QuoteSnapshotApp,
     TickTypeEnum,
     _normalize_symbol,
 )
+from tomic.services.strategy_pipeline import StrategyProposal
 
 
 @pytest.mark.parametrize(
@@ -66,3 +71,169 @@ def test_tick_price_ignores_negative_sentinel():
     app.tickPrice(req_id, TickTypeEnum.ASK, 1.25, None)
 
     assert math.isclose(app._responses[req_id]["ask"], 1.25)
+
+
+def test_late_callbacks_do_not_recreate_cleared_requests():
+    app = QuoteSnapshotApp()
+    app.register_request(7, snapshot=True)
+    app.clear_request(7)
+
+    app.tickPrice(7, TickTypeEnum.BID, 1.0, None)
+    app.tickOptionComputation(7, 13, 0.2, 0.5, 1.0, 0.0, 0.1, 0.2, -0.1, 100.0)
+    app.tickSnapshotEnd(7)
+    app.contractDetails(8, SimpleNamespace())
+    app.contractDetailsEnd(8)
+
+    assert app._responses == {}
+    assert app._events == {}
+    assert app._contract_details == {}
+
+
+class _DelayedQuoteApp(QuoteSnapshotApp):
+    """Answer every request after ``delay`` seconds on a timer thread."""
+
+    def __init__(self, delay: float = 0.2, missing_ask_once: set[float] | None = None):
+        super().__init__()
+        self._ready.set()
+        self.delay = delay
+        self.missing_ask_once = set(missing_ask_once or ())
+        self.requested: list[float] = []
+
+    def isConnected(self) -> bool:  # noqa: N802 - IB API
+        return True
+
+    def reqMktData(self, req_id, contract, ticks, snapshot, regulatory, options):  # noqa: N802
+        strike = contract.strike
+        self.requested.append(strike)
+        data = self._data(req_id)
+
+        def _answer():
+            data["bid"] = 1.0
+            if strike in self.missing_ask_once:
+                self.missing_ask_once.discard(strike)
+            else:
+                data["ask"] = 1.2
+            self._finalize_request(req_id)
+
+        threading.Timer(self.delay, _answer).start()
+
+    def cancelMktData(self, req_id):  # noqa: N802
+        pass
+
+
+def _condor_service(monkeypatch, app):
+    from tomic.analysis.incremental_scoring import ReevaluationResult
+    from tomic.services import ib_marketdata
+    from tomic.services.ib_session import IBSessionManager
+
+    monkeypatch.setattr(
+        ib_marketdata,
+        "reevaluate_proposal",
+        lambda proposal, **kwargs: ReevaluationResult(1.0, [], "full"),
+    )
+    manager = IBSessionManager(connector=lambda **kwargs: kwargs["app"], idle_timeout=0)
+    service = IBMarketDataService(
+        app_factory=lambda: app, generic_ticks="", session_manager=manager
+    )
+    service._quote_retry_delay = 0.0
+    monkeypatch.setattr(
+        service,
+        "_build_contract",
+        lambda leg, **kwargs: SimpleNamespace(symbol="XYZ", strike=leg["strike"]),
+    )
+    legs = [
+        {"symbol": "XYZ", "expiry": "2026-12-18", "strike": strike, "type": right,
+         "position": pos, "tradingClass": "XYZ", "primaryExchange": "ARCA", "conId": i}
+        for i, (strike, right, pos) in enumerate(
+            [(110.0, "call", -1), (115.0, "call", 1), (90.0, "put", -1), (85.0, "put", 1)]
+        )
+    ]
+    return service, StrategyProposal(strategy="iron_condor", legs=legs)
+
+
+def test_refresh_requests_legs_concurrently(monkeypatch):
+    app = _DelayedQuoteApp(delay=0.2)
+    service, proposal = _condor_service(monkeypatch, app)
+
+    start = time.perf_counter()
+    result = service.refresh(proposal, timeout=2.0)
+    elapsed = time.perf_counter() - start
+
+    assert result.missing_quotes == []
+    assert elapsed < 0.6
+    assert all(math.isclose(leg["mid"], 1.1) for leg in proposal.legs)
+
+
+def test_refresh_retries_only_incomplete_legs(monkeypatch):
+    app = _DelayedQuoteApp(delay=0.01, missing_ask_once={90.0})
+    service, proposal = _condor_service(monkeypatch, app)
+
+    result = service.refresh(proposal, timeout=1.0)
+
+    assert result.missing_quotes == []
+    assert app.requested == [110.0, 115.0, 90.0, 85.0, 90.0]
+
+
+class _PacedOutApp(_DelayedQuoteApp):
+    """Fail the third ``reqMktData`` like a pacer that found no free line."""
+
+    def __init__(self):
+        super().__init__(delay=0.01)
+        self.cancelled: list[int] = []
+
+    def reqMktData(self, req_id, contract, ticks, snapshot, regulatory, options):  # noqa: N802
+        if len(self.requested) == 2:
+            raise PacingTimeout("geen vrije market data line")
+        super().reqMktData(req_id, contract, ticks, snapshot, regulatory, options)
+
+    def cancelMktData(self, req_id):  # noqa: N802
+        self.cancelled.append(req_id)
+
+
+def test_failed_send_cancels_and_clears_the_requests_already_issued(monkeypatch):
+    app = _PacedOutApp()
+    service, proposal = _condor_service(monkeypatch, app)
+
+    with pytest.raises(PacingTimeout):
+        service.refresh(proposal, timeout=1.0)
+
+    assert len(app.cancelled) == 3
+    assert app._responses == {}
+    assert app._events == {}
+
+
+def test_refresh_many_requests_shared_contracts_once(monkeypatch):
+    app = _DelayedQuoteApp(delay=0.01)
+    service, condor = _condor_service(monkeypatch, app)
+    put_spread = StrategyProposal(
+        strategy="short_put_spread",
+        legs=[dict(condor.legs[2]), dict(condor.legs[3])],
+    )
+
+    results = service.refresh_many([condor, put_spread], timeout=1.0)
+
+    assert sorted(app.requested) == [85.0, 90.0, 110.0, 115.0]
+    assert [r.missing_quotes for r in results] == [[], []]
+    assert all(math.isclose(leg["mid"], 1.1) for leg in put_spread.legs)
+    assert results[1].proposal is put_spread
+
+
+def test_quote_plan_groups_legs_by_contract():
+    from tomic.services.ib_marketdata import QuotePlan
+
+    leg = {"symbol": "xyz", "expiry": "2026-12-18", "strike": 90, "type": "put"}
+    same = {"symbol": "XYZ", "expiry": "20261218", "strike": 90.0, "right": "P", "conId": 7}
+    other = {"symbol": "XYZ", "expiry": "2026-12-18", "strike": 95.0, "type": "put"}
+    plan = QuotePlan.build(
+        [
+            StrategyProposal(strategy="a", legs=[leg, other]),
+            StrategyProposal(strategy="b", legs=[same, {"strike": 1}]),
+        ]
+    )
+
+    assert len(plan) == 3
+    assert plan.total_legs == 4
+    assert plan.keys[0][0] == plan.keys[1][0]
+    plan.members[plan.keys[0][0]].reverse()
+    plan.share_contract_fields(plan.keys[0][0])
+    assert leg["conId"] == 7
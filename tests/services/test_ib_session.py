@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import math
+import threading
+from types import SimpleNamespace
+
+from tomic.analysis.incremental_scoring import ReevaluationResult
+from tomic.services import ib_marketdata
+from tomic.services.ib_marketdata import IBMarketDataService, QuoteSnapshotApp
+from tomic.services.ib_session import IBSessionManager, SessionParams
+from tomic.services.strategy_pipeline import StrategyProposal
+
+
+class FakeQuoteApp(QuoteSnapshotApp):
+    def __init__(self) -> None:
+        super().__init__()
+        self.connected = True
+        self.requests: list[int] = []
+        self.disconnects = 0
+        self._ready.set()
+
+    def isConnected(self) -> bool:  # noqa: N802 - IB API
+        return self.connected
+
+    def disconnect(self) -> None:
+        self.connected = False
+        self.disconnects += 1
+
+    def reqMktData(self, req_id, contract, ticks, snapshot, regulatory, options):  # noqa: N802
+        self.requests.append(req_id)
+        data = self._data(req_id)
+        data["bid"] = 1.0
+        data["ask"] = 1.2
+        self._finalize_request(req_id)
+
+    def cancelMktData(self, req_id):  # noqa: N802
+        pass
+
+
+class FakeConnector:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        return kwargs["app"]
+
+
+PARAMS = SessionParams(host="127.0.0.1", port=4002, client_id=901)
+
+
+def test_lease_reuses_connection_and_reference_counts():
+    connector = FakeConnector()
+    manager = IBSessionManager(connector=connector, idle_timeout=60)
+
+    with manager.lease("marketdata", FakeQuoteApp, PARAMS) as first:
+        with manager.lease("marketdata", FakeQuoteApp, PARAMS) as second:
+            assert second is first
+            assert first.refs == 2
+    assert first.refs == 0
+    with manager.lease("marketdata", FakeQuoteApp, PARAMS) as third:
+        assert third is first
+
+    assert connector.calls == 1
+    manager.close_all()
+    assert first.app.disconnects == 1
+
+
+def test_unhealthy_session_reconnects():
+    connector = FakeConnector()
+    manager = IBSessionManager(connector=connector, idle_timeout=60)
+
+    with manager.lease("marketdata", FakeQuoteApp, PARAMS) as first:
+        pass
+    first.app.connected = False
+    with manager.lease("marketdata", FakeQuoteApp, PARAMS) as second:
+        assert second is not first
+        assert second.healthy()
+
+    assert connector.calls == 2
+    manager.close_all()
+
+
+def test_leases_with_other_timeouts_share_the_session():
+    connector = FakeConnector()
+    manager = IBSessionManager(connector=connector, idle_timeout=60)
+    slow = SessionParams(host="127.0.0.1", port=4002, client_id=901, timeout=30.0)
+
+    with manager.lease("marketdata", FakeQuoteApp, PARAMS) as first:
+        with manager.lease("marketdata", FakeQuoteApp, slow) as second:
+            assert second is first
+
+    assert connector.calls == 1
+    manager.close_all()
+
+
+def test_client_id_fallback_keeps_the_session_app():
+    stray = FakeQuoteApp()
+    calls: list[dict] = []
+
+    def connector(**kwargs):
+        calls.append(kwargs)
+        # connect_ib_with_retry swaps in its own client after error 326
+        return stray if len(calls) == 1 else kwargs["app"]
+
+    manager = IBSessionManager(connector=connector, idle_timeout=60)
+    with manager.lease("marketdata", FakeQuoteApp, PARAMS) as session:
+        assert session.app is calls[1]["app"]
+        assert session.app is not calls[0]["app"]
+
+    assert stray.disconnects == 1
+    assert calls[1]["unique"] is True and calls[1]["max_retries"] == 0
+    manager.close_all()
+
+
+def test_zero_idle_timeout_closes_on_release():
+    manager = IBSessionManager(connector=FakeConnector(), idle_timeout=0)
+    with manager.lease("marketdata", FakeQuoteApp, PARAMS) as session:
+        pass
+    assert manager.session("marketdata") is None
+    assert session.app.disconnects == 1
+
+
+def test_reserve_ids_hands_out_disjoint_ranges():
+    manager = IBSessionManager(connector=FakeConnector(), idle_timeout=60)
+    with manager.lease("marketdata", FakeQuoteApp, PARAMS) as session:
+        first = session.reserve_ids(4)
+        second = session.reserve_ids(3)
+        assert len(first) == 4 and len(second) == 3
+        assert set(first).isdisjoint(second)
+        assert session.app._next_id() == second[-1] + 1
+    manager.close_all()
+
+
+def test_connect_runs_outside_the_manager_lock():
+    gate = threading.Event()
+    started = threading.Event()
+    connector = FakeConnector()
+
+    def slow_connector(**kwargs):
+        if kwargs["client_id"] == PARAMS.client_id:
+            started.set()
+            assert gate.wait(2)
+        return connector(**kwargs)
+
+    manager = IBSessionManager(connector=slow_connector, idle_timeout=60)
+    leases: list = []
+
+    def lease():
+        leases.append(manager.acquire("marketdata", FakeQuoteApp, PARAMS))
+
+    threads = [threading.Thread(target=lease, daemon=True) for _ in range(2)]
+    threads[0].start()
+    assert started.wait(2)
+    threads[1].start()
+
+    # Other roles and lookups do not wait for the pending connect.
+    other = SessionParams(host="127.0.0.1", port=4002, client_id=902)
+    assert manager.acquire("history", FakeQuoteApp, other).refs == 1
+    assert manager.session("marketdata") is None
+
+    gate.set()
+    for thread in threads:
+        thread.join(2)
+    assert len(leases) == 2 and leases[0] is leases[1]
+    assert leases[0].refs == 2
+    assert connector.calls == 2
+    manager.close_all()
+
+
+def test_refresh_shares_one_connection(monkeypatch):
+    monkeypatch.setattr(ib_marketdata, "reevaluate_proposal", _fake_reevaluate)
+    connector = FakeConnector()
+    manager = IBSessionManager(connector=connector, idle_timeout=60)
+    service = IBMarketDataService(
+        app_factory=FakeQuoteApp, generic_ticks="", session_manager=manager
+    )
+    monkeypatch.setattr(
+        service, "_build_contract", lambda leg, **kwargs: SimpleNamespace(symbol="XYZ")
+    )
+
+    for _ in range(5):
+        result = service.refresh(_proposal(), timeout=1.0)
+        assert result.missing_quotes == []
+        assert math.isclose(result.proposal.legs[0]["mid"], 1.1)
+
+    assert connector.calls == 1
+    app = manager.session("marketdata").app
+    assert len(app.requests) == 5
+    assert app.disconnects == 0
+    manager.close_all()
+
+
+def _fake_reevaluate(proposal, **kwargs):
+    return ReevaluationResult(1.0, [], "full")
+
+
+def _proposal() -> StrategyProposal:
+    return StrategyProposal(
+        strategy="naked_put",
+        legs=[
+            {
+                "symbol": "XYZ",
+                "expiry": "2026-12-18",
+                "strike": 90.0,
+                "type": "put",
+                "position": -1,
+                "tradingClass": "XYZ",
+                "primaryExchange": "ARCA",
+                "conId": 1234,
+            }
+        ],
+    )
@@ -175,3 +175,71 @@ def test_resolve_runtime_settings_respects_overrides(monkeypatch):
     assert settings.throttle.max_inflight == 1
     assert math.isclose(settings.throttle.min_interval, 0.1, rel_tol=1e-6)
 
+
+
+def test_refresh_pipeline_batches_default_fetch():
+    entries = [_make_entry("AAA", "iron_condor"), _make_entry("BBB", "short_put")]
+    batches: list[list[str]] = []
+
+    def fake_batch(proposals, **kwargs):
+        batches.append([proposal.strategy for proposal in proposals])
+        assert kwargs["spot_prices"] == [None, None]
+        assert kwargs["interest_rate"] == 0.04
+        return [
+            SnapshotResult(proposal=p, reasons=[], accepted=True, missing_quotes=[])
+            for p in proposals
+        ]
+
+    params = RefreshParams(entries=entries, fetch_snapshots=fake_batch, interest_rate=0.04)
+    result = refresh_pipeline(RefreshContext(), params=params)
+
+    assert batches == [["iron_condor", "short_put"]]
+    assert result.stats.accepted == 2
+    assert result.stats.attempts == 2
+
+
+def test_refresh_pipeline_batch_retries_only_failed_entries():
+    entries = [
+        _make_entry("AAA", "iron_condor"),
+        _make_entry("BBB", "short_put"),
+        _make_entry("CCC", "calendar"),
+    ]
+    batches: list[list[str]] = []
+
+    def fake_batch(proposals, **kwargs):
+        names = [proposal.strategy for proposal in proposals]
+        batches.append(names)
+        if "short_put" in names:
+            raise RuntimeError("upstream down")
+        return [
+            None
+            if p.strategy == "calendar" and len(batches) == 4
+            else SnapshotResult(proposal=p, reasons=[], accepted=True, missing_quotes=[])
+            for p in proposals
+        ]
+
+    params = RefreshParams(entries=entries, fetch_snapshots=fake_batch, max_attempts=2)
+    result = refresh_pipeline(RefreshContext(), params=params)
+
+    assert batches == [
+        ["iron_condor", "short_put", "calendar"],
+        ["iron_condor"],
+        ["short_put"],
+        ["calendar"],
+        ["short_put", "calendar"],
+        ["short_put"],
+        ["calendar"],
+    ]
+    assert result.stats.accepted == 2
+    assert result.stats.failed == 1
+    assert [r.source.symbol for r in result.rejections] == ["BBB"]
+
+
+def test_explicit_parallel_request_disables_default_batch(monkeypatch):
+    monkeypatch.setattr(refresh_mod, "cfg_value", lambda key, default=None: default)
+
+    assert refresh_mod._resolve_runtime_settings(RefreshParams(entries=[])).batch is True
+    parallel = RefreshParams(entries=[], parallel=True)
+    assert refresh_mod._resolve_runtime_settings(parallel).batch is False
+    both = RefreshParams(entries=[], parallel=True, batch=True)
+    assert refresh_mod._resolve_runtime_settings(both).batch is True
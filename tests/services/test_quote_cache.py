@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from types import SimpleNamespace
+
+from tomic.services.ib_marketdata import QuoteSnapshotApp
+from tomic.services.quote_cache import LiveQuoteCache
+
+
+class _StreamingApp(QuoteSnapshotApp):
+    """Stream a two-sided quote shortly after each subscription."""
+
+    def __init__(self, reject: set[float] | None = None, silent: set[float] | None = None):
+        super().__init__()
+        self._ready.set()
+        self.reject = set(reject or ())
+        self.silent = set(silent or ())
+        self.connected = True
+        self.requested: list[tuple[float, bool]] = []
+        self.cancelled: list[int] = []
+
+    def isConnected(self) -> bool:  # noqa: N802 - IB API
+        return self.connected
+
+    def reqMktData(self, req_id, contract, ticks, snapshot, regulatory, options):  # noqa: N802
+        strike = contract.strike
+        self.requested.append((strike, snapshot))
+
+        def _answer():
+            if strike in self.reject:
+                self.error(req_id, 0, 200, "No security definition has been found")
+                return
+            if strike in self.silent:
+                self.push(req_id, bid=1.0)
+                return
+            self.push(req_id, bid=1.0, ask=1.2)
+
+        threading.Timer(0.01, _answer).start()
+
+    def push(self, req_id, **ticks):
+        self._data(req_id).update(ticks)
+        self._finalize_request(req_id)
+
+    def cancelMktData(self, req_id):  # noqa: N802
+        self.cancelled.append(req_id)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _contracts(*strikes):
+    return [(("XYZ", "20261218", strike, "put"), SimpleNamespace(strike=strike)) for strike in strikes]
+
+
+def test_refreshes_are_served_from_streaming_subscriptions(monkeypatch):
+    from tests.services.test_ib_marketdata import _condor_service
+
+    app = _StreamingApp()
+    service, proposal = _condor_service(monkeypatch, app)
+    cache = LiveQuoteCache(max_age=30, idle_ttl=0, max_lines=10)
+    service._quote_cache = cache
+
+    first = service.refresh(proposal, timeout=1.0)
+    for leg in proposal.legs:
+        leg.pop("mid")
+    second = service.refresh(proposal, timeout=1.0)
+
+    assert first.missing_quotes == second.missing_quotes == []
+    assert app.requested == [(110.0, False), (115.0, False), (90.0, False), (85.0, False)]
+    assert app.cancelled == []
+    assert cache.stats.hits == 4
+    assert all(math.isclose(leg["mid"], 1.1) for leg in proposal.legs)
+
+
+def test_quiet_live_subscriptions_stay_current_and_ticks_update_the_cache():
+    clock = _Clock()
+    app = _StreamingApp()
+    cache = LiveQuoteCache(max_age=5, idle_ttl=0, max_lines=10, clock=clock)
+    [(key, contract)] = _contracts(90.0)
+
+    served, rejected = cache.collect(app, [(key, contract)], timeout=1.0)
+    assert rejected == [] and served[key]["bid"] == 1.0
+    [req_id] = cache._by_req
+
+    clock.now += 3
+    app.push(req_id, bid=1.05)
+    clock.now += 60
+    served, rejected = cache.collect(app, [(key, contract)], timeout=1.0)
+    assert rejected == [] and served[key]["bid"] == 1.05
+    assert math.isclose(served[key]["quote_age_sec"], 60.0)
+    assert len(app.requested) == 1
+    assert cache.stats.hits == 1
+
+    app.connected = False
+    assert cache.get(key) is None
+    assert cache.get(key, max_age=90)["bid"] == 1.05
+
+
+def test_incomplete_quotes_fall_back_without_waiting_again():
+    app = _StreamingApp(silent={90.0})
+    cache = LiveQuoteCache(max_age=30, idle_ttl=60, max_lines=10, first_quote_wait=0.1)
+    contracts = _contracts(85.0, 90.0)
+    key = contracts[1][0]
+
+    start = time.monotonic()
+    served, fallback = cache.collect(app, contracts, timeout=5.0)
+    assert time.monotonic() - start < 1.0
+    assert list(served) == [contracts[0][0]]
+    assert fallback == [contracts[1]]
+
+    start = time.monotonic()
+    served, fallback = cache.collect(app, contracts, timeout=5.0)
+    assert time.monotonic() - start < 0.05
+    assert fallback == [contracts[1]]
+
+    [req_id] = [r for r, k in cache._by_req.items() if k == key]
+    app.push(req_id, ask=1.2)
+    served, fallback = cache.collect(app, contracts, timeout=5.0)
+    assert fallback == [] and served[key]["ask"] == 1.2
+    assert len(app.requested) == 2
+    assert app.cancelled == []
+
+
+def test_subscriptions_that_stay_incomplete_are_dropped():
+    app = _StreamingApp(silent={90.0})
+    cache = LiveQuoteCache(max_age=30, idle_ttl=60, max_lines=10, max_incomplete=2, first_quote_wait=0.05)
+    contracts = _contracts(90.0)
+
+    for _ in range(2):
+        assert cache.collect(app, contracts, timeout=1.0)[1] == contracts
+        assert app.cancelled == []
+    assert cache.collect(app, contracts, timeout=1.0)[1] == contracts
+    assert len(app.cancelled) == 1 and len(cache) == 0
+
+    assert cache.collect(app, contracts, timeout=1.0)[1] == contracts
+    assert len(app.requested) == 1
+
+
+def test_one_sided_contract_costs_no_more_than_plain_refreshes(monkeypatch):
+    from tests.services.test_ib_marketdata import _condor_service
+
+    def _run(cache):
+        app = _StreamingApp(silent={90.0})
+        service, proposal = _condor_service(monkeypatch, app)
+        service._max_quote_retries = 1
+        service._quote_cache = cache
+        timings = []
+        for _ in range(3):
+            start = time.monotonic()
+            result = service.refresh(proposal, timeout=5.0)
+            timings.append(time.monotonic() - start)
+            assert result.missing_quotes == ["90.0"]
+        snapshots = [strike for strike, snapshot in app.requested if snapshot]
+        return timings, snapshots
+
+    plain, plain_snapshots = _run(None)
+    cache = LiveQuoteCache(max_age=30, idle_ttl=60, max_lines=10, first_quote_wait=0.1)
+    cached, cached_snapshots = _run(cache)
+
+    assert cached_snapshots == [s for s in plain_snapshots if s == 90.0] == [90.0] * 6
+    assert cached[0] < plain[0] + 0.5
+    assert all(c < p + 0.2 for c, p in zip(cached[1:], plain[1:]))
+    assert cache.stats.hits == 6
+
+
+def test_line_limit_evicts_least_recently_used_and_errors_fall_through():
+    clock = _Clock()
+    app = _StreamingApp(reject={95.0})
+    cache = LiveQuoteCache(max_age=30, idle_ttl=60, max_lines=3, clock=clock)
+
+    cache.collect(app, _contracts(80.0, 85.0), timeout=1.0)
+    clock.now += 1
+    cache.collect(app, _contracts(85.0), timeout=1.0)
+    served, rejected = cache.collect(app, _contracts(90.0, 95.0), timeout=1.0)
+
+    assert [key[2] for key, _contract in rejected] == [95.0]
+    assert sorted(key[2] for key in served) == [90.0]
+    assert sorted(key[2] for key in cache.snapshot()) == [85.0, 90.0]
+    assert cache.stats.evicted == 1
+
+    clock.now += 61
+    assert cache.evict_idle() == 2
+    assert len(cache) == 0
+    cache.close()
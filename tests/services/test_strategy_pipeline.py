@@ -135,6 +135,32 @@ def test_build_proposals_generates_results(sample_option):
     assert evaluated["underlying"] == "XYZ"
 
 
+def test_build_proposals_records_stage_profile(sample_option):
+    def generator(symbol, strategy, option_chain, atr, config, spot, interactive_mode=False):
+        return [], []
+
+    pipeline = StrategyPipeline(
+        config={},
+        strike_selector_factory=lambda **kwargs: DummySelector(),
+        strategy_generator=generator,
+    )
+    context = StrategyContext(
+        symbol="XYZ",
+        strategy="iron_condor",
+        option_chain=[sample_option],
+        spot_price=102.0,
+        dte_range=(0, 365),
+    )
+
+    pipeline.build_proposals(context)
+
+    profile = pipeline.last_profile
+    assert profile is not None
+    names = [stage.name for stage in profile.stages]
+    assert names == ["mid_context", "selection", "leg_evaluation", "generation", "conversion"]
+    assert all(stage.calls == 1 for stage in profile.stages)
+
+
 def test_build_proposals_handles_rejections(sample_option):
     selector = DummySelector(selected=[], by_filter={"delta": 2}, by_reason={"delta:low": 2})
 
@@ -0,0 +1,153 @@
+import math
+from copy import deepcopy
+
+from tomic.strategies import StrategyName, atm_iron_butterfly
+from tomic.strategies.pruning import ComboPruner
+
+
+def _opt(strike, right, mid, delta=None):
+    return {"strike": strike, "type": right, "mid": mid, "delta": delta}
+
+
+def _condor(sc_mid, lc_mid, sp_mid, lp_mid, *, short_delta=0.2):
+    return [
+        (_opt(110, "call", sc_mid, short_delta), -1),
+        (_opt(115, "call", lc_mid, 0.1), 1),
+        (_opt(90, "put", sp_mid, -short_delta), -1),
+        (_opt(85, "put", lp_mid, -0.1), 1),
+    ]
+
+
+def test_bounds_for_iron_condor():
+    pruner = ComboPruner(strategy=StrategyName.IRON_CONDOR.value)
+    bounds = pruner.bounds(_condor(1.5, 0.5, 1.5, 0.5))
+    assert math.isclose(bounds.credit, 2.0)
+    assert math.isclose(bounds.width, 5.0)
+    assert math.isclose(bounds.risk_reward, 1.5)
+    assert math.isclose(bounds.rom, 2.0 / 3.0 * 100)
+    assert bounds.ev is not None
+
+
+def test_unknown_short_mid_is_never_pruned():
+    pruner = ComboPruner(
+        strategy=StrategyName.IRON_CONDOR.value,
+        min_risk_reward=1.0,
+        require_positive_credit=True,
+    )
+    assert pruner.bounds(_condor(None, 0.5, 1.5, 0.5)).credit is None
+    assert pruner.check(_condor(None, 0.5, 1.5, 0.5)) is None
+    assert pruner.pruned == 0
+
+
+def test_prunes_non_positive_credit():
+    pruner = ComboPruner(
+        strategy=StrategyName.IRON_CONDOR.value, require_positive_credit=True
+    )
+    reason = pruner.check(_condor(0.5, 0.6, 0.5, 0.6))
+    assert reason == "bovengrens credit niet positief"
+    assert pruner.pruned == 1
+    assert pruner.by_reason == {reason: 1}
+    assert pruner.summary() == "1/1 combinaties gepruned op bovengrenzen"
+
+
+def test_prunes_unreachable_risk_reward():
+    pruner = ComboPruner(strategy=StrategyName.IRON_CONDOR.value, min_risk_reward=2.0)
+    # credit 1.0 on a 5 wide wing -> R/R 4.0 > 2.0
+    assert pruner.check(_condor(0.8, 0.3, 0.8, 0.3)) == "bovengrens risk/reward onhaalbaar"
+    # credit 2.0 -> R/R 1.5 passes the bound
+    assert pruner.check(_condor(1.5, 0.5, 1.5, 0.5, short_delta=0.1)) is None
+    assert (pruner.checked, pruner.pruned) == (2, 1)
+
+
+def test_ratio_strategies_only_use_credit_bound():
+    pruner = ComboPruner(
+        strategy=StrategyName.BACKSPREAD_PUT.value,
+        min_risk_reward=5.0,
+        require_positive_credit=False,
+    )
+    legs = [(_opt(90, "put", 0.5, -0.2), -1), (_opt(80, "put", 0.4, -0.1), 1)]
+    assert pruner.bounds(legs).width is None
+    assert pruner.check(legs) is None
+
+
+def test_disabled_pruner_skips_checks():
+    pruner = ComboPruner(
+        strategy=StrategyName.IRON_CONDOR.value,
+        require_positive_credit=True,
+        enabled=False,
+    )
+    assert pruner.check(_condor(0.5, 0.6, 0.5, 0.6)) is None
+    assert pruner.checked == 0
+
+
+def _norm_cdf(x):
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+
+def _bs_chain(spot=100.0, vol=0.25, days=48):
+    """Black-Scholes priced monthly chain from 70 to 130 in 2.5 steps."""
+
+    t = days / 365
+    rows = []
+    for i in range(25):
+        strike = 70 + 2.5 * i
+        d1 = (math.log(spot / strike) + 0.5 * vol * vol * t) / (vol * math.sqrt(t))
+        d2 = d1 - vol * math.sqrt(t)
+        for right in ("call", "put"):
+            if right == "call":
+                mid = spot * _norm_cdf(d1) - strike * _norm_cdf(d2)
+                delta = _norm_cdf(d1)
+            else:
+                mid = strike * _norm_cdf(-d2) - spot * _norm_cdf(-d1)
+                delta = _norm_cdf(d1) - 1
+            mid = max(mid, 0.01)
+            rows.append(
+                {
+                    "expiry": "20240719",
+                    "strike": strike,
+                    "type": right,
+                    "bid": round(mid * 0.97, 2),
+                    "ask": round(mid * 1.03, 2),
+                    "mid": round(mid, 2),
+                    "model_price": round(mid, 2),
+                    "delta": round(delta, 3),
+                    "iv": vol,
+                    "gamma": 0.02,
+                    "vega": 0.1,
+                    "theta": -0.03,
+                    "edge": 0.0,
+                }
+            )
+    return rows
+
+
+def test_wing_generator_accepts_the_same_proposals_with_pruning(monkeypatch):
+    monkeypatch.setenv("TOMIC_TODAY", "2024-06-01")
+    config = {
+        "min_risk_reward": 0.0,
+        "strike_to_strategy_config": {
+            "use_ATR": False,
+            "center_strike_relative_to_spot": [-10, -5, 0, 5, 10],
+            "wing_sigma_multiple": 2.0,
+        },
+    }
+    results = {}
+    for enabled in (True, False):
+        cfg = deepcopy(config)
+        cfg["bound_pruning"] = enabled
+        proposals, reasons = atm_iron_butterfly.generate("AAA", _bs_chain(), cfg, 100.0, 2.0)
+        accepted = sorted(
+            (
+                tuple((leg["strike"], leg["type"], leg["position"]) for leg in p.legs),
+                p.score,
+            )
+            for p in proposals
+        )
+        results[enabled] = (accepted, reasons)
+
+    pruned_accepted, pruned_reasons = results[True]
+    full_accepted, full_reasons = results[False]
+    assert pruned_accepted and pruned_accepted == full_accepted
+    assert any(r.startswith("bovengrens") for r in pruned_reasons)
+    assert not any(r.startswith("bovengrens") for r in full_reasons)
+    assert len(pruned_reasons) == len(full_reasons)
@@ -55,6 +55,7 @@ def test_log_combo_evaluation_includes_mid_metadata(monkeypatch):
             messages.append(message)
 
     monkeypatch.setattr(logutils, "logger", DummyLogger())
+    monkeypatch.setattr(logutils.combo_recorder, "verbose", True)
 
     snapshot = MidTagSnapshot(tags=("tradable", "true:1"), counters={"true": 1})
 
@@ -70,3 +71,59 @@ def test_log_combo_evaluation_includes_mid_metadata(monkeypatch):
 
     assert any("mid_tags=tradable,true:1" in msg for msg in messages)
     assert any("mid_counts=true:1" in msg for msg in messages)
+
+
+def test_log_combo_evaluation_records_without_formatting(monkeypatch):
+    messages: list[str] = []
+
+    class DummyLogger:
+        def info(self, message, **kwargs):
+            messages.append(message)
+
+    recorder = logutils.ComboEvaluationRecorder(capacity=3)
+    monkeypatch.setattr(logutils, "logger", DummyLogger())
+    monkeypatch.setattr(logutils, "combo_recorder", recorder)
+
+    for idx in range(5):
+        log_combo_evaluation(
+            "iron_condor",
+            f"combo {idx}",
+            None,
+            "reject",
+            "bovengrens credit niet positief" if idx % 2 else "opties niet gevonden",
+        )
+
+    assert messages == []
+    assert len(recorder) == 3
+    assert [item.desc for item in recorder.recent()] == ["combo 2", "combo 3", "combo 4"]
+    assert recorder.reason_counts() == {
+        "opties niet gevonden": 3,
+        "bovengrens credit niet positief": 2,
+    }
+    rendered = recorder.render(limit=1)
+    assert len(rendered) == 1
+    assert rendered[0].startswith("[iron_condor] combo 4")
+    assert "REJECT (opties niet gevonden)" in rendered[0]
+
+
+def test_recorder_counts_by_reason_code_and_buffers_copies():
+    recorder = logutils.ComboEvaluationRecorder(capacity=10)
+    metrics = {"pos": 61.5, "ev": 0.12, "max_profit": 80.0, "max_loss": -120.0, "big": [0] * 100}
+    leg = {"expiry": "2025-01-17", "type": "put", "strike": 95.0, "position": -1, "quotes": {}}
+
+    for idx in range(50):
+        recorder.record(
+            logutils.ComboEvaluation(
+                "short_put", f"combo {idx}", metrics, "reject",
+                f"credit {idx / 100:.2f} < minimum 0.50", legs=[leg],
+            )
+        )
+
+    assert len(recorder.counts()) == 1
+    assert recorder.reason_counts() == {"credit # < minimum #": 50}
+    item = recorder.recent(1)[0]
+    assert item.metrics == {"pos": 61.5, "ev": 0.12, "max_profit": 80.0, "max_loss": -120.0}
+    assert item.legs == [{"expiry": "2025-01-17", "type": "put", "strike": 95.0, "position": -1}]
+    assert item.legs[0] is not leg
+    leg["strike"] = 90.0
+    assert "SP=95.0P" in recorder.render(limit=1)[0]
@@ -0,0 +1,217 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+
+class _StubPolygon(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        key = parse_qs(url.query).get("apiKey", [""])[0]
+        server = self.server
+        with server.lock:
+            server.requests.append((url.path, key))
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            retries = server.requests.count((url.path, key))
+        try:
+            time.sleep(server.delay)
+            if key == "bad":
+                status, body = 403, {"status": "NOT_AUTHORIZED"}
+            elif url.path == "/boom":
+                status, body = 500, {}
+            elif url.path == "/retry" and retries == 1:
+                status, body = 429, {}
+            elif url.path.startswith("/v3/reference/tickers/"):
+                symbol = url.path.rsplit("/", 1)[-1]
+                status, body = 200, {"results": {"name": f"{symbol} Inc", "market": "stocks"}}
+            else:
+                status, body = 200, {"ok": True}
+        finally:
+            with server.lock:
+                server.active -= 1
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubPolygon)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.active = 0
+    server.peak = 0
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _run(scenario, server):
+    """Run ``scenario`` in a clean interpreter: tests stub ``aiohttp``."""
+
+    code = (
+        "import json, sys\n"
+        "import aiohttp\n"
+        f"from tests.test_polygon_async_client import {scenario}\n"
+        "print(json.dumps(" + scenario + "(sys.argv[1])))\n"
+    )
+    host, port = server.server_address
+    proc = subprocess.run(
+        [sys.executable, "-c", code, f"http://{host}:{port}"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parents[1],
+        timeout=60,
+    )
+    if "No module named 'aiohttp'" in proc.stderr:
+        pytest.skip("aiohttp not installed")
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _client(base_url, **kwargs):
+    from tomic.infrastructure.throttling import RateLimiter
+    from tomic.integrations.polygon.async_client import AsyncPolygonClient
+
+    async def no_sleep(_delay):
+        pass
+
+    kwargs.setdefault("limiter", RateLimiter(0, 0))
+    return AsyncPolygonClient(base_url=base_url, sleep=no_sleep, **kwargs)
+
+
+def concurrent_details(base_url):
+    import asyncio
+
+    async def run():
+        async with _client(base_url, api_key="k1", concurrency=4) as client:
+            return await client.fetch_ticker_details_batch([f"S{i}" for i in range(12)])
+
+    return asyncio.run(run())
+
+
+def retry_and_rotate(base_url):
+    import asyncio
+
+    async def run():
+        async with _client(base_url, api_key="bad,good") as client:
+            return [await client._request("retry"), await client._request("other")]
+
+    return asyncio.run(run())
+
+
+def shared_budget(base_url):
+    import asyncio
+
+    from tomic.infrastructure.throttling import RateLimiter
+
+    async def run():
+        limiter = RateLimiter(1, 0.1, burst=1)
+        async with _client(base_url, api_key="a,b", concurrency=8, limiter=limiter) as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(client._request(f"p{i}") for i in range(6)))
+            return time.perf_counter() - start
+
+    return asyncio.run(run())
+
+
+def circuit_breaker_trips(base_url):
+    import asyncio
+
+    import aiohttp
+
+    from tomic.integrations.polygon.client import CircuitBreaker, CircuitBreakerError
+
+    async def run():
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        outcome = []
+        async with _client(base_url, api_key="k", circuit_breaker=breaker) as client:
+            for _ in range(3):
+                try:
+                    await client._request("boom")
+                except aiohttp.ClientResponseError as exc:
+                    outcome.append(exc.status)
+                except CircuitBreakerError:
+                    outcome.append("open")
+        return outcome
+
+    return asyncio.run(run())
+
+
+def cached_details(base_url):
+    import asyncio
+    import tempfile
+
+    from tomic.integrations.polygon.cache import ResponseCache
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(f"{tmp}/cache.sqlite3")
+            async with _client(base_url, api_key="k1", cache=cache) as client:
+                first = await client.fetch_ticker_details("ABC")
+                second = await client.fetch_ticker_details("ABC")
+            cache.close()
+        return [first, second]
+
+    return asyncio.run(run())
+
+
+def test_requests_run_concurrently_up_to_the_limit(stub_server):
+    stub_server.delay = 0.1
+
+    details = _run("concurrent_details", stub_server)
+
+    assert details["S7"]["name"] == "S7 Inc"
+    assert len(details) == 12
+    assert stub_server.peak == 4
+
+
+def test_rate_limit_is_retried_and_rejected_keys_rotate(stub_server):
+    assert _run("retry_and_rotate", stub_server) == [{"ok": True}, {"ok": True}]
+
+    assert stub_server.requests == [
+        ("/retry", "bad"),
+        ("/retry", "good"),
+        ("/retry", "good"),
+        ("/other", "bad"),
+        ("/other", "good"),
+    ]
+
+
+def test_rate_budget_is_shared_by_concurrent_requests(stub_server):
+    elapsed = _run("shared_budget", stub_server)
+
+    # One token up front, then one per 0.1s for the other five requests.
+    assert elapsed >= 0.45
+    assert len(stub_server.requests) == 6
+
+
+def test_server_errors_open_the_circuit(stub_server):
+    assert _run("circuit_breaker_trips", stub_server) == [500, 500, "open"]
+    assert len(stub_server.requests) == 2
+
+
+def test_responses_are_served_from_the_cache(stub_server):
+    first, second = _run("cached_details", stub_server)
+
+    assert first == second
+    assert first["name"] == "ABC Inc"
+    assert len(stub_server.requests) == 1
@@ -0,0 +1,164 @@
+import json
+import sqlite3
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+from tomic.integrations.polygon import cache as cache_mod
+from tomic.integrations.polygon.cache import ResponseCache, request_key
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_request_key_ignores_api_key_and_param_order():
+    _, a = request_key("/v3/snapshot/options/ABC", {"b": 2, "a": "x", "apiKey": "k1"})
+    _, b = request_key("v3/snapshot/options/ABC?apiKey=k2&a=x", {"b": "2"})
+    assert a == b == "v3/snapshot/options/ABC?a=x&b=2"
+
+
+def test_ttl_policies(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_mod, "_today", lambda: date(2024, 6, 10))
+    cache = ResponseCache(tmp_path / "c.sqlite3", ttl_overrides={"snapshot": 5})
+    bars = "v2/aggs/ticker/ABC/range/1/day/2024-01-01/{end}"
+
+    assert cache.ttl_for(bars.format(end="2024-06-01")) is None
+    assert cache.ttl_for(bars.format(end="2024-06-09")) == 3600
+    assert cache.ttl_for("v3/reference/tickers/ABC") == 86400
+    assert cache.ttl_for("v3/snapshot/options/ABC", {"cursor": "x"}) == 5
+    assert cache.ttl_for("v1/unknown") == 0
+    assert cache.put("v1/unknown", None, {"a": 1}) is False
+    assert cache.get("v1/unknown") is None
+
+
+def test_entries_expire_and_evict_least_recently_used(tmp_path):
+    clock = _Clock()
+    cache = ResponseCache(tmp_path / "c.sqlite3", max_bytes=60, clock=clock)
+
+    cache.put("v3/reference/tickers/A", None, {"name": "a" * 10})
+    clock.now += 1
+    cache.put("v3/reference/tickers/B", None, {"name": "b" * 10})
+    clock.now += 1
+    assert cache.get("v3/reference/tickers/A").payload == {"name": "a" * 10}
+    clock.now += 1
+    cache.put("v3/reference/tickers/C", None, {"name": "c" * 10})
+
+    assert cache.get("v3/reference/tickers/B") is None
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] <= 60
+
+    clock.now += 86400 + 1
+    assert cache.get("v3/reference/tickers/A") is None
+
+
+def test_size_total_tracks_replacements_and_existing_files(tmp_path):
+    path = tmp_path / "c.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE responses (key TEXT PRIMARY KEY, payload TEXT NOT NULL, etag TEXT, "
+        "last_modified TEXT, stored_at REAL NOT NULL, expires_at REAL, "
+        "accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+    )
+    conn.execute("INSERT INTO responses VALUES ('old', '{}', NULL, NULL, 0, NULL, 0, 40)")
+    conn.commit()
+    conn.close()
+
+    cache = ResponseCache(path, max_bytes=1000)
+    assert cache.stats()["bytes"] == 40
+    cache.put("v3/reference/tickers/A", None, {"name": "a" * 10})
+    cache.put("v3/reference/tickers/A", None, {"name": "a" * 30})
+    cache.put("v3/reference/tickers/B", None, {"name": "b"})
+
+    conn = cache._connect()
+    (actual,) = conn.execute("SELECT SUM(size) FROM responses").fetchone()
+    assert cache.stats() == {"entries": 3, "bytes": actual, "max_bytes": 1000}
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
+
+
+class _Server(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        path = urlsplit(self.path).path
+        server.hits.append((path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"results": {"name": path.rsplit("/", 1)[-1]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if "/TAGGED/" in path:
+            self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def fake_polygon():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Server)
+    server.hits = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    try:
+        yield server, f"http://{host}:{port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _client(base_url, cache):
+    mod = pytest.importorskip("tomic.integrations.polygon.client")
+    if not hasattr(mod.requests, "Session"):
+        pytest.skip("requests not installed")
+    client = mod.PolygonClient(api_key="key", cache=cache)
+    client.BASE_URL = base_url
+    client.connect()
+    return client
+
+
+def test_client_serves_repeats_from_cache(tmp_path, fake_polygon):
+    server, base_url = fake_polygon
+    cache = ResponseCache(tmp_path / "c.sqlite3")
+    client = _client(base_url, cache)
+    try:
+        first = client.fetch_ticker_details("abc")
+        second = client.fetch_ticker_details("abc")
+        other = client._request("v3/reference/tickers/ABC", {"apiKey": "other"})
+    finally:
+        client.disconnect()
+
+    assert first == second
+    assert other == {"results": {"name": "ABC"}}
+    assert server.hits == [("/v3/reference/tickers/ABC", None)]
+
+
+def test_client_revalidates_expired_entries_with_etag(tmp_path, fake_polygon):
+    server, base_url = fake_polygon
+    clock = _Clock()
+    cache = ResponseCache(tmp_path / "c.sqlite3", clock=clock)
+    client = _client(base_url, cache)
+    end = (date.today() + timedelta(days=1)).isoformat()
+    path = f"v2/aggs/ticker/TAGGED/range/1/day/2024-01-01/{end}"
+    try:
+        assert client._request(path) == {"results": {"name": end}}
+        clock.now += 3601
+        assert client._request(path) == {"results": {"name": end}}
+        assert client._request(path) == {"results": {"name": end}}
+    finally:
+        client.disconnect()
+
+    assert [etag for _, etag in server.hits] == [None, '"v1"']
@@ -0,0 +1,178 @@
+"""Benchmark framing of the TWS message stream by the IB reader thread.
+
+Feeds a recorded (or synthetic) raw socket stream through the legacy
+``buf += data`` / ``comm.read_msg`` loop and through
+:class:`~tomic.ibapi.framing.MessageFramer`.  ``--chunk`` controls how much
+data a single ``recvMsg`` call returns; during tick floods ``_recvAllMsg``
+hands the reader megabytes at once, which is where the legacy slicing turns
+quadratic.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+
+from tomic.ibapi.framing import MessageFramer
+
+MODES = ("legacy", "framer")
+
+_TICK_PRICE = 1
+_TICK_SIZE = 2
+_TICK_OPTION_COMPUTATION = 21
+
+
+def _frame(*fields: object) -> bytes:
+    payload = "".join(f"{value}\0" for value in fields).encode("ascii")
+    return struct.pack("!I", len(payload)) + payload
+
+
+def synthetic_stream(messages: int = 200_000, *, contracts: int = 500) -> bytes:
+    """Return a deterministic stream of tick messages for ``contracts`` ids."""
+
+    frames: list[bytes] = []
+    for idx in range(messages):
+        req_id = 1000 + idx % contracts
+        kind = idx % 3
+        price = 1.0 + (idx % 997) / 100
+        if kind == 0:
+            frames.append(_frame(_TICK_PRICE, 6, req_id, 1 + idx % 2, f"{price:.2f}", 10, 0))
+        elif kind == 1:
+            frames.append(_frame(_TICK_SIZE, 6, req_id, 0, 100 + idx % 50))
+        else:
+            frames.append(
+                _frame(
+                    _TICK_OPTION_COMPUTATION, req_id, 13, 0,
+                    "0.2531", "0.4312", f"{price:.4f}", "0", "0.0213",
+                    "0.1124", "-0.0312", "101.25",
+                )
+            )
+    return b"".join(frames)
+
+
+def chunk_stream(stream: bytes, chunk_size: int) -> list[bytes]:
+    """Split ``stream`` like successive ``recvMsg`` results would."""
+
+    size = max(int(chunk_size), 1)
+    return [stream[pos : pos + size] for pos in range(0, len(stream), size)]
+
+
+def _legacy_read_msg(buf: bytes) -> tuple:
+    # Mirrors ``ibapi.comm.read_msg`` without the debug logging.
+    if len(buf) < 4:
+        return (0, "", buf)
+    size = struct.unpack("!I", buf[0:4])[0]
+    if len(buf) - 4 >= size:
+        text = struct.unpack("!%ds" % size, buf[4 : 4 + size])[0]
+        return (size, text, buf[4 + size :])
+    return (size, "", buf)
+
+
+def legacy_frames(chunks: Iterable[bytes]) -> list[bytes]:
+    """Split ``chunks`` with the original ``EReader.run`` loop."""
+
+    out: list[bytes] = []
+    buf = b""
+    for data in chunks:
+        buf += data
+        while len(buf) > 0:
+            (_size, msg, buf) = _legacy_read_msg(buf)
+            if msg:
+                out.append(msg)
+            else:
+                break
+    return out
+
+
+def framer_frames(chunks: Iterable[bytes]) -> list[bytes]:
+    """Split ``chunks`` with :class:`MessageFramer`."""
+
+    out: list[bytes] = []
+    framer = MessageFramer()
+    for data in chunks:
+        framer.feed(data)
+        out.extend(framer.drain())
+    return out
+
+
+_RUNNERS: dict[str, Callable[[Iterable[bytes]], list[bytes]]] = {
+    "legacy": legacy_frames,
+    "framer": framer_frames,
+}
+
+
+def run_mode(mode: str, chunks: Sequence[bytes], *, runs: int = 3) -> dict:
+    """Frame ``chunks`` ``runs`` times in ``mode`` and return statistics."""
+
+    if mode not in _RUNNERS:
+        raise ValueError(f"unknown mode {mode!r}")
+    runner = _RUNNERS[mode]
+    total_bytes = sum(len(chunk) for chunk in chunks)
+    durations: list[float] = []
+    messages: list[bytes] = []
+    for _ in range(max(1, runs)):
+        start = time.perf_counter()
+        messages = runner(chunks)
+        durations.append(time.perf_counter() - start)
+    best = min(durations)
+    return {
+        "mode": mode,
+        "bytes": total_bytes,
+        "chunks": len(chunks),
+        "messages": len(messages),
+        "runs": len(durations),
+        "best_s": best,
+        "mb_per_s": (total_bytes / 1e6) / best if best > 0 else None,
+        "msgs_per_s": len(messages) / best if best > 0 else None,
+    }
+
+
+def compare(stream: bytes, *, chunk_size: int, runs: int) -> list[dict]:
+    """Run every mode on ``stream`` and verify the outputs are identical."""
+
+    chunks = chunk_stream(stream, chunk_size)
+    if legacy_frames(chunks) != framer_frames(chunks):
+        raise AssertionError("framer output differs from legacy reader")
+    return [run_mode(mode, chunks, runs=runs) for mode in MODES]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Meet framing van de TWS berichtenstroom (legacy vs bytearray)"
+    )
+    parser.add_argument("--input", type=Path, default=None, help="Opgenomen ruwe socketstroom")
+    parser.add_argument("--record", type=Path, default=None, help="Schrijf de synthetische stroom weg")
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument(
+        "--chunk", type=int, default=1 << 20, help="Bytes per recvMsg aanroep"
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", type=Path, default=None, help="Schrijf resultaten naar JSON")
+    args = parser.parse_args(argv)
+
+    if args.input is not None:
+        stream = args.input.read_bytes()
+    else:
+        stream = synthetic_stream(args.messages)
+        if args.record is not None:
+            args.record.write_bytes(stream)
+            print(f"stroom: {args.record}")
+
+    results = compare(stream, chunk_size=args.chunk, runs=args.runs)
+    for row in results:
+        print(
+            f"{row['mode']:>6}: {row['best_s'] * 1000:.1f} ms, "
+            f"{row['mb_per_s']:.1f} MB/s, {row['messages']} berichten "
+            f"in {row['chunks']} chunks ({row['bytes'] / 1e6:.1f} MB)"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"json: {args.json}")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    main()
@@ -0,0 +1,253 @@
+"""Benchmark IB chain fetches and quote refreshes against a fake TWS.
+
+Starts :class:`~tomic.api.fake_tws.FakeTWS` on a free local port and drives
+the real client code over a real socket:
+
+``chain``
+    :class:`~tomic.api.market_client.OptionChainClientLegacy` fetching the
+    complete option chain of the fixture underlying.
+``quotes``
+    :class:`~tomic.services.ib_marketdata.IBMarketDataService` refreshing a
+    batch of synthetic iron condor proposals over a shared session.
+
+``--latency`` delays every server response, ``--max-msg-rate`` and
+``--max-tickers`` make the server answer with pacing errors 100/101 the way
+TWS does.  A recorded chain (JSON from :meth:`ChainFixture.save` or an
+exported chain CSV) can be replayed with ``--fixture``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+from tomic.api.fake_tws import ChainFixture, FakeTWS
+from tomic.logutils import setup_logging
+
+MODES = ("chain", "quotes")
+
+
+def load_fixture(path: Path | None, *, symbol: str, spot: float, **kwargs: Any) -> ChainFixture:
+    """Return the recorded fixture at ``path`` or a synthetic chain."""
+
+    if path is None:
+        return ChainFixture.synthetic(symbol, spot=spot, **kwargs)
+    if path.suffix.lower() == ".csv":
+        return ChainFixture.from_chain_csv(path, symbol=symbol, spot=spot)
+    return ChainFixture.load(path)
+
+
+def build_proposals(fixture: ChainFixture, count: int) -> list[Any]:
+    """Return ``count`` iron condors spread over the fixture chain."""
+
+    from tomic.services.strategy_pipeline import StrategyProposal
+
+    strikes = fixture.strikes
+    below = [s for s in strikes if s < fixture.spot]
+    above = [s for s in strikes if s > fixture.spot]
+    width = max(1, min(len(below), len(above)) // 4)
+    proposals = []
+    for idx in range(count):
+        expiry = fixture.expiries[idx % len(fixture.expiries)]
+        offset = (idx // len(fixture.expiries)) % max(1, min(len(below), len(above)) - width)
+        short_put, long_put = below[-1 - offset], below[-1 - offset - width]
+        short_call, long_call = above[offset], above[offset + width]
+        legs = [
+            {"symbol": fixture.symbol, "expiry": expiry, "strike": strike, "type": right,
+             "position": position, "tradingClass": fixture.trading_class}
+            for strike, right, position in (
+                (long_put, "put", 1),
+                (short_put, "put", -1),
+                (short_call, "call", -1),
+                (long_call, "call", 1),
+            )
+        ]
+        proposals.append(StrategyProposal(strategy="iron_condor", legs=legs))
+    return proposals
+
+
+def _fake_connector(server: FakeTWS):
+    from tomic.api.ib_connection import connect_ib_with_retry
+
+    def connect(**kwargs: Any) -> Any:
+        kwargs.update(host=server.host, port=server.port)
+        return connect_ib_with_retry(**kwargs)
+
+    return connect
+
+
+def run_quotes(
+    server: FakeTWS, *, proposals: int, rounds: int, timeout: float
+) -> dict:
+    """Refresh ``proposals`` proposals ``rounds`` times over one session."""
+
+    from tomic.services.ib_marketdata import IBMarketDataService
+    from tomic.services.ib_session import IBSessionManager
+
+    manager = IBSessionManager(connector=_fake_connector(server), idle_timeout=0)
+    service = IBMarketDataService(session_manager=manager)
+    batch = build_proposals(server.fixture, proposals)
+    durations: list[float] = []
+    complete = 0
+    try:
+        for _ in range(max(1, rounds)):
+            start = time.perf_counter()
+            results = service.refresh_many(batch, timeout=timeout, log_delta=False)
+            durations.append(time.perf_counter() - start)
+            complete = sum(1 for result in results if not result.missing_quotes)
+    finally:
+        manager.close_all()
+    legs = sum(len(p.legs) for p in batch)
+    return {
+        "mode": "quotes",
+        "proposals": len(batch),
+        "legs": legs,
+        "complete": complete,
+        "rounds": len(durations),
+        "first_s": durations[0],
+        "best_s": min(durations),
+        "legs_per_s": legs / min(durations) if min(durations) > 0 else None,
+    }
+
+
+def run_chain(server: FakeTWS, *, timeout: float, client_id: int = 977) -> dict:
+    """Fetch the complete option chain of the fixture underlying."""
+
+    from tomic.api.market_client import OptionChainClientLegacy
+
+    class ChainApp(OptionChainClientLegacy):
+        def __init__(self, symbol: str) -> None:
+            super().__init__(symbol)
+            self.finished = threading.Event()
+
+        def _init_requests(self) -> None:
+            try:
+                super()._init_requests()
+            finally:
+                self.finished.set()
+
+    fixture = server.fixture
+    app = ChainApp(fixture.symbol)
+    start = time.perf_counter()
+    app.connect(server.host, server.port, client_id)
+    thread = threading.Thread(target=app.run, daemon=True)
+    thread.start()
+    try:
+        app.finished.wait(timeout)
+        duration = time.perf_counter() - start
+        with app.data_lock:
+            records = list(app.market_data.values())
+    finally:
+        app.disconnect()
+        thread.join(timeout=2)
+    quotes = sum(
+        1 for rec in records if rec.get("bid") is not None and rec.get("ask") is not None
+    )
+    return {
+        "mode": "chain",
+        "ok": app.finished.is_set() and quotes > 0,
+        "contracts": len(records),
+        "complete": quotes,
+        "best_s": duration,
+        "contracts_per_s": quotes / duration if duration > 0 else None,
+    }
+
+
+def run_mode(mode: str, server: FakeTWS, args: argparse.Namespace) -> dict:
+    """Run ``mode`` against ``server`` and attach the server statistics.
+
+    Every mode starts with an empty contract details cache in a temporary
+    directory so the configured cache file is left alone.
+    """
+
+    from tomic.services.contract_cache import ContractDetailsCache, set_contract_cache
+
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}")
+    with tempfile.TemporaryDirectory() as tmp:
+        set_contract_cache(ContractDetailsCache(Path(tmp) / "contracts.json"))
+        try:
+            if mode == "chain":
+                row = run_chain(server, timeout=args.timeout)
+            else:
+                row = run_quotes(
+                    server, proposals=args.proposals, rounds=args.rounds, timeout=args.timeout
+                )
+        finally:
+            set_contract_cache(None)
+    row["latency_ms"] = server.latency * 1000
+    row["pacing_errors"] = server.stats.pacing_errors + server.stats.ticker_limit_errors
+    return row
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Meet IB chain- en quote-doorvoer tegen een lokale nep-TWS"
+    )
+    parser.add_argument("--mode", choices=MODES + ("all",), default="all")
+    parser.add_argument("--fixture", type=Path, default=None, help="Opgenomen keten (JSON of CSV)")
+    parser.add_argument("--record", type=Path, default=None, help="Schrijf de gebruikte keten als JSON")
+    parser.add_argument("--symbol", default="FAKE")
+    parser.add_argument("--spot", type=float, default=100.0)
+    parser.add_argument("--expiries", type=int, default=6)
+    parser.add_argument("--strikes", type=int, default=15, help="Strikes per kant van spot")
+    parser.add_argument("--proposals", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="Antwoordvertraging in ms")
+    parser.add_argument("--max-msg-rate", type=int, default=None, help="Berichten per seconde (fout 100)")
+    parser.add_argument("--max-tickers", type=int, default=None, help="Gelijktijdige tickers (fout 101)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", type=Path, default=None, help="Schrijf resultaten naar JSON")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("TOMIC_LOG_LEVEL", "WARNING")
+    setup_logging()
+
+    fixture = load_fixture(
+        args.fixture,
+        symbol=args.symbol,
+        spot=args.spot,
+        expiries=args.expiries,
+        strikes_per_side=args.strikes,
+    )
+    if args.record is not None:
+        fixture.save(args.record)
+        print(f"keten: {args.record}")
+
+    modes: Sequence[str] = MODES if args.mode == "all" else (args.mode,)
+    results = []
+    for mode in modes:
+        with FakeTWS(
+            fixture,
+            latency=args.latency / 1000,
+            max_msg_rate=args.max_msg_rate,
+            max_tickers=args.max_tickers,
+        ) as server:
+            row = run_mode(mode, server, args)
+        results.append(row)
+        if mode == "chain":
+            print(
+                f" chain: {row['best_s']:.2f}s, {row['complete']}/{row['contracts']} "
+                f"contracten ({row['contracts_per_s']:.0f}/s), "
+                f"pacing fouten={row['pacing_errors']}"
+            )
+        else:
+            print(
+                f"quotes: eerste {row['first_s'] * 1000:.0f} ms, beste "
+                f"{row['best_s'] * 1000:.0f} ms voor {row['legs']} legs "
+                f"({row['legs_per_s']:.0f}/s), {row['complete']}/{row['proposals']} "
+                f"compleet, pacing fouten={row['pacing_errors']}"
+            )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"json: {args.json}")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    main()
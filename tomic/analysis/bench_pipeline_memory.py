@@ -0,0 +1,211 @@
+"""Benchmark memory use of a single strategy pipeline run.
+
+Compares the shared :class:`~tomic.core.data.ChainTable` path with the legacy
+behaviour where every stage copied the option records.  Each mode runs in a
+fresh interpreter so peak RSS figures are not polluted by the other mode.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+try:  # pragma: no cover - not available on Windows
+    import resource
+except ImportError:  # pragma: no cover - platform dependent
+    resource = None  # type: ignore[assignment]
+
+from tomic.config import get as cfg_get
+from tomic.core.pricing import MidPricingContext, MidService
+from tomic.logutils import setup_logging
+from tomic.services.strategy_pipeline import StrategyContext, StrategyPipeline
+from tomic.utils import today
+
+MODES = ("shared", "copy")
+
+
+def synthetic_chain(
+    *,
+    spot: float = 100.0,
+    strikes_per_side: int = 40,
+    expiries: Sequence[int] = (21, 35, 49),
+) -> list[dict[str, Any]]:
+    """Return a deterministic option chain around ``spot``.
+
+    Premiums are rich and deltas fall off quickly away from the money, so
+    the default iron condor criteria accept a few combinations and a run
+    goes all the way through proposal scoring.
+    """
+
+    base = today()
+    chain: list[dict[str, Any]] = []
+    for dte in expiries:
+        expiry = (base + timedelta(days=dte)).strftime("%Y-%m-%d")
+        for step in range(-strikes_per_side, strikes_per_side + 1):
+            strike = round(spot + step, 2)
+            moneyness = (strike - spot) / spot
+            for right in ("call", "put"):
+                otm = moneyness if right == "call" else -moneyness
+                mid = max(0.05, spot * 0.08 * math.exp(-6 * max(otm, 0.0)) + max(-otm, 0.0) * spot)
+                delta = 0.5 * math.exp(-15 * otm) if otm > 0 else 1 - 0.5 * math.exp(15 * otm)
+                chain.append(
+                    {
+                        "symbol": "BENCH",
+                        "expiry": expiry,
+                        "strike": strike,
+                        "type": right,
+                        "bid": round(mid * 0.97, 2),
+                        "ask": round(mid * 1.03, 2),
+                        "close": round(mid, 2),
+                        "iv": 0.25,
+                        "delta": round(delta if right == "call" else -delta, 4),
+                        "gamma": 0.02,
+                        "vega": 0.1,
+                        "theta": -0.03,
+                        "volume": 100,
+                        "open_interest": 1000,
+                    }
+                )
+    return chain
+
+
+class _CopyingMidContext(MidPricingContext):
+    """Mid context reproducing the legacy per-option dict copies."""
+
+    def enrich_chain(self):  # type: ignore[override]
+        return [dict(option) for option in super().enrich_chain()]
+
+
+class _CopyingMidService(MidService):
+    def build_context(self, option_chain, **kwargs):  # type: ignore[override]
+        context = super().build_context([dict(opt) for opt in option_chain], **kwargs)
+        return _CopyingMidContext(context._resolver, interest_rate=context._interest_rate)
+
+
+def _peak_rss_kb() -> int | None:
+    if resource is None:
+        return None
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def run_mode(
+    mode: str,
+    *,
+    strategy: str = "iron_condor",
+    runs: int = 3,
+    strikes_per_side: int = 40,
+    config: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Run ``runs`` pipeline evaluations in ``mode`` and return statistics."""
+
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}")
+    chain = synthetic_chain(strikes_per_side=strikes_per_side)
+    pipeline = StrategyPipeline(cfg_get)
+    if mode == "copy":
+        pipeline._mid_service = _CopyingMidService()
+
+    durations: list[float] = []
+    peaks: list[int] = []
+    blocks: list[int] = []
+    proposals = 0
+    for _ in range(max(1, runs)):
+        option_chain = [dict(rec) for rec in chain] if mode == "copy" else chain
+        context = StrategyContext(
+            symbol="BENCH",
+            strategy=strategy,
+            option_chain=option_chain,
+            spot_price=100.0,
+            atr=2.0,
+            config=config,
+            dte_range=(0, 365),
+        )
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        result, _summary = pipeline.build_proposals(context)
+        durations.append(time.perf_counter() - start)
+        after = tracemalloc.take_snapshot()
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats = after.compare_to(before, "filename")
+        blocks.append(sum(max(stat.count_diff, 0) for stat in stats))
+        peaks.append(peak)
+        proposals = len(result)
+
+    return {
+        "mode": mode,
+        "strategy": strategy,
+        "options": len(chain),
+        "proposals": proposals,
+        "runs": len(durations),
+        "avg_runtime_s": sum(durations) / len(durations),
+        "peak_traced_kb": max(peaks) / 1024,
+        "retained_blocks": max(blocks),
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def _init_worker() -> None:
+    os.environ.setdefault("TOMIC_LOG_LEVEL", "WARNING")
+    setup_logging()
+
+
+def compare(
+    *, strategy: str, runs: int, strikes_per_side: int
+) -> list[dict[str, Any]]:
+    """Run every mode in its own process and return the collected results."""
+
+    ctx = multiprocessing.get_context("spawn")
+    results: list[dict[str, Any]] = []
+    for mode in MODES:
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=ctx, initializer=_init_worker
+        ) as pool:
+            future = pool.submit(
+                run_mode,
+                mode,
+                strategy=strategy,
+                runs=runs,
+                strikes_per_side=strikes_per_side,
+            )
+            results.append(future.result())
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Meet geheugengebruik van een pipeline run (gedeelde chain vs kopieën)"
+    )
+    parser.add_argument("--strategy", default="iron_condor")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--strikes", type=int, default=40, help="Strikes per kant van spot")
+    parser.add_argument("--json", type=Path, default=None, help="Schrijf resultaten naar JSON")
+    args = parser.parse_args(argv)
+
+    results = compare(strategy=args.strategy, runs=args.runs, strikes_per_side=args.strikes)
+    for row in results:
+        rss = row["peak_rss_kb"]
+        rss_txt = f"{rss / 1024:.1f} MB" if rss is not None else "-"
+        print(
+            f"{row['mode']:>6}: {row['avg_runtime_s'] * 1000:.1f} ms, "
+            f"peak alloc {row['peak_traced_kb']:.0f} KB, "
+            f"blocks {row['retained_blocks']}, peak RSS {rss_txt}, "
+            f"{row['proposals']} proposals uit {row['options']} opties"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"json: {args.json}")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark the volatility helpers with and without NumPy.
+
+Runs :func:`~tomic.analysis.metrics.historical_volatility`,
+:func:`~tomic.analysis.metrics.average_true_range` and the
+``vol_helpers`` rank/percentile functions on synthetic daily series (2,500
+days by default, roughly ten years).  The ``python`` backend hides NumPy
+from both modules so the pure-Python fallbacks are measured in the same
+interpreter.  ``*_many`` cases score every IV in the series against the
+whole series: a loop of scalar calls in the ``python`` backend, one
+:func:`~tomic.cli.services.vol_helpers.iv_rank_many` /
+:func:`~tomic.cli.services.vol_helpers.iv_percentile_many` call with NumPy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+from tomic.analysis import metrics
+from tomic.cli.services import vol_helpers
+from tomic.helpers.numeric import has_numpy
+
+BACKENDS = ("python", "numpy")
+
+
+def synthetic_series(days: int = 2500, *, seed: int = 1) -> dict[str, list[float]]:
+    """Return deterministic ``closes``, ``highs``, ``lows`` and ``ivs``."""
+
+    rng = random.Random(seed)
+    closes, highs, lows, ivs = [], [], [], []
+    close = 100.0
+    for _ in range(days):
+        close *= math.exp(rng.gauss(0, 0.015))
+        closes.append(close)
+        highs.append(close * (1 + abs(rng.gauss(0, 0.008))))
+        lows.append(close * (1 - abs(rng.gauss(0, 0.008))))
+        ivs.append(12 + 20 * rng.random())
+    return {"closes": closes, "highs": highs, "lows": lows, "ivs": ivs}
+
+
+@contextmanager
+def backend(name: str) -> Iterator[None]:
+    """Run with NumPy (``numpy``) or with the pure-Python fallbacks."""
+
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name!r}")
+    saved = metrics.np, vol_helpers.np
+    if name == "python":
+        metrics.np = vol_helpers.np = None
+    try:
+        yield
+    finally:
+        metrics.np, vol_helpers.np = saved
+
+
+def cases(data: dict[str, list[float]], name: str) -> dict[str, Callable[[], object]]:
+    closes, highs, lows, ivs = data["closes"], data["highs"], data["lows"], data["ivs"]
+
+    def rank_many() -> object:
+        if name == "python":
+            return [vol_helpers.iv_rank(v, ivs) for v in ivs]
+        return vol_helpers.iv_rank_many(ivs, ivs)
+
+    def pct_many() -> object:
+        if name == "python":
+            return [vol_helpers.iv_percentile(v, ivs) for v in ivs]
+        return vol_helpers.iv_percentile_many(ivs, ivs)
+
+    return {
+        "historical_volatility": lambda: [
+            metrics.historical_volatility(closes, window=w) for w in (20, 30, 90, 252)
+        ],
+        "average_true_range": lambda: metrics.average_true_range(highs, lows, closes),
+        "rolling_hv": lambda: vol_helpers.rolling_hv(closes, 30),
+        "iv_rank": lambda: vol_helpers.iv_rank(ivs[-1], ivs),
+        "iv_percentile": lambda: vol_helpers.iv_percentile(ivs[-1], ivs),
+        "iv_rank_many": rank_many,
+        "iv_percentile_many": pct_many,
+    }
+
+
+def run_backend(name: str, data: dict[str, list[float]], *, runs: int = 5) -> dict:
+    """Return the best time per case for backend ``name``."""
+
+    timings: dict[str, float] = {}
+    with backend(name):
+        for case, func in cases(data, name).items():
+            durations = []
+            for _ in range(max(1, runs)):
+                start = time.perf_counter()
+                func()
+                durations.append(time.perf_counter() - start)
+            timings[case] = min(durations)
+    return {"backend": name, "days": len(data["closes"]), "best_s": timings}
+
+
+def compare(data: dict[str, list[float]], *, runs: int = 5) -> list[dict]:
+    """Run both backends; the ``numpy`` row is skipped without NumPy."""
+
+    rows = [run_backend("python", data, runs=runs)]
+    if has_numpy(metrics.np) and has_numpy(vol_helpers.np):
+        rows.append(run_backend("numpy", data, runs=runs))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Meet de volatiliteitshelpers met en zonder NumPy"
+    )
+    parser.add_argument("--days", type=int, default=2500)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", type=Path, default=None, help="Schrijf resultaten naar JSON")
+    args = parser.parse_args(argv)
+
+    rows = compare(synthetic_series(args.days), runs=args.runs)
+    base = rows[0]["best_s"]
+    for row in rows:
+        for case, best in row["best_s"].items():
+            speedup = base[case] / best if best > 0 else float("inf")
+            print(
+                f"{row['backend']:>6} {case:<22} {best * 1000:9.3f} ms "
+                f"(x{speedup:.1f}, {row['days']} dagen)"
+            )
+    if not has_numpy(metrics.np):
+        print("numpy niet beschikbaar: alleen de Python fallback gemeten")
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+        print(f"resultaten: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Incremental re-evaluation of proposals after quote updates.
+
+Refreshing market data usually only touches bid/ask/mid (and sometimes
+greeks) of a proposal's legs, yet :func:`~tomic.analysis.scoring.calculate_score`
+recomputes everything from scratch: leg normalisation, mid resolution for
+every leg, DTE parsing, wing metrics and greek aggregation.  The
+:class:`ProposalReevaluator` keeps a snapshot of each scored proposal and on
+the next call diffs the legs against it:
+
+* no leg changed  -> the cached score and reasons are returned as is;
+* only quote/greek fields changed -> mids are resolved again for the changed
+  legs only and credit, margin, ROM, EV and score are recomputed from the
+  cached leg views and liquidity result;
+* anything else (strikes, legs, volume, spot, criteria) -> full rescoring.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TYPE_CHECKING
+
+from ..core import LegView
+from ..criteria import CriteriaConfig, load_criteria
+from ..helpers.bs_utils import populate_model_delta
+from ..metrics import MidPriceResolver, iter_leg_views
+from ..strategy.reasons import ReasonDetail
+from ..utils import normalize_leg
+from . import scoring
+from .scoring_helpers import populate_breakeven_distances, populate_greek_totals
+from .scoring_validators import check_liquidity, validate_entry_quality
+
+if TYPE_CHECKING:
+    from tomic.strategy_candidates import StrategyProposal
+
+QUOTE_FIELDS = frozenset(
+    {
+        "bid",
+        "ask",
+        "last",
+        "close",
+        "mid",
+        "mid_source",
+        "mid_reason",
+        "mid_fallback",
+        "mid_from_parity",
+        "one_sided",
+        "missing_edge",
+        "missing_metrics",
+        "metrics_ignored",
+    }
+)
+"""Leg fields that only influence pricing dependent metrics."""
+
+GREEK_FIELDS = frozenset({"delta", "gamma", "vega", "theta", "iv", "model"})
+"""Leg fields that additionally require the greek totals to be rebuilt."""
+
+META_FIELDS = frozenset(
+    {
+        "mid_refresh_trigger",
+        "mid_refresh_timestamp",
+        "mid_previous",
+        "mid_delta",
+        "quote_age",
+        "quote_age_sec",
+    }
+)
+"""Refresh bookkeeping rewritten on every snapshot; ignored when diffing legs."""
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class ReevaluationResult:
+    """Outcome of :meth:`ProposalReevaluator.reevaluate`."""
+
+    score: Optional[float]
+    reasons: List[ReasonDetail]
+    mode: str
+    changed_legs: tuple[int, ...] = ()
+
+    @property
+    def accepted(self) -> bool:
+        return self.score is not None
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    ref: "weakref.ref[StrategyProposal]"
+    strategy: str
+    spot: float | None
+    criteria: CriteriaConfig
+    snapshots: list[dict[str, Any]]
+    views: list[LegView]
+    score: Optional[float]
+    reasons: List[ReasonDetail]
+    liquidity: tuple[bool, List[ReasonDetail]] | None = None
+
+
+def _changed_keys(leg: Mapping[str, Any], snapshot: Mapping[str, Any]) -> set[str]:
+    changed = {key for key, value in leg.items() if snapshot.get(key, _MISSING) != value}
+    changed.update(key for key in snapshot if key not in leg)
+    return changed - META_FIELDS
+
+
+def _resolve_view(leg: Mapping[str, Any]) -> LegView:
+    return next(iter(iter_leg_views([leg], price_resolver=MidPriceResolver)))
+
+
+class ProposalReevaluator:
+    """Re-score proposals while reusing structural data between refreshes."""
+
+    def __init__(self) -> None:
+        self._entries: dict[int, _CacheEntry] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"skipped": 0, "quotes": 0, "full": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def forget(self, proposal: "StrategyProposal") -> None:
+        """Drop cached state for ``proposal``."""
+
+        with self._lock:
+            self._entries.pop(id(proposal), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # ------------------------------------------------------------------
+    def evaluate(
+        self,
+        proposal: "StrategyProposal",
+        *,
+        spot: float | None = None,
+        criteria: CriteriaConfig | None = None,
+        atr: float | None = None,
+    ) -> ReevaluationResult:
+        """Score ``proposal`` from scratch and cache its structural data."""
+
+        crit = criteria or load_criteria()
+        strategy_name = str(getattr(proposal.strategy, "value", proposal.strategy))
+        score, reasons = scoring.calculate_score(
+            proposal.strategy, proposal, spot, criteria=crit, atr=atr
+        )
+        self._store(proposal, strategy_name, spot, crit, score, list(reasons))
+        self._count("full")
+        return ReevaluationResult(score, list(reasons), "full")
+
+    def reevaluate(
+        self,
+        proposal: "StrategyProposal",
+        *,
+        spot: float | None = None,
+        criteria: CriteriaConfig | None = None,
+        atr: float | None = None,
+    ) -> ReevaluationResult:
+        """Re-score ``proposal`` recomputing only what its leg changes require."""
+
+        crit = criteria or load_criteria()
+        strategy_name = str(getattr(proposal.strategy, "value", proposal.strategy))
+        with self._lock:
+            entry = self._entries.get(id(proposal))
+        if (
+            entry is None
+            or entry.ref() is not proposal
+            or entry.strategy != strategy_name
+            or entry.spot != spot
+            or entry.criteria is not crit
+            or len(entry.snapshots) != len(proposal.legs)
+        ):
+            return self.evaluate(proposal, spot=spot, criteria=crit, atr=atr)
+
+        changed: list[int] = []
+        greeks_changed = False
+        for idx, (leg, snapshot) in enumerate(zip(proposal.legs, entry.snapshots)):
+            keys = _changed_keys(leg, snapshot)
+            if not keys:
+                continue
+            if not keys <= QUOTE_FIELDS | GREEK_FIELDS:
+                return self.evaluate(proposal, spot=spot, criteria=crit, atr=atr)
+            greeks_changed = greeks_changed or bool(keys & GREEK_FIELDS)
+            changed.append(idx)
+
+        if atr is not None:
+            proposal.atr = atr
+        if not changed:
+            self._count("skipped")
+            return ReevaluationResult(entry.score, list(entry.reasons), "skipped")
+
+        score, reasons = self._rescore_quotes(entry, proposal, changed, greeks_changed)
+        entry.score = score
+        entry.reasons = list(reasons)
+        entry.snapshots = [dict(leg) for leg in proposal.legs]
+        self._count("quotes")
+        return ReevaluationResult(score, list(reasons), "quotes", tuple(changed))
+
+    # ------------------------------------------------------------------
+    def _rescore_quotes(
+        self,
+        entry: _CacheEntry,
+        proposal: "StrategyProposal",
+        changed: Sequence[int],
+        greeks_changed: bool,
+    ) -> tuple[Optional[float], List[ReasonDetail]]:
+        legs = proposal.legs
+        for idx in changed:
+            leg = legs[idx]
+            populate_model_delta(leg)
+            normalize_leg(leg)
+            entry.views[idx] = _resolve_view(leg)
+
+        strategy_name = entry.strategy
+        fallback_count, fallback_allowed, fallback_reason, fallback_warning = (
+            scoring.resolve_fallback_state(strategy_name, entry.views)
+        )
+        try:
+            valid, reasons = validate_entry_quality(strategy_name, legs)
+            if not valid:
+                return None, reasons
+            if entry.liquidity is None:
+                ok, liquidity_reasons = check_liquidity(strategy_name, legs, entry.criteria)
+                entry.liquidity = (ok, list(liquidity_reasons))
+            ok, liquidity_reasons = entry.liquidity
+            if not ok:
+                return None, list(liquidity_reasons)
+
+            return scoring.compute_proposal_metrics(
+                strategy_name,
+                proposal,
+                legs,
+                entry.criteria,
+                entry.spot,
+                fallback_count=fallback_count,
+                fallback_allowed=fallback_allowed,
+                fallback_reason=fallback_reason,
+                fallback_warning=fallback_warning,
+                leg_views=entry.views,
+            )
+        finally:
+            if greeks_changed:
+                populate_greek_totals(proposal, legs)
+            populate_breakeven_distances(proposal, entry.spot)
+
+    def _store(
+        self,
+        proposal: "StrategyProposal",
+        strategy_name: str,
+        spot: float | None,
+        criteria: CriteriaConfig,
+        score: Optional[float],
+        reasons: List[ReasonDetail],
+    ) -> None:
+        key = id(proposal)
+        entries = self._entries
+        lock = self._lock
+
+        def _drop(_ref: Any, key: int = key) -> None:
+            with lock:
+                current = entries.get(key)
+                if current is not None and current.ref is _ref:
+                    entries.pop(key, None)
+
+        entry = _CacheEntry(
+            ref=weakref.ref(proposal, _drop),
+            strategy=strategy_name,
+            spot=spot,
+            criteria=criteria,
+            snapshots=[dict(leg) for leg in proposal.legs],
+            views=[_resolve_view(leg) for leg in proposal.legs],
+            score=score,
+            reasons=reasons,
+        )
+        with lock:
+            entries[key] = entry
+
+    def _count(self, mode: str) -> None:
+        self.stats[mode] = self.stats.get(mode, 0) + 1
+
+
+_DEFAULT_REEVALUATOR = ProposalReevaluator()
+
+
+def reevaluate_proposal(
+    proposal: "StrategyProposal",
+    *,
+    spot: float | None = None,
+    criteria: CriteriaConfig | None = None,
+    atr: float | None = None,
+) -> ReevaluationResult:
+    """Proxy to the shared :class:`ProposalReevaluator` instance."""
+
+    return _DEFAULT_REEVALUATOR.reevaluate(
+        proposal, spot=spot, criteria=criteria, atr=atr
+    )
+
+
+__all__ = [
+    "GREEK_FIELDS",
+    "META_FIELDS",
+    "QUOTE_FIELDS",
+    "ProposalReevaluator",
+    "ReevaluationResult",
+    "reevaluate_proposal",
+]
@@ -6,7 +6,13 @@ from typing import Any, Dict, Iterable, Sequence
 import math
 import statistics
 
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - numpy missing
+    np = None  # type: ignore
+
 from tomic.helpers.dateutils import parse_date
+from tomic.helpers.numeric import has_numpy
 from tomic.helpers.account import _fmt_money
 
 # Default margin fallback when no margin info is available.
@@ -81,6 +87,8 @@ def historical_volatility(
     """
     if len(closes) < 2:
         return None
+    if has_numpy(np):
+        return _historical_volatility_numpy(closes, window, trading_days)
     # Guard against division by zero: skip pairs where c1 is zero or negative
     returns = [
         math.log(c2 / c1)
@@ -96,6 +104,100 @@ def historical_volatility(
     return hv
 
 
+def _historical_volatility_numpy(
+    closes: Sequence[float], window: int, trading_days: int
+) -> float | None:
+    prices = np.asarray(closes, dtype=float)
+    prev, curr = prices[:-1], prices[1:]
+    ok = (prev > 0) & (curr > 0)
+    returns = np.log(curr[ok] / prev[ok])
+    if not returns.size:
+        return None
+    window_returns = returns[-window:]
+    if window_returns.size < 2:
+        return None
+    return float(window_returns.std(ddof=1)) * math.sqrt(trading_days) * 100
+
+
+def rolling_historical_volatility(
+    closes: Sequence[float],
+    windows: Iterable[int],
+    *,
+    trading_days: int = 252,
+) -> Dict[int, list[float | None]]:
+    """Return :func:`historical_volatility` for every prefix of ``closes``.
+
+    ``result[window][i]`` equals ``historical_volatility(closes[: i + 1],
+    window=window)`` up to floating point error.  Window sums come from
+    prefix sums of the (mean-centred) log returns and their squares, so a
+    full series costs O(n) per window instead of O(n²).
+    """
+
+    windows = [int(w) for w in windows]
+    if has_numpy(np):
+        return _rolling_hv_numpy(closes, windows, trading_days)
+
+    valid: list[float] = []
+    counts = [0] if len(closes) else []
+    for c1, c2 in zip(closes[:-1], closes[1:]):
+        if c1 > 0 and c2 > 0:
+            valid.append(math.log(c2 / c1))
+        counts.append(len(valid))
+    centre = sum(valid) / len(valid) if valid else 0.0
+    sums = [0.0]
+    squares = [0.0]
+    for ret in valid:
+        dev = ret - centre
+        sums.append(sums[-1] + dev)
+        squares.append(squares[-1] + dev * dev)
+
+    scale = math.sqrt(trading_days) * 100
+    result: Dict[int, list[float | None]] = {}
+    for window in windows:
+        series: list[float | None] = []
+        for count in counts:
+            lo = max(count - window, 0) if window > 0 else 0
+            k = count - lo
+            if k < 2:
+                series.append(None)
+                continue
+            total = sums[count] - sums[lo]
+            var = (squares[count] - squares[lo] - total * total / k) / (k - 1)
+            series.append(math.sqrt(max(var, 0.0)) * scale)
+        result[window] = series
+    return result
+
+
+def _rolling_hv_numpy(
+    closes: Sequence[float], windows: Sequence[int], trading_days: int
+) -> Dict[int, list[float | None]]:
+    prices = np.asarray(closes, dtype=float)
+    if prices.size < 2:
+        return {window: [None] * prices.size for window in windows}
+    prev, curr = prices[:-1], prices[1:]
+    ok = (prev > 0) & (curr > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.log(curr[ok] / prev[ok])
+    counts = np.concatenate(([0], np.cumsum(ok)))
+    devs = returns - (returns.mean() if returns.size else 0.0)
+    sums = np.concatenate(([0.0], np.cumsum(devs)))
+    squares = np.concatenate(([0.0], np.cumsum(devs * devs)))
+
+    scale = math.sqrt(trading_days) * 100
+    result: Dict[int, list[float | None]] = {}
+    for window in windows:
+        lo = np.maximum(counts - window, 0) if window > 0 else np.zeros_like(counts)
+        k = counts - lo
+        total = sums[counts] - sums[lo]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = (squares[counts] - squares[lo] - total * total / k) / (k - 1)
+        hv = np.sqrt(np.maximum(var, 0.0)) * scale
+        result[window] = [
+            float(value) if n >= 2 else None for value, n in zip(hv.tolist(), k.tolist())
+        ]
+    return result
+
+
 def average_true_range(
     highs: Sequence[float],
     lows: Sequence[float],
@@ -106,6 +208,8 @@ def average_true_range(
     """Return the average true range over ``period`` days."""
     if len(highs) < 2 or len(lows) < 2 or len(closes) < 2:
         return None
+    if has_numpy(np):
+        return _average_true_range_numpy(highs, lows, closes, period)
     trs: list[float] = []
     for i in range(1, len(closes)):
         hi = highs[i]
@@ -121,9 +225,27 @@ def average_true_range(
     return sum(period_trs) / len(period_trs)
 
 
+def _average_true_range_numpy(
+    highs: Sequence[float],
+    lows: Sequence[float],
+    closes: Sequence[float],
+    period: int,
+) -> float | None:
+    n = len(closes)
+    hi = np.asarray(highs, dtype=float)[1:n]
+    lo = np.asarray(lows, dtype=float)[1:n]
+    prev_close = np.asarray(closes, dtype=float)[: n - 1]
+    trs = np.maximum(hi - lo, np.maximum(np.abs(hi - prev_close), np.abs(lo - prev_close)))
+    period_trs = trs[-period:]
+    if not period_trs.size:
+        return None
+    return float(period_trs.mean())
+
+
 __all__ = [
     "compute_term_structure",
     "render_kpi_box",
     "historical_volatility",
+    "rolling_historical_volatility",
     "average_true_range",
 ]
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Mapping, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING
 import math
 
+from ..core import LegView
 from ..core.pricing.mid_tags import MidTagSnapshot
 from ..metrics import (
     MidPriceResolver,
@@ -17,6 +18,7 @@ from ..metrics import (
 from ..pricing.margin_engine import compute_margin_and_rr
 from ..criteria import CriteriaConfig, RULES, load_criteria
 from ..helpers.numeric import safe_float
+from ..helpers.stage_profiler import profile_stage
 from ..utils import normalize_leg, get_leg_right
 from ..logutils import logger
 from ..mid_resolver import MidUsageSummary
@@ -70,6 +72,9 @@ _fallback_limit_ok = fallback_limit_ok
 _preview_penalty = preview_penalty
 _populate_additional_metrics = populate_additional_metrics
 _bs_estimate_missing = bs_estimate_missing
+_CREDIT_TO_WIDTH_WARN_RATIO = CREDIT_TO_WIDTH_WARN_RATIO
+_ROM_WARN_THRESHOLD = ROM_WARN_THRESHOLD
+_MARGIN_MIN_THRESHOLD = MARGIN_MIN_THRESHOLD
 
 
 def calculate_breakevens(
@@ -130,8 +135,13 @@ def compute_proposal_metrics(
     fallback_allowed: int = 0,
     fallback_reason: str | None = None,
     fallback_warning: str | None = None,
+    leg_views: Sequence[LegView] | None = None,
 ) -> Tuple[Optional[float], List[ReasonDetail]]:
-    """Compute proposal metrics and return score with structured reasons."""
+    """Compute proposal metrics and return score with structured reasons.
+
+    ``leg_views`` may carry already resolved views for ``legs``; the legs are
+    then assumed to be normalized and their mids are not resolved again.
+    """
 
     reasons: List[ReasonDetail] = []
 
@@ -140,8 +150,9 @@ def compute_proposal_metrics(
         proposal.reasons = deduped
         return result_score, deduped
 
-    for leg in legs:
-        normalize_leg(leg)
+    if leg_views is None:
+        for leg in legs:
+            normalize_leg(leg)
 
     short_deltas = [
         abs(leg.get("delta", 0))
@@ -161,7 +172,10 @@ def compute_proposal_metrics(
                 short_edges.append(edge_val)
     proposal.edge = round(sum(short_edges) / len(short_edges), 2) if short_edges else None
 
-    leg_views = list(iter_leg_views(legs, price_resolver=MidPriceResolver))
+    if leg_views is None:
+        leg_views = list(iter_leg_views(legs, price_resolver=MidPriceResolver))
+    else:
+        leg_views = list(leg_views)
 
     missing_mid: List[str] = []
     for leg, view in zip(legs, leg_views):
@@ -478,6 +492,27 @@ def compute_proposal_metrics(
     return _finalize(proposal.score)
 
 
+def resolve_fallback_state(
+    strategy_name: str, legs: Sequence[Dict[str, Any] | LegView]
+) -> Tuple[int, int, str | None, str | None]:
+    """Return fallback count, allowance, reason and warning for ``legs``."""
+
+    fallback_ok, fallback_count, fallback_allowed, fallback_reason = _fallback_limit_ok(
+        strategy_name, legs
+    )
+    fallback_warning: str | None = None
+    if not fallback_ok:
+        if fallback_reason:
+            if fallback_allowed:
+                fallback_warning = f"{fallback_reason} ({fallback_count}/{fallback_allowed} toegestaan)"
+            else:
+                fallback_warning = fallback_reason
+        else:
+            fallback_warning = f"te veel fallback-legs ({fallback_count}/{fallback_allowed} toegestaan)"
+        logger.info(f"[{strategy_name}] {fallback_warning}")
+    return fallback_count, fallback_allowed, fallback_reason, fallback_warning
+
+
 def calculate_score(
     strategy: str | Any,
     proposal: "StrategyProposal",
@@ -488,6 +523,18 @@ def calculate_score(
 ) -> Tuple[Optional[float], List[ReasonDetail]]:
     """Populate proposal metrics and return the computed score."""
 
+    with profile_stage("scoring"):
+        return _calculate_score(strategy, proposal, spot, criteria=criteria, atr=atr)
+
+
+def _calculate_score(
+    strategy: str | Any,
+    proposal: "StrategyProposal",
+    spot: float | None,
+    *,
+    criteria: CriteriaConfig | None,
+    atr: float | None,
+) -> Tuple[Optional[float], List[ReasonDetail]]:
     if atr is not None:
         proposal.atr = atr
 
@@ -495,19 +542,9 @@ def calculate_score(
     strategy_name = getattr(strategy, "value", strategy)
     _bs_estimate_missing(legs)
 
-    fallback_ok, fallback_count, fallback_allowed, fallback_reason = _fallback_limit_ok(
-        strategy_name, legs
+    fallback_count, fallback_allowed, fallback_reason, fallback_warning = (
+        resolve_fallback_state(strategy_name, legs)
     )
-    fallback_warning: str | None = None
-    if not fallback_ok:
-        if fallback_reason:
-            if fallback_allowed:
-                fallback_warning = f"{fallback_reason} ({fallback_count}/{fallback_allowed} toegestaan)"
-            else:
-                fallback_warning = fallback_reason
-        else:
-            fallback_warning = f"te veel fallback-legs ({fallback_count}/{fallback_allowed} toegestaan)"
-        logger.info(f"[{strategy_name}] {fallback_warning}")
 
     valid, reasons = validate_entry_quality(strategy_name, legs)
     if not valid:
@@ -560,6 +597,7 @@ __all__ = [
     "calculate_score",
     "calculate_breakevens",
     "passes_risk",
+    "resolve_fallback_state",
     "resolve_min_risk_reward",
     "validate_entry_quality",
     "validate_exit_tradability",
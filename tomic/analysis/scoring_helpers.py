@@ -305,13 +305,37 @@ def compute_wing_metrics(legs: List[Dict[str, Any]]) -> tuple[Dict[str, float] |
     return widths, symmetry
 
 
+def populate_greek_totals(proposal: "StrategyProposal", legs: List[Dict[str, Any]]) -> None:
+    """Populate aggregated greeks on proposal from leg data."""
+    greek_totals = aggregate_greeks(legs, schema=PROPOSAL_GREEK_SCHEMA)
+    proposal.greeks = dict(greek_totals)
+    proposal.greeks_sum = {key.capitalize(): value for key, value in greek_totals.items()}
+
+
+def populate_breakeven_distances(proposal: "StrategyProposal", spot: float | None) -> None:
+    """Populate distances between spot and the proposal breakevens."""
+    distances: List[float] = []
+    percents: List[float] = []
+    spot_val = safe_float(spot)
+    if spot_val not in (None, 0):
+        for be in getattr(proposal, "breakevens", []) or []:
+            be_val = safe_float(be)
+            if be_val is None:
+                continue
+            diff = abs(be_val - spot_val)
+            distances.append(diff)
+            percents.append((diff / spot_val) * 100)
+    proposal.breakeven_distances = {
+        "dollar": distances,
+        "percent": percents,
+    }
+
+
 def populate_additional_metrics(
     proposal: "StrategyProposal", legs: List[Dict[str, Any]], spot: float | None
 ) -> None:
     """Populate additional metrics on proposal from leg data."""
-    greek_totals = aggregate_greeks(legs, schema=PROPOSAL_GREEK_SCHEMA)
-    proposal.greeks = dict(greek_totals)
-    proposal.greeks_sum = {key.capitalize(): value for key, value in greek_totals.items()}
+    populate_greek_totals(proposal, legs)
 
     atr_values = collect_leg_values(legs, ("ATR14", "atr14", "atr"))
     if getattr(proposal, "atr", None) is None and atr_values:
@@ -361,21 +385,7 @@ def populate_additional_metrics(
     proposal.wing_width = widths
     proposal.wing_symmetry = symmetry
 
-    distances: List[float] = []
-    percents: List[float] = []
-    spot_val = safe_float(spot)
-    if spot_val not in (None, 0):
-        for be in getattr(proposal, "breakevens", []) or []:
-            be_val = safe_float(be)
-            if be_val is None:
-                continue
-            diff = abs(be_val - spot_val)
-            distances.append(diff)
-            percents.append((diff / spot_val) * 100)
-    proposal.breakeven_distances = {
-        "dollar": distances,
-        "percent": percents,
-    }
+    populate_breakeven_distances(proposal, spot)
 
 
 def bs_estimate_missing(legs: List[Dict[str, Any]]) -> None:
@@ -408,5 +418,7 @@ __all__ = [
     "compute_wing_metrics",
     # Metrics
     "populate_additional_metrics",
+    "populate_greek_totals",
+    "populate_breakeven_distances",
     "bs_estimate_missing",
 ]
@@ -7,40 +7,30 @@ from types import SimpleNamespace
 from typing import Iterable, Dict, Any
 
 from tomic.config import get as cfg_get
-from tomic.journal.utils import load_json, update_json_file
+from tomic.infrastructure.timeseries import read_latest, read_latest_many
+from tomic.journal.utils import update_json_file
 from tomic.logutils import logger
 
 
 DEFAULT_SUMMARY_DIR = Path(cfg_get("IV_DAILY_SUMMARY_DIR", "tomic/data/iv_daily_summary"))
 
 
-def _load_records(path: Path) -> list[dict]:
-    if not path.exists():
-        return []
-    data = load_json(path)
-    return list(data) if isinstance(data, list) else []
-
-
 def get_latest_summary(symbol: str, base_dir: Path | None = None) -> SimpleNamespace | None:
     """Return latest IV summary record for ``symbol`` or ``None``."""
     if base_dir is None:
         base_dir = DEFAULT_SUMMARY_DIR
-    path = base_dir / f"{symbol}.json"
-    records = _load_records(path)
-    if not records:
+    record = read_latest(Path(base_dir) / f"{symbol}.json")
+    if record is None:
         return None
-    records.sort(key=lambda r: r.get("date", ""))
-    return SimpleNamespace(**records[-1])
+    return SimpleNamespace(**record)
 
 
 def load_latest_summaries(symbols: Iterable[str], base_dir: Path | None = None) -> Dict[str, SimpleNamespace]:
     """Return mapping of symbol to latest IV summary record."""
-    result: Dict[str, SimpleNamespace] = {}
-    for sym in symbols:
-        rec = get_latest_summary(sym, base_dir)
-        if rec is not None:
-            result[sym] = rec
-    return result
+    if base_dir is None:
+        base_dir = DEFAULT_SUMMARY_DIR
+    latest = read_latest_many(base_dir, symbols)
+    return {sym: SimpleNamespace(**rec) for sym, rec in latest.items()}
 
 
 def append_to_iv_summary(
@@ -63,7 +53,15 @@ def append_to_iv_summary(
         return
 
     try:
-        update_json_file(path, record, ["date"])
+        try:
+            update_json_file(path, record, ["date"])
+        except ValueError as exc:
+            # The store refuses to overwrite unparsable files; keep the old
+            # content next to the summary and start a new one.
+            backup = path.with_name(f"{path.name}.corrupt")
+            logger.error(f"Unreadable IV summary for {symbol} moved to {backup}: {exc}")
+            path.replace(backup)
+            update_json_file(path, record, ["date"])
     except Exception as exc:  # pragma: no cover - filesystem errors
         logger.error(f"Failed to update IV summary for {symbol}: {exc}")
         return
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from .ib_connection import IBClient
+from .pacing import PACING_ERROR_CODES
 from tomic.logutils import logger
 
 
@@ -34,6 +35,11 @@ class BaseIBApp(IBClient):
     ) -> None:  # noqa: D401 - simple wrapper
         """Handle error messages from the IB API."""
 
+        if errorCode in PACING_ERROR_CODES and (
+            errorCode != 162 or "pacing" in str(errorString).lower()
+        ):
+            self.pacer.report_violation(errorCode)
+
         if errorCode in self.IGNORED_ERROR_CODES:
             logger.debug(f"IB error {errorCode} ignored: {errorString}")
             return
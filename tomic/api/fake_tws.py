@@ -0,0 +1,720 @@
+"""Local fake TWS speaking the wire protocol of the bundled ``ibapi``.
+
+:class:`FakeTWS` accepts regular :class:`ibapi.client.EClient` connections
+and answers the requests TOMIC relies on for chain fetches and quote
+refreshes from a :class:`ChainFixture`:
+
+* handshake, ``startApi`` -> ``nextValidId`` / ``managedAccounts``;
+* ``reqCurrentTime``, ``reqIds`` and ``reqMarketDataType``;
+* ``reqContractDetails`` for the underlying and its options (error 200 for
+  unknown contracts);
+* ``reqSecDefOptParams``;
+* ``reqMktData`` (snapshot and streaming) with price, size and model
+  option computation ticks, ``cancelMktData``.
+
+Fixtures are synthetic (:meth:`ChainFixture.synthetic`) or recorded, either
+as JSON written by :meth:`ChainFixture.save` or from an exported option chain
+CSV.  Response latency, the messages-per-second limit (error 100) and the
+number of simultaneous market data lines (error 101) are configurable so
+pacing behaviour can be benchmarked offline.
+
+The server announces server version 200, the last version before protobuf
+encoded messages, so every message is plain text fields.
+"""
+
+from __future__ import annotations
+
+import csv
+import heapq
+import itertools
+import json
+import math
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Mapping
+
+from tomic.ibapi.framing import MessageFramer
+from tomic.logutils import logger
+
+SERVER_VERSION = 200
+
+# Outgoing (client -> server) message ids used by TOMIC
+REQ_MKT_DATA = 1
+CANCEL_MKT_DATA = 2
+REQ_IDS = 8
+REQ_CONTRACT_DATA = 9
+REQ_CURRENT_TIME = 49
+REQ_MARKET_DATA_TYPE = 59
+START_API = 71
+REQ_SEC_DEF_OPT_PARAMS = 78
+
+# Incoming (server -> client) message ids
+TICK_PRICE = 1
+ERR_MSG = 4
+NEXT_VALID_ID = 9
+CONTRACT_DATA = 10
+MANAGED_ACCTS = 15
+TICK_OPTION_COMPUTATION = 21
+CURRENT_TIME = 49
+CONTRACT_DATA_END = 52
+TICK_SNAPSHOT_END = 57
+SEC_DEF_OPT_PARAMS = 75
+SEC_DEF_OPT_PARAMS_END = 76
+
+# Tick types
+BID, ASK, LAST, CLOSE = 1, 2, 4, 9
+MODEL_OPTION = 13
+_DELAYED_OFFSET = 65  # BID 1 -> DELAYED_BID 66, ...
+
+QuoteKey = tuple[str, float, str]
+
+
+def _quote_key(expiry: Any, strike: Any, right: Any) -> QuoteKey:
+    digits = "".join(ch for ch in str(expiry) if ch.isdigit())
+    return (digits, round(float(strike), 4), str(right or "").upper()[:1])
+
+
+def _norm_cdf(x: float) -> float:
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+
+@dataclass(slots=True)
+class OptionQuote:
+    """Market data returned for a single option contract."""
+
+    bid: float
+    ask: float
+    iv: float
+    delta: float
+    gamma: float = 0.0
+    vega: float = 0.0
+    theta: float = 0.0
+    close: float | None = None
+    volume: int = 0
+    open_interest: int = 0
+
+
+@dataclass
+class ChainFixture:
+    """Underlying and option chain served by :class:`FakeTWS`."""
+
+    symbol: str
+    spot: float
+    expiries: list[str]
+    strikes: list[float]
+    con_id: int = 100_000
+    trading_class: str | None = None
+    exchange: str = "SMART"
+    primary_exchange: str = "CBOE"
+    multiplier: str = "100"
+    min_tick: float = 0.01
+    iv: float = 0.25
+    quotes: dict[QuoteKey, OptionQuote] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.symbol = self.symbol.upper()
+        self.trading_class = self.trading_class or self.symbol
+        self.expiries = sorted(_quote_key(exp, 0, "C")[0] for exp in self.expiries)
+        self.strikes = sorted(float(s) for s in self.strikes)
+        self._con_ids: dict[QuoteKey, int] = {}
+        ids = itertools.count(self.con_id + 1)
+        for expiry in self.expiries:
+            for strike in self.strikes:
+                for right in ("C", "P"):
+                    self._con_ids[_quote_key(expiry, strike, right)] = next(ids)
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def synthetic(
+        cls,
+        symbol: str = "FAKE",
+        *,
+        spot: float = 100.0,
+        expiries: int = 8,
+        strikes_per_side: int = 20,
+        strike_step: float = 1.0,
+        start: date | None = None,
+    ) -> "ChainFixture":
+        """Weekly expiries (Fridays) and strikes evenly spaced around ``spot``."""
+
+        day = start or date.today()
+        day += timedelta(days=(4 - day.weekday()) % 7 or 7)
+        exps = [(day + timedelta(weeks=i)).strftime("%Y%m%d") for i in range(expiries)]
+        center = round(spot / strike_step) * strike_step
+        strikes = [
+            round(center + i * strike_step, 4)
+            for i in range(-strikes_per_side, strikes_per_side + 1)
+            if center + i * strike_step > 0
+        ]
+        return cls(symbol=symbol, spot=spot, expiries=exps, strikes=strikes)
+
+    @classmethod
+    def from_chain_csv(
+        cls, path: str | Path, *, symbol: str, spot: float, **kwargs: Any
+    ) -> "ChainFixture":
+        """Build a fixture from an exported option chain CSV."""
+
+        quotes: dict[QuoteKey, OptionQuote] = {}
+        expiries: set[str] = set()
+        strikes: set[float] = set()
+
+        def num(row: Mapping[str, str], name: str, default: float = 0.0) -> float:
+            try:
+                return float(row.get(name) or default)
+            except ValueError:
+                return default
+
+        with Path(path).open(newline="", encoding="utf-8") as handle:
+            for raw in csv.DictReader(handle):
+                row = {k.strip().lower(): (v or "").strip() for k, v in raw.items() if k}
+                try:
+                    key = _quote_key(row["expiry"], row["strike"], row.get("type") or row.get("right"))
+                except (KeyError, ValueError):
+                    continue
+                expiries.add(key[0])
+                strikes.add(key[1])
+                close = num(row, "close") or None
+                bid = num(row, "bid") or (close or 0.0)
+                ask = num(row, "ask") or (close or bid)
+                quotes[key] = OptionQuote(
+                    bid=bid,
+                    ask=ask,
+                    iv=num(row, "iv"),
+                    delta=num(row, "delta"),
+                    gamma=num(row, "gamma"),
+                    vega=num(row, "vega"),
+                    theta=num(row, "theta"),
+                    close=close,
+                    volume=int(num(row, "volume")),
+                    open_interest=int(num(row, "openinterest")),
+                )
+        fixture = cls(
+            symbol=symbol, spot=spot, expiries=sorted(expiries), strikes=sorted(strikes), **kwargs
+        )
+        fixture.quotes.update(quotes)
+        return fixture
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ChainFixture":
+        """Load a fixture written by :meth:`save`."""
+
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        raw_quotes = data.pop("quotes", {})
+        fixture = cls(**data)
+        for text, values in raw_quotes.items():
+            expiry, strike, right = text.split("|")
+            fixture.quotes[_quote_key(expiry, strike, right)] = OptionQuote(**values)
+        return fixture
+
+    def save(self, path: str | Path) -> None:
+        data = {
+            "symbol": self.symbol,
+            "spot": self.spot,
+            "expiries": self.expiries,
+            "strikes": self.strikes,
+            "con_id": self.con_id,
+            "trading_class": self.trading_class,
+            "exchange": self.exchange,
+            "primary_exchange": self.primary_exchange,
+            "multiplier": self.multiplier,
+            "min_tick": self.min_tick,
+            "iv": self.iv,
+            "quotes": {
+                f"{exp}|{strike:g}|{right}": asdict(quote)
+                for (exp, strike, right), quote in self.quotes.items()
+            },
+        }
+        Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    # ------------------------------------------------------------------
+    def option_con_id(self, expiry: Any, strike: Any, right: Any) -> int | None:
+        try:
+            return self._con_ids.get(_quote_key(expiry, strike, right))
+        except ValueError:
+            return None
+
+    def quote(self, expiry: Any, strike: Any, right: Any) -> OptionQuote:
+        """Return the recorded quote or a Black-Scholes based synthetic one."""
+
+        key = _quote_key(expiry, strike, right)
+        recorded = self.quotes.get(key)
+        if recorded is not None:
+            return recorded
+        exp_date = datetime.strptime(key[0], "%Y%m%d").date()
+        t = max((exp_date - date.today()).days, 1) / 365.0
+        spot, k, sigma = self.spot, key[1], self.iv
+        sqrt_t = math.sqrt(t)
+        d1 = (math.log(spot / k) + 0.5 * sigma * sigma * t) / (sigma * sqrt_t)
+        d2 = d1 - sigma * sqrt_t
+        pdf = math.exp(-0.5 * d1 * d1) / math.sqrt(2 * math.pi)
+        if key[2] == "C":
+            price = spot * _norm_cdf(d1) - k * _norm_cdf(d2)
+            delta = _norm_cdf(d1)
+        else:
+            price = k * _norm_cdf(-d2) - spot * _norm_cdf(-d1)
+            delta = _norm_cdf(d1) - 1.0
+        price = max(price, self.min_tick)
+        half_spread = max(self.min_tick, round(price * 0.02, 2))
+        return OptionQuote(
+            bid=round(max(price - half_spread, 0.0), 2),
+            ask=round(price + half_spread, 2),
+            iv=sigma,
+            delta=round(delta, 4),
+            gamma=round(pdf / (spot * sigma * sqrt_t), 5),
+            vega=round(spot * pdf * sqrt_t / 100, 4),
+            theta=round(-spot * pdf * sigma / (2 * sqrt_t) / 365, 4),
+            close=round(price, 2),
+            volume=100,
+            open_interest=1000,
+        )
+
+
+@dataclass
+class FakeTWSStats:
+    """Counters collected by :class:`FakeTWS`."""
+
+    connections: int = 0
+    requests: dict[str, int] = field(default_factory=dict)
+    messages_sent: int = 0
+    pacing_errors: int = 0
+    ticker_limit_errors: int = 0
+    unknown_contracts: int = 0
+
+    def count(self, name: str) -> None:
+        self.requests[name] = self.requests.get(name, 0) + 1
+
+
+def _fields(*values: Any) -> bytes:
+    parts = []
+    for value in values:
+        if isinstance(value, bool):
+            value = int(value)
+        elif value is None:
+            value = ""
+        parts.append(f"{value}\0")
+    payload = "".join(parts).encode("ascii", errors="replace")
+    return struct.pack("!I", len(payload)) + payload
+
+
+class _Connection:
+    """One client connection: request parsing and delayed response queue."""
+
+    def __init__(self, server: "FakeTWS", sock: socket.socket) -> None:
+        self.server = server
+        self.sock = sock
+        self.framer = MessageFramer()
+        self.subscriptions: set[int] = set()
+        self.market_data_type = 1
+        self.recent: deque[float] = deque()
+        self._queue: list[tuple[float, int, bytes]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._sender = threading.Thread(target=self._send_loop, daemon=True)
+
+    # ------------------------------------------------------------------
+    def serve(self) -> None:
+        self._sender.start()
+        try:
+            if not self._handshake():
+                return
+            while not self._closed:
+                data = self.sock.recv(65536)
+                if not data:
+                    break
+                for msg in self.framer.feed_and_drain(data):
+                    self._dispatch(msg)
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def send(self, *values: Any, delay: float | None = None) -> None:
+        latency = self.server.latency if delay is None else delay
+        due = time.monotonic() + max(latency, 0.0)
+        with self._cond:
+            heapq.heappush(self._queue, (due, next(self._seq), _fields(*values)))
+            self._cond.notify()
+
+    def _send_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._queue:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                due = self._queue[0][0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                batch = []
+                now = time.monotonic()
+                while self._queue and self._queue[0][0] <= now:
+                    batch.append(heapq.heappop(self._queue)[2])
+            try:
+                self.sock.sendall(b"".join(batch))
+            except OSError:
+                return
+            self.server.stats.messages_sent += len(batch)
+
+    # ------------------------------------------------------------------
+    def _recv_exact(self, size: int) -> bytes:
+        chunks = []
+        while size > 0:
+            chunk = self.sock.recv(size)
+            if not chunk:
+                raise ConnectionError("client closed during handshake")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def _handshake(self) -> bool:
+        prefix = self._recv_exact(4)
+        if prefix != b"API\0":
+            logger.warning(f"[fake_tws] onbekende handshake {prefix!r}")
+            return False
+        (size,) = struct.unpack("!I", self._recv_exact(4))
+        self._recv_exact(size)  # "v100..203" version range
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d %H:%M:%S UTC")
+        self.sock.sendall(_fields(SERVER_VERSION, stamp))
+        self.server.stats.connections += 1
+        return True
+
+    def _paced(self, req_id: int) -> bool:
+        """Return ``False`` and answer error 100 when the rate limit is hit."""
+
+        limit = self.server.max_msg_rate
+        if not limit:
+            return True
+        now = time.monotonic()
+        while self.recent and now - self.recent[0] >= 1.0:
+            self.recent.popleft()
+        if len(self.recent) >= limit:
+            self.server.stats.pacing_errors += 1
+            self.error(req_id, 100, "Max rate of messages per second has been exceeded")
+            return False
+        self.recent.append(now)
+        return True
+
+    def error(self, req_id: int, code: int, text: str) -> None:
+        self.send(ERR_MSG, req_id, code, text, "", int(time.time() * 1000))
+
+    def _dispatch(self, msg: bytes) -> None:
+        parts = msg.split(b"\0")[:-1]
+        if not parts:
+            return
+        try:
+            msg_id = int(parts[0])
+        except ValueError:
+            return
+        fields = [p.decode("ascii", errors="replace") for p in parts[1:]]
+        handler = self._HANDLERS.get(msg_id)
+        self.server.stats.count(handler.__name__[4:] if handler else f"msg_{msg_id}")
+        if handler is not None:
+            handler(self, fields)
+
+    # ------------------------------------------------------------------
+    def _on_start_api(self, fields: list[str]) -> None:
+        self.send(NEXT_VALID_ID, 1, self.server.next_order_id, delay=0.0)
+        self.send(MANAGED_ACCTS, 1, "DU0000000", delay=0.0)
+
+    def _on_req_ids(self, fields: list[str]) -> None:
+        self.send(NEXT_VALID_ID, 1, self.server.next_order_id)
+
+    def _on_current_time(self, fields: list[str]) -> None:
+        self.send(CURRENT_TIME, 1, int(time.time()))
+
+    def _on_market_data_type(self, fields: list[str]) -> None:
+        self.market_data_type = int(fields[1]) if len(fields) > 1 else 1
+
+    def _on_contract_details(self, fields: list[str]) -> None:
+        # version, reqId, conId, symbol, secType, expiry, strike, right, ...
+        req_id = int(fields[1])
+        if not self._paced(req_id):
+            return
+        fixture = self.server.fixture
+        symbol, sec_type = fields[3].upper(), fields[4].upper()
+        if symbol != fixture.symbol:
+            self._unknown(req_id)
+            return
+        if sec_type == "STK":
+            self._contract_data(req_id, sec_type="STK", con_id=fixture.con_id)
+        elif sec_type == "OPT":
+            expiry, strike, right = fields[5], fields[6], fields[7]
+            con_id = fixture.option_con_id(expiry, strike or 0, right)
+            if con_id is None:
+                self._unknown(req_id)
+                return
+            self._contract_data(
+                req_id,
+                sec_type="OPT",
+                con_id=con_id,
+                expiry=_quote_key(expiry, 0, "C")[0],
+                strike=float(strike),
+                right=right.upper()[:1],
+            )
+        else:
+            self._unknown(req_id)
+            return
+        self.send(CONTRACT_DATA_END, 1, req_id)
+
+    def _contract_data(
+        self,
+        req_id: int,
+        *,
+        sec_type: str,
+        con_id: int,
+        expiry: str = "",
+        strike: float = 0.0,
+        right: str = "",
+    ) -> None:
+        fx = self.server.fixture
+        is_opt = sec_type == "OPT"
+        now = datetime.now(timezone.utc)
+        session = "0000-2359" if self.server.market_open else "CLOSED"
+        hours = ";".join(
+            f"{(now + timedelta(days=d)).strftime('%Y%m%d')}:{session}" for d in (-1, 0, 1)
+        )
+        local = f"{fx.symbol} {expiry} {strike:g} {right}" if is_opt else fx.symbol
+        self.send(
+            CONTRACT_DATA,
+            req_id,
+            fx.symbol,
+            sec_type,
+            expiry,               # lastTradeDateOrContractMonth
+            expiry,               # lastTradeDate
+            strike,
+            right,
+            fx.exchange,
+            "USD",
+            local,                # localSymbol
+            fx.trading_class,     # marketName
+            fx.trading_class if is_opt else fx.symbol,
+            con_id,
+            fx.min_tick,
+            fx.multiplier if is_opt else "",
+            "LMT,MKT",            # orderTypes
+            "SMART,CBOE",         # validExchanges
+            1,                    # priceMagnifier
+            fx.con_id if is_opt else 0,
+            f"{fx.symbol} fake",  # longName
+            fx.primary_exchange,
+            expiry[:6],           # contractMonth
+            "", "", "",           # industry, category, subcategory
+            "UTC",                # timeZoneId
+            hours,                # tradingHours
+            hours,                # liquidHours
+            "", 0,                # evRule, evMultiplier
+            0,                    # secIdList count
+            1,                    # aggGroup
+            fx.symbol if is_opt else "",
+            "STK" if is_opt else "",
+            "",                   # marketRuleIds
+            expiry,               # realExpirationDate
+            "" if is_opt else "COMMON",
+            1, 1, 1,              # minSize, sizeIncrement, suggestedSizeIncrement
+            0,                    # ineligibility reasons count
+        )
+
+    def _unknown(self, req_id: int) -> None:
+        self.server.stats.unknown_contracts += 1
+        self.error(req_id, 200, "No security definition has been found for the request")
+
+    def _on_sec_def_opt_params(self, fields: list[str]) -> None:
+        req_id = int(fields[0])
+        if not self._paced(req_id):
+            return
+        fx = self.server.fixture
+        if fields[1].upper() == fx.symbol:
+            self.send(
+                SEC_DEF_OPT_PARAMS,
+                req_id,
+                fx.exchange,
+                fx.con_id,
+                fx.trading_class,
+                fx.multiplier,
+                len(fx.expiries),
+                *fx.expiries,
+                len(fx.strikes),
+                *fx.strikes,
+            )
+        self.send(SEC_DEF_OPT_PARAMS_END, req_id)
+
+    def _on_mkt_data(self, fields: list[str]) -> None:
+        # version, reqId, conId, symbol, secType, expiry, strike, right,
+        # multiplier, exchange, primaryExchange, currency, localSymbol,
+        # tradingClass, deltaNeutral, genericTicks, snapshot, ...
+        req_id = int(fields[1])
+        if not self._paced(req_id):
+            return
+        fx = self.server.fixture
+        symbol, sec_type = fields[3].upper(), fields[4].upper()
+        snapshot = fields[16] == "1" if len(fields) > 16 else False
+        if not snapshot:
+            limit = self.server.max_tickers
+            if limit and len(self.subscriptions) >= limit:
+                self.server.stats.ticker_limit_errors += 1
+                self.error(req_id, 101, "Max number of tickers has been reached")
+                return
+        offset = _DELAYED_OFFSET if self.market_data_type in (3, 4) else 0
+        if symbol != fx.symbol:
+            self._unknown(req_id)
+            return
+        if sec_type == "STK":
+            spot = fx.spot
+            self.send(TICK_PRICE, 6, req_id, LAST + offset, spot, 100, 0)
+            self.send(TICK_PRICE, 6, req_id, BID + offset, round(spot - 0.01, 2), 100, 0)
+            self.send(TICK_PRICE, 6, req_id, ASK + offset, round(spot + 0.01, 2), 100, 0)
+            self.send(TICK_PRICE, 6, req_id, CLOSE, spot, 0, 0)
+        elif sec_type == "OPT":
+            expiry, strike, right = fields[5], fields[6], fields[7]
+            if fx.option_con_id(expiry, strike or 0, right) is None:
+                self._unknown(req_id)
+                return
+            quote = fx.quote(expiry, strike, right)
+            self.send(TICK_PRICE, 6, req_id, BID + offset, quote.bid, 10, 0)
+            self.send(TICK_PRICE, 6, req_id, ASK + offset, quote.ask, 10, 0)
+            if quote.close is not None:
+                self.send(TICK_PRICE, 6, req_id, CLOSE, quote.close, 0, 0)
+            self.send(
+                TICK_OPTION_COMPUTATION,
+                req_id,
+                MODEL_OPTION,
+                0,
+                quote.iv,
+                quote.delta,
+                round((quote.bid + quote.ask) / 2, 4),
+                0.0,
+                quote.gamma,
+                quote.vega,
+                quote.theta,
+                fx.spot,
+            )
+        else:
+            self._unknown(req_id)
+            return
+        if snapshot:
+            self.send(TICK_SNAPSHOT_END, 1, req_id)
+        else:
+            self.subscriptions.add(req_id)
+
+    def _on_cancel_mkt_data(self, fields: list[str]) -> None:
+        if len(fields) > 1:
+            self.subscriptions.discard(int(fields[1]))
+
+    _HANDLERS = {
+        START_API: _on_start_api,
+        REQ_IDS: _on_req_ids,
+        REQ_CURRENT_TIME: _on_current_time,
+        REQ_MARKET_DATA_TYPE: _on_market_data_type,
+        REQ_CONTRACT_DATA: _on_contract_details,
+        REQ_SEC_DEF_OPT_PARAMS: _on_sec_def_opt_params,
+        REQ_MKT_DATA: _on_mkt_data,
+        CANCEL_MKT_DATA: _on_cancel_mkt_data,
+    }
+
+
+class FakeTWS:
+    """Threaded TCP server emulating TWS for the requests TOMIC issues.
+
+    ``latency`` delays every response (seconds), ``max_msg_rate`` answers
+    requests beyond that many per second with error 100 and ``max_tickers``
+    limits simultaneous streaming market data lines (error 101).
+    """
+
+    def __init__(
+        self,
+        fixture: ChainFixture | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        max_msg_rate: int | None = None,
+        max_tickers: int | None = None,
+        market_open: bool = True,
+        next_order_id: int = 1,
+    ) -> None:
+        self.fixture = fixture or ChainFixture.synthetic()
+        self.host = host
+        self.port = port
+        self.latency = max(float(latency), 0.0)
+        self.max_msg_rate = max_msg_rate
+        self.max_tickers = max_tickers
+        self.market_open = market_open
+        self.next_order_id = next_order_id
+        self.stats = FakeTWSStats()
+        self._sock: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._connections: list[_Connection] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "FakeTWS":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.host, self.port
+
+    def start(self) -> "FakeTWS":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen()
+        self.port = sock.getsockname()[1]
+        self._sock = sock
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"[fake_tws] luistert op {self.host}:{self.port}")
+        return self
+
+    def stop(self) -> None:
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+
+    def _accept_loop(self) -> None:
+        while self._sock is not None:
+            try:
+                client, _addr = self._sock.accept()
+            except OSError:
+                return
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn = _Connection(self, client)
+            with self._lock:
+                self._connections.append(conn)
+            threading.Thread(target=conn.serve, daemon=True).start()
+
+
+__all__ = [
+    "ChainFixture",
+    "FakeTWS",
+    "FakeTWSStats",
+    "OptionQuote",
+    "SERVER_VERSION",
+]
@@ -7,6 +7,7 @@ import threading
 from ibapi.contract import Contract
 
 from .ib_connection import connect_ib
+from .pacing import Priority, pacing_priority
 from tomic.logutils import logger
 from tomic.config import get as cfg_get
 
@@ -21,6 +22,7 @@ def _contract_repr(contract: Contract) -> str:
     ).strip()
 
 
+@pacing_priority(Priority.LOW)  # backfills yield to interactive refreshes
 def fetch_historical_option_data(
     contracts: dict[int, Contract], *, app=None, what: str = "TRADES"
 ) -> dict[int, dict[str, float | None]]:
@@ -14,6 +14,12 @@ from tomic.config import get as cfg_get
 
 from tomic.logutils import logger, log_result
 from .client_registry import ACTIVE_CLIENT_IDS
+from .pacing import (
+    IBPacingScheduler,
+    Priority,
+    get_pacing_scheduler,
+    historical_request_keys,
+)
 
 
 class DuplicateClientIdError(Exception):
@@ -74,6 +80,77 @@ class IBClient(EClient, EWrapper):
         # Track connection-level errors (like duplicate client ID)
         self._connection_error: Optional[str] = None
         self._connection_error_code: Optional[int] = None
+        self.pacer: IBPacingScheduler = get_pacing_scheduler()
+        self._reader_thread: int | None = None
+
+    # Pacing ------------------------------------------------------------
+    # Every outgoing message, market data line and historical request goes
+    # through the shared :class:`IBPacingScheduler`.
+    def _on_reader_thread(self) -> bool:
+        return threading.get_ident() == self._reader_thread
+
+    def run(self) -> None:  # noqa: D401 - EClient message loop
+        self._reader_thread = threading.get_ident()
+        super().run()
+
+    def _message_priority(self) -> Priority | None:
+        # Requests made from callbacks must not queue behind other threads.
+        return Priority.HIGH if self._on_reader_thread() else None
+
+    def sendMsg(self, msgId: int, msg: str) -> None:  # noqa: N802 - EClient API
+        self.pacer.acquire_message(priority=self._message_priority())
+        super().sendMsg(msgId, msg)
+
+    def sendMsgProtoBuf(self, msgId: int, msg: bytes) -> None:  # noqa: N802 - EClient API
+        self.pacer.acquire_message(priority=self._message_priority())
+        super().sendMsgProtoBuf(msgId, msg)
+
+    def reqMktData(  # noqa: N802 - EClient API
+        self,
+        reqId: int,
+        contract: Any,
+        genericTickList: str,
+        snapshot: bool,
+        regulatorySnapshot: bool,
+        mktDataOptions: Any,
+    ) -> None:
+        self.pacer.open_line(
+            self,
+            reqId,
+            snapshot=bool(snapshot or regulatorySnapshot),
+            block=not self._on_reader_thread(),
+        )
+        super().reqMktData(
+            reqId, contract, genericTickList, snapshot, regulatorySnapshot, mktDataOptions
+        )
+
+    def cancelMktData(self, reqId: int) -> None:  # noqa: N802 - EClient API
+        try:
+            super().cancelMktData(reqId)
+        finally:
+            self.pacer.close_line(self, reqId)
+
+    def reqHistoricalData(  # noqa: N802 - EClient API
+        self,
+        reqId: int,
+        contract: Any,
+        endDateTime: str,
+        durationStr: str,
+        barSizeSetting: str,
+        whatToShow: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        key, contract_key = historical_request_keys(
+            contract, endDateTime, durationStr, barSizeSetting, whatToShow
+        )
+        self.pacer.acquire_historical(
+            key, contract_key, block=not self._on_reader_thread()
+        )
+        super().reqHistoricalData(
+            reqId, contract, endDateTime, durationStr, barSizeSetting, whatToShow,
+            *args, **kwargs,
+        )
 
     def nextValidId(self, orderId: int) -> None:  # noqa: N802 - IB API callback
         self.next_valid_id = orderId
@@ -114,6 +191,7 @@ class IBClient(EClient, EWrapper):
                 return
 
     def tickSnapshotEnd(self, reqId: int) -> None:  # noqa: N802
+        self.pacer.close_line(self, reqId)
         with self._requests_lock:
             state = self._requests.get(reqId)
             if state is not None and state.kind == "snapshot":
@@ -262,6 +340,7 @@ class IBClient(EClient, EWrapper):
         try:
             super().disconnect()
         finally:
+            self.pacer.release_owner(self)
             if client_id is not None:
                 ACTIVE_CLIENT_IDS.discard(client_id)
 
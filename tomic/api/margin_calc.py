@@ -1,10 +1,17 @@
 import threading
+import time
+from typing import Sequence
+
 from ibapi.order import Order
 from ibapi.contract import Contract
 
 from tomic.api.base_client import BaseIBApp
 from tomic.api.ib_connection import connect_ib
 from tomic.config import get as cfg_get
+from tomic.logutils import logger
+
+# IB reports UNSET_DOUBLE when a what-if margin is not available.
+_UNSET_MARGIN = 1e300
 
 
 def _create_option_contract(symbol: str, expiry: str, strike: float, right: str) -> Contract:
@@ -22,6 +29,20 @@ def _create_option_contract(symbol: str, expiry: str, strike: float, right: str)
     return c
 
 
+def _what_if_order(leg: dict) -> Order:
+    order = Order()
+    order.action = leg["action"]
+    order.totalQuantity = leg["qty"]
+    order.orderType = "MKT"
+    # Explicitly disable deprecated TWS attributes to avoid order rejection
+    # when submitting what-if orders for margin calculations.
+    # See https://ibkrcampus.com/campus/ibkr-api-page/twsapi-doc for details.
+    order.eTradeOnly = False
+    order.firmQuoteOnly = False  # disable firm quote check for what-if orders
+    order.whatIf = True
+    return order
+
+
 class MarginApp(BaseIBApp):
     """Minimal IB app to request what-if orders for margin."""
 
@@ -75,16 +96,7 @@ def calculate_trade_margin(
         total = 0.0
         for leg in legs:
             contract = _create_option_contract(symbol, expiry, leg["strike"], leg["type"])
-            order = Order()
-            order.action = leg["action"]
-            order.totalQuantity = leg["qty"]
-            order.orderType = "MKT"
-            # Explicitly disable deprecated TWS attributes to avoid order rejection
-            # when submitting what-if orders for margin calculations.
-            # See https://ibkrcampus.com/campus/ibkr-api-page/twsapi-doc for details.
-            order.eTradeOnly = False
-            order.firmQuoteOnly = False  # disable firm quote check for what-if orders
-            order.whatIf = True
+            order = _what_if_order(leg)
             app.margin = None
             app.event.clear()
             app.placeOrder(app.order_id, contract, order)
@@ -99,3 +111,111 @@ def calculate_trade_margin(
             app.disconnect()
         except Exception:
             pass
+
+
+class BatchMarginApp(BaseIBApp):
+    """IB app collecting many what-if responses keyed by order id."""
+
+    def __init__(self):
+        super().__init__()
+        self._cond = threading.Condition()
+        self.margins: dict[int, float | None] = {}
+
+    def openOrder(self, orderId, contract, order, orderState):
+        if not getattr(order, "whatIf", False):
+            return
+        try:
+            margin = float(orderState.initMarginChange)
+        except Exception:
+            margin = None
+        if margin is not None and abs(margin) >= _UNSET_MARGIN:
+            margin = None
+        with self._cond:
+            self.margins.setdefault(orderId, margin)
+            self._cond.notify_all()
+
+    def error(self, reqId, errorTime, errorCode, errorString, advancedOrderRejectJson=""):
+        super().error(reqId, errorTime, errorCode, errorString, advancedOrderRejectJson)
+        if reqId > 0 and errorCode not in self.WARNING_ERROR_CODES:
+            with self._cond:
+                self.margins.setdefault(reqId, None)
+                self._cond.notify_all()
+
+    def wait_for(self, order_ids: Sequence[int], timeout: float) -> dict[int, float | None]:
+        """Wait until every order id was answered or ``timeout`` passed."""
+
+        with self._cond:
+            self._cond.wait_for(
+                lambda: all(oid in self.margins for oid in order_ids), timeout=timeout
+            )
+            return {oid: self.margins[oid] for oid in order_ids if oid in self.margins}
+
+
+def calculate_trade_margins(
+    trades: Sequence[tuple[str, str, list]],
+    host: str | None = None,
+    port: int | None = None,
+    client_id: int | None = None,
+    timeout: float | None = None,
+) -> list[float | None]:
+    """Return the initial margin for each ``(symbol, expiry, legs)`` trade.
+
+    All what-if orders are sent over a single connection without waiting
+    for each other and their responses are matched by order id.  Trades
+    for which a leg was rejected or not answered within ``timeout`` seconds
+    get ``None``.
+    """
+    if not trades:
+        return []
+    host = host or cfg_get("IB_HOST", "127.0.0.1")
+    port = int(port or cfg_get("IB_PORT", 4002))
+    cid = client_id if client_id is not None else int(cfg_get("IB_CLIENT_ID", 100))
+    timeout = float(timeout or cfg_get("MARGIN_WHATIF_TIMEOUT", 15))
+    app = BatchMarginApp()
+    try:
+        connect_ib(client_id=cid, host=host, port=port, app=app)
+    except Exception as exc:
+        logger.warning(f"⚠️ Geen IB verbinding voor marginberekening: {exc}")
+        return [None] * len(trades)
+
+    try:
+        order_id = int(app.next_valid_id)
+        plan: list[list[int] | None] = []
+        start = time.perf_counter()
+        for symbol, expiry, legs in trades:
+            ids: list[int] = []
+            try:
+                for leg in legs:
+                    contract = _create_option_contract(
+                        symbol, expiry.replace("-", ""), leg["strike"], leg["type"]
+                    )
+                    app.placeOrder(order_id, contract, _what_if_order(leg))
+                    ids.append(order_id)
+                    order_id += 1
+            except (KeyError, TypeError, ValueError) as exc:
+                logger.error(f"⚠️ Ongeldige legs voor {symbol} {expiry}: {exc}")
+                plan.append(None)
+                continue
+            plan.append(ids)
+
+        pending = [oid for ids in plan if ids for oid in ids]
+        margins = app.wait_for(pending, timeout)
+        logger.info(
+            f"📐 {len(margins)}/{len(pending)} what-if antwoorden in "
+            f"{time.perf_counter() - start:.1f}s"
+        )
+
+        results: list[float | None] = []
+        for ids in plan:
+            values = [margins.get(oid) for oid in ids or []]
+            if not values or any(value is None for value in values):
+                results.append(None)
+                continue
+            total = sum(values)
+            results.append(round(total, 2) if total else None)
+        return results
+    finally:
+        try:
+            app.disconnect()
+        except Exception:
+            pass
@@ -13,6 +13,7 @@ import threading
 import time
 import math
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from zoneinfo import ZoneInfo
 from typing import Any, Dict
 
@@ -21,6 +22,7 @@ from ibapi.ticktype import TickTypeEnum
 from tomic.api.base_client import BaseIBApp
 from tomic.config import get as cfg_get
 from tomic.services._id_sequence import IncrementingIdMixin
+from tomic.services.contract_cache import ContractDetailsCache, get_contract_cache
 from .client_registry import ACTIVE_CLIENT_IDS
 from tomic.logutils import log_result, logger
 from tomic.models import OptionContract
@@ -322,7 +324,7 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
     ) -> None:
         # Initialize RequestTimerManager first for timer state
         RequestTimerManager.__init__(self)
-        super().__init__(symbol, primary_exchange=primary_exchange)
+        MarketClient.__init__(self, symbol, primary_exchange=primary_exchange)
         if max_concurrent_requests is None:
             max_concurrent_requests = int(cfg_get("MAX_CONCURRENT_REQUESTS", 5))
         self._detail_semaphore = threading.Semaphore(max_concurrent_requests)
@@ -350,7 +352,7 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
         self.spot_event = threading.Event()
         self.details_event = threading.Event()
         self.params_event = threading.Event()
-        self.contract_received = threading.Event()
+        self.contract_received = threading.Condition()
         self.market_event = threading.Event()
         self.all_data_event = threading.Event()
         self.iv_event = threading.Event()
@@ -522,20 +524,15 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
                 f"✅ [stap 4] ConId: {self.con_id}, TradingClass: {self.trading_class}. primaryExchange: {con.primaryExchange}"
             )
             self.details_event.set()
-            # Wait for the spot price to become available before requesting
-            # option parameters. This prevents ``reqSecDefOptParams`` from being
-            # triggered multiple times when the price arrives after the
-            # contract details callback.
-            if self.spot_price is None:
-                logger.debug(
-                    "Waiting for spot price before requesting option parameters"
-                )
-                self.spot_event.wait(2)
+            # The spot price is requested only after these details arrived and
+            # its ticks are decoded on this thread, so waiting for it here
+            # merely stalls the reader.  ``con_id`` guards against repeated
+            # ``reqSecDefOptParams`` calls.
             logger.info("▶️ START stap 5 - reqSecDefOptParams() voor optieparameters")
             self.reqSecDefOptParams(
                 self._next_id(), self.symbol, "", "STK", self.con_id
             )
-            self.contract_received.set()
+            self._notify_contract_received()
 
         elif reqId in self._pending_details:
             if not self._step8_logged:
@@ -606,7 +603,11 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
             logger.debug(
                 f"contractDetails ontvangen: {con.symbol} {con.lastTradeDateOrContractMonth} {con.strike} {con.right}"
             )
-            self.contract_received.set()
+            self._notify_contract_received()
+
+    def _notify_contract_received(self) -> None:
+        with self.contract_received:
+            self.contract_received.notify_all()
 
     @log_result
     def contractDetailsEnd(self, reqId: int) -> None:  # noqa: N802
@@ -619,7 +620,7 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
                 self.invalid_contracts.add(reqId)
             self._detail_semaphore.release()
             self._mark_complete(reqId)
-        self.contract_received.set()
+        self._notify_contract_received()
 
     @log_result
     def securityDefinitionOptionParameter(
@@ -632,7 +633,7 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
         expirations: list[str],
         strikes: list[float],
     ) -> None:  # noqa: N802
-        if self.expiries:
+        if self.expiries or self.params_event.is_set():
             return
 
         self.multiplier = multiplier
@@ -662,14 +663,34 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
         )
 
         self.params_event.set()
+        self.iv_event.clear()
+        # Selection waits for the spot price, whose ticks are decoded on the
+        # reader thread that delivered this callback; continue elsewhere.
+        threading.Thread(
+            target=self._run_chain_selection,
+            args=(exp_list, list(strikes), tradingClass),
+            daemon=True,
+        ).start()
+
+    def _run_chain_selection(
+        self, exp_list: list[str], strikes: list[float], trading_class: str
+    ) -> None:
+        if self._select_chain(exp_list, strikes, trading_class):
+            self.iv_event.set()
 
+    def _select_chain(
+        self, exp_list: list[str], strikes: list[float], tradingClass: str
+    ) -> bool:
+        """Pick expiries and strikes around the spot price.
+
+        Returns ``False`` when no spot price arrived in time.
+        """
         # Zorg dat spot_price beschikbaar is
         if self.spot_price is None:
             logger.warning(
                 "Spot price not yet available. Waiting for spot price before processing expiries."
             )
-            self.data_event.clear()
-            self.data_event.wait(10)
+            self.spot_event.wait(10)
 
         # Stop als spot_price nog steeds ontbreekt
         if self.spot_price is None:
@@ -677,7 +698,7 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
                 "❌ FAIL stap 3: Spot price not available after timeout. "
                 "Skipping option data request."
             )
-            return
+            return False
 
         strike_range = int(cfg_get("STRIKE_RANGE", 10))
         stddev_mult = float(cfg_get("STRIKE_STDDEV_MULTIPLIER", 1.0))
@@ -726,47 +747,41 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
             if expiry_strikes:
                 atm_strike = min(expiry_strikes, key=lambda x: abs(x - center))
 
-        def finalize(allowed: list[float]) -> None:
-            self.strikes = allowed
-            self._strike_lookup = {s: s for s in allowed}
-            self._exp_strikes = {exp: list(self.strikes) for exp in self.expiries}
-            logger.info(
-                f"✅ [stap 6] Geselecteerde strikes: {', '.join(str(s) for s in self.strikes)}"
-            )
-            self.expected_contracts = len(self.expiries) * len(self.strikes) * 2
+        iv = None
+        stddev = None
+        if atm_expiry and atm_strike is not None:
             logger.info(
-                f"✅ [stap 6] Er zijn {len(self.expiries)} expiries en {len(self.strikes)} strikes dus {self.expected_contracts} combinaties"
+                f"IV bepaling via expiry {atm_expiry} en ATM strike {atm_strike}"
             )
-            if self.expected_contracts == 0:
-                self.all_data_event.set()
-                self._stop_max_data_timer()
-            self.iv_event.set()
-
-        def worker() -> None:
-            iv = None
-            stddev = None
-            if atm_expiry and atm_strike is not None:
+            iv = self._fetch_iv_for_expiry(atm_expiry, atm_strike)
+            if iv is not None:
+                dte = (
+                    datetime.strptime(atm_expiry, "%Y%m%d").date() - today_date
+                ).days
+                stddev = center * iv * math.sqrt(dte / 365) * stddev_mult
                 logger.info(
-                    f"IV bepaling via expiry {atm_expiry} en ATM strike {atm_strike}"
+                    f"IV ontvangen: {iv} -> stddev {stddev:.2f} (multiplier {stddev_mult})"
                 )
-                iv = self._fetch_iv_for_expiry(atm_expiry, atm_strike)
-                if iv is not None:
-                    dte = (
-                        datetime.strptime(atm_expiry, "%Y%m%d").date() - today_date
-                    ).days
-                    stddev = center * iv * math.sqrt(dte / 365) * stddev_mult
-                    logger.info(
-                        f"IV ontvangen: {iv} -> stddev {stddev:.2f} (multiplier {stddev_mult})"
-                    )
-            if iv is None or stddev is None:
-                logger.debug("IV niet beschikbaar, fallback naar STRIKE_RANGE")
-                allowed = [s for s in sorted(strikes) if abs(s - center) <= strike_range]
-            else:
-                allowed = [s for s in sorted(strikes) if abs(s - center) <= stddev]
-            finalize(allowed)
+        if iv is None or stddev is None:
+            logger.debug("IV niet beschikbaar, fallback naar STRIKE_RANGE")
+            allowed = [s for s in sorted(strikes) if abs(s - center) <= strike_range]
+        else:
+            allowed = [s for s in sorted(strikes) if abs(s - center) <= stddev]
 
-        self.iv_event.clear()
-        threading.Thread(target=worker, daemon=True).start()
+        self.strikes = allowed
+        self._strike_lookup = {s: s for s in allowed}
+        self._exp_strikes = {exp: list(self.strikes) for exp in self.expiries}
+        logger.info(
+            f"✅ [stap 6] Geselecteerde strikes: {', '.join(str(s) for s in self.strikes)}"
+        )
+        self.expected_contracts = len(self.expiries) * len(self.strikes) * 2
+        logger.info(
+            f"✅ [stap 6] Er zijn {len(self.expiries)} expiries en {len(self.strikes)} strikes dus {self.expected_contracts} combinaties"
+        )
+        if self.expected_contracts == 0:
+            self.all_data_event.set()
+            self._stop_max_data_timer()
+        return True
 
     def securityDefinitionOptionParameterEnd(self, reqId: int) -> None:  # noqa: N802
         """Mark option parameter retrieval as complete."""
@@ -1065,13 +1080,21 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
         Returns ``True`` when details were received within the configured
         timeout, otherwise ``False``. The number of retry attempts is
         controlled via the ``CONTRACT_DETAILS_RETRIES`` config option.
+        Contracts found in the contract details cache are answered locally
+        without contacting IB.
         """
 
+        cache = get_contract_cache()
+        if self._replay_cached_details(cache, contract, req_id):
+            return True
+
         timeout = cfg_get("CONTRACT_DETAILS_TIMEOUT", 2)
         retries = int(cfg_get("CONTRACT_DETAILS_RETRIES", 0))
 
+        def answered() -> bool:
+            return req_id in self.option_info or req_id not in self._pending_details
+
         for attempt in range(retries + 1):
-            self.contract_received.clear()
             self.reqContractDetails(req_id, contract)
             prefix = "✅ [stap 7]" if attempt == 0 else "🔄 retry"
             logger.debug(
@@ -1089,7 +1112,16 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
                 f"reqContractDetails attempt {attempt + 1} for: {contract_repr(contract)}"
             )
 
-            if self.contract_received.wait(timeout) and req_id in self.option_info:
+            # Several requests are in flight; wait for this ``req_id``.
+            with self.contract_received:
+                self.contract_received.wait_for(answered, timeout)
+            if req_id in self.option_info:
+                details = self.option_info[req_id]
+                cache.store(
+                    contract,
+                    getattr(details, "contract", None),
+                    min_tick=getattr(details, "minTick", None),
+                )
                 return True
 
             logger.info(
@@ -1099,6 +1131,28 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
 
         return False
 
+    def _replay_cached_details(
+        self, cache: ContractDetailsCache, contract: Contract, req_id: int
+    ) -> bool:
+        """Feed cached contract details through :meth:`contractDetails`."""
+
+        if req_id not in self._pending_details:
+            return False
+        cached = cache.lookup(contract)
+        if cached is None:
+            return False
+        contract.conId = cached.con_id
+        if cached.trading_class:
+            contract.tradingClass = cached.trading_class
+        if cached.primary_exchange:
+            contract.primaryExchange = cached.primary_exchange
+        if cached.multiplier:
+            contract.multiplier = cached.multiplier
+        details = SimpleNamespace(contract=contract, minTick=cached.min_tick)
+        logger.debug(f"contractDetails uit cache voor reqId {req_id}: conId={cached.con_id}")
+        self.contractDetails(req_id, details)
+        return req_id in self.option_info
+
     def _fetch_iv_for_expiry(self, expiry: str, strike: float) -> float | None:
         """Return implied volatility for the specified ATM option.
 
@@ -1245,7 +1299,8 @@ class OptionChainClientLegacy(RequestTimerManager, MarketClient):
                 for r in ("C", "P"):
                     tasks.append(asyncio.create_task(handle_request(e, s, r)))
 
-        await asyncio.gather(*tasks)
+        with get_contract_cache().deferred():
+            await asyncio.gather(*tasks)
         if self.use_hist_iv:
             contracts = {
                 rid: self.option_info[rid].contract
@@ -1310,25 +1365,11 @@ class TermStructureClient(OptionChainClientLegacy):
         self._ts_expiries = expiries
         self._ts_window = strike_window
 
-    def securityDefinitionOptionParameter(
-        self,
-        reqId: int,
-        exchange: str,
-        underlyingConId: int,
-        tradingClass: str,
-        multiplier: str,
-        expirations: list[str],
-        strikes: list[float],
-    ) -> None:  # noqa: N802
-        super().securityDefinitionOptionParameter(
-            reqId,
-            exchange,
-            underlyingConId,
-            tradingClass,
-            multiplier,
-            expirations,
-            strikes,
-        )
+    def _select_chain(
+        self, exp_list: list[str], strikes: list[float], tradingClass: str
+    ) -> bool:
+        if not super()._select_chain(exp_list, strikes, tradingClass):
+            return False
         if self.expiries:
             self.expiries = self.expiries[: self._ts_expiries]
         if self.spot_price is not None and self.strikes:
@@ -1345,6 +1386,7 @@ class TermStructureClient(OptionChainClientLegacy):
         )
         if self.expected_contracts == 0:
             self.all_data_event.set()
+        return True
 
 
 @log_result
@@ -0,0 +1,505 @@
+"""Process wide pacing of requests sent to TWS / IB Gateway.
+
+IB enforces several limits per connection and account:
+
+* at most ~50 messages per second from the API client (error 100),
+* a fixed number of simultaneous market data lines (error 101),
+* historical data pacing: 60 requests per 10 minutes, no identical request
+  within 15 seconds and fewer than six requests for the same contract within
+  two seconds (error 162).
+
+:class:`IBPacingScheduler` models these limits in one place.  Every
+:class:`~tomic.api.ib_connection.IBClient` submits through the shared
+scheduler returned by :func:`get_pacing_scheduler`: outgoing messages take a
+token from a token bucket, ``reqMktData`` holds a line until it is cancelled
+(snapshots release their line automatically) and ``reqHistoricalData`` waits
+for a free slot in the historical windows.  Waiters are served in priority
+order and FIFO within a priority; use :func:`pacing_priority` to mark
+interactive work as :attr:`Priority.HIGH` or backfills as
+:attr:`Priority.LOW`.
+
+Requests issued from the IB reader thread never wait for lines or historical
+slots, since the callbacks that free them are decoded on that same thread.
+Other threads wait at most ``line_wait_timeout`` seconds for a line and then
+get :class:`PacingTimeout`; when every line is held by a stream only a
+cancel can free one.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Hashable, Iterator
+
+from tomic.config import get as cfg_get
+from tomic.logutils import logger
+
+
+class Priority(IntEnum):
+    """Scheduling priority; lower values are served first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+#: IB error codes signalling a pacing violation.
+PACING_ERROR_CODES = {100: "messages", 101: "lines", 162: "historical", 420: "historical"}
+
+class PacingTimeout(TimeoutError):
+    """Raised when a request could not be admitted in time."""
+
+
+_PRIORITY: ContextVar[Priority] = ContextVar("ib_pacing_priority", default=Priority.NORMAL)
+
+
+@contextmanager
+def pacing_priority(level: Priority) -> Iterator[None]:
+    """Submit IB requests made in this context with ``level`` priority."""
+
+    token = _PRIORITY.set(Priority(level))
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def current_priority() -> Priority:
+    return _PRIORITY.get()
+
+
+@dataclass(frozen=True)
+class PacingLimits:
+    """Limits enforced by :class:`IBPacingScheduler` (``0`` disables a limit)."""
+
+    messages_per_second: float = 45.0
+    message_burst: int = 5
+    market_data_lines: int = 100
+    snapshot_line_seconds: float = 11.0
+    historical_requests: int = 60
+    historical_window: float = 600.0
+    historical_identical_interval: float = 15.0
+    historical_contract_requests: int = 5
+    historical_contract_window: float = 2.0
+    violation_backoff: float = 1.0
+    line_wait_timeout: float = 60.0
+
+    @classmethod
+    def from_config(cls) -> "PacingLimits":
+        return cls(
+            messages_per_second=float(cfg_get("IB_MAX_MESSAGES_PER_SEC", 45.0)),
+            market_data_lines=int(cfg_get("IB_MAX_MARKET_DATA_LINES", 100)),
+            historical_requests=int(cfg_get("IB_HIST_MAX_REQUESTS", 60)),
+            historical_window=float(cfg_get("IB_HIST_WINDOW_SECONDS", 600.0)),
+            line_wait_timeout=float(cfg_get("IB_LINE_WAIT_TIMEOUT", 60.0)),
+        )
+
+
+@dataclass
+class PacingStats:
+    """Counters describing the work done by an :class:`IBPacingScheduler`."""
+
+    messages: int = 0
+    message_wait: float = 0.0
+    lines_opened: int = 0
+    lines_peak: int = 0
+    line_wait: float = 0.0
+    lines_overcommitted: int = 0
+    historical: int = 0
+    historical_wait: float = 0.0
+    violations: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+LineKey = tuple[int, int]
+
+_WAIT_STATS = {
+    "messages": "message_wait",
+    "lines": "line_wait",
+    "historical": "historical_wait",
+}
+
+
+class IBPacingScheduler:
+    """Admit IB requests within message, line and historical data limits."""
+
+    def __init__(
+        self,
+        limits: PacingLimits | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limits = limits or PacingLimits()
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._queues: dict[str, list[tuple[int, int]]] = {
+            "messages": [],
+            "lines": [],
+            "historical": [],
+        }
+        self._tokens = float(max(self.limits.message_burst, 1))
+        self._refilled = clock()
+        self._paused_until: dict[str, float] = {}
+        # (owner, req_id) -> expiry of snapshot lines, ``None`` for streaming
+        self._lines: dict[LineKey, float | None] = {}
+        # id(owner) -> class name, to report who holds the lines
+        self._owner_names: dict[int, str] = {}
+        self._hist_times: deque[float] = deque()
+        self._hist_identical: dict[Hashable, float] = {}
+        self._hist_contract: dict[Hashable, deque[float]] = {}
+        self.stats = PacingStats()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def acquire_message(self, *, priority: Priority | None = None) -> float:
+        """Wait for a message token and return the seconds waited."""
+
+        if self.limits.messages_per_second <= 0:
+            with self._cond:
+                self.stats.messages += 1
+            return 0.0
+        return self._admit("messages", priority, self._message_delay, self._take_token)
+
+    def open_line(
+        self,
+        owner: object,
+        req_id: int,
+        *,
+        snapshot: bool = False,
+        priority: Priority | None = None,
+        block: bool = True,
+    ) -> float:
+        """Reserve a market data line for ``req_id`` of ``owner``.
+
+        With ``block=False`` the line is granted even when every line is in
+        use; the overcommit is counted in :attr:`stats`.  A blocking call
+        raises :class:`PacingTimeout` after ``line_wait_timeout`` seconds.
+        """
+
+        key = (id(owner), int(req_id))
+        expires = self.limits.snapshot_line_seconds if snapshot else None
+
+        def grant(now: float) -> None:
+            self._owner_names[key[0]] = type(owner).__name__
+            self._lines[key] = now + expires if expires is not None else None
+            self.stats.lines_opened += 1
+            self.stats.lines_peak = max(self.stats.lines_peak, len(self._lines))
+
+        with self._cond:
+            if key in self._lines or self.limits.market_data_lines <= 0 or not block:
+                now = self._clock()
+                self._expire_lines(now)
+                if (
+                    key not in self._lines
+                    and 0 < self.limits.market_data_lines <= len(self._lines)
+                ):
+                    self.stats.lines_overcommitted += 1
+                grant(now)
+                return 0.0
+        timeout = self.limits.line_wait_timeout
+        return self._admit(
+            "lines",
+            priority,
+            self._line_delay,
+            grant,
+            timeout=timeout if timeout > 0 else None,
+        )
+
+    def close_line(self, owner: object, req_id: int) -> None:
+        """Release the market data line held by ``req_id`` of ``owner``."""
+
+        with self._cond:
+            if self._lines.pop((id(owner), int(req_id)), False) is not False:
+                self._cond.notify_all()
+
+    def release_owner(self, owner: object) -> None:
+        """Release every line held by ``owner`` (e.g. after a disconnect)."""
+
+        ident = id(owner)
+        with self._cond:
+            stale = [key for key in self._lines if key[0] == ident]
+            for key in stale:
+                del self._lines[key]
+            self._owner_names.pop(ident, None)
+            if stale:
+                self._cond.notify_all()
+
+    def acquire_historical(
+        self,
+        key: Hashable,
+        contract_key: Hashable | None = None,
+        *,
+        priority: Priority | None = None,
+        block: bool = True,
+    ) -> float:
+        """Wait until a historical data request for ``key`` is allowed.
+
+        ``key`` identifies identical requests (contract, end time, duration,
+        bar size, what to show); ``contract_key`` groups requests for the same
+        contract and exchange.
+        """
+
+        contract_key = key if contract_key is None else contract_key
+
+        def grant(now: float) -> None:
+            self._hist_times.append(now)
+            self._hist_identical[key] = now
+            self._hist_contract.setdefault(contract_key, deque()).append(now)
+            self.stats.historical += 1
+
+        def delay(now: float) -> float:
+            return self._historical_delay(now, key, contract_key)
+
+        if not block:
+            with self._cond:
+                grant(self._clock())
+            return 0.0
+        return self._admit("historical", priority, delay, grant)
+
+    def report_violation(self, code: int) -> None:
+        """Back off after IB rejected a request with a pacing error."""
+
+        kind = PACING_ERROR_CODES.get(int(code))
+        if kind is None:
+            return
+        with self._cond:
+            self.stats.violations[kind] = self.stats.violations.get(kind, 0) + 1
+            backoff = self.limits.violation_backoff
+            if kind == "historical":
+                backoff = max(backoff, self.limits.historical_identical_interval)
+            if kind == "messages":
+                self._tokens = 0.0
+            self._paused_until[kind] = self._clock() + backoff
+            self._cond.notify_all()
+        logger.warning(f"[pacing] IB pacing fout {code}; {kind} gepauzeerd voor {backoff:.1f}s")
+
+    def utilization(self) -> dict[str, float]:
+        """Return the fraction (0-1) of each limit currently in use."""
+
+        limits = self.limits
+        with self._cond:
+            now = self._clock()
+            self._refill(now)
+            self._expire_lines(now)
+            self._purge_historical(now)
+            burst = max(limits.message_burst, 1)
+            return {
+                "messages": 1.0 - self._tokens / burst if limits.messages_per_second > 0 else 0.0,
+                "lines": (
+                    len(self._lines) / limits.market_data_lines
+                    if limits.market_data_lines > 0
+                    else 0.0
+                ),
+                "historical": (
+                    len(self._hist_times) / limits.historical_requests
+                    if limits.historical_requests > 0
+                    else 0.0
+                ),
+            }
+
+    def active_lines(self) -> int:
+        with self._cond:
+            self._expire_lines(self._clock())
+            return len(self._lines)
+
+    def waiting(self) -> dict[str, int]:
+        with self._cond:
+            return {name: len(queue) for name, queue in self._queues.items()}
+
+    def line_holders(self) -> dict[str, dict[str, int]]:
+        """Return the open lines per owner class, split in streams and snapshots."""
+
+        with self._cond:
+            self._expire_lines(self._clock())
+            return self._line_holders()
+
+    # ------------------------------------------------------------------
+    # Internal helpers (called with ``self._cond`` held)
+    # ------------------------------------------------------------------
+    def _admit(
+        self,
+        resource: str,
+        priority: Priority | None,
+        delay_fn: Callable[[float], float | None],
+        grant_fn: Callable[[float], None],
+        *,
+        timeout: float | None = None,
+    ) -> float:
+        """Queue for ``resource`` and grant once first in line and ready.
+
+        ``delay_fn`` returns ``0`` when the resource is available, the seconds
+        until it will be, or ``None`` when only a release can free it.  After
+        ``timeout`` seconds the ticket is withdrawn and :class:`PacingTimeout`
+        raised.
+        """
+
+        level = current_priority() if priority is None else Priority(priority)
+        ticket = (int(level), next(self._seq))
+        queue = self._queues[resource]
+        with self._cond:
+            start = self._clock()
+            deadline = start + timeout if timeout is not None else None
+            heapq.heappush(queue, ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    wait: float | None = None
+                    if queue[0] == ticket:
+                        paused = self._paused_until.get(resource, 0.0) - now
+                        wait = paused if paused > 0 else delay_fn(now)
+                        if wait is not None and wait <= 0:
+                            heapq.heappop(queue)
+                            grant_fn(now)
+                            waited = now - start
+                            name = _WAIT_STATS[resource]
+                            setattr(self.stats, name, getattr(self.stats, name) + waited)
+                            self._cond.notify_all()
+                            return waited
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            raise self._timeout(resource, now - start)
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            except BaseException:
+                if ticket in queue:
+                    queue.remove(ticket)
+                    heapq.heapify(queue)
+                    self._cond.notify_all()
+                raise
+
+    def _timeout(self, resource: str, waited: float) -> PacingTimeout:
+        detail = ""
+        if resource == "lines":
+            holders = ", ".join(
+                f"{name}: {counts['stream']} stream / {counts['snapshot']} snapshot"
+                for name, counts in sorted(self._line_holders().items())
+            )
+            detail = f"; {len(self._lines)} lines in gebruik ({holders or 'geen'})"
+        message = f"[pacing] geen {resource} vrij na {waited:.1f}s{detail}"
+        logger.error(message)
+        return PacingTimeout(message)
+
+    def _line_holders(self) -> dict[str, dict[str, int]]:
+        counts: Counter[tuple[str, str]] = Counter(
+            (self._owner_names.get(owner, "?"), "stream" if until is None else "snapshot")
+            for (owner, _req), until in self._lines.items()
+        )
+        holders: dict[str, dict[str, int]] = {}
+        for (name, kind), count in counts.items():
+            holders.setdefault(name, {"stream": 0, "snapshot": 0})[kind] = count
+        return holders
+
+    def _refill(self, now: float) -> None:
+        rate = self.limits.messages_per_second
+        burst = float(max(self.limits.message_burst, 1))
+        elapsed = max(now - self._refilled, 0.0)
+        self._tokens = min(burst, self._tokens + elapsed * rate)
+        self._refilled = now
+
+    def _message_delay(self, now: float) -> float:
+        self._refill(now)
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self.limits.messages_per_second
+
+    def _take_token(self, now: float) -> None:
+        self._tokens -= 1.0
+        self.stats.messages += 1
+
+    def _expire_lines(self, now: float) -> None:
+        expired = [key for key, until in self._lines.items() if until is not None and until <= now]
+        for key in expired:
+            del self._lines[key]
+
+    def _line_delay(self, now: float) -> float | None:
+        self._expire_lines(now)
+        if len(self._lines) < self.limits.market_data_lines:
+            return 0.0
+        expiries = [until for until in self._lines.values() if until is not None]
+        return min(expiries) - now if expiries else None
+
+    def _purge_historical(self, now: float) -> None:
+        limits = self.limits
+        while self._hist_times and now - self._hist_times[0] >= limits.historical_window:
+            self._hist_times.popleft()
+        for key in [
+            k
+            for k, at in self._hist_identical.items()
+            if now - at >= limits.historical_identical_interval
+        ]:
+            del self._hist_identical[key]
+        for key, times in list(self._hist_contract.items()):
+            while times and now - times[0] >= limits.historical_contract_window:
+                times.popleft()
+            if not times:
+                del self._hist_contract[key]
+
+    def _historical_delay(self, now: float, key: Hashable, contract_key: Hashable) -> float:
+        limits = self.limits
+        self._purge_historical(now)
+        delays = [0.0]
+        if 0 < limits.historical_requests <= len(self._hist_times):
+            delays.append(self._hist_times[0] + limits.historical_window - now)
+        last = self._hist_identical.get(key)
+        if last is not None:
+            delays.append(last + limits.historical_identical_interval - now)
+        recent = self._hist_contract.get(contract_key)
+        if recent and 0 < limits.historical_contract_requests <= len(recent):
+            delays.append(recent[0] + limits.historical_contract_window - now)
+        return max(delays)
+
+
+def historical_request_keys(
+    contract: Any, end: str, duration: str, bar_size: str, what: str
+) -> tuple[Hashable, Hashable]:
+    """Return the identical-request and per-contract keys for IB pacing."""
+
+    ident = getattr(contract, "conId", 0) or (
+        getattr(contract, "symbol", ""),
+        getattr(contract, "secType", ""),
+        getattr(contract, "lastTradeDateOrContractMonth", ""),
+        getattr(contract, "strike", 0.0),
+        getattr(contract, "right", ""),
+    )
+    contract_key = (ident, getattr(contract, "exchange", ""), what)
+    return (contract_key, end, duration, bar_size), contract_key
+
+
+_DEFAULT_SCHEDULER: IBPacingScheduler | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_pacing_scheduler() -> IBPacingScheduler:
+    """Return the process wide :class:`IBPacingScheduler`."""
+
+    global _DEFAULT_SCHEDULER
+    with _DEFAULT_LOCK:
+        if _DEFAULT_SCHEDULER is None:
+            _DEFAULT_SCHEDULER = IBPacingScheduler(PacingLimits.from_config())
+        return _DEFAULT_SCHEDULER
+
+
+__all__ = [
+    "IBPacingScheduler",
+    "PACING_ERROR_CODES",
+    "PacingLimits",
+    "PacingStats",
+    "PacingTimeout",
+    "Priority",
+    "current_priority",
+    "get_pacing_scheduler",
+    "historical_request_keys",
+    "pacing_priority",
+]
@@ -17,6 +17,7 @@ from typing import Any, ClassVar, Dict, List, Optional, Tuple
 from tomic.backtest.config import BacktestConfig
 from tomic.backtest.results import IVDataPoint
 from tomic.config import get as cfg_get
+from tomic.infrastructure.timeseries import read_series
 from tomic.logutils import logger
 
 
@@ -276,8 +277,7 @@ class DataLoader:
                 return None
 
             try:
-                with open(iv_path, "r", encoding="utf-8") as f:
-                    raw_data = json.load(f)
+                raw_data = read_series(iv_path)
                 # Cache the raw data
                 DataLoader._raw_data_cache[cache_key] = raw_data
             except Exception as e:
@@ -356,8 +356,7 @@ class DataLoader:
 
         if price_path.exists():
             try:
-                with open(price_path, "r", encoding="utf-8") as f:
-                    raw_data = json.load(f)
+                raw_data = read_series(price_path)
 
                 if isinstance(raw_data, list):
                     for record in raw_data:
@@ -389,8 +388,7 @@ class DataLoader:
 
         if price_path.exists():
             try:
-                with open(price_path, "r", encoding="utf-8") as f:
-                    raw_data = json.load(f)
+                raw_data = read_series(price_path)
 
                 if isinstance(raw_data, list):
                     for record in raw_data:
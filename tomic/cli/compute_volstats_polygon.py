@@ -210,7 +210,11 @@ def main(argv: List[str] | None = None) -> None:
             "hv90": hv90,
             "hv252": hv252,
         }
-        update_json_file(hv_dir / f"{sym}.json", hv_record, ["date"])
+        try:
+            update_json_file(hv_dir / f"{sym}.json", hv_record, ["date"])
+        except ValueError as exc:
+            logger.error(f"⚠️ HV voor {sym} niet opgeslagen: {exc}")
+            continue
 
         if metrics is None:
             logger.info(f"⏭️ {sym} already processed for {date_str}")
@@ -248,7 +252,11 @@ def main(argv: List[str] | None = None) -> None:
             "term_m1_m3": term_m1_m3,
             "skew": skew,
         }
-        update_json_file(summary_dir / f"{sym}.json", summary_record, ["date"])
+        try:
+            update_json_file(summary_dir / f"{sym}.json", summary_record, ["date"])
+        except ValueError as exc:
+            logger.error(f"⚠️ IV summary voor {sym} niet opgeslagen: {exc}")
+            continue
         logger.info(f"Saved vol stats for {sym}")
     logger.success("✅ Volatility stats updated")
 
@@ -20,6 +20,7 @@ except Exception:  # pragma: no cover - fallback when package is missing
     holidays = SimpleNamespace(US=lambda: _NoHolidays(), NYSE=lambda: _NoHolidays())  # type: ignore
 
 from tomic.config import get as cfg_get
+from tomic.infrastructure.series_index import SeriesIndex
 from tomic.infrastructure.storage import load_json
 from tomic.cli.services.vol_helpers import MIN_IV_HISTORY_DAYS
 
@@ -127,6 +128,19 @@ def _series_window(records: object, *, date_key: str = "date") -> SeriesWindow:
     return SeriesWindow(min(dates), max(dates), len(unique_dates))
 
 
+def _indexed_window(directory: Path, symbol: str) -> SeriesWindow:
+    """Return the date range of ``symbol`` without reading its history."""
+
+    entry = SeriesIndex(directory).entry(symbol)
+    if not entry:
+        return SeriesWindow(None, None, 0)
+    start = _parse_date(entry.get("first_date"))
+    end = _parse_date(entry.get("last_date"))
+    if start is None or end is None:
+        return SeriesWindow(None, None, 0)
+    return SeriesWindow(start, end, int(entry.get("count") or 0))
+
+
 def _load_series(path: Path) -> list[dict]:
     data = load_json(path, default_factory=list)
     if isinstance(data, list):
@@ -282,9 +296,8 @@ def _scan_symbol(
     limits: dict[str, int],
     min_gap_trading_days: int = 5,
 ) -> tuple[str, SeriesWindow, SeriesWindow, SeriesWindow, list[date], int, list[str], list[DataGap]]:
-    spot_records = _load_series(spot_dir / f"{symbol}.json")
-    spot_window = _series_window(spot_records)
-    hv_window = _series_window(_load_series(hv_dir / f"{symbol}.json"))
+    spot_window = _indexed_window(spot_dir, symbol)
+    hv_window = _indexed_window(hv_dir, symbol)
     iv_records = _load_series(iv_dir / f"{symbol}.json")
     iv_window = _series_window(iv_records)
     iv_history_count = _count_iv_records_with_atm(iv_records)
@@ -4,12 +4,11 @@ from __future__ import annotations
 
 import csv
 import ftplib
-import io
 import os
 import shutil
 import socket
+import threading
 import time
-import zipfile
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -19,17 +18,11 @@ import yaml
 
 from tomic import config as cfg
 from tomic.cli.common import prompt, prompt_yes_no
-from tomic.cli.services.vol_helpers import (
-    _get_closes,
-    iv_percentile,
-    iv_rank,
-    rolling_hv,
-    get_historical_iv_series,
-)
+from tomic.cli.services.orats_pipeline import iter_orats_days
 from tomic.helpers.json_utils import dump_json
 from tomic.journal.utils import load_json
 from tomic.logutils import logger
-from tomic.utils import _is_third_friday
+from tomic.scripts.recalculate_iv_rank import IVRankEngine
 
 try:
     from tabulate import tabulate
@@ -126,6 +119,14 @@ class OratsBackfillFlow:
         self._download_count = 0
         # Cache directory for persistent ZIP storage
         self.cache_dir = Path(cfg.get("ORATS_CACHE_DIR", "tomic/data/orats_cache")).expanduser()
+        # Pipeline sizing: parallel FTP sessions, parse processes, days per write
+        self.download_workers = max(1, int(cfg.get("ORATS_DOWNLOAD_WORKERS", 2) or 1))
+        self.parse_workers = cfg.get("ORATS_PARSE_WORKERS")
+        self.write_batch_days = max(1, int(cfg.get("ORATS_WRITE_BATCH_DAYS", 20) or 1))
+        # One FTP connection per download thread
+        self._ftp_local = threading.local()
+        self._ftp_sessions: list[ftplib.FTP] = []
+        self._ftp_lock = threading.Lock()
 
     def _connect_ftp(self) -> ftplib.FTP:
         """Connect to ORATS FTP server with timeout.
@@ -276,6 +277,30 @@ class OratsBackfillFlow:
                 self._safe_delete_file(cache_path)
             return None, ftp
 
+    def _fetch_zip(self, date: datetime) -> Path | None:
+        """Return the ZIP for ``date`` using this thread's FTP connection.
+
+        Called from the download threads of the pipeline; every thread
+        keeps its own connection, closed by :meth:`_close_ftp_sessions`.
+        """
+        ftp = getattr(self._ftp_local, "ftp", None)
+        zip_path, new_ftp = self._get_cached_or_download(ftp, date)
+        if new_ftp is not ftp:
+            self._ftp_local.ftp = new_ftp
+            if new_ftp is not None:
+                with self._ftp_lock:
+                    self._ftp_sessions.append(new_ftp)
+        return zip_path
+
+    def _close_ftp_sessions(self) -> None:
+        with self._ftp_lock:
+            sessions, self._ftp_sessions = self._ftp_sessions, []
+        for ftp in sessions:
+            try:
+                ftp.quit()
+            except Exception:
+                pass  # FTP connection may already be closed
+
     def _get_existing_dates_for_symbol(self, symbol: str) -> set[str]:
         """Get set of dates that already have data for a symbol.
 
@@ -338,465 +363,6 @@ class OratsBackfillFlow:
 
         return dates_to_process, missing_by_symbol
 
-    def _parse_orats_csv(
-        self, zip_path: Path, requested_symbols: set[str]
-    ) -> dict[str, list[OratsRecord]]:
-        """Parse ORATS ZIP file and extract metrics per symbol.
-
-        Returns dict mapping symbol -> list of OratsRecord objects.
-        """
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zf:
-                csv_files = [name for name in zf.namelist() if name.endswith(".csv")]
-                if not csv_files:
-                    logger.warning(f"Geen CSV gevonden in {zip_path.name}")
-                    return {}
-
-                csv_name = csv_files[0]
-                with zf.open(csv_name) as csv_file:
-                    # Detect delimiter by reading a sample
-                    text_stream = io.TextIOWrapper(csv_file, encoding="utf-8")
-                    sample = text_stream.read(10000)
-                    text_stream.seek(0)
-
-                    # Try to detect delimiter (ORATS may use comma or tab)
-                    detected_delimiter = ","  # Default to comma
-                    for test_delimiter in [',', '\t', ';', '|']:
-                        lines = sample.split('\n')[:5]
-                        if lines:
-                            header_line = lines[0]
-                            num_delimiters = header_line.count(test_delimiter)
-                            # ORATS should have 30+ columns
-                            if num_delimiters > 20:
-                                detected_delimiter = test_delimiter
-                                logger.info(f"Detected CSV delimiter: {repr(test_delimiter)} ({num_delimiters + 1} columns)")
-                                break
-
-                    reader = csv.DictReader(text_stream, delimiter=detected_delimiter)
-
-                    # Group rows by ticker
-                    symbol_rows: dict[str, list[dict[str, str]]] = {}
-                    for row in reader:
-                        ticker = row.get("ticker", "").strip().upper()
-                        if ticker and ticker in requested_symbols:
-                            if ticker not in symbol_rows:
-                                symbol_rows[ticker] = []
-                            symbol_rows[ticker].append(row)
-
-                    # Calculate metrics for each symbol
-                    results: dict[str, list[OratsRecord]] = {}
-                    for ticker, rows in symbol_rows.items():
-                        record = self._calculate_metrics(ticker, rows)
-                        if record:
-                            results[ticker] = [record]
-
-                    return results
-
-        except zipfile.BadZipFile:
-            logger.error(f"Corrupt ZIP bestand: {zip_path.name}")
-            return {}
-        except Exception as exc:
-            logger.error(f"CSV parse fout in {zip_path.name}: {exc}")
-            return {}
-
-    def _calculate_metrics(
-        self, ticker: str, rows: list[dict[str, str]]
-    ) -> OratsRecord | None:
-        """Calculate ATM IV, term structure, and skew from ORATS rows.
-
-        ALIGNED WITH POLYGON METHODOLOGY (polygon_iv.py):
-        - Expiration selection: Only Third Friday expirations (13-48 DTE for front month,
-          fallback to nearest expiration with DTE >= 7 if none in standard range)
-        - Deduplication: Remove duplicate (strike, type) combinations
-        - ATM IV: Single ATM call from front month
-        - Term structure: M1-M2 and M1-M3 using single ATM calls per month
-        - Skew: Delta ±0.25 from front month only (not all expirations)
-        - IV Rank/Percentile: Based on 30-day rolling HV
-        """
-        if not rows:
-            return None
-
-        # Get trade date from first row
-        trade_date = rows[0].get("trade_date", "")
-        if not trade_date:
-            logger.warning(f"Geen trade_date gevonden voor {ticker}")
-            return None
-
-        # Parse date to YYYY-MM-DD - try multiple formats
-        parsed_date = None
-        trade_dt = None
-        for date_format in ["%Y%m%d", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d"]:
-            try:
-                trade_dt = datetime.strptime(trade_date, date_format)
-                parsed_date = trade_dt.strftime("%Y-%m-%d")
-                break
-            except ValueError:
-                continue
-
-        if not parsed_date or not trade_dt:
-            logger.warning(f"Ongeldige datum voor {ticker}: {trade_date}")
-            return None
-
-        # Get spot price from first row
-        try:
-            spot_price = float(rows[0].get("stkPx", 0))
-        except (ValueError, TypeError):
-            logger.warning(f"Geen geldige spot prijs voor {ticker}")
-            return None
-
-        if spot_price <= 0:
-            logger.warning(f"Ongeldige spot prijs voor {ticker}: {spot_price}")
-            return None
-
-        # ================================================================
-        # STEP 1: Group rows by expiration and calculate DTE
-        # ================================================================
-        exp_groups: dict[str, list[dict[str, str]]] = {}
-        exp_dte: dict[str, float] = {}
-
-        for row in rows:
-            exp_date = row.get("expirDate", "").strip()
-            if not exp_date:
-                continue
-
-            # Parse expiration date
-            exp_dt = None
-            for date_format in ["%Y%m%d", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d"]:
-                try:
-                    exp_dt = datetime.strptime(exp_date, date_format)
-                    break
-                except ValueError:
-                    continue
-
-            if not exp_dt:
-                continue
-
-            # Calculate DTE
-            dte = (exp_dt - trade_dt).days
-            if dte < 0:  # Skip expired options
-                continue
-
-            if exp_date not in exp_groups:
-                exp_groups[exp_date] = []
-                exp_dte[exp_date] = dte
-
-            exp_groups[exp_date].append(row)
-
-        if not exp_groups:
-            logger.warning(f"Geen geldige expirations voor {ticker}")
-            return None
-
-        # ================================================================
-        # STEP 1.5: Filter to only Third Friday expirations (matching Polygon)
-        # ================================================================
-        third_friday_groups = {}
-        third_friday_dte = {}
-
-        for exp_date, rows in exp_groups.items():
-            # Parse expiration date to check if it's a third Friday
-            for date_format in ["%Y%m%d", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d"]:
-                try:
-                    exp_dt = datetime.strptime(exp_date, date_format).date()
-                    if _is_third_friday(exp_dt):
-                        third_friday_groups[exp_date] = rows
-                        third_friday_dte[exp_date] = exp_dte[exp_date]
-                    break
-                except ValueError:
-                    continue
-
-        if not third_friday_groups:
-            logger.warning(
-                f"Geen Third Friday expirations voor {ticker} - alleen weeklies beschikbaar"
-            )
-            return None
-
-        logger.info(
-            f"Filtered {len(exp_groups)} expirations to {len(third_friday_groups)} Third Fridays"
-        )
-
-        # Use only third Friday expirations from here on
-        exp_groups = third_friday_groups
-        exp_dte = third_friday_dte
-
-        # ================================================================
-        # STEP 1.75: Deduplicate rows for each expiration (matching Polygon)
-        # ================================================================
-        for exp_date in exp_groups:
-            original_count = len(exp_groups[exp_date])
-            exp_groups[exp_date] = self._deduplicate_rows(exp_groups[exp_date])
-            dedup_count = len(exp_groups[exp_date])
-            if original_count != dedup_count:
-                logger.info(
-                    f"Deduplicated {exp_date}: {original_count} -> {dedup_count} rows"
-                )
-
-        # ================================================================
-        # STEP 2: Select front month (13-48 DTE, like Polygon)
-        # ================================================================
-        front_month = None
-        for exp_date in sorted(exp_groups.keys(), key=lambda x: exp_dte[x]):
-            dte = exp_dte[exp_date]
-            if 13 <= dte <= 48:
-                front_month = exp_date
-                break
-
-        # Fallback: if no expiration in 13-48 DTE range, use nearest with DTE >= 7
-        if not front_month:
-            sorted_by_dte = sorted(exp_groups.keys(), key=lambda x: exp_dte[x])
-            for exp_date in sorted_by_dte:
-                dte = exp_dte[exp_date]
-                if dte >= 7:  # Minimum 7 days to avoid very short-term noise
-                    front_month = exp_date
-                    logger.info(
-                        f"Fallback: using {exp_date} ({dte} DTE) for {ticker} - "
-                        f"geen expiration in standaard 13-48 DTE range"
-                    )
-                    break
-
-        if not front_month:
-            logger.warning(f"Geen bruikbare expiration gevonden voor {ticker}")
-            return None
-
-        # ================================================================
-        # STEP 3: Select M2 and M3 (next two monthly expirations)
-        # ================================================================
-        sorted_exps = sorted(exp_groups.keys(), key=lambda x: exp_dte[x])
-        front_idx = sorted_exps.index(front_month)
-
-        month2 = sorted_exps[front_idx + 1] if front_idx + 1 < len(sorted_exps) else None
-        month3 = sorted_exps[front_idx + 2] if front_idx + 2 < len(sorted_exps) else None
-
-        # ================================================================
-        # STEP 4: Extract ATM call from front month (like Polygon)
-        # ================================================================
-        atm_iv = self._extract_atm_call(exp_groups[front_month], spot_price)
-
-        # ================================================================
-        # STEP 5: Extract ATM calls from M2 and M3 for term structure
-        # ================================================================
-        iv_month2 = None
-        iv_month3 = None
-
-        if month2:
-            iv_month2 = self._extract_atm_call(exp_groups[month2], spot_price)
-
-        if month3:
-            iv_month3 = self._extract_atm_call(exp_groups[month3], spot_price)
-
-        # Term structure: M1-M2 and M1-M3 (matching Polygon formula)
-        term_m1_m2 = None
-        term_m1_m3 = None
-
-        if atm_iv is not None and iv_month2 is not None:
-            term_m1_m2 = round((atm_iv - iv_month2) * 100, 2)
-
-        if atm_iv is not None and iv_month3 is not None:
-            term_m1_m3 = round((atm_iv - iv_month3) * 100, 2)
-
-        # ================================================================
-        # STEP 6: Extract skew from FRONT MONTH ONLY (matching Polygon)
-        # ================================================================
-        skew = self._extract_skew(exp_groups[front_month], spot_price)
-
-        # ================================================================
-        # STEP 7: Calculate IV Rank and Percentile using historical IV
-        # ================================================================
-        iv_rank_value = None
-        iv_percentile_value = None
-
-        if atm_iv is not None:
-            try:
-                # Use historical IV series for rank/percentile (not HV)
-                # parsed_date is already a string in YYYY-MM-DD format
-                iv_series = get_historical_iv_series(ticker, exclude_date=parsed_date)
-                if iv_series:
-                    # Scale IV to percentage for comparison
-                    scaled_iv = atm_iv * 100
-                    iv_rank_value = iv_rank(scaled_iv, iv_series)
-                    iv_percentile_value = iv_percentile(scaled_iv, iv_series)
-
-                    # Convert to 0-100 scale (iv_rank and iv_percentile return 0-1)
-                    if isinstance(iv_rank_value, (int, float)):
-                        iv_rank_value *= 100
-                    if isinstance(iv_percentile_value, (int, float)):
-                        iv_percentile_value *= 100
-                else:
-                    logger.debug(f"Insufficient IV history for {ticker} on {parsed_date}")
-            except Exception as exc:
-                logger.warning(f"IV rank/percentile berekening mislukt voor {ticker}: {exc}")
-
-        return OratsRecord(
-            ticker=ticker,
-            date=parsed_date,
-            atm_iv=atm_iv,
-            term_m1_m2=term_m1_m2,
-            term_m1_m3=term_m1_m3,
-            skew=skew,
-            iv_rank=iv_rank_value,
-            iv_percentile=iv_percentile_value,
-        )
-
-    def _extract_atm_call(
-        self, rows: list[dict[str, str]], spot_price: float
-    ) -> float | None:
-        """Extract single ATM call IV (closest to spot, matching Polygon).
-
-        Follows IVExtractor.extract_atm_call from polygon_iv.py:
-        - Only call options
-        - Find strike closest to spot
-        - Filter out extreme deltas (< 0.05 or > 0.95)
-        """
-        atm_iv = None
-        atm_err = float("inf")
-
-        for row in rows:
-            try:
-                strike = float(row.get("strike", 0))
-                c_mid_iv = row.get("cMidIv", "").strip()
-                c_delta = row.get("cDelta", "").strip()
-
-                if not c_mid_iv or c_mid_iv == "null":
-                    continue
-
-                iv_val = float(c_mid_iv)
-
-                # Delta filtering (matching Polygon)
-                if c_delta and c_delta != "null":
-                    delta_val = float(c_delta)
-                    if delta_val < 0.05 or delta_val > 0.95:
-                        continue
-
-                # Find closest strike to spot
-                diff = abs(strike - spot_price)
-                if diff < atm_err:
-                    atm_err = diff
-                    atm_iv = iv_val
-
-            except (ValueError, TypeError):
-                continue
-
-        return atm_iv
-
-    def _extract_skew(
-        self, rows: list[dict[str, str]], spot_price: float
-    ) -> float | None:
-        """Extract skew from single expiration (matching Polygon).
-
-        Follows IVExtractor.extract_skew from polygon_iv.py:
-        - Primary: Delta-based (call δ ≈ 0.25, put δ ≈ -0.25)
-        - Fallback: Strike-based (call 115%, put 85%)
-        - Formula: (put_iv - call_iv) * 100
-        """
-        call_iv: float | None = None
-        put_iv: float | None = None
-        call_delta_err = float("inf")
-        put_delta_err = float("inf")
-        call_strike_err = float("inf")
-        put_strike_err = float("inf")
-
-        target_call = spot_price * 1.15
-        target_put = spot_price * 0.85
-
-        for row in rows:
-            try:
-                strike = float(row.get("strike", 0))
-                p_mid_iv = row.get("pMidIv", "").strip()
-                c_mid_iv = row.get("cMidIv", "").strip()
-                p_delta = row.get("pDelta", "").strip()
-                c_delta = row.get("cDelta", "").strip()
-
-                # Delta-based selection (primary method)
-                if p_delta and p_delta != "null" and p_mid_iv and p_mid_iv != "null":
-                    try:
-                        delta_val = float(p_delta)
-                        iv_val = float(p_mid_iv)
-                        # Target delta around -0.25
-                        err = abs(delta_val + 0.25)
-                        if err < put_delta_err:
-                            put_delta_err = err
-                            put_iv = iv_val
-                    except ValueError:
-                        pass
-
-                if c_delta and c_delta != "null" and c_mid_iv and c_mid_iv != "null":
-                    try:
-                        delta_val = float(c_delta)
-                        iv_val = float(c_mid_iv)
-                        # Target delta around +0.25
-                        err = abs(delta_val - 0.25)
-                        if err < call_delta_err:
-                            call_delta_err = err
-                            call_iv = iv_val
-                    except ValueError:
-                        pass
-
-                # Strike-based fallback
-                if p_mid_iv and p_mid_iv != "null":
-                    try:
-                        iv_val = float(p_mid_iv)
-                        diff = abs(strike - target_put)
-                        if diff < put_strike_err:
-                            put_strike_err = diff
-                            # Only use fallback if no delta-based selection
-                            if put_delta_err == float("inf"):
-                                put_iv = iv_val
-                    except ValueError:
-                        pass
-
-                if c_mid_iv and c_mid_iv != "null":
-                    try:
-                        iv_val = float(c_mid_iv)
-                        diff = abs(strike - target_call)
-                        if diff < call_strike_err:
-                            call_strike_err = diff
-                            # Only use fallback if no delta-based selection
-                            if call_delta_err == float("inf"):
-                                call_iv = iv_val
-                    except ValueError:
-                        pass
-
-            except (ValueError, TypeError):
-                continue
-
-        if call_iv is not None and put_iv is not None:
-            return round((put_iv - call_iv) * 100, 2)
-
-        return None
-
-    def _deduplicate_rows(self, rows: list[dict[str, str]]) -> list[dict[str, str]]:
-        """Deduplicate rows by (strike, option_type) combination.
-
-        When multiple rows exist for the same strike and type, keep the last one
-        in the CSV (simulating Polygon's deduplication by latest timestamp).
-
-        This matches Polygon's deduplication logic in polygon_iv.py:389-463.
-        """
-        seen: dict[tuple[float, str], dict[str, str]] = {}
-
-        for row in rows:
-            try:
-                strike = float(row.get("strike", 0))
-
-                # Determine option type based on which IV fields are populated
-                c_mid_iv = row.get("cMidIv", "").strip()
-                p_mid_iv = row.get("pMidIv", "").strip()
-
-                # Create entries for both call and put if both exist
-                if c_mid_iv and c_mid_iv != "null":
-                    key = (strike, "call")
-                    seen[key] = row
-
-                if p_mid_iv and p_mid_iv != "null":
-                    key = (strike, "put")
-                    seen[key] = row
-
-            except (ValueError, TypeError):
-                # Skip rows with invalid strike prices
-                continue
-
-        # Return deduplicated rows
-        return list(seen.values())
-
     def _merge_records(
         self, symbol: str, new_records: list[OratsRecord]
     ) -> tuple[list[dict[str, Any]], Path | None]:
@@ -866,6 +432,58 @@ class OratsBackfillFlow:
 
         return merged_list, None
 
+    def _records_with_rank(
+        self, symbol: str, metrics: list[dict[str, Any]]
+    ) -> list[OratsRecord]:
+        """Build records for a batch of dates, with IV rank and percentile.
+
+        Every date is ranked against the stored history plus the rest of
+        the batch, excluding the date itself.
+        """
+        summary_dir = Path(cfg.get("IV_SUMMARY_DIR", "tomic/data/iv_daily_summary")).expanduser()
+        existing = load_json(summary_dir / f"{symbol}.json")
+        if not isinstance(existing, list):
+            existing = []
+
+        series: dict[str, Any] = {}
+        for record in existing:
+            if isinstance(record, dict) and "date" in record:
+                series[str(record["date"])] = record.get("atm_iv")
+        for item in metrics:
+            if item["atm_iv"] is not None:
+                series[item["date"]] = item["atm_iv"]
+        engine = IVRankEngine({"date": d, "atm_iv": iv} for d, iv in series.items())
+
+        records = []
+        for item in metrics:
+            rank = percentile = None
+            if item["atm_iv"] is not None:
+                rank, percentile = engine.rank_percentile(item["date"], item["atm_iv"] * 100)
+            records.append(
+                OratsRecord(
+                    ticker=symbol,
+                    date=item["date"],
+                    atm_iv=item["atm_iv"],
+                    term_m1_m2=item["term_m1_m2"],
+                    term_m1_m3=item["term_m1_m3"],
+                    skew=item["skew"],
+                    iv_rank=rank,
+                    iv_percentile=percentile,
+                )
+            )
+        return records
+
+    def _write_batches(
+        self, pending: dict[str, list[dict[str, Any]]], processed_symbols: set[str]
+    ) -> None:
+        """Merge the collected dates of every symbol in one write per symbol."""
+        for symbol in sorted(pending):
+            records = self._records_with_rank(symbol, pending[symbol])
+            merged_records, _ = self._merge_records(symbol, records)
+            processed_symbols.add(symbol)
+            print(f"  ✓ {symbol}: {len(records)} dagen bijgewerkt, {len(merged_records)} totaal records")
+        pending.clear()
+
     def _generate_validation_report(self) -> Path:
         """Generate CSV validation report with old vs new comparisons."""
         logs_dir = Path("tomic/logs").expanduser()
@@ -1068,46 +686,53 @@ class OratsBackfillFlow:
             print("Geannuleerd.")
             return
 
-        # FTP connection will be created lazily when needed (if cache misses)
-        ftp: ftplib.FTP | None = None
+        # Symbols that still need each date
+        symbols_by_date: dict[datetime, list[str]] = {}
+        for date in dates_to_process:
+            date_key = date.strftime("%Y-%m-%d")
+            needed = [
+                s for s in symbols
+                if s in missing_by_symbol and date_key in missing_by_symbol[s]
+            ]
+            if needed:
+                symbols_by_date[date] = needed
+        cached_dates = {d for d in symbols_by_date if self._get_cache_path(d).exists()}
 
         processed_symbols: set[str] = set()
         failed_downloads = 0
         missing_symbols = 0
         cache_hits = 0
 
+        # Metrics per symbol, written once every ``write_batch_days`` days
+        pending: dict[str, list[dict[str, Any]]] = {}
+        batch_days = 0
+
+        # Downloads run ahead on their own FTP connections (created lazily on
+        # cache misses) while earlier days are parsed in worker processes
+        days = iter_orats_days(
+            list(symbols_by_date),
+            self._fetch_zip,
+            symbols_by_date.__getitem__,
+            download_workers=self.download_workers,
+            parse_workers=self.parse_workers,
+        )
+
         try:
-            for idx, date in enumerate(dates_to_process, 1):
+            for idx, (date, zip_path, day_metrics) in enumerate(days, 1):
                 date_str = date.strftime("%Y%m%d")
-                date_key = date.strftime("%Y-%m-%d")
-
-                # Get symbols that need this date
-                symbols_needing_date = [
-                    s for s in symbols
-                    if s in missing_by_symbol and date_key in missing_by_symbol[s]
-                ]
-
-                if not symbols_needing_date:
-                    continue
+                symbols_for_date = set(symbols_by_date[date])
 
-                print(f"\n[{idx}/{len(dates_to_process)}] {date.strftime('%d/%m/%Y')} ({date_str}) - {len(symbols_needing_date)} symbols")
-
-                # Get from cache or download
-                zip_path, ftp = self._get_cached_or_download(ftp, date)
+                print(f"\n[{idx}/{len(symbols_by_date)}] {date.strftime('%d/%m/%Y')} ({date_str}) - {len(symbols_for_date)} symbols")
 
                 if zip_path is None:
                     failed_downloads += 1
                     logger.warning(f"Kon ZIP niet ophalen voor {date_str}")
                     continue
 
-                if self._get_cache_path(date).exists():
+                if date in cached_dates:
                     cache_hits += 1
 
-                # Parse CSV - only request symbols that need this date
-                symbols_for_date = set(symbols_needing_date)
-                day_records = self._parse_orats_csv(zip_path, symbols_for_date)
-
-                if not day_records:
+                if not day_metrics:
                     # Show which symbols were not found
                     not_found = sorted(symbols_for_date)
                     if len(not_found) <= 5:
@@ -1120,11 +745,11 @@ class OratsBackfillFlow:
                         f"(2) geen optie data beschikbaar (lage volumes), "
                         f"(3) geen Third Friday expirations"
                     )
-                    missing_symbols += len(symbols_needing_date)
+                    missing_symbols += len(symbols_for_date)
                     continue
 
                 # Report symbols that were requested but not found
-                found_symbols = set(day_records.keys())
+                found_symbols = set(day_metrics.keys())
                 not_found_symbols = symbols_for_date - found_symbols
                 if not_found_symbols:
                     if len(not_found_symbols) <= 3:
@@ -1134,20 +759,22 @@ class OratsBackfillFlow:
                         nf_str = f"{', '.join(nf_sorted[:3])}... (+{len(not_found_symbols) - 3})"
                     print(f"  ⚠️  Niet gevonden: {nf_str} (geen optie data beschikbaar)")
 
-                # Update JSON files per symbol
-                for symbol, records in day_records.items():
-                    merged_records, backup_path = self._merge_records(symbol, records)
-                    processed_symbols.add(symbol)
-                    print(f"  ✓ {symbol}: {len(merged_records)} totaal records")
+                for symbol, metrics in day_metrics.items():
+                    pending.setdefault(symbol, []).append(metrics)
+                print(f"  ✓ {len(found_symbols)} symbols berekend")
 
                 # ZIP files blijven in cache - niet verwijderen!
 
+                batch_days += 1
+                if batch_days >= self.write_batch_days:
+                    self._write_batches(pending, processed_symbols)
+                    batch_days = 0
+
         finally:
-            if ftp is not None:
-                try:
-                    ftp.quit()
-                except Exception:
-                    pass  # FTP connection may already be closed
+            days.close()
+            # Also keep the days that completed before an interruption
+            self._write_batches(pending, processed_symbols)
+            self._close_ftp_sessions()
 
         # Generate validation report
         if self.validation_entries:
@@ -22,6 +22,7 @@ from tomic.helpers.price_utils import ClosePriceSnapshot
 from tomic.logutils import logger
 from tomic.reporting import EvaluationSummary, format_reject_reasons
 from tomic.helpers.dateutils import parse_date
+from tomic.helpers.stage_profiler import StageProfiler
 from tomic.services.chain_processing import (
     ChainEvaluationConfig,
     ChainPreparationConfig,
@@ -119,6 +120,33 @@ def _print_evaluation_overview(
     print(f"Top reason for reject: {format_reject_reasons(summary)}")
 
 
+def _print_stage_profile(
+    profile: StageProfiler | None,
+    tabulate_fn: Callable[..., str],
+    *,
+    export_name: str | None = None,
+) -> None:
+    if not profile:
+        return
+    print(f"Doorlooptijd per stap ({profile.total_s * 1000:.0f} ms):")
+    print(
+        tabulate_fn(
+            profile.rows(),
+            headers=["Stap", "Aantal", "ms", "%", "Blokken"],
+            tablefmt="github",
+            colalign=("left", "right", "right", "right", "right"),
+        )
+    )
+    if export_name and cfg.get("PIPELINE_PROFILE_EXPORT", False):
+        target = Path(cfg.get("EXPORT_DIR", "exports")) / export_name
+        try:
+            profile.to_json(target)
+        except OSError as exc:
+            logger.warning(f"Kon profiel niet opslaan naar {target}: {exc}")
+        else:
+            print(f"Profiel opgeslagen in {target}")
+
+
 def process_chain(
     session: ControlPanelSession,
     services: ControlPanelServices,
@@ -208,6 +236,11 @@ def process_chain(
                 evaluation.context.spot_price,
                 evaluation_summary,
             )
+    _print_stage_profile(
+        getattr(evaluation, "profile", None),
+        tabulate_fn,
+        export_name=f"pipeline_profile_{symbol}_{strategy_name}.json",
+    )
 
     build_rejection_summary_fn(
         session,
@@ -596,6 +629,7 @@ def run_market_scan(
         spot_from_chain=spot_from_chain_fn,
         atr_loader=latest_atr,
         refresh_snapshot=portfolio_services.refresh_proposal_from_ib,
+        refresh_snapshots=portfolio_services.refresh_proposals_from_ib,
         apply_interpolation=use_interpolation,
     )
 
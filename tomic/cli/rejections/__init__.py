@@ -1,9 +1,15 @@
 """Rejection handling utilities for the TOMIC control panel."""
 
-from .handlers import build_rejection_summary, refresh_rejections, show_rejection_detail
+from .handlers import (
+    build_rejection_summary,
+    refresh_rejections,
+    show_recent_evaluations,
+    show_rejection_detail,
+)
 
 __all__ = [
     "build_rejection_summary",
     "refresh_rejections",
+    "show_recent_evaluations",
     "show_rejection_detail",
 ]
@@ -7,7 +7,12 @@ from typing import Any, Callable, Iterable, Mapping, MutableMapping, Sequence
 from tomic.cli.common import prompt, prompt_yes_no
 from tomic.cli.controlpanel_session import ControlPanelSession
 from tomic.cli.app_services import ControlPanelServices
-from tomic.logutils import logger
+from tomic.logutils import (
+    ComboEvaluation,
+    combo_recorder,
+    format_combo_evaluation,
+    logger,
+)
 from tomic.reporting import (
     ReasonAggregator,
     build_rejection_table as _reporting_build_rejection_table,
@@ -109,6 +114,41 @@ def _build_rejection_table(entries: Iterable[Mapping[str, Any]]):
     return _reporting_build_rejection_table(entries)
 
 
+def _render_entry(entry: Mapping[str, Any]) -> str:
+    legs = entry.get("legs")
+    if not isinstance(legs, Sequence) or isinstance(legs, (str, bytes)):
+        legs = None
+    meta = entry.get("meta")
+    return format_combo_evaluation(
+        ComboEvaluation(
+            strategy=str(entry.get("strategy") or "—"),
+            desc=str(entry.get("description") or "—"),
+            metrics=dict(entry.get("metrics") or {}),
+            result=str(entry.get("status") or "—"),
+            reason=entry.get("reason") or entry.get("raw_reason"),
+            legs=list(legs) if legs else None,
+            extra=dict(meta) if isinstance(meta, Mapping) else None,
+        )
+    )
+
+
+def show_recent_evaluations(
+    strategy: str | None = None,
+    *,
+    limit: int = 25,
+) -> None:
+    """Print the most recent buffered combo evaluations."""
+
+    items = combo_recorder.recent()
+    if strategy:
+        items = [item for item in items if item.strategy == strategy]
+    if not items:
+        print("Geen recente evaluaties beschikbaar.")
+        return
+    for item in items[-limit:]:
+        print(format_combo_evaluation(item))
+
+
 def show_rejection_detail(
     session: ControlPanelSession,
     entry: Mapping[str, Any],
@@ -141,6 +181,7 @@ def show_rejection_detail(
     print(f"Reden: {reason_label_text}")
     if note and note != reason_label_text:
         print(f"Detail: {note}")
+    print(f"Log: {_render_entry(entry)}")
 
     metrics = entry.get("metrics") or {}
     if metrics:
@@ -228,6 +269,7 @@ def show_rejection_detail(
 
     print("\nActies:")
     print("1. Haal orderinformatie van IB op")
+    print("2. Toon recente evaluaties voor deze strategie")
     while True:
         selection = prompt_fn("Kies actie (0 om terug): ")
         if selection in {"", "0"}:
@@ -239,6 +281,8 @@ def show_rejection_detail(
                 symbol_hint,
                 show_proposal_details=show_proposal_details,
             )
+        elif selection == "2":
+            show_recent_evaluations(entry.get("strategy"))
         else:
             print("❌ Ongeldige keuze")
 
@@ -0,0 +1,479 @@
+"""Streaming stages for the ORATS strikes backfill.
+
+The backfill used to handle one trading day at a time: download the ZIP,
+turn every CSV row of the whole market into a dict, compute the metrics
+and rewrite the summary files, so the network sat idle while Python
+parsed.  :func:`iter_orats_days` overlaps the stages instead.  Downloads
+run ahead on a few threads, each finished ZIP is decompressed and parsed
+in a worker process and the caller receives the metrics in date order, so
+it can batch its writes per symbol.  At most ``prefetch`` days are in
+flight at any time.
+
+Parsing only splits the rows of the requested tickers and keeps them as
+columns (:class:`TickerChain`).  :func:`chain_metrics` selects the ATM,
+skew and term structure contracts with array operations (NumPy when it is
+installed), following the Polygon methodology: third Friday expirations
+only, the front month at 13-48 DTE (else the nearest at 7 DTE or more),
+the ATM call per month and the ±0.25 delta put/call skew of the front
+month.  Values that are empty, ``null`` or not numeric count as missing.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import math
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - numpy missing
+    np = None  # type: ignore
+
+from tomic.helpers.numeric import has_numpy
+from tomic.logutils import logger
+from tomic.utils import _is_third_friday
+
+DATE_FORMATS = ("%Y%m%d", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d")
+
+#: Front month window in days to expiration; fallback is the first
+#: expiration with at least ``FRONT_MONTH_MIN_DTE`` days.
+FRONT_MONTH_DTE = (13, 48)
+FRONT_MONTH_MIN_DTE = 7
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(text: str) -> datetime | None:
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _to_float(text: str) -> float:
+    text = text.strip()
+    if not text or text == "null":
+        return math.nan
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+@dataclass
+class TickerChain:
+    """Option rows of one ticker on one trade date, stored per column.
+
+    ``trade_date`` and ``spot`` are the raw values of the first row.
+    """
+
+    ticker: str
+    trade_date: str
+    spot: str
+    expiry: list[str] = field(default_factory=list)
+    strike: list[float] = field(default_factory=list)
+    call_iv: list[float] = field(default_factory=list)
+    put_iv: list[float] = field(default_factory=list)
+    call_delta: list[float] = field(default_factory=list)
+    put_delta: list[float] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.strike)
+
+
+def detect_delimiter(header: str) -> str:
+    """Return the delimiter of an ORATS header line (30+ columns)."""
+
+    for delimiter in (",", "\t", ";", "|"):
+        if header.count(delimiter) > 20:
+            return delimiter
+    return ","
+
+
+def read_orats_zip(zip_path: str | Path, symbols: Iterable[str]) -> dict[str, TickerChain]:
+    """Return the option rows of ``symbols`` in an ORATS strikes ZIP.
+
+    Rows of other tickers are skipped before they are split into fields
+    when the ticker is the first column, as in the ORATS files.
+    """
+
+    zip_path = Path(zip_path)
+    wanted = {s.strip().upper() for s in symbols}
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        csv_files = [name for name in zf.namelist() if name.endswith(".csv")]
+        if not csv_files:
+            logger.warning(f"Geen CSV gevonden in {zip_path.name}")
+            return {}
+        with zf.open(csv_files[0]) as raw:
+            stream = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            header_line = stream.readline()
+            delimiter = detect_delimiter(header_line)
+            header = next(csv.reader([header_line], delimiter=delimiter), [])
+            columns = {name.strip(): idx for idx, name in enumerate(header)}
+            if "ticker" not in columns:
+                logger.warning(f"Geen ticker kolom in {zip_path.name}")
+                return {}
+            return _collect_chains(stream, delimiter, columns, wanted)
+
+
+def _collect_chains(
+    lines: Iterable[str],
+    delimiter: str,
+    columns: dict[str, int],
+    wanted: set[str],
+) -> dict[str, TickerChain]:
+    ticker_idx = columns["ticker"]
+    if ticker_idx == 0:
+        lines = (
+            line
+            for line in lines
+            if line.split(delimiter, 1)[0].strip().strip('"').upper() in wanted
+        )
+
+    def column(name: str) -> Callable[[list[str]], str]:
+        idx = columns.get(name)
+        if idx is None:
+            return lambda row: ""
+        return lambda row: row[idx] if idx < len(row) else ""
+
+    trade_date, spot, expiry = column("trade_date"), column("stkPx"), column("expirDate")
+    numeric = [column(name) for name in ("strike", "cMidIv", "pMidIv", "cDelta", "pDelta")]
+
+    chains: dict[str, TickerChain] = {}
+    for row in csv.reader(lines, delimiter=delimiter):
+        if ticker_idx >= len(row):
+            continue
+        ticker = row[ticker_idx].strip().upper()
+        if not ticker or ticker not in wanted:
+            continue
+        chain = chains.get(ticker)
+        if chain is None:
+            chain = chains[ticker] = TickerChain(ticker, trade_date(row), spot(row))
+        chain.expiry.append(expiry(row).strip())
+        strike, c_iv, p_iv, c_delta, p_delta = (_to_float(get(row)) for get in numeric)
+        chain.strike.append(strike)
+        chain.call_iv.append(c_iv)
+        chain.put_iv.append(p_iv)
+        chain.call_delta.append(c_delta)
+        chain.put_delta.append(p_delta)
+    return chains
+
+
+def _select_expirations(chain: TickerChain, trade_dt: datetime) -> list[str] | None:
+    """Return the front month, M2 and M3 among the third-Friday expirations."""
+
+    dte_by_exp: dict[str, int] = {}
+    valid = 0
+    for exp in dict.fromkeys(chain.expiry):
+        exp_dt = _parse_date(exp) if exp else None
+        if exp_dt is None:
+            continue
+        dte = (exp_dt - trade_dt).days
+        if dte < 0:
+            continue
+        valid += 1
+        if _is_third_friday(exp_dt.date()):
+            dte_by_exp[exp] = dte
+    if not valid:
+        logger.warning(f"Geen geldige expirations voor {chain.ticker}")
+        return None
+    if not dte_by_exp:
+        logger.warning(
+            f"Geen Third Friday expirations voor {chain.ticker} - alleen weeklies beschikbaar"
+        )
+        return None
+
+    ordered = sorted(dte_by_exp, key=dte_by_exp.__getitem__)
+    low, high = FRONT_MONTH_DTE
+    front = next((i for i, exp in enumerate(ordered) if low <= dte_by_exp[exp] <= high), None)
+    if front is None:
+        front = next(
+            (i for i, exp in enumerate(ordered) if dte_by_exp[exp] >= FRONT_MONTH_MIN_DTE),
+            None,
+        )
+        if front is None:
+            logger.warning(f"Geen bruikbare expiration gevonden voor {chain.ticker}")
+            return None
+        logger.info(
+            f"Fallback: using {ordered[front]} ({dte_by_exp[ordered[front]]} DTE) for "
+            f"{chain.ticker} - geen expiration in standaard {low}-{high} DTE range"
+        )
+    return ordered[front : front + 3]
+
+
+# NumPy selection ------------------------------------------------------
+def _dedup_numpy(rows: "np.ndarray", strike, call_ok, put_ok) -> "np.ndarray":
+    """Keep the last row per ``(strike, type)``, ordered by first appearance."""
+
+    rows = rows[~np.isnan(strike[rows])]
+    order, kept = [], []
+    for flag, ok in ((0, call_ok), (1, put_ok)):
+        typed = rows[ok[rows]]
+        if not typed.size:
+            continue
+        keys = strike[typed]
+        _, first = np.unique(keys, return_index=True)
+        _, last = np.unique(keys[::-1], return_index=True)
+        order.append(2 * typed[first] + flag)
+        kept.append(typed[typed.size - 1 - last])
+    if not kept:
+        return rows[:0]
+    return np.concatenate(kept)[np.argsort(np.concatenate(order), kind="stable")]
+
+
+def _closest_numpy(values: "np.ndarray", target: float, mask: "np.ndarray") -> int | None:
+    """Return the first position of the value closest to ``target`` within ``mask``."""
+
+    err = np.abs(values - target)
+    err = np.where(mask & (err < np.inf), err, np.inf)
+    if not err.size:
+        return None
+    pos = int(np.argmin(err))
+    return pos if err[pos] < np.inf else None
+
+
+def _select_numpy(
+    chain: TickerChain, expirations: list[str], spot: float
+) -> tuple[list[float | None], tuple[float | None, float | None]]:
+    expiry = np.asarray(chain.expiry, dtype=object)
+    strike = np.asarray(chain.strike, dtype=float)
+    call_iv = np.asarray(chain.call_iv, dtype=float)
+    put_iv = np.asarray(chain.put_iv, dtype=float)
+    call_delta = np.asarray(chain.call_delta, dtype=float)
+    put_delta = np.asarray(chain.put_delta, dtype=float)
+    call_ok, put_ok = ~np.isnan(call_iv), ~np.isnan(put_iv)
+
+    atm: list[float | None] = []
+    skew: tuple[float | None, float | None] = (None, None)
+    for idx, exp in enumerate(expirations):
+        rows = _dedup_numpy(np.flatnonzero(expiry == exp), strike, call_ok, put_ok)
+        civ, cd = call_iv[rows], call_delta[rows]
+        extreme = (cd < 0.05) | (cd > 0.95)
+        pos = _closest_numpy(strike[rows], spot, call_ok[rows] & ~extreme)
+        atm.append(None if pos is None else float(civ[pos]))
+        if idx:
+            continue
+        piv, pd_ = put_iv[rows], put_delta[rows]
+        put = _closest_numpy(pd_, -0.25, put_ok[rows] & ~np.isnan(pd_))
+        if put is None:
+            put = _closest_numpy(strike[rows], spot * 0.85, put_ok[rows])
+        call = _closest_numpy(cd, 0.25, call_ok[rows] & ~np.isnan(cd))
+        if call is None:
+            call = _closest_numpy(strike[rows], spot * 1.15, call_ok[rows])
+        skew = (
+            None if put is None else float(piv[put]),
+            None if call is None else float(civ[call]),
+        )
+    return atm, skew
+
+
+# Pure Python selection ------------------------------------------------
+def _dedup_python(rows: list[int], chain: TickerChain) -> list[int]:
+    seen: dict[tuple[float, str], int] = {}
+    for i in rows:
+        strike = chain.strike[i]
+        if math.isnan(strike):
+            continue
+        if not math.isnan(chain.call_iv[i]):
+            seen[(strike, "call")] = i
+        if not math.isnan(chain.put_iv[i]):
+            seen[(strike, "put")] = i
+    return list(seen.values())
+
+
+def _closest_python(values: Sequence[float], target: float, mask: Sequence[bool]) -> int | None:
+    best, best_err = None, math.inf
+    for pos, (value, ok) in enumerate(zip(values, mask)):
+        if ok and abs(value - target) < best_err:
+            best, best_err = pos, abs(value - target)
+    return best
+
+
+def _select_python(
+    chain: TickerChain, expirations: list[str], spot: float
+) -> tuple[list[float | None], tuple[float | None, float | None]]:
+    atm: list[float | None] = []
+    skew: tuple[float | None, float | None] = (None, None)
+    for idx, exp in enumerate(expirations):
+        rows = _dedup_python([i for i, e in enumerate(chain.expiry) if e == exp], chain)
+        strike = [chain.strike[i] for i in rows]
+        civ = [chain.call_iv[i] for i in rows]
+        piv = [chain.put_iv[i] for i in rows]
+        cd = [chain.call_delta[i] for i in rows]
+        pd_ = [chain.put_delta[i] for i in rows]
+        call_ok = [not math.isnan(v) for v in civ]
+        put_ok = [not math.isnan(v) for v in piv]
+        mask = [ok and not (d < 0.05 or d > 0.95) for ok, d in zip(call_ok, cd)]
+        pos = _closest_python(strike, spot, mask)
+        atm.append(None if pos is None else civ[pos])
+        if idx:
+            continue
+        put = _closest_python(pd_, -0.25, [ok and not math.isnan(d) for ok, d in zip(put_ok, pd_)])
+        if put is None:
+            put = _closest_python(strike, spot * 0.85, put_ok)
+        call = _closest_python(cd, 0.25, [ok and not math.isnan(d) for ok, d in zip(call_ok, cd)])
+        if call is None:
+            call = _closest_python(strike, spot * 1.15, call_ok)
+        skew = (
+            None if put is None else piv[put],
+            None if call is None else civ[call],
+        )
+    return atm, skew
+
+
+def chain_metrics(chain: TickerChain) -> dict[str, Any] | None:
+    """Return ``date``, ``atm_iv``, ``term_m1_m2``, ``term_m1_m3`` and ``skew``.
+
+    IV rank and percentile depend on the stored history and are left to
+    the caller.
+    """
+
+    if not chain.trade_date:
+        logger.warning(f"Geen trade_date gevonden voor {chain.ticker}")
+        return None
+    trade_dt = _parse_date(chain.trade_date)
+    if trade_dt is None:
+        logger.warning(f"Ongeldige datum voor {chain.ticker}: {chain.trade_date}")
+        return None
+    try:
+        spot = float(chain.spot)
+    except (TypeError, ValueError):
+        logger.warning(f"Geen geldige spot prijs voor {chain.ticker}")
+        return None
+    if spot <= 0:
+        logger.warning(f"Ongeldige spot prijs voor {chain.ticker}: {spot}")
+        return None
+
+    expirations = _select_expirations(chain, trade_dt)
+    if expirations is None:
+        return None
+    select = _select_numpy if has_numpy(np) else _select_python
+    atm, (put_iv, call_iv) = select(chain, expirations, spot)
+    atm_iv = atm[0]
+
+    def term(other: float | None) -> float | None:
+        if atm_iv is None or other is None:
+            return None
+        return round((atm_iv - other) * 100, 2)
+
+    skew = None
+    if put_iv is not None and call_iv is not None:
+        skew = round((put_iv - call_iv) * 100, 2)
+    return {
+        "date": trade_dt.strftime("%Y-%m-%d"),
+        "atm_iv": atm_iv,
+        "term_m1_m2": term(atm[1]) if len(atm) > 1 else None,
+        "term_m1_m3": term(atm[2]) if len(atm) > 2 else None,
+        "skew": skew,
+    }
+
+
+def process_orats_zip(zip_path: str | Path, symbols: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """Return :func:`chain_metrics` per ticker found in ``zip_path``.
+
+    Runs in the parse worker processes; a corrupt or unreadable file
+    yields an empty result.
+    """
+
+    name = Path(zip_path).name
+    try:
+        results: dict[str, dict[str, Any]] = {}
+        for ticker, chain in read_orats_zip(zip_path, symbols).items():
+            metrics = chain_metrics(chain)
+            if metrics:
+                results[ticker] = metrics
+        return results
+    except zipfile.BadZipFile:
+        logger.error(f"Corrupt ZIP bestand: {name}")
+        return {}
+    except Exception as exc:
+        logger.error(f"CSV parse fout in {name}: {exc}")
+        return {}
+
+
+def iter_orats_days(
+    dates: Sequence[datetime],
+    fetch: Callable[[datetime], Path | None],
+    symbols_for: Callable[[datetime], Iterable[str]],
+    *,
+    download_workers: int = 2,
+    parse_workers: int | None = None,
+    prefetch: int | None = None,
+) -> Iterator[tuple[datetime, Path | None, dict[str, dict[str, Any]]]]:
+    """Yield ``(date, zip_path, metrics per ticker)`` for ``dates`` in order.
+
+    ``fetch`` returns the local ZIP of a date (``None`` when it could not
+    be retrieved) and runs on ``download_workers`` threads; it must be
+    safe to call from several threads.  Each ZIP is handed to
+    :func:`process_orats_zip` for the symbols of ``symbols_for(date)`` as
+    soon as it is on disk, on ``parse_workers`` processes (default: CPU
+    count, ``1`` parses on a thread).  ``prefetch`` bounds the number of
+    dates downloaded or parsed ahead of the consumer (default: twice the
+    number of workers).
+    """
+
+    download_workers = max(1, int(download_workers))
+    parse_workers = max(1, int(parse_workers or os.cpu_count() or 1))
+    prefetch = max(1, int(prefetch or 2 * (download_workers + parse_workers)))
+
+    downloads = ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix="orats-ftp")
+    parsers: Executor = (
+        ProcessPoolExecutor(max_workers=parse_workers)
+        if parse_workers > 1
+        else ThreadPoolExecutor(max_workers=1, thread_name_prefix="orats-parse")
+    )
+    # Start the worker processes before the download threads exist: a fork
+    # taken while another thread holds a (logging) lock inherits it locked.
+    parsers.submit(os.getpid).result()
+
+    def stage(day: datetime) -> tuple[Path | None, Future | None]:
+        try:
+            path = fetch(day)
+        except Exception as exc:
+            logger.error(f"Ophalen ORATS ZIP voor {day:%Y%m%d} mislukt: {exc}")
+            return None, None
+        if path is None:
+            return None, None
+        return path, parsers.submit(process_orats_zip, str(path), sorted(symbols_for(day)))
+
+    pending = iter(dates)
+    inflight: deque[tuple[datetime, Future]] = deque()
+
+    def refill() -> None:
+        while len(inflight) < prefetch:
+            day = next(pending, None)
+            if day is None:
+                return
+            inflight.append((day, downloads.submit(stage, day)))
+
+    try:
+        refill()
+        while inflight:
+            day, staged = inflight.popleft()
+            path, parsed = staged.result()
+            metrics = parsed.result() if parsed is not None else {}
+            refill()
+            yield day, path, metrics
+    finally:
+        downloads.shutdown(wait=True, cancel_futures=True)
+        parsers.shutdown(wait=True, cancel_futures=True)
+
+
+__all__ = [
+    "TickerChain",
+    "chain_metrics",
+    "detect_delimiter",
+    "iter_orats_days",
+    "process_orats_zip",
+    "read_orats_zip",
+]
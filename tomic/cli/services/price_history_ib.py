@@ -11,6 +11,7 @@ from typing import Iterable, Sequence
 from ibapi.contract import Contract
 
 from tomic.api.ib_connection import connect_ib
+from tomic.api.pacing import Priority, pacing_priority
 from tomic.config import get as cfg_get
 from tomic.journal.utils import update_json_file
 from tomic.logutils import logger
@@ -25,6 +26,7 @@ def _format_date(raw: str) -> str:
     return raw
 
 
+@pacing_priority(Priority.LOW)
 def _request_bars(app, symbol: str) -> Iterable[dict]:
     """Request daily bars for ``symbol`` and return ``PriceRecord`` objects."""
     app.historical_data = []
@@ -106,8 +108,13 @@ def fetch_ib_daily_prices(symbols: Sequence[str] | None = None, *, compute_volst
             if not records:
                 continue
             file = base_dir / f"{sym}.json"
-            for rec in records:
-                update_json_file(file, rec, ["date"])
+            try:
+                for rec in records:
+                    update_json_file(file, rec, ["date"])
+            except ValueError as exc:
+                # An unreadable history is left for manual repair.
+                logger.error(f"⚠️ Koersdata voor {sym} niet opgeslagen: {exc}")
+                continue
             stored.append(sym)
     finally:
         app.disconnect()
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 """Services for fetching historical prices via Polygon."""
 
+import asyncio
 from datetime import datetime
 from pathlib import Path
 from time import sleep
-from typing import Mapping, Sequence
+from typing import Iterable, Iterator, Mapping, Sequence
 from zoneinfo import ZoneInfo
 
 from tomic.config import get as cfg_get
@@ -13,13 +14,65 @@ from tomic.helpers.price_meta import load_price_meta, save_price_meta
 from tomic.infrastructure.throttling import RateLimiter
 from tomic.integrations.polygon.client import PolygonClient
 from tomic.logutils import logger
-from tomic.polygon_prices import merge_price_data, request_bars
+from tomic.polygon_prices import merge_price_data, request_bars, request_bars_async
 
 from .volatility import compute_polygon_volatility_stats
 
 
+def _fetch_serial(
+    symbols: Sequence[str], sleep_between: float
+) -> Iterator[tuple[str, list[dict]]]:
+    """Yield ``(symbol, records)`` one request at a time."""
+    between_limiter = RateLimiter(1, sleep_between, sleep=sleep)
+    client = PolygonClient()
+    client.connect()
+    previous_requested = False
+    try:
+        for sym in symbols:
+            if previous_requested:
+                between_limiter.wait()
+            records, requested = request_bars(client, sym)
+            if requested:
+                between_limiter.record()
+            previous_requested = requested
+            yield sym, records
+    finally:
+        client.disconnect()
+
+
+async def _fetch_concurrent_async(
+    symbols: Sequence[str], concurrency: int
+) -> list[tuple[str, list[dict]]]:
+    from tomic.integrations.polygon.async_client import AsyncPolygonClient
+
+    async with AsyncPolygonClient(concurrency=concurrency) as client:
+        results = await asyncio.gather(
+            *(request_bars_async(client, sym) for sym in symbols),
+            return_exceptions=True,
+        )
+    fetched: list[tuple[str, list[dict]]] = []
+    for sym, result in zip(symbols, results):
+        if isinstance(result, BaseException):
+            logger.error(f"⚠️ Polygon prijzen voor {sym} mislukt: {result}")
+            continue
+        fetched.append((sym, result[0]))
+    return fetched
+
+
+def _fetch_concurrent(
+    symbols: Sequence[str], concurrency: int
+) -> list[tuple[str, list[dict]]]:
+    """Return ``(symbol, records)`` fetched with up to ``concurrency`` requests
+    in flight; a failing symbol is logged and skipped."""
+    return asyncio.run(_fetch_concurrent_async(symbols, concurrency))
+
+
 def fetch_polygon_price_history(symbols: Sequence[str] | None = None, *, run_volstats: bool = True) -> list[str]:
-    """Fetch Polygon daily history for provided ``symbols``."""
+    """Fetch Polygon daily history for provided ``symbols``.
+
+    With ``POLYGON_MAX_CONCURRENCY`` above 1 the requests run concurrently
+    through :class:`~tomic.integrations.polygon.async_client.AsyncPolygonClient`.
+    """
     if symbols:
         target_symbols = [s.upper() for s in symbols]
     else:
@@ -36,48 +89,46 @@ def fetch_polygon_price_history(symbols: Sequence[str] | None = None, *, run_vol
         max_syms = int(raw_max) if raw_max is not None else None
     except (TypeError, ValueError):
         max_syms = None
+    if max_syms is not None:
+        target_symbols = target_symbols[:max_syms]
     sleep_between = float(cfg_get("POLYGON_SLEEP_BETWEEN", 1.2))
+    try:
+        concurrency = int(cfg_get("POLYGON_MAX_CONCURRENCY", 1) or 1)
+    except (TypeError, ValueError):
+        concurrency = 1
 
-    between_limiter = RateLimiter(1, sleep_between, sleep=sleep)
+    if concurrency > 1:
+        fetched: Iterable[tuple[str, list[dict]]] = _fetch_concurrent(
+            target_symbols, concurrency
+        )
+    else:
+        fetched = _fetch_serial(target_symbols, sleep_between)
 
     base_dir = Path(cfg_get("PRICE_HISTORY_DIR", "tomic/data/spot_prices"))
-    client = PolygonClient()
-    client.connect()
     stored: list[str] = []
     processed: list[str] = []
-    previous_requested = False
     meta = load_price_meta()
     meta_updated = False
-    try:
-        for idx, sym in enumerate(target_symbols):
-            if max_syms is not None and idx >= max_syms:
-                break
-            if previous_requested:
-                between_limiter.wait()
-
-            records, requested = request_bars(client, sym)
-            if not records:
-                previous_requested = requested
-                if requested:
-                    between_limiter.record()
-                continue
-            file = base_dir / f"{sym}.json"
+    for sym, records in fetched:
+        if not records:
+            continue
+        file = base_dir / f"{sym}.json"
+        try:
             merge_price_data(file, records)
-            stored.append(sym)
-            processed.append(sym)
-            entry = meta.get(sym)
-            if not isinstance(entry, Mapping):
-                entry = {}
-            entry = dict(entry)
-            entry["fetched_at"] = datetime.now(ZoneInfo("America/New_York")).isoformat()
-            entry.setdefault("source", "polygon-history")
-            meta[sym] = entry
-            meta_updated = True
-            if requested:
-                between_limiter.record()
-            previous_requested = requested
-    finally:
-        client.disconnect()
+        except ValueError as exc:
+            # An unreadable history is left for manual repair.
+            logger.error(f"⚠️ Koersdata voor {sym} niet opgeslagen: {exc}")
+            continue
+        stored.append(sym)
+        processed.append(sym)
+        entry = meta.get(sym)
+        if not isinstance(entry, Mapping):
+            entry = {}
+        entry = dict(entry)
+        entry["fetched_at"] = datetime.now(ZoneInfo("America/New_York")).isoformat()
+        entry.setdefault("source", "polygon-history")
+        meta[sym] = entry
+        meta_updated = True
 
     if meta_updated:
         save_price_meta(meta)
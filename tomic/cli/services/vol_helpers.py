@@ -1,29 +1,65 @@
 """Shared helpers for volatility statistics calculations."""
 from __future__ import annotations
 
+import math
+from bisect import bisect_left
 from pathlib import Path
 from numbers import Number
 from typing import Iterable, Sequence
 
-from tomic.analysis.metrics import historical_volatility
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - numpy missing
+    np = None  # type: ignore
+
+from tomic.analysis.metrics import rolling_historical_volatility
+from tomic.helpers.numeric import has_numpy
 from tomic.helpers.price_utils import cfg_get as price_cfg_get
+from tomic.infrastructure.timeseries import read_series
 from tomic.journal.utils import load_json
 from tomic.utils import load_price_history
 
 
 def _numeric_values(series: Iterable[object]) -> list[float]:
-    """Return numeric values from ``series`` cast to ``float``."""
+    """Return numeric values from ``series`` cast to ``float``, without NaN."""
 
     values: list[float] = []
     for value in series:
         if isinstance(value, Number):
-            values.append(float(value))
-            continue
+            number = float(value)
+        else:
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                continue
+        if not math.isnan(number):
+            values.append(number)
+    return values
+
+
+def _numeric_array(series: Iterable[object]) -> "np.ndarray":
+    """Return the numeric values of ``series`` as a float array, without NaN.
+
+    ``None`` converts to NaN, so it is dropped along with real NaNs.
+    """
+
+    try:
+        values = np.asarray(series, dtype=float)
+    except (TypeError, ValueError):
+        values = None
+    if values is None or values.ndim != 1:
+        values = np.asarray(_numeric_values(series), dtype=float)
+    return values[~np.isnan(values)]
+
+
+def _optional_floats(values: Iterable[object]) -> list[float | None]:
+    result: list[float | None] = []
+    for value in values:
         try:
-            values.append(float(value))
+            result.append(float(value))
         except (TypeError, ValueError):
-            continue
-    return values
+            result.append(None)
+    return result
 
 
 def _get_closes(symbol: str) -> list[float]:
@@ -35,12 +71,11 @@ def _get_closes(symbol: str) -> list[float]:
         if base:
             path = Path(base) / f"{symbol}.json"
             try:
-                raw = load_json(path)
+                raw = load_json(path, copy=False)
             except Exception:
                 raw = None
             if isinstance(raw, list):
-                raw.sort(key=lambda rec: rec.get("date", ""))
-                data = raw
+                data = sorted(raw, key=lambda rec: rec.get("date", ""))
     closes: list[float] = []
     for rec in data:
         try:
@@ -51,14 +86,17 @@ def _get_closes(symbol: str) -> list[float]:
 
 
 def rolling_hv(closes: Sequence[float], window: int) -> list[float]:
-    """Return historical volatility values for rolling windows."""
+    """Return historical volatility values for rolling windows.
 
-    result: list[float] = []
-    for idx in range(window, len(closes) + 1):
-        hv = historical_volatility(closes[idx - window : idx], window=window)
-        if hv is not None:
-            result.append(hv)
-    return result
+    Each value covers the ``window - 1`` most recent returns up to a close,
+    starting at the first close with a complete window.  Pairs with a
+    non-positive close are skipped, so such a window reaches further back.
+    """
+
+    if window < 2:
+        return []
+    series = rolling_historical_volatility(closes, [window - 1])[window - 1]
+    return [hv for hv in series[window - 1 :] if hv is not None]
 
 
 # Minimum number of IV history records required for reliable rank/percentile
@@ -93,16 +131,10 @@ def get_historical_iv_series(
 
     path = Path(base) / f"{symbol}.json"
     try:
-        raw = load_json(path)
+        raw = read_series(path)
     except Exception:
         return []
 
-    if not isinstance(raw, list):
-        return []
-
-    # Sort by date to ensure chronological order
-    raw.sort(key=lambda rec: rec.get("date", ""))
-
     iv_values: list[float] = []
     for rec in raw:
         if not isinstance(rec, dict):
@@ -144,6 +176,24 @@ def has_sufficient_iv_history(symbol: str, min_days: int = MIN_IV_HISTORY_DAYS)
     return len(iv_series) >= min_days
 
 
+def _bounds(series: Sequence[float]) -> tuple[float, float] | None:
+    """Return ``(min, max)`` of ``series`` or ``None`` when it has no range."""
+
+    if has_numpy(np):
+        values = _numeric_array(series)
+        if not values.size:
+            return None
+        lo, hi = float(values.min()), float(values.max())
+    else:
+        values = _numeric_values(series)
+        if not values:
+            return None
+        lo, hi = min(values), max(values)
+    if hi == lo:
+        return None
+    return lo, hi
+
+
 def iv_rank(value: float, series: Sequence[float]) -> float | None:
     """Return the IV rank for ``value`` relative to ``series``."""
 
@@ -152,13 +202,10 @@ def iv_rank(value: float, series: Sequence[float]) -> float | None:
     except (TypeError, ValueError):
         return None
 
-    values = _numeric_values(series)
-    if not values:
-        return None
-    lo = min(values)
-    hi = max(values)
-    if hi == lo:
+    bounds = _bounds(series)
+    if bounds is None:
         return None
+    lo, hi = bounds
     return (numeric_value - lo) / (hi - lo)
 
 
@@ -170,6 +217,11 @@ def iv_percentile(value: float, series: Sequence[float]) -> float | None:
     except (TypeError, ValueError):
         return None
 
+    if has_numpy(np):
+        values = _numeric_array(series)
+        if not values.size:
+            return None
+        return int(np.count_nonzero(values < numeric_value)) / values.size
     values = _numeric_values(series)
     if not values:
         return None
@@ -177,11 +229,68 @@ def iv_percentile(value: float, series: Sequence[float]) -> float | None:
     return count / len(values)
 
 
+def iv_rank_many(values: Sequence[float], series: Sequence[float]) -> list[float | None]:
+    """Return :func:`iv_rank` of every item in ``values`` against one ``series``."""
+
+    bounds = _bounds(series)
+    if bounds is None:
+        return [None] * len(values)
+    lo, hi = bounds
+    if has_numpy(np):
+        try:
+            scores = (np.asarray(values, dtype=float) - lo) / (hi - lo)
+        except (TypeError, ValueError):
+            pass
+        else:
+            # ``None`` became NaN; the loop below maps it back to ``None``.
+            if scores.ndim == 1 and not np.isnan(scores).any():
+                return scores.tolist()
+    return [
+        (value - lo) / (hi - lo) if value is not None else None
+        for value in _optional_floats(values)
+    ]
+
+
+def iv_percentile_many(
+    values: Sequence[float], series: Sequence[float]
+) -> list[float | None]:
+    """Return :func:`iv_percentile` of every item in ``values`` against one ``series``.
+
+    The series is sorted once and each value is placed with a binary search.
+    """
+
+    if has_numpy(np):
+        ordered = np.sort(_numeric_array(series))
+        if not ordered.size:
+            return [None] * len(values)
+        try:
+            points = np.asarray(values, dtype=float)
+        except (TypeError, ValueError):
+            points = None
+        if points is not None and points.ndim == 1 and not np.isnan(points).any():
+            counts = np.searchsorted(ordered, points, side="left")
+            return (counts / ordered.size).tolist()
+        size = ordered.size
+        ordered_list = ordered.tolist()
+    else:
+        numeric = _numeric_values(series)
+        if not numeric:
+            return [None] * len(values)
+        size = len(numeric)
+        ordered_list = sorted(numeric)
+    return [
+        bisect_left(ordered_list, value) / size if value is not None else None
+        for value in _optional_floats(values)
+    ]
+
+
 __all__ = [
     "_get_closes",
     "rolling_hv",
     "iv_rank",
     "iv_percentile",
+    "iv_rank_many",
+    "iv_percentile_many",
     "get_historical_iv_series",
     "has_sufficient_iv_history",
     "MIN_IV_HISTORY_DAYS",
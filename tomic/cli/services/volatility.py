@@ -71,15 +71,19 @@ def compute_volatility_stats(symbols: Sequence[str] | None = None) -> list[str]:
             "hv90": hv90,
             "hv252": hv252,
         }
-        update_json_file(hv_dir / f"{sym}.json", hv_record, ["date"])
-
         summary_record = {
             "date": date_str,
             "atm_iv": iv,
             "iv_rank": rank,
             "iv_percentile": pct,
         }
-        update_json_file(summary_dir / f"{sym}.json", summary_record, ["date"])
+        try:
+            update_json_file(hv_dir / f"{sym}.json", hv_record, ["date"])
+            update_json_file(summary_dir / f"{sym}.json", summary_record, ["date"])
+        except ValueError as exc:
+            # An unreadable history is left for manual repair.
+            logger.error(f"⚠️ Volatiliteit voor {sym} niet opgeslagen: {exc}")
+            continue
         stored.append(sym)
         logger.info(f"Saved vol stats for {sym}")
 
@@ -0,0 +1,77 @@
+"""Migrate the per-symbol JSON series to the SQLite time-series store."""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from tomic.config import get as cfg_get
+from tomic.infrastructure.timeseries import TimeSeriesStore
+
+from ._tabulate import tabulate
+
+DATASETS = {
+    "spot_prices": ("PRICE_HISTORY_DIR", "tomic/data/spot_prices"),
+    "iv_daily_summary": ("IV_DAILY_SUMMARY_DIR", "tomic/data/iv_daily_summary"),
+    "historical_volatility": (
+        "HISTORICAL_VOLATILITY_DIR",
+        "tomic/data/historical_volatility",
+    ),
+}
+
+
+def _dataset_dir(dataset: str) -> Path:
+    key, default = DATASETS[dataset]
+    return Path(cfg_get(key, default)).expanduser()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Importeer of exporteer tijdreeksen naar de SQLite database"
+    )
+    parser.add_argument(
+        "command",
+        choices=["import", "export", "stats"],
+        help="import: JSON → database, export: database → JSON, stats: aantallen",
+    )
+    parser.add_argument(
+        "--dataset",
+        choices=sorted(DATASETS),
+        action="append",
+        help="Beperk tot deze dataset (default: alle)",
+    )
+    parser.add_argument("--db", help="Pad naar de database (default: TIMESERIES_DB)")
+    parser.add_argument("--out", help="Doelmap voor export (default: de JSON map van de dataset)")
+    args = parser.parse_args(argv)
+
+    db = Path(args.db or cfg_get("TIMESERIES_DB", "tomic/data/timeseries.sqlite3"))
+    store = TimeSeriesStore(db.expanduser())
+    datasets = args.dataset or sorted(DATASETS)
+
+    rows = []
+    for dataset in datasets:
+        start = time.perf_counter()
+        if args.command == "import":
+            count = store.import_json_dir(dataset, _dataset_dir(dataset))
+        elif args.command == "export":
+            target = Path(args.out) / dataset if args.out else _dataset_dir(dataset)
+            count = store.export_json_dir(dataset, target)
+        else:
+            count = store.count(dataset)
+        rows.append(
+            [
+                dataset,
+                len(store.symbols(dataset)),
+                count,
+                f"{time.perf_counter() - start:.2f}s",
+            ]
+        )
+    store.close()
+    print(tabulate(rows, headers=["Dataset", "Symbolen", "Records", "Duur"]))
+
+
+if __name__ == "__main__":  # pragma: no cover - manual usage
+    import sys
+
+    main(sys.argv[1:])
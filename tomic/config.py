@@ -71,13 +71,50 @@ class AppConfig(BaseModel):
     IV_DEBUG_DIR: str = "iv_debug"
     HISTORICAL_VOLATILITY_DIR: str = "tomic/data/historical_volatility"
     ORATS_CACHE_DIR: str = "tomic/data/orats_cache"
+    # ORATS backfill pipeline: FTP sessions, parse processes (None = CPU count),
+    # trading days collected per symbol before the summary files are written
+    ORATS_DOWNLOAD_WORKERS: int = 2
+    ORATS_PARSE_WORKERS: int | None = None
+    ORATS_WRITE_BATCH_DAYS: int = 20
+    # Serve spot/IV/HV series from a SQLite mirror of the JSON files
+    TIMESERIES_STORE_ENABLED: bool = False
+    TIMESERIES_DB: str = "tomic/data/timeseries.sqlite3"
+    # conId/tradingClass per option contract; entries expire after the TTL (0 = off)
+    CONTRACT_DETAILS_CACHE_FILE: str = "tomic/data/contract_details_cache.json"
+    CONTRACT_DETAILS_CACHE_TTL_DAYS: float = 7.0
+    # IB what-if margins per journal leg set (0 hours = no cache)
+    MARGIN_CACHE_FILE: str = "tomic/data/margin_cache.json"
+    MARGIN_CACHE_TTL_HOURS: float = 24.0
+    # Send all what-if orders of a margin update over one connection
+    MARGIN_BATCH_WHATIF: bool = True
+    MARGIN_WHATIF_TIMEOUT: float = 15.0
+    # Parsed JSON kept in memory until the file changes (0 = no cache)
+    JSON_CACHE_MAX_MB: float = 64.0
     EXPORT_DIR: str = "exports"
+    # Write the stage timing breakdown of each chain evaluation to EXPORT_DIR
+    PIPELINE_PROFILE_EXPORT: bool = False
     IB_HOST: str = "127.0.0.1"
     IB_PORT: int = 4002  # IB Gateway paper trading port (was 7497 for TWS)
     IB_LIVE_PORT: int = 4001  # IB Gateway live trading port (was 7496 for TWS)
     IB_CLIENT_ID: int = 100
     IB_MARKETDATA_CLIENT_ID: int = 901
     IB_ORDER_CLIENT_ID: int = 902
+    # Seconds an unused shared IB session stays connected (0 = close immediately)
+    IB_SESSION_IDLE_TIMEOUT: float = 300.0
+    # Process wide IB pacing (see tomic.api.pacing); 0 disables a limit
+    IB_MAX_MESSAGES_PER_SEC: float = 45.0
+    IB_MAX_MARKET_DATA_LINES: int = 100
+    IB_HIST_MAX_REQUESTS: int = 60
+    IB_HIST_WINDOW_SECONDS: float = 600.0
+    # Seconds a non-reader thread waits for a market data line (0 = forever)
+    IB_LINE_WAIT_TIMEOUT: float = 60.0
+    # Streaming quote cache for refreshes (see tomic.services.quote_cache)
+    IB_QUOTE_CACHE_ENABLED: bool = False
+    IB_QUOTE_CACHE_MAX_AGE: float = 30.0
+    IB_QUOTE_CACHE_IDLE_TTL: float = 120.0
+    IB_QUOTE_CACHE_MAX_LINES: int = 40
+    IB_QUOTE_CACHE_MAX_INCOMPLETE: int = 3
+    IB_QUOTE_CACHE_FIRST_QUOTE_WAIT: float = 2.0
     IB_ACCOUNT_ALIAS: str = ""
     DEFAULT_ORDER_TYPE: str = "LMT"
     DEFAULT_TIME_IN_FORCE: str = "DAY"
@@ -169,6 +206,14 @@ class AppConfig(BaseModel):
     POLYGON_DELAY_SNAPSHOT_MS: int = 200
     MAX_SYMBOLS_PER_RUN: int | None = None
     POLYGON_API_KEYS: List[str] = []
+    # Concurrent Polygon fetches (1 = serial); per-key budget, None = SLEEP_BETWEEN
+    POLYGON_MAX_CONCURRENCY: int = 1
+    POLYGON_REQUESTS_PER_MINUTE: int | None = None
+    # On-disk Polygon response cache; TTL overrides per policy name (seconds)
+    POLYGON_HTTP_CACHE_ENABLED: bool = False
+    POLYGON_HTTP_CACHE_PATH: str = "tomic/data/polygon_http_cache.sqlite3"
+    POLYGON_HTTP_CACHE_MAX_MB: float = 256
+    POLYGON_HTTP_CACHE_TTL: Dict[str, float | None] = {}
     DATA_HEALTH_THRESHOLDS: Dict[str, Any] = {
         "spot_max_age_days": 3,
         "hv_max_age_days": 7,
@@ -1,5 +1,6 @@
 """Core data providers used by pricing services."""
 
+from .chain_table import ChainRow, ChainTable
 from .chain_normalizer import (  # noqa: F401
     ChainNormalizerConfig,
     dataframe_to_records,
@@ -10,6 +11,8 @@ from .chain_normalizer import (  # noqa: F401
 from .interest_rates import InterestRateProvider, InterestRateQuote
 
 __all__ = [
+    "ChainRow",
+    "ChainTable",
     "ChainNormalizerConfig",
     "InterestRateProvider",
     "InterestRateQuote",
@@ -0,0 +1,247 @@
+"""Shared option chain representation with per-stage overlay columns.
+
+The strategy pipeline used to copy every option record at each stage
+(``list(records)``, ``dict(opt)`` in the mid resolver, another ``dict`` when
+enriching).  :class:`ChainTable` keeps a single reference to the original
+records and stores stage output (mid, mid source, interest rate, ...) as
+columns layered on top.  Rows are exposed as lightweight
+:class:`ChainRow` mappings that resolve keys through those layers and only
+allocate a private dict when a caller writes to them.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Mapping, MutableMapping, Sequence, overload
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+"""Sentinel marking a row without a value in an overlay column."""
+
+
+class ChainTable(Sequence[MutableMapping[str, Any]]):
+    """Immutable view over option records with overlay columns.
+
+    ``records`` are never copied or mutated.  Overlay columns added through
+    :meth:`with_columns` shadow base values, constant ``defaults`` only apply
+    when neither the base record nor an overlay provides the key (mirroring
+    ``dict.setdefault``).
+    """
+
+    __slots__ = ("_base", "_overlays", "_columns", "_defaults")
+
+    def __init__(
+        self,
+        records: Sequence[Mapping[str, Any]] | Iterable[Mapping[str, Any]],
+        *,
+        _overlays: tuple[tuple[str, tuple[Any, ...]], ...] = (),
+        _defaults: Mapping[str, Any] | None = None,
+    ) -> None:
+        if isinstance(records, ChainTable):
+            self._base: tuple[Mapping[str, Any], ...] = records._base
+            _overlays = records._overlays + _overlays
+            merged = dict(records._defaults)
+            merged.update(_defaults or {})
+            _defaults = merged
+        else:
+            self._base = tuple(records)
+        self._overlays = _overlays
+        self._columns: dict[str, list[tuple[Any, ...]]] = {}
+        for name, values in _overlays:
+            self._columns.setdefault(name, []).append(values)
+        self._defaults: dict[str, Any] = dict(_defaults or {})
+
+    # ------------------------------------------------------------------
+    # Construction helpers
+    # ------------------------------------------------------------------
+    def with_columns(self, columns: Mapping[str, Sequence[Any]]) -> "ChainTable":
+        """Return a new table sharing the base records plus ``columns``.
+
+        Each column must provide one value per row; use :data:`MISSING` for
+        rows that should fall through to the underlying value.
+        """
+
+        size = len(self._base)
+        added: list[tuple[str, tuple[Any, ...]]] = []
+        for name, values in columns.items():
+            column = tuple(values)
+            if len(column) != size:
+                raise ValueError(
+                    f"column {name!r} has {len(column)} values, expected {size}"
+                )
+            added.append((str(name), column))
+        return ChainTable(
+            self._base,
+            _overlays=self._overlays + tuple(added),
+            _defaults=self._defaults,
+        )
+
+    def with_defaults(self, defaults: Mapping[str, Any]) -> "ChainTable":
+        """Return a new table where ``defaults`` fill keys absent from rows."""
+
+        merged = dict(self._defaults)
+        merged.update(defaults)
+        return ChainTable(self._base, _overlays=self._overlays, _defaults=merged)
+
+    # ------------------------------------------------------------------
+    # Sequence protocol
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._base)
+
+    @overload
+    def __getitem__(self, index: int) -> "ChainRow": ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list["ChainRow"]: ...
+
+    def __getitem__(self, index: int | slice) -> "ChainRow" | list["ChainRow"]:
+        if isinstance(index, slice):
+            return [ChainRow(self, i) for i in range(*index.indices(len(self._base)))]
+        if index < 0:
+            index += len(self._base)
+        if not 0 <= index < len(self._base):
+            raise IndexError("chain table index out of range")
+        return ChainRow(self, index)
+
+    def __iter__(self) -> Iterator["ChainRow"]:
+        for idx in range(len(self._base)):
+            yield ChainRow(self, idx)
+
+    # ------------------------------------------------------------------
+    # Column access
+    # ------------------------------------------------------------------
+    @property
+    def records(self) -> tuple[Mapping[str, Any], ...]:
+        """Return the shared base records."""
+
+        return self._base
+
+    @property
+    def overlay_names(self) -> tuple[str, ...]:
+        """Return overlay column names in the order they were added."""
+
+        return tuple(self._columns)
+
+    def column(self, name: str, default: Any = None) -> list[Any]:
+        """Return the resolved values of ``name`` for every row."""
+
+        return [self._lookup(idx, name, default) for idx in range(len(self._base))]
+
+    def materialize(self) -> list[dict[str, Any]]:
+        """Return plain dict copies of all rows (legacy behaviour)."""
+
+        return [dict(row) for row in self]
+
+    def _lookup(self, idx: int, key: str, default: Any = MISSING) -> Any:
+        stack = self._columns.get(key)
+        if stack:
+            for values in reversed(stack):
+                value = values[idx]
+                if value is not MISSING:
+                    return value
+        base = self._base[idx]
+        if key in base:
+            return base[key]
+        if key in self._defaults:
+            return self._defaults[key]
+        return default
+
+    def _keys(self, idx: int) -> Iterator[str]:
+        base = self._base[idx]
+        seen = set(base)
+        yield from base
+        for name, stack in self._columns.items():
+            if name not in seen and any(values[idx] is not MISSING for values in stack):
+                seen.add(name)
+                yield name
+        for name in self._defaults:
+            if name not in seen:
+                seen.add(name)
+                yield name
+
+
+class ChainRow(MutableMapping[str, Any]):
+    """Copy-on-write mapping for a single :class:`ChainTable` row."""
+
+    __slots__ = ("_table", "_index", "_local", "_deleted")
+
+    def __init__(self, table: ChainTable, index: int) -> None:
+        self._table = table
+        self._index = index
+        self._local: dict[str, Any] | None = None
+        self._deleted: set[str] | None = None
+
+    @property
+    def base(self) -> Mapping[str, Any]:
+        """Return the shared underlying record."""
+
+        return self._table._base[self._index]
+
+    def __getitem__(self, key: str) -> Any:
+        if self._local is not None and key in self._local:
+            return self._local[key]
+        if self._deleted is not None and key in self._deleted:
+            raise KeyError(key)
+        value = self._table._lookup(self._index, key)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._local is not None and key in self._local:
+            return self._local[key]
+        if self._deleted is not None and key in self._deleted:
+            return default
+        value = self._table._lookup(self._index, key)
+        return default if value is MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        if self._local is not None and key in self._local:
+            return True
+        if self._deleted is not None and key in self._deleted:
+            return False
+        return self._table._lookup(self._index, key) is not MISSING  # type: ignore[arg-type]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self._local is None:
+            self._local = {}
+        self._local[key] = value
+        if self._deleted is not None:
+            self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if self._local is not None:
+            self._local.pop(key, None)
+        if self._table._lookup(self._index, key) is not MISSING:
+            if self._deleted is None:
+                self._deleted = set()
+            self._deleted.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        deleted = self._deleted or ()
+        local = self._local or {}
+        for key in self._table._keys(self._index):
+            if key not in deleted and key not in local:
+                yield key
+        yield from local
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"ChainRow({dict(self)!r})"
+
+
+__all__ = ["MISSING", "ChainRow", "ChainTable"]
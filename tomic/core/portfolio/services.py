@@ -26,7 +26,11 @@ from tomic.exports import (
 from tomic.helpers.price_utils import _load_latest_close
 from tomic.logutils import capture_combo_evaluations, logger, summarize_evaluations
 from tomic.reporting import EvaluationSummary
-from tomic.services.ib_marketdata import SnapshotResult, fetch_quote_snapshot
+from tomic.services.ib_marketdata import (
+    SnapshotResult,
+    fetch_quote_snapshot,
+    fetch_quote_snapshots,
+)
 from tomic.services.order_submission import (
     OrderSubmissionService,
     prepare_order_instructions,
@@ -147,6 +151,33 @@ def refresh_proposal_from_ib(
         raise
 
 
+def refresh_proposals_from_ib(
+    proposals: Sequence[StrategyProposal],
+    *,
+    spot_prices: Sequence[float | None] | None = None,
+    timeout: float | None = None,
+) -> list[SnapshotResult]:
+    """Fetch updated market data for several proposals in one IB batch."""
+
+    criteria_cfg = load_criteria()
+    if timeout is None:
+        timeout = float(cfg.get("MARKET_DATA_TIMEOUT", 15))
+    spots = [
+        spot if isinstance(spot, (int, float)) else None
+        for spot in (spot_prices or [None] * len(proposals))
+    ]
+    try:
+        return fetch_quote_snapshots(
+            proposals,
+            criteria=criteria_cfg,
+            spot_prices=spots,
+            timeout=timeout,
+        )
+    except Exception as exc:  # pragma: no cover - passthrough for UI handling
+        logger.exception("IB market data refresh failed: %s", exc)
+        raise
+
+
 def build_proposal_presentation(
     session: SessionProtocol,
     proposal: StrategyProposal,
@@ -410,6 +441,7 @@ __all__ = [
     "read_portfolio_timestamp",
     "record_portfolio_timestamp",
     "refresh_proposal_from_ib",
+    "refresh_proposals_from_ib",
     "rejection_messages",
     "save_trades",
     "submit_order",
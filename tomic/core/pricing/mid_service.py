@@ -75,16 +75,15 @@ class MidPricingContext:
     def interest_rate_source(self) -> str | None:
         return self._interest_rate.source if self._interest_rate else None
 
-    def enrich_chain(self) -> list[MutableMapping[str, object]]:
+    def enrich_chain(self) -> Sequence[MutableMapping[str, object]]:
         if self._resolver is None:
             return []
-        enriched = []
-        for option in self._resolver.enrich_chain():
-            data = dict(option)
-            data.setdefault("interest_rate", self.interest_rate)
-            data.setdefault("interest_rate_source", self.interest_rate_source)
-            enriched.append(data)
-        return enriched
+        return self._resolver.enrich_chain().with_defaults(
+            {
+                "interest_rate": self.interest_rate,
+                "interest_rate_source": self.interest_rate_source,
+            }
+        )
 
     def summarize_legs(self, legs: Iterable[Mapping[str, object]], *, fallback_allowed: int | None = None) -> MidUsageSummary:
         if self._resolver is None:
@@ -165,5 +165,15 @@ def as_float(
     )
 
 
-__all__ = ["safe_float", "as_float"]
+def has_numpy(module: Any) -> bool:
+    """Return ``True`` when ``module`` is a usable NumPy.
+
+    Modules import NumPy as an optional dependency and keep ``None`` when it
+    is missing; a stand-in module without array support counts as missing.
+    """
+
+    return module is not None and getattr(module, "ndarray", None) is not None
+
+
+__all__ = ["safe_float", "as_float", "has_numpy"]
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 """Utilities for tracking price history fetch timestamps."""
 
+from copy import deepcopy
 from pathlib import Path
 from typing import Any, Mapping
 
@@ -75,7 +76,7 @@ def ensure_all_symbols(meta: dict[str, Any]) -> dict[str, Any]:
 def load_price_meta() -> dict[str, Any]:
     """Return mapping of symbols to metadata entries."""
     path = Path(cfg_get("PRICE_META_FILE", "price_meta.json"))
-    data = load_json(path)
+    data = load_json(path, copy=False)
     meta_raw: dict[str, Any] = data if isinstance(data, dict) else {}
     normalized: dict[str, Any] = {}
     for key, value in meta_raw.items():
@@ -84,7 +85,7 @@ def load_price_meta() -> dict[str, Any]:
         elif isinstance(value, str) and key.isupper():
             normalized[key] = _normalize_close_meta(value)
         else:
-            normalized[key] = value
+            normalized[key] = deepcopy(value)
     return ensure_all_symbols(normalized)
 
 
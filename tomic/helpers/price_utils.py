@@ -7,9 +7,8 @@ from typing import Any, Iterator
 
 from tomic.config import get as cfg_get  # re-exported for monkeypatching in tests
 from tomic.helpers.price_meta import load_price_meta
-from tomic.journal.utils import load_json
+from tomic.infrastructure.timeseries import read_latest
 from tomic.logutils import logger
-from tomic.utils import load_price_history
 
 
 @dataclass(frozen=True)
@@ -52,18 +51,8 @@ def _load_latest_close(
     """
 
     logger.debug(f"Loading close price for {symbol}")
-    data = load_price_history(symbol)
-    if not data:
-        base = cfg_get("PRICE_HISTORY_DIR")
-        if base:
-            path = Path(base) / f"{symbol}.json"
-            try:
-                raw = load_json(path)
-            except Exception:
-                raw = None
-            if isinstance(raw, list):
-                raw.sort(key=lambda rec: rec.get("date", ""))
-                data = raw
+    base = Path(cfg_get("PRICE_HISTORY_DIR", "tomic/data/spot_prices"))
+    rec = read_latest(base / f"{symbol}.json")
     meta_source: str | None = None
     fetched_at: str | None = None
     baseline_active = False
@@ -82,8 +71,7 @@ def _load_latest_close(
         if isinstance(raw_as_of, str):
             baseline_as_of = raw_as_of
 
-    if data:
-        rec = data[-1]
+    if rec:
         try:
             price = float(rec.get("close"))
             date_str = str(rec.get("date"))
@@ -0,0 +1,185 @@
+"""Lightweight per-stage timing for pipeline runs.
+
+A :class:`StageProfiler` records wall time, call counts and allocation deltas
+for named stages.  Stages nest: a stage opened while another one is active is
+stored under ``"parent/child"`` so the breakdown shows where inside e.g.
+``generation`` the time went.  Parent timings include their children.
+
+Code deep inside the pipeline (scoring, generators) uses
+:func:`profile_stage`, which attaches to the profiler activated by the
+caller and is a cheap no-op when no profiler is active.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+_ACTIVE: ContextVar["StageProfiler | None"] = ContextVar(
+    "tomic_stage_profiler", default=None
+)
+
+
+@dataclass(slots=True)
+class StageTiming:
+    """Accumulated measurements for a single stage."""
+
+    name: str
+    calls: int = 0
+    wall_s: float = 0.0
+    alloc_blocks: int = 0
+    alloc_bytes: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "wall_ms": round(self.wall_s * 1000, 3),
+            "alloc_blocks": self.alloc_blocks,
+            "alloc_bytes": self.alloc_bytes,
+        }
+
+
+class StageProfiler:
+    """Collect :class:`StageTiming` entries in first-seen order."""
+
+    def __init__(self, label: str | None = None) -> None:
+        self.label = label
+        self._stages: dict[str, StageTiming] = {}
+        self._stack: list[str] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._stages)
+
+    @property
+    def stages(self) -> list[StageTiming]:
+        return list(self._stages.values())
+
+    def get(self, name: str) -> StageTiming | None:
+        return self._stages.get(name)
+
+    @property
+    def total_s(self) -> float:
+        """Wall time of all top-level stages."""
+
+        return sum(t.wall_s for t in self._stages.values() if "/" not in t.name)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageTiming]:
+        """Time the enclosed block as ``name`` (nested under the open stage)."""
+
+        key = f"{self._stack[-1]}/{name}" if self._stack else name
+        timing = self._stages.get(key)
+        if timing is None:
+            timing = self._stages[key] = StageTiming(name=key)
+        tracing = tracemalloc.is_tracing()
+        bytes_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        blocks_before = sys.getallocatedblocks()
+        self._stack.append(key)
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.wall_s += time.perf_counter() - start
+            self._stack.pop()
+            timing.calls += 1
+            timing.alloc_blocks += sys.getallocatedblocks() - blocks_before
+            if tracing and tracemalloc.is_tracing():
+                delta = tracemalloc.get_traced_memory()[0] - bytes_before
+                timing.alloc_bytes = (timing.alloc_bytes or 0) + delta
+
+    @contextmanager
+    def activate(self) -> Iterator["StageProfiler"]:
+        """Make this profiler the target of :func:`profile_stage`."""
+
+        token = _ACTIVE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE.reset(token)
+
+    def merge(self, other: "StageProfiler | None") -> "StageProfiler":
+        """Add the stages of ``other`` to this profiler and return ``self``."""
+
+        if other is None:
+            return self
+        for timing in other.stages:
+            own = self._stages.get(timing.name)
+            if own is None:
+                own = self._stages[timing.name] = StageTiming(name=timing.name)
+            own.calls += timing.calls
+            own.wall_s += timing.wall_s
+            own.alloc_blocks += timing.alloc_blocks
+            if timing.alloc_bytes is not None:
+                own.alloc_bytes = (own.alloc_bytes or 0) + timing.alloc_bytes
+        return self
+
+    def rows(self) -> list[list[str]]:
+        """Return table rows ``[stage, calls, ms, %, blocks]`` for display."""
+
+        total = self.total_s
+        rows: list[list[str]] = []
+        for timing in self._stages.values():
+            depth = timing.name.count("/")
+            label = "  " * depth + timing.name.rsplit("/", 1)[-1]
+            share = f"{timing.wall_s / total * 100:.0f}%" if total > 0 else "-"
+            rows.append(
+                [
+                    label,
+                    str(timing.calls),
+                    f"{timing.wall_s * 1000:.1f}",
+                    share,
+                    f"{timing.alloc_blocks:+d}",
+                ]
+            )
+        return rows
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "label": self.label,
+            "total_ms": round(self.total_s * 1000, 3),
+            "stages": [timing.as_dict() for timing in self._stages.values()],
+        }
+
+    def to_json(self, path: Path | str | None = None) -> str:
+        """Serialise the profile and optionally write it to ``path``."""
+
+        text = json.dumps(self.as_dict(), indent=2)
+        if path is not None:
+            target = Path(path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(text)
+        return text
+
+
+def active_profiler() -> StageProfiler | None:
+    """Return the profiler activated in the current context, if any."""
+
+    return _ACTIVE.get()
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[StageTiming | None]:
+    """Time the block on the active profiler; no-op without one."""
+
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        yield None
+        return
+    with profiler.stage(name) as timing:
+        yield timing
+
+
+__all__ = [
+    "StageProfiler",
+    "StageTiming",
+    "active_profiler",
+    "profile_stage",
+]
@@ -0,0 +1,69 @@
+"""Incremental framing of the length-prefixed TWS message stream.
+
+Every message on the wire is a 4 byte big-endian size followed by the payload.
+The original reader kept the unread bytes in an immutable ``bytes`` object and
+sliced off one message at a time, copying the remaining tail for every
+message.  Large bursts (tick floods, historical data) therefore cost
+``O(n²)``.  :class:`MessageFramer` keeps the data in a ``bytearray`` with a
+read offset, copies each payload exactly once and only compacts the buffer
+once the consumed prefix grows large.
+"""
+
+from __future__ import annotations
+
+import struct
+
+_HEADER = struct.Struct("!I")
+_HEADER_SIZE = _HEADER.size
+
+
+class MessageFramer:
+    """Buffer raw socket data and split it into complete message payloads."""
+
+    def __init__(self, compact_threshold: int = 1 << 16) -> None:
+        self._buf = bytearray()
+        self._pos = 0
+        self._compact_threshold = max(int(compact_threshold), 0)
+
+    def __len__(self) -> int:
+        """Return the number of buffered bytes not yet returned."""
+
+        return len(self._buf) - self._pos
+
+    def feed(self, data: bytes | bytearray | memoryview) -> None:
+        """Append raw bytes received from the socket."""
+
+        if data:
+            self._buf += data
+
+    def drain(self) -> list[bytes]:
+        """Return all complete payloads and keep a trailing partial message."""
+
+        buf = self._buf
+        pos = self._pos
+        end = len(buf)
+        messages: list[bytes] = []
+        with memoryview(buf) as view:
+            while end - pos >= _HEADER_SIZE:
+                (size,) = _HEADER.unpack_from(buf, pos)
+                start = pos + _HEADER_SIZE
+                stop = start + size
+                if stop > end:
+                    break
+                messages.append(bytes(view[start:stop]))
+                pos = stop
+        if pos == end:
+            buf.clear()
+            pos = 0
+        elif pos >= self._compact_threshold and pos * 2 >= end:
+            del buf[:pos]
+            pos = 0
+        self._pos = pos
+        return messages
+
+    def feed_and_drain(self, data: bytes | bytearray | memoryview) -> list[bytes]:
+        self.feed(data)
+        return self.drain()
+
+
+__all__ = ["MessageFramer"]
@@ -11,7 +11,7 @@ remove the size prefix and put the rest in a Queue.
 import logging
 from threading import Thread
 
-from ibapi import comm
+from ibapi.framing import MessageFramer
 
 logger = logging.getLogger(__name__)
 
@@ -25,24 +25,17 @@ class EReader(Thread):
     def run(self):
         try:
             logger.debug("EReader thread started")
-            buf = b""
+            framer = MessageFramer()
             while self.conn.isConnected():
                 data = self.conn.recvMsg()
                 logger.debug("reader loop, recvd size %d", len(data))
-                buf += data
-
-                while len(buf) > 0:
-                    (size, msg, buf) = comm.read_msg(buf)
-                    # logger.debug("resp %s", buf.decode('ascii'))
-                    logger.debug(
-                        "size:%d msg.size:%d msg:|%s| buf:%s|", size, len(msg), buf, "|"
-                    )
-
-                    if msg:
-                        self.msg_queue.put(msg)
-                    else:
-                        logger.debug("more incoming packet(s) are needed ")
-                        break
+                framer.feed(data)
+
+                for msg in framer.drain():
+                    logger.debug("msg.size:%d", len(msg))
+                    self.msg_queue.put(msg)
+                if len(framer):
+                    logger.debug("more incoming packet(s) are needed ")
 
             logger.debug("EReader thread finished")
         except Exception:
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 __all__ = [
+    "series_index",
     "storage",
     "throttling",
+    "timeseries",
 ]
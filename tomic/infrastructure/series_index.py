@@ -0,0 +1,172 @@
+"""Latest-record index for directories of per-symbol history files.
+
+Finding the last record of ``<dir>/<SYMBOL>.json`` means parsing the whole
+history.  :class:`SeriesIndex` keeps one small sidecar file per directory
+(``.series_index``) with, per symbol, the latest record, the record count,
+the date range and the ``(mtime_ns, size)`` of the source file.
+
+Every lookup checks that stamp against the source file, so an entry that
+is out of date (or missing) is rebuilt from the history file and written
+back.  The index is therefore always correct; writing it is best effort (a
+read-only data directory just means rebuilding on every lookup) and writers
+merely keep it warm:
+:func:`~tomic.infrastructure.storage.update_json_file` and
+:func:`~tomic.infrastructure.storage.merge_json_records` call
+:func:`note_write` for directories that already have an index.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from tomic.logutils import logger
+
+from .storage import PathLike, file_lock, load_json, save_json
+
+INDEX_NAME = ".series_index"
+
+
+def _summarize(records: Iterable[Any], key: str) -> dict[str, Any]:
+    rows = [rec for rec in records if isinstance(rec, dict)]
+    dates = [str(rec[key]) for rec in rows if rec.get(key)]
+    return {
+        "latest": rows[-1] if rows else None,
+        "count": len(rows),
+        "first_date": min(dates) if dates else None,
+        "last_date": max(dates) if dates else None,
+    }
+
+
+def _stamp(stat: os.stat_result) -> dict[str, int]:
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _matches(entry: Any, stat: os.stat_result | None) -> bool:
+    return (
+        isinstance(entry, dict)
+        and stat is not None
+        and entry.get("mtime_ns") == stat.st_mtime_ns
+        and entry.get("size") == stat.st_size
+    )
+
+
+class SeriesIndex:
+    """Index of the ``*.json`` histories in ``directory``."""
+
+    def __init__(self, directory: PathLike, *, key: str = "date") -> None:
+        self.directory = Path(directory)
+        self.path = self.directory / INDEX_NAME
+        self.key = key
+
+    def _load(self) -> dict[str, Any]:
+        data = load_json(self.path, default_factory=dict, copy=False)
+        return data if isinstance(data, dict) else {}
+
+    def _build(self, path: Path, stat: os.stat_result) -> dict[str, Any]:
+        data = load_json(path, default_factory=list, copy=False)
+        records = data if isinstance(data, list) else []
+        records = sorted(
+            (rec for rec in records if isinstance(rec, dict)),
+            key=lambda rec: str(rec.get(self.key, "")),
+        )
+        return {**_summarize(records, self.key), **_stamp(stat)}
+
+    def _store(self, updates: dict[str, dict | None]) -> None:
+        try:
+            with file_lock(self.path):
+                index = dict(self._load())
+                for symbol, entry in updates.items():
+                    if entry is None:
+                        index.pop(symbol, None)
+                    else:
+                        index[symbol] = entry
+                save_json(index, self.path)
+        except OSError as exc:
+            logger.debug(f"Series index {self.path} niet bijgewerkt: {exc}")
+
+    def entries(self, symbols: Iterable[str] | None = None) -> dict[str, dict]:
+        """Return the index entry of every symbol that has a history file.
+
+        Without ``symbols`` all ``*.json`` files in the directory are listed.
+        """
+
+        if symbols is None:
+            symbols = [p.stem for p in sorted(self.directory.glob("*.json"))]
+        index = self._load()
+        result: dict[str, dict] = {}
+        rebuilt: dict[str, dict | None] = {}
+        for symbol in symbols:
+            try:
+                stat = (self.directory / f"{symbol}.json").stat()
+            except OSError:
+                if symbol in index:
+                    rebuilt[symbol] = None
+                continue
+            entry = index.get(symbol)
+            if not _matches(entry, stat):
+                entry = self._build(self.directory / f"{symbol}.json", stat)
+                rebuilt[symbol] = entry
+            result[symbol] = entry
+        if rebuilt:
+            self._store(rebuilt)
+        return result
+
+    def entry(self, symbol: str) -> dict | None:
+        return self.entries([symbol]).get(symbol)
+
+    def latest(self, symbol: str) -> dict | None:
+        """Return a copy of the most recent record of ``symbol``."""
+
+        entry = self.entry(symbol)
+        latest = entry.get("latest") if entry else None
+        return dict(latest) if isinstance(latest, dict) else None
+
+
+def note_write(
+    path: PathLike,
+    before: os.stat_result | None,
+    *,
+    records: Sequence[Any] | None = None,
+    tail: Sequence[dict] = (),
+    added: int = 0,
+    key: str = "date",
+) -> None:
+    """Update the index entry of ``path`` after a write.
+
+    ``records`` is the full sorted content after a rewrite.  After an
+    in-place append pass the written ``tail`` records and the number of
+    records ``added``; the previous entry must still describe the file as
+    it was ``before`` the write, otherwise the entry is dropped and rebuilt
+    on the next lookup.  Directories without an index are left alone.
+    """
+
+    p = Path(path)
+    index = SeriesIndex(p.parent, key=key)
+    if not index.path.exists():
+        return
+    symbol = p.stem
+    try:
+        stat = p.stat()
+    except OSError:
+        return
+    if records is not None:
+        entry: dict | None = {**_summarize(records, key), **_stamp(stat)}
+    else:
+        old = index._load().get(symbol)
+        if not tail or not _matches(old, before):
+            entry = None
+        else:
+            dates = [str(rec[key]) for rec in tail if rec.get(key)]
+            entry = {
+                "latest": tail[-1],
+                "count": int(old.get("count") or 0) + added,
+                "first_date": old.get("first_date") or (dates[0] if dates else None),
+                "last_date": dates[-1] if dates else old.get("last_date"),
+                **_stamp(stat),
+            }
+    index._store({symbol: entry})
+
+
+__all__ = ["INDEX_NAME", "SeriesIndex", "note_write"]
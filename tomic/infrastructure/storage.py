@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import tempfile
 import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Iterable, List, Sequence
+from typing import Any, Callable, Iterable, Iterator, Sequence
 
-from tomic.helpers.json_utils import dump_json
+try:  # pragma: no cover - not available on Windows
+    import fcntl
+except ImportError:  # pragma: no cover - fall back to in-process locking
+    fcntl = None  # type: ignore[assignment]
+
+from tomic.helpers.json_utils import _default, dump_json
 from tomic.logutils import logger
 
 PathLike = str | Path
@@ -27,25 +38,340 @@ def _get_file_lock(path: PathLike) -> threading.Lock:
         return _file_locks[path_str]
 
 
+_held = threading.local()
+
+
+@contextmanager
+def _os_lock(resolved: str, mode: int) -> Iterator[None]:
+    lock_dir = Path(tempfile.gettempdir()) / "tomic-locks"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha1(resolved.encode("utf-8")).hexdigest()
+    with open(lock_dir / f"{digest}.lock", "a") as handle:
+        fcntl.flock(handle, mode)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: PathLike, *, shared: bool = False) -> Iterator[None]:
+    """Hold the in-process lock and an exclusive OS lock for ``path``.
+
+    The OS lock lives in a file under the temp directory, because the data
+    file itself is replaced on every full rewrite.  With ``shared`` only a
+    read lock is taken, best effort: readers wait for a writer but not for
+    each other.  A thread that already holds the lock passes straight
+    through.
+    """
+
+    resolved = str(Path(path).resolve())
+    held: set[str] = _held.__dict__.setdefault("paths", set())
+    if resolved in held:
+        yield
+        return
+    if shared:
+        if fcntl is None:
+            yield
+            return
+        try:
+            lock = _os_lock(resolved, fcntl.LOCK_SH)
+            lock.__enter__()
+        except OSError:
+            yield
+            return
+        try:
+            yield
+        finally:
+            lock.__exit__(None, None, None)
+        return
+    with _get_file_lock(resolved):
+        held.add(resolved)
+        try:
+            if fcntl is None:
+                yield
+            else:
+                with _os_lock(resolved, fcntl.LOCK_EX):
+                    yield
+        finally:
+            held.discard(resolved)
+
+
+# Records written by ``dump_json`` start on a new line indented two spaces.
+_RECORD_START = b"\n  {"
+_TAIL_CHUNK = 64 * 1024
+_TAIL_LIMIT = 1024 * 1024
+_COPY_CHUNK = 1024 * 1024
+
+
+def _read_tail(path: Path) -> tuple[dict, int | None, int] | None:
+    """Return the last record of the JSON list at ``path`` and its bounds.
+
+    The bounds are the offset just past the previous record (``None`` when
+    the last record is the only one) and the offset just past the last
+    record.  Only the end of the file is read.  ``None`` means the layout is not the
+    one ``dump_json`` produces (or the list is empty) and the caller has to
+    rewrite the file.
+    """
+
+    try:
+        size = path.stat().st_size
+        with path.open("rb") as handle:
+            chunk = _TAIL_CHUNK
+            while True:
+                start = max(0, size - chunk)
+                handle.seek(start)
+                tail = handle.read().rstrip()
+                if not tail.endswith(b"]"):
+                    return None
+                body = tail[:-1].rstrip()
+                begin = body.rfind(_RECORD_START)
+                if begin >= 0:
+                    break
+                if start == 0 or chunk >= _TAIL_LIMIT:
+                    return None
+                chunk *= 4
+        record = json.loads(body[begin + 1 :])
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict):
+        return None
+    before = body[:begin].rstrip()
+    previous = start + len(before) - 1 if before.endswith(b",") else None
+    return record, previous, start + len(body)
+
+
+def _undo_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.undo")
+
+
+def _recover_append(path: Path) -> None:
+    """Roll back an in-place append whose writer died halfway."""
+
+    undo = _undo_path(path)
+    if not undo.exists():
+        return
+    with file_lock(path):
+        try:
+            blob = undo.read_bytes()
+        except FileNotFoundError:  # another process got here first
+            return
+        header, _, original = blob.partition(b"\n")
+        try:
+            offset, length = (int(part) for part in header.split())
+        except ValueError:
+            length = -1
+        # A short undo file means the writer died before touching the data.
+        if length == len(original):
+            with path.open("r+b") as handle:
+                handle.seek(offset)
+                handle.write(original)
+                handle.truncate()
+            logger.warning(f"Onderbroken append op {path} teruggedraaid")
+        undo.unlink()
+        _JSON_CACHE.discard(os.path.abspath(path))
+
+
+def _append_records(path: Path, records: Sequence[dict], offset: int) -> None:
+    """Write ``records`` after the record that ends at ``offset``.
+
+    Anything after ``offset`` is overwritten in place, so only the new
+    records and the few bytes they replace hit the disk.  Those bytes go to
+    an undo file first; the next reader or writer rolls back an append that
+    did not finish (:func:`_recover_append`), and :func:`load_json` reads
+    under a shared lock, so it never sees a torn list.  Without ``fcntl``
+    readers cannot wait and the file is copied and replaced instead, which
+    costs I/O proportional to the history.  Callers hold :func:`file_lock`.
+    """
+
+    parts = [
+        "\n".join(
+            "  " + line
+            for line in json.dumps(rec, indent=2, default=_default).splitlines()
+        )
+        for rec in records
+    ]
+    payload = (",\n" + ",\n".join(parts) + "\n]").encode("utf-8")
+    if fcntl is not None:
+        undo = _undo_path(path)
+        with path.open("r+b") as handle:
+            handle.seek(offset)
+            original = handle.read()
+            undo.write_bytes(f"{offset} {len(original)}\n".encode("ascii") + original)
+            handle.seek(offset)
+            handle.write(payload)
+            handle.truncate()
+        undo.unlink()
+        _JSON_CACHE.discard(os.path.abspath(path))
+        return
+    tmp = path.with_name(f"temp_{path.name}")
+    with path.open("rb") as src, tmp.open("wb") as dst:
+        remaining = offset
+        while remaining:
+            chunk = src.read(min(remaining, _COPY_CHUNK))
+            if not chunk:
+                raise OSError(f"{path} shrank while appending")
+            dst.write(chunk)
+            remaining -= len(chunk)
+        dst.write(payload)
+    tmp.replace(path)
+    _JSON_CACHE.discard(os.path.abspath(path))
+
+
 def _ensure_parent(path: PathLike) -> Path:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
     return p
 
 
-def load_json(path: PathLike, *, default_factory: DefaultFactory | None = None) -> Any:
-    """Return parsed JSON data from ``path`` or ``default_factory()`` when missing."""
+_CONTAINERS = (dict, list)
+
+
+def _copy_json(data: Any) -> Any:
+    """Return a deep copy of parsed JSON (dicts, lists and scalars only)."""
+
+    if type(data) is dict:
+        result = data.copy()
+        for key, value in result.items():
+            if type(value) in _CONTAINERS:
+                result[key] = _copy_json(value)
+        return result
+    if type(data) is list:
+        return [_copy_json(item) if type(item) in _CONTAINERS else item for item in data]
+    return data
+
+
+class _JsonReadCache:
+    """Parsed JSON per absolute path, valid while ``(mtime_ns, size)`` match.
+
+    Memory is bounded by the summed size of the cached files
+    (``JSON_CACHE_MAX_MB``); the least recently used files go first.  Files
+    modified during the last second are not cached because a second write
+    within the file system's timestamp granularity could keep the same
+    stamp.
+    """
+
+    _RACY_NS = 1_000_000_000
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[int, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _limit() -> int:
+        from tomic.config import get as cfg_get
+
+        return int(float(cfg_get("JSON_CACHE_MAX_MB", 64)) * 1024 * 1024)
+
+    def get(self, key: str, stat: os.stat_result) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[2]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, stat: os.stat_result, data: Any) -> bool:
+        """Cache ``data``; ``False`` when the file is too large or too fresh."""
+
+        limit = self._limit()
+        if stat.st_size > limit or time.time_ns() - stat.st_mtime_ns < self._RACY_NS:
+            self.discard(key)
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, data)
+            self._bytes += stat.st_size
+            while self._bytes > limit and self._entries:
+                _, (_, size, _) = self._entries.popitem(last=False)
+                self._bytes -= size
+                self.evictions += 1
+        return True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "files": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+_JSON_CACHE = _JsonReadCache()
+
+
+def json_cache_stats() -> dict[str, int]:
+    """Return hit/miss/eviction counters and the size of the read cache."""
+
+    return _JSON_CACHE.stats()
+
+
+def clear_json_cache() -> None:
+    """Drop every cached file and reset the counters."""
+
+    _JSON_CACHE.clear()
+
+
+def load_json(
+    path: PathLike,
+    *,
+    default_factory: DefaultFactory | None = None,
+    copy: bool = True,
+) -> Any:
+    """Return parsed JSON data from ``path`` or ``default_factory()`` when missing.
+
+    Results are cached until the file's mtime or size changes, so reading
+    an unchanged file costs a ``stat``.  Files are parsed under a shared
+    :func:`file_lock`, so an in-place append is never seen halfway.
+    Callers get their own copy unless they pass ``copy=False``, in which
+    case the shared cached object is returned and must not be modified.
+    """
 
     p = Path(path)
     factory = default_factory or list
-    if not p.exists():
-        return factory()
     try:
-        with p.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
-    except (json.JSONDecodeError, OSError, IOError) as exc:
-        logger.error(f"Corrupted or unreadable JSON at {p}: {exc}")
+        stat = p.stat()
+    except OSError:
         return factory()
+    key = os.path.abspath(p)
+    found, data = _JSON_CACHE.get(key, stat)
+    if not found:
+        try:
+            _recover_append(p)
+            with file_lock(p, shared=True):
+                stat = p.stat()
+                with p.open("r", encoding="utf-8") as handle:
+                    data = json.load(handle)
+        except FileNotFoundError:
+            return factory()
+        except (json.JSONDecodeError, OSError, IOError) as exc:
+            logger.error(f"Corrupted or unreadable JSON at {p}: {exc}")
+            return factory()
+        if not _JSON_CACHE.put(key, stat, data):
+            return data
+    return _copy_json(data) if copy else data
 
 
 def save_json(data: Any, path: PathLike) -> None:
@@ -55,6 +381,24 @@ def save_json(data: Any, path: PathLike) -> None:
     tmp = p.with_name(f"temp_{p.name}")
     dump_json(data, tmp)
     tmp.replace(p)
+    _JSON_CACHE.discard(os.path.abspath(p))
+
+
+def _load_for_rewrite(path: Path) -> list:
+    """Return the records stored at ``path`` before a full rewrite.
+
+    A missing or empty file holds no records.  A file that exists but is
+    not a JSON list raises :class:`ValueError` instead of being replaced by
+    the new records alone.
+    """
+
+    stat = _stat(path)
+    if stat is None or stat.st_size == 0:
+        return []
+    data = load_json(path, default_factory=lambda: None)
+    if not isinstance(data, list):
+        raise ValueError(f"Refusing to rewrite {path}: existing content is not a JSON list")
+    return data
 
 
 def update_json_file(
@@ -63,16 +407,25 @@ def update_json_file(
     key_fields: Sequence[str],
     *,
     sort_key: str | Callable[[dict], Any] | None = "date",
-) -> List[dict]:
+) -> None:
     """Insert ``new_record`` into ``file`` ensuring unique records per key.
 
-    Thread-safe: uses file-level locking to prevent race conditions.
+    When ``new_record`` sorts after the last record (or replaces it) only
+    the end of the file is rewritten, in place; otherwise the whole file is
+    replaced.  Readers never see either halfway.  A file that does not parse
+    raises :class:`ValueError` and is left untouched.
+
+    Safe across threads and processes: writers hold a per-file lock.
     """
-    lock = _get_file_lock(file)
-    with lock:
-        data = load_json(file, default_factory=list)
-        if not isinstance(data, list):
-            data = []
+    path = Path(file)
+    with file_lock(path):
+        _recover_append(path)
+        before = _stat(path)
+        appended = _try_append(path, [new_record], key_fields, sort_key, replace=True)
+        if appended is not None:
+            _note_write(path, before, sort_key, tail=appended[0], added=appended[1])
+            return
+        data = _load_for_rewrite(path)
         filtered: list[dict] = []
         for record in data:
             if not isinstance(record, dict):
@@ -86,8 +439,72 @@ def update_json_file(
                 filtered.sort(key=lambda r: r.get(sort_key, ""))
             else:
                 filtered.sort(key=sort_key)
-        save_json(filtered, file)
-        return filtered
+        save_json(filtered, path)
+        _note_write(path, before, sort_key, records=filtered)
+
+
+def _stat(path: Path) -> os.stat_result | None:
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+def _note_write(
+    path: Path,
+    before: os.stat_result | None,
+    sort_key: str | Callable[[dict], Any] | None,
+    **kwargs: Any,
+) -> None:
+    """Keep the latest-record index of ``path``'s directory in step."""
+
+    if not isinstance(sort_key, str):
+        return
+    from .series_index import note_write
+
+    note_write(path, before, key=sort_key, **kwargs)
+
+
+def _try_append(
+    path: Path,
+    records: Sequence[dict],
+    key_fields: Sequence[str],
+    sort_key: str | Callable[[dict], Any] | None,
+    *,
+    replace: bool = False,
+) -> tuple[list[dict], int] | None:
+    """Write ``records`` at the end of ``path`` when that keeps it sorted and unique.
+
+    Requires ``sort_key`` to be one of ``key_fields``: every record then
+    sorts strictly after the current last one, so none of them can collide
+    with an existing record.  With ``replace`` a single record whose key
+    equals the last record's key overwrites it.  Returns the written tail
+    and the number of records added, or ``None`` when a rewrite is needed.
+    """
+
+    if not isinstance(sort_key, str) or sort_key not in key_fields or not records:
+        return None
+    tail = _read_tail(path)
+    if tail is None:
+        return None
+    last, previous, end = tail
+    last_value = last.get(sort_key, "")
+    try:
+        if all(rec.get(sort_key, "") > last_value for rec in records):
+            ordered = sorted(records, key=lambda r: r.get(sort_key, ""))
+            _append_records(path, ordered, end)
+            return ordered, len(ordered)
+    except TypeError:
+        return None
+    if (
+        replace
+        and len(records) == 1
+        and previous is not None
+        and all(records[0].get(k) == last.get(k) for k in key_fields)
+    ):
+        _append_records(path, records, previous)
+        return list(records), 0
+    return None
 
 
 def merge_json_records(
@@ -98,18 +515,29 @@ def merge_json_records(
 ) -> int:
     """Merge ``records`` into ``file`` keyed by ``key``.
 
-    Thread-safe: uses file-level locking to prevent race conditions.
+    Records newer than the last stored one are appended in place; anything
+    else triggers a full rewrite.  A file that
+    does not parse raises :class:`ValueError`.  Safe across threads and
+    processes.
     """
-    lock = _get_file_lock(file)
-    with lock:
-        existing = load_json(file, default_factory=list)
-        if not isinstance(existing, list):
-            existing = []
+    incoming = [rec for rec in records if isinstance(rec, dict)]
+    if not incoming:
+        return 0
+    path = Path(file)
+    with file_lock(path):
+        _recover_append(path)
+        before = _stat(path)
+        appended = _try_append(path, incoming, [key], key)
+        if appended is not None:
+            _note_write(path, before, key, tail=appended[0], added=appended[1])
+            return appended[1]
+        existing = _load_for_rewrite(path)
         seen = {rec.get(key) for rec in existing if isinstance(rec, dict)}
-        new_records = [rec for rec in records if isinstance(rec, dict) and rec.get(key) not in seen]
+        new_records = [rec for rec in incoming if rec.get(key) not in seen]
         if not new_records:
             return 0
         existing.extend(new_records)
         existing.sort(key=lambda rec: rec.get(key, ""))
-        save_json(existing, file)
+        save_json(existing, path)
+        _note_write(path, before, key, records=existing)
         return len(new_records)
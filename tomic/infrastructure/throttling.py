@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import asyncio
-from collections import deque
+import threading
 import time
-from typing import Awaitable, Callable, Deque
+from collections import deque
+from typing import Awaitable, Callable
 
 ClockFunc = Callable[[], float]
 SleepFunc = Callable[[float], None]
@@ -16,11 +17,25 @@ LogFunc = Callable[[str], None]
 class RateLimiter:
     """Bound the number of calls permitted during a time window.
 
-    The limiter supports both synchronous and asynchronous flows.  By default it
-    enforces ``max_calls`` across ``period`` seconds using ``time.monotonic``.
-    The provided ``sleep`` and ``async_sleep`` callables are invoked whenever a
-    wait is required.  Passing the module-level ``sleep`` function from a script
-    keeps monkeypatch-friendly behaviour in the test-suite.
+    No window of ``period`` seconds ever holds more than ``max_calls``
+    calls.  Within that limit the limiter is a token bucket refilled at
+    ``max_calls / period`` tokens per second that holds at most ``burst``
+    tokens (``max_calls`` by default, never more): up to ``burst`` calls go
+    through at once, later ones are spread out at the steady rate.  The
+    window is checked against the times of the last ``max_calls``
+    reservations, since a refilled bucket alone would allow close to
+    ``max_calls + burst`` calls in one window.
+
+    It is safe to share between threads and event loops: every
+    caller reserves the next free slot under a lock and then sleeps outside
+    of it until exactly that moment.  Reservations are handed out in arrival
+    order, so waiters are served FIFO and each one wakes up once instead of
+    polling.
+
+    The limiter supports both synchronous and asynchronous flows.  The
+    provided ``sleep`` and ``async_sleep`` callables are invoked whenever a
+    wait is required.  Passing the module-level ``sleep`` function from a
+    script keeps monkeypatch-friendly behaviour in the test-suite.
     """
 
     def __init__(
@@ -28,48 +43,91 @@ class RateLimiter:
         max_calls: int,
         period: float,
         *,
+        burst: int | None = None,
         clock: ClockFunc | None = None,
         sleep: SleepFunc | None = None,
         async_sleep: AsyncSleepFunc | None = None,
     ) -> None:
         self.max_calls = max_calls
         self.period = max(period, 0.0)
+        self.burst = max(1, min(burst if burst is not None else max_calls, max(max_calls, 1)))
         self._clock: ClockFunc = clock or time.monotonic
         self._sleep: SleepFunc | None = sleep or time.sleep
         self._async_sleep: AsyncSleepFunc | None = async_sleep or asyncio.sleep
-        self._timestamps: Deque[float] = deque()
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = self._clock()
+        self._waiting = 0
+        # Reservation times that still count towards a window
+        self._granted: deque[float] = deque()
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
     def _enabled(self) -> bool:
-        return self.max_calls > 0 and self.period >= 0.0
+        return self.max_calls > 0 and self.period > 0.0
 
-    def _purge(self, now: float) -> None:
-        """Discard timestamps that fall outside the active window."""
+    @property
+    def rate(self) -> float:
+        """Tokens added per second (``0`` when the limiter is disabled)."""
 
-        if not self._timestamps:
-            return
-        boundary = now - self.period
-        while self._timestamps and self._timestamps[0] <= boundary:
-            self._timestamps.popleft()
+        return self.max_calls / self.period if self._enabled() else 0.0
 
-    def _delay_required(self, now: float) -> float:
-        """Return the number of seconds required before the next call."""
+    def _refill(self, now: float) -> None:
+        """Credit the tokens accrued since the last update. Caller holds the lock."""
 
-        if not self._enabled():
-            return 0.0
-        self._purge(now)
-        if len(self._timestamps) < self.max_calls:
-            return 0.0
-        oldest = self._timestamps[0]
-        remaining = self.period - (now - oldest)
-        return remaining if remaining > 0 else 0.0
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+            self._updated = now
 
-    def _record(self, when: float) -> None:
-        if not self._enabled():
-            return
-        self._timestamps.append(when)
+    def _reserve(self) -> float:
+        """Take the next token and return the clock time it becomes valid.
+
+        The balance may go negative: the debt is what orders later callers
+        behind this one.  The slot is pushed back further when it would put
+        more than ``max_calls`` reservations in one ``period``.
+        """
+
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1.0
+            ready = now if self._tokens >= 0 else now - self._tokens / self.rate
+            ready = max(ready, self._window_ready(now))
+            self._granted.append(ready)
+            return ready
+
+    def _window_ready(self, now: float) -> float:
+        """Earliest time a new call keeps every window within ``max_calls``.
+
+        Caller holds the lock.
+        """
+
+        granted = self._granted
+        while granted and granted[0] + self.period <= now:
+            granted.popleft()
+        if not granted:
+            return now
+        ready = granted[-1]
+        if len(granted) >= self.max_calls:
+            ready = max(ready, granted[-self.max_calls] + self.period)
+        return ready
+
+    def _refund(self, ready_at: float) -> None:
+        """Return a reserved token whose caller gave up before using it."""
+
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(float(self.burst), self._tokens + 1.0)
+            try:
+                self._granted.remove(ready_at)
+            except ValueError:
+                pass
+
+    def _log_wait(self, log: LogFunc | None, message: str | None, delay: float) -> None:
+        if log is not None and message is not None:
+            log(message.format(wait=delay, max_calls=self.max_calls, period=self.period))
 
     # ------------------------------------------------------------------
     # Public API
@@ -77,15 +135,40 @@ class RateLimiter:
     def time_until_ready(self) -> float:
         """Return seconds until the next call is allowed (without sleeping)."""
 
-        now = self._clock()
-        return self._delay_required(now)
+        if not self._enabled():
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            missing = 1.0 - self._tokens
+            window = self._window_ready(now) - now
+        return max(missing / self.rate if missing > 0 else 0.0, window)
+
+    def utilization(self) -> float:
+        """Return the share of the burst capacity currently in use.
+
+        ``0.0`` means a full bucket, ``1.0`` an empty one.  Values above
+        ``1.0`` indicate reservations queued beyond the bucket, i.e. callers
+        should lower their concurrency.
+        """
+
+        if not self._enabled():
+            return 0.0
+        with self._lock:
+            self._refill(self._clock())
+            return max(0.0, (self.burst - self._tokens) / self.burst)
+
+    def waiting(self) -> int:
+        """Return the number of callers currently sleeping on a reservation."""
+
+        with self._lock:
+            return self._waiting
 
     def record(self) -> None:
         """Register an external call without triggering a sleep."""
 
-        now = self._clock()
-        self._purge(now)
-        self._record(now)
+        if self._enabled():
+            self._reserve()
 
     def wait(
         self,
@@ -98,19 +181,26 @@ class RateLimiter:
         if not self._enabled():
             return 0.0
 
+        ready_at = self._reserve()
+        delay = ready_at - self._clock()
+        if delay <= 0:
+            return 0.0
+        if self._sleep is None:
+            self._refund(ready_at)
+            raise RuntimeError("RateLimiter sleep requested but no sleep function provided")
+        self._log_wait(log, message, delay)
         waited = 0.0
-        while True:
-            now = self._clock()
-            delay = self._delay_required(now)
-            if delay <= 0:
-                self._record(now)
-                return waited
-            if log is not None and message is not None and waited == 0.0:
-                log(message.format(wait=delay, max_calls=self.max_calls, period=self.period))
-            if self._sleep is None:
-                raise RuntimeError("RateLimiter sleep requested but no sleep function provided")
-            self._sleep(delay)
-            waited += delay
+        with self._lock:
+            self._waiting += 1
+        try:
+            while delay > 0:
+                self._sleep(delay)
+                waited += delay
+                delay = ready_at - self._clock()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        return waited
 
     async def wait_async(
         self,
@@ -118,23 +208,37 @@ class RateLimiter:
         log: LogFunc | None = None,
         message: str | None = None,
     ) -> float:
-        """Asynchronous variant of :meth:`wait`."""
+        """Asynchronous variant of :meth:`wait`.
+
+        The lock is only held while reserving, so the event loop is never
+        blocked.  A cancelled waiter gives its token back.
+        """
 
         if not self._enabled():
             return 0.0
 
+        ready_at = self._reserve()
+        delay = ready_at - self._clock()
+        if delay <= 0:
+            return 0.0
+        if self._async_sleep is None:
+            self._refund(ready_at)
+            raise RuntimeError(
+                "RateLimiter async wait requested but no async sleep function provided"
+            )
+        self._log_wait(log, message, delay)
         waited = 0.0
-        while True:
-            now = self._clock()
-            delay = self._delay_required(now)
-            if delay <= 0:
-                self._record(now)
-                return waited
-            if log is not None and message is not None and waited == 0.0:
-                log(message.format(wait=delay, max_calls=self.max_calls, period=self.period))
-            if self._async_sleep is None:
-                raise RuntimeError(
-                    "RateLimiter async wait requested but no async sleep function provided"
-                )
-            await self._async_sleep(delay)
-            waited += delay
+        with self._lock:
+            self._waiting += 1
+        try:
+            while delay > 0:
+                await self._async_sleep(delay)
+                waited += delay
+                delay = ready_at - self._clock()
+        except asyncio.CancelledError:
+            self._refund(ready_at)
+            raise
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        return waited
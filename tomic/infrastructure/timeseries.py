@@ -0,0 +1,359 @@
+"""SQLite backed store for per-symbol daily time series.
+
+Spot prices, IV daily summaries and historical volatility are kept as one
+JSON list per symbol (``<dir>/<SYMBOL>.json``).  Readers parse the whole file
+even when they only need the last record.  :class:`TimeSeriesStore` keeps the
+same records in a single SQLite database keyed by ``(dataset, symbol,
+date)`` so point, range and latest lookups only touch the rows they need.
+
+The JSON files remain the source of truth for writers.  :func:`read_series`
+and :func:`read_latest` are the compatibility read path: with the store
+disabled (``TIMESERIES_STORE_ENABLED``) they parse the JSON file as before;
+with it enabled they re-import a file whose size or mtime changed since the
+last import and answer from the database.  Without the store,
+:func:`read_latest` answers from the directory's
+:class:`~tomic.infrastructure.series_index.SeriesIndex`.  The dataset of a file is the
+name of its directory, e.g. ``spot_prices``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from tomic.config import get as cfg_get
+from tomic.logutils import logger
+
+from .series_index import SeriesIndex
+from .storage import PathLike, load_json, save_json
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS records (
+        dataset TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        date TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        PRIMARY KEY (dataset, symbol, date)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sources (
+        dataset TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        path TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        PRIMARY KEY (dataset, symbol)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def _rows(
+    dataset: str, symbol: str, records: Iterable[Any], key: str
+) -> Iterator[tuple[str, str, str, str]]:
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        stamp = record.get(key)
+        if not stamp:
+            continue
+        yield dataset, symbol, str(stamp), json.dumps(record, separators=(",", ":"))
+
+
+class TimeSeriesStore:
+    """Daily records per ``(dataset, symbol, date)`` in one SQLite file.
+
+    Connections are opened per thread, so a store can be shared freely.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def get(self, dataset: str, symbol: str, date: str) -> dict | None:
+        """Return the record of ``symbol`` on ``date`` or ``None``."""
+
+        row = self._connect().execute(
+            "SELECT payload FROM records WHERE dataset=? AND symbol=? AND date=?",
+            (dataset, symbol, date),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def range(
+        self,
+        dataset: str,
+        symbol: str,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> list[dict]:
+        """Return records with ``start <= date <= end`` sorted by date."""
+
+        sql = "SELECT payload FROM records WHERE dataset=? AND symbol=?"
+        params: list[Any] = [dataset, symbol]
+        if start is not None:
+            sql += " AND date >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND date <= ?"
+            params.append(end)
+        rows = self._connect().execute(sql + " ORDER BY date", params).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def latest(self, dataset: str, symbol: str) -> dict | None:
+        """Return the most recent record of ``symbol``."""
+
+        row = self._connect().execute(
+            "SELECT payload FROM records WHERE dataset=? AND symbol=? "
+            "ORDER BY date DESC LIMIT 1",
+            (dataset, symbol),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def symbols(self, dataset: str) -> list[str]:
+        rows = self._connect().execute(
+            "SELECT DISTINCT symbol FROM records WHERE dataset=? ORDER BY symbol",
+            (dataset,),
+        ).fetchall()
+        return [symbol for (symbol,) in rows]
+
+    def count(self, dataset: str, symbol: str | None = None) -> int:
+        sql = "SELECT COUNT(*) FROM records WHERE dataset=?"
+        params: list[Any] = [dataset]
+        if symbol is not None:
+            sql += " AND symbol=?"
+            params.append(symbol)
+        return int(self._connect().execute(sql, params).fetchone()[0])
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def append(
+        self,
+        dataset: str,
+        symbol: str,
+        records: Iterable[Any],
+        *,
+        key: str = "date",
+    ) -> int:
+        """Insert or replace ``records`` keyed by ``key`` in one transaction."""
+
+        rows = list(_rows(dataset, symbol, records, key))
+        if not rows:
+            return 0
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO records(dataset, symbol, date, payload) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def replace(
+        self, dataset: str, symbol: str, records: Iterable[Any], *, key: str = "date"
+    ) -> int:
+        """Replace every record of ``symbol`` with ``records``."""
+
+        rows = list(_rows(dataset, symbol, records, key))
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.execute("DELETE FROM records WHERE dataset=? AND symbol=?", (dataset, symbol))
+            conn.executemany(
+                "INSERT OR REPLACE INTO records(dataset, symbol, date, payload) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # JSON bridge
+    # ------------------------------------------------------------------
+    def import_json(self, dataset: str, path: PathLike, *, symbol: str | None = None) -> int:
+        """Replace ``symbol`` (default: file stem) with the records in ``path``."""
+
+        p = Path(path)
+        symbol = symbol or p.stem
+        try:
+            stat = p.stat()
+        except OSError:
+            return 0
+        data = load_json(p, default_factory=list, copy=False)
+        count = self.replace(dataset, symbol, data if isinstance(data, list) else [])
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sources(dataset, symbol, path, mtime_ns, size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (dataset, symbol, str(p.resolve()), stat.st_mtime_ns, stat.st_size),
+            )
+        return count
+
+    def import_json_dir(self, dataset: str, directory: PathLike) -> int:
+        """Import every ``*.json`` file in ``directory``; return the record count."""
+
+        total = 0
+        for path in sorted(Path(directory).glob("*.json")):
+            total += self.import_json(dataset, path)
+        return total
+
+    def export_json_dir(self, dataset: str, directory: PathLike) -> int:
+        """Write one JSON list per symbol of ``dataset`` to ``directory``."""
+
+        total = 0
+        for symbol in self.symbols(dataset):
+            records = self.range(dataset, symbol)
+            save_json(records, Path(directory) / f"{symbol}.json")
+            total += len(records)
+        return total
+
+    def sync_json(self, dataset: str, path: PathLike) -> bool:
+        """Re-import ``path`` when it changed since the last import.
+
+        Returns ``True`` when the store holds data for the file's symbol.
+        """
+
+        p = Path(path)
+        symbol = p.stem
+        try:
+            stat = p.stat()
+        except OSError:
+            # JSON removed after migrating: serve whatever was imported.
+            return self.count(dataset, symbol) > 0
+        row = self._connect().execute(
+            "SELECT path, mtime_ns, size FROM sources WHERE dataset=? AND symbol=?",
+            (dataset, symbol),
+        ).fetchone()
+        if row != (str(p.resolve()), stat.st_mtime_ns, stat.st_size):
+            self.import_json(dataset, p, symbol=symbol)
+        return True
+
+
+_DEFAULT_STORE: TimeSeriesStore | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_timeseries_store() -> TimeSeriesStore | None:
+    """Return the process wide store, or ``None`` when it is disabled."""
+
+    global _DEFAULT_STORE
+    if not bool(cfg_get("TIMESERIES_STORE_ENABLED", False)):
+        return None
+    with _DEFAULT_LOCK:
+        if _DEFAULT_STORE is None:
+            path = cfg_get("TIMESERIES_DB", "tomic/data/timeseries.sqlite3")
+            _DEFAULT_STORE = TimeSeriesStore(Path(path).expanduser())
+        return _DEFAULT_STORE
+
+
+def set_timeseries_store(store: TimeSeriesStore | None) -> None:
+    """Replace the process wide store (``None`` re-reads the configuration)."""
+
+    global _DEFAULT_STORE
+    with _DEFAULT_LOCK:
+        _DEFAULT_STORE = store
+
+
+def _store_for(path: Path) -> TimeSeriesStore | None:
+    store = get_timeseries_store()
+    if store is None:
+        return None
+    try:
+        if store.sync_json(path.parent.name, path):
+            return store
+    except sqlite3.Error as exc:
+        logger.warning(f"Tijdreeks database niet bruikbaar, terug naar JSON: {exc}")
+    return None
+
+
+def read_series(
+    path: PathLike, *, start: str | None = None, end: str | None = None
+) -> list[dict]:
+    """Return the records of the JSON series at ``path`` sorted by date."""
+
+    p = Path(path)
+    store = _store_for(p)
+    if store is not None:
+        return store.range(p.parent.name, p.stem, start, end)
+    if not os.path.exists(p):
+        return []
+    data = load_json(p, default_factory=list)
+    if not isinstance(data, list):
+        return []
+    records = [rec for rec in data if isinstance(rec, dict)]
+    records.sort(key=lambda rec: rec.get("date", ""))
+    if start is not None or end is not None:
+        records = [
+            rec
+            for rec in records
+            if (start is None or str(rec.get("date", "")) >= start)
+            and (end is None or str(rec.get("date", "")) <= end)
+        ]
+    return records
+
+
+def read_latest(path: PathLike) -> dict | None:
+    """Return the most recent record of the JSON series at ``path``."""
+
+    p = Path(path)
+    store = _store_for(p)
+    if store is not None:
+        return store.latest(p.parent.name, p.stem)
+    return SeriesIndex(p.parent).latest(p.stem)
+
+
+def read_latest_many(directory: PathLike, symbols: Iterable[str]) -> dict[str, dict]:
+    """Return the most recent record per symbol of the series in ``directory``.
+
+    Without the store this reads the series index once for all symbols.
+    """
+
+    base = Path(directory)
+    symbols = list(symbols)
+    if get_timeseries_store() is not None:
+        latest = {symbol: read_latest(base / f"{symbol}.json") for symbol in symbols}
+        return {symbol: rec for symbol, rec in latest.items() if rec is not None}
+    entries = SeriesIndex(base).entries(symbols)
+    return {
+        symbol: dict(entry["latest"])
+        for symbol, entry in entries.items()
+        if isinstance(entry.get("latest"), dict)
+    }
+
+
+__all__ = [
+    "TimeSeriesStore",
+    "get_timeseries_store",
+    "read_latest",
+    "read_latest_many",
+    "read_series",
+    "set_timeseries_store",
+]
@@ -1,5 +1,20 @@
 """Polygon integration package."""
 
+from typing import TYPE_CHECKING
+
 from .client import PolygonClient
 
-__all__ = ["PolygonClient"]
+if TYPE_CHECKING:  # pragma: no cover - import hints only
+    from .async_client import AsyncPolygonClient
+
+
+def __getattr__(name: str):
+    # ``aiohttp`` is only imported by callers that use the async client.
+    if name == "AsyncPolygonClient":
+        from .async_client import AsyncPolygonClient
+
+        return AsyncPolygonClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["AsyncPolygonClient", "PolygonClient"]
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+"""Asynchronous Polygon REST client for concurrent bulk fetches.
+
+:class:`AsyncPolygonClient` mirrors the endpoints and the retry semantics of
+:class:`~tomic.integrations.polygon.client.PolygonClient` (429 back-off,
+rotating to the next API key on 403, :class:`CircuitBreaker` accounting) on
+top of ``aiohttp``.  Requests run concurrently up to ``concurrency`` and
+draw from a shared rate budget: one
+:class:`~tomic.infrastructure.throttling.RateLimiter` per API key, so every
+extra key adds its own quota.  Nightly updates are latency bound, not
+quota bound, which is what the serial client with its fixed sleeps wastes.
+"""
+
+import asyncio
+import json
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+import aiohttp
+
+from ... import config as cfg
+from ...infrastructure.throttling import RateLimiter
+from ...logutils import logger
+from .cache import ResponseCache, get_response_cache
+from .client import CircuitBreaker, CircuitBreakerError, PolygonClient, _mask_key_index
+
+AsyncSleepFunc = Callable[[float], Awaitable[None]]
+
+
+def _default_limiter() -> RateLimiter:
+    """Return the per-key budget: ``POLYGON_REQUESTS_PER_MINUTE`` or one call
+    per ``POLYGON_SLEEP_BETWEEN`` seconds like the serial fetchers."""
+
+    per_minute = cfg.get("POLYGON_REQUESTS_PER_MINUTE")
+    try:
+        per_minute = int(per_minute) if per_minute is not None else None
+    except (TypeError, ValueError):
+        per_minute = None
+    if per_minute:
+        return RateLimiter(per_minute, 60.0)
+    return RateLimiter(1, float(cfg.get("POLYGON_SLEEP_BETWEEN", 1.2)))
+
+
+class AsyncPolygonClient:
+    """Polygon REST client for ``asyncio`` with bounded concurrency.
+
+    Use as ``async with AsyncPolygonClient() as client`` and ``await`` the
+    ``fetch_*`` methods from as many tasks as needed; at most
+    ``concurrency`` requests are in flight and each API key stays within
+    its rate budget.  Pass ``limiter`` to share one budget across all keys
+    (or across several clients).
+    """
+
+    BASE_URL = PolygonClient.BASE_URL
+
+    def __init__(
+        self,
+        api_key: str | Sequence[str] | None = None,
+        *,
+        concurrency: int | None = None,
+        limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        cache: ResponseCache | None = None,
+        base_url: str | None = None,
+        timeout: float = 10.0,
+        sleep: AsyncSleepFunc | None = None,
+    ) -> None:
+        keys = (
+            api_key
+            or cfg.get("POLYGON_API_KEYS")
+            or cfg.get("POLYGON_API_KEY", "")
+        )
+        if isinstance(keys, str):
+            keys = [k.strip() for k in keys.split(",") if k.strip()]
+        self._api_keys: List[str] = list(keys) if keys else []
+        self._api_idx = 0
+        if concurrency is None:
+            concurrency = int(cfg.get("POLYGON_MAX_CONCURRENCY", 1) or 1)
+        self.concurrency = max(1, int(concurrency))
+        self._limiters: List[RateLimiter] = (
+            [limiter]
+            if limiter is not None
+            else [_default_limiter() for _ in range(max(len(self._api_keys), 1))]
+        )
+        self._circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_threshold=5,
+            recovery_timeout=60.0,
+            half_open_max_calls=3,
+        )
+        self._cache = cache if cache is not None else get_response_cache()
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self._timeout = timeout
+        self._sleep: AsyncSleepFunc = sleep or asyncio.sleep
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _next_key_index(self) -> int:
+        idx = self._api_idx % max(len(self._api_keys), 1)
+        self._api_idx += 1
+        return idx
+
+    def _limiter_for(self, idx: int) -> RateLimiter:
+        return self._limiters[idx % len(self._limiters)]
+
+    async def connect(self) -> None:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self._timeout)
+            )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def disconnect(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncPolygonClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.disconnect()
+
+    # Internal helper -------------------------------------------------
+    async def _request(
+        self, path: str, params: Dict[str, Any] | None = None
+    ) -> Dict[str, Any]:
+        if self._session is None or self._semaphore is None:
+            raise RuntimeError("Client not connected")
+        async with self._semaphore:
+            return await self._send(self._session, path, params)
+
+    async def _send(
+        self,
+        session: aiohttp.ClientSession,
+        path: str,
+        params: Dict[str, Any] | None,
+    ) -> Dict[str, Any]:
+        cached = self._cache.get(path, params) if self._cache is not None else None
+        if cached is not None and cached.fresh:
+            logger.debug(f"Polygon cache hit for {path}")
+            return cached.payload
+        headers = cached.validators() if cached is not None else {}
+
+        if not self._circuit_breaker.allow_request():
+            logger.warning(
+                f"Circuit breaker OPEN - blocking request to {path}. "
+                f"Service may be unavailable."
+            )
+            raise CircuitBreakerError(
+                f"Polygon API circuit breaker is open. Request to {path} blocked."
+            )
+
+        params = dict(params or {})
+        total_keys = len(self._api_keys)
+        key_idx = self._next_key_index()
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        attempts = 0
+        key_attempts = 0
+        max_keys = max(total_keys, 1)
+
+        try:
+            while True:
+                api_key = self._api_keys[key_idx] if self._api_keys else ""
+                if api_key:
+                    logger.debug(f"Using Polygon {_mask_key_index(key_idx, total_keys)}")
+                await self._limiter_for(key_idx).wait_async()
+                params["apiKey"] = api_key
+                masked = {**params, "apiKey": "***"}
+                logger.debug(f"GET {url} params={masked}")
+                async with session.get(url, params=params, headers=headers) as resp:
+                    status = resp.status
+                    text = await resp.text()
+                    resp_headers = resp.headers
+                    logger.debug(f"Response {status}: {text[:200]}")
+
+                    if status == 429:
+                        attempts += 1
+                        wait = min(60, 2 ** attempts + random.uniform(0, 1))
+                        logger.warning(
+                            f"Polygon rate limit hit (attempt {attempts}), sleeping {wait:.1f}s"
+                        )
+                        await self._sleep(wait)
+                        if attempts < 5:
+                            continue
+                        # Record failure for circuit breaker after max retries
+                        self._circuit_breaker.record_failure()
+
+                    elif status == 403 and key_attempts < max_keys - 1:
+                        key_attempts += 1
+                        logger.warning(
+                            f"Polygon 403 for {_mask_key_index(key_idx, total_keys)} "
+                            f"— trying next key."
+                        )
+                        key_idx = self._next_key_index()
+                        continue
+
+                    elif status == 304 and cached is not None:
+                        break
+
+                    elif 500 <= status < 600:
+                        # Server errors trip the circuit; 4xx are client errors
+                        self._circuit_breaker.record_failure()
+
+                    resp.raise_for_status()
+                break
+
+            self._circuit_breaker.record_success()
+            if status == 304 and cached is not None:
+                self._cache.refresh(cached, path, params)
+                return cached.payload
+            try:
+                data = json.loads(text) if text else {}
+            except ValueError as exc:  # JSON decode error
+                logger.warning(f"Invalid JSON from Polygon for {path}: {exc}")
+                return {}
+            if self._cache is not None:
+                self._cache.put(
+                    path,
+                    params,
+                    data,
+                    etag=resp_headers.get("ETag"),
+                    last_modified=resp_headers.get("Last-Modified"),
+                )
+            return data
+
+        except asyncio.TimeoutError as exc:
+            self._circuit_breaker.record_failure()
+            logger.error(f"Polygon request timeout for {path}: {exc}")
+            raise
+        except aiohttp.ClientResponseError:
+            raise
+        except aiohttp.ClientError as exc:
+            self._circuit_breaker.record_failure()
+            logger.error(f"Polygon connection error for {path}: {exc}")
+            raise
+
+    # Endpoints -------------------------------------------------------
+    async def fetch_option_chain(self, symbol: str) -> List[Dict[str, Any]]:
+        """Return option contracts for ``symbol`` using Polygon."""
+        data = await self._request(
+            "v3/reference/options/contracts",
+            {"underlying_ticker": symbol.upper()},
+        )
+        return data.get("results", [])
+
+    async def fetch_market_metrics(self, symbol: str) -> Dict[str, Any]:
+        """Return simple market metrics for ``symbol`` from Polygon."""
+        data = await self._request(f"v2/aggs/ticker/{symbol.upper()}/prev", {})
+        results = data.get("results") or []
+        spot = results[0].get("c") if results else None
+        return {"spot_price": spot}
+
+    async def fetch_spot_price(self, symbol: str) -> float | None:
+        """Return the latest trade price for ``symbol``."""
+        data = await self._request(
+            f"v2/snapshot/locale/us/markets/stocks/tickers/{symbol.upper()}"
+        )
+        ticker = data.get("ticker") or {}
+        price = None
+        last_trade = ticker.get("lastTrade") or ticker.get("last") or {}
+        if last_trade:
+            price = last_trade.get("p") or last_trade.get("price")
+        if price is None:
+            price = ticker.get("day", {}).get("c") or ticker.get("min", {}).get("c")
+
+        # Valt terug op de last-trade-endpoint wanneer snapshot niets oplevert
+        if price is None:
+            data = await self._request(f"v2/last/trade/{symbol.upper()}")
+            result = data.get("results") or data.get("last") or {}
+            price = result.get("p") or result.get("price")
+
+        try:
+            return float(price) if price is not None else None
+        except Exception:
+            return None
+
+    async def fetch_ticker_details(self, symbol: str) -> Dict[str, Any]:
+        """Fetch ticker details; see :meth:`PolygonClient.fetch_ticker_details`."""
+        try:
+            data = await self._request(f"v3/reference/tickers/{symbol.upper()}")
+            results = data.get("results", {})
+
+            return {
+                "symbol": symbol.upper(),
+                "name": results.get("name"),
+                "market": results.get("market"),
+                "locale": results.get("locale"),
+                "primary_exchange": results.get("primary_exchange"),
+                "type": results.get("type"),
+                "sic_code": results.get("sic_code"),
+                "sic_description": results.get("sic_description"),
+                "market_cap": results.get("market_cap"),
+                "currency": results.get("currency_name"),
+            }
+        except Exception as exc:
+            logger.warning(f"Failed to fetch ticker details for {symbol}: {exc}")
+            return {"symbol": symbol.upper()}
+
+    async def fetch_ticker_details_batch(
+        self, symbols: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch ticker details for multiple symbols concurrently.
+
+        Pacing comes from the rate budget instead of fixed sleeps.
+        """
+        details = await asyncio.gather(
+            *(self.fetch_ticker_details(symbol) for symbol in symbols)
+        )
+        return {symbol.upper(): detail for symbol, detail in zip(symbols, details)}
+
+
+__all__ = ["AsyncPolygonClient"]
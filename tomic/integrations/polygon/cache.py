@@ -0,0 +1,324 @@
+"""On-disk cache for Polygon REST responses.
+
+Ticker details, closed historical aggregates and option snapshots are
+requested again on every run, and sometimes within the same run.
+:class:`ResponseCache` keeps the decoded JSON payloads in one SQLite file,
+keyed by the normalised request (path plus sorted query parameters, without
+``apiKey``), so repeated requests cost neither time nor quota.
+
+How long a response stays fresh depends on the endpoint (see
+:data:`TTL_POLICIES`): aggregates whose range ended more than
+:data:`CLOSED_BARS_AFTER_DAYS` days ago never change, reference data lives
+for a day and snapshots for seconds.  ``POLYGON_HTTP_CACHE_TTL`` overrides
+a policy by name, ``bars_closed`` for closed ranges (``None`` = never
+expires, ``0`` = do not cache).  Expired entries that came with an
+``ETag`` or ``Last-Modified`` header are revalidated with a conditional
+request instead of being fetched again.  The file is kept below ``POLYGON_HTTP_CACHE_MAX_MB`` by evicting the least
+recently used entries.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Mapping
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from zoneinfo import ZoneInfo
+
+from tomic.config import get as cfg_get
+from tomic.logutils import logger
+
+CLOSED_BARS_AFTER_DAYS = 3
+
+#: ``(name, path pattern, ttl)`` in match order; ``ttl`` is seconds,
+#: ``None`` for responses that never change and ``0`` for "do not cache".
+#: ``bars`` is resolved per request by :func:`_bars_ttl`.
+TTL_POLICIES: tuple[tuple[str, re.Pattern[str], float | None], ...] = (
+    ("bars", re.compile(r"^v2/aggs/ticker/[^/]+/range/\d+/\w+/(?P<start>[^/]+)/(?P<end>[^/]+)$"), 3600.0),
+    ("prev", re.compile(r"^v2/aggs/ticker/[^/]+/prev$"), 3600.0),
+    ("snapshot", re.compile(r"^v[23]/(snapshot|last)/"), 15.0),
+    ("contracts", re.compile(r"^v3/reference/options/contracts"), 3600.0),
+    ("reference", re.compile(r"^v3/reference/"), 86400.0),
+)
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        payload TEXT NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        stored_at REAL NOT NULL,
+        expires_at REAL,
+        accessed_at REAL NOT NULL,
+        size INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS responses_lru ON responses(accessed_at, size);
+    CREATE TABLE IF NOT EXISTS cache_size (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        total INTEGER NOT NULL
+    );
+    INSERT INTO cache_size(id, total)
+        SELECT 0, COALESCE(SUM(size), 0) FROM responses
+        WHERE NOT EXISTS (SELECT 1 FROM cache_size);
+    CREATE TRIGGER IF NOT EXISTS responses_size_insert AFTER INSERT ON responses
+        BEGIN UPDATE cache_size SET total = total + NEW.size; END;
+    CREATE TRIGGER IF NOT EXISTS responses_size_delete AFTER DELETE ON responses
+        BEGIN UPDATE cache_size SET total = total - OLD.size; END;
+    CREATE TRIGGER IF NOT EXISTS responses_size_update AFTER UPDATE OF size ON responses
+        BEGIN UPDATE cache_size SET total = total - OLD.size + NEW.size; END;
+"""
+
+
+def _today() -> date:
+    return datetime.now(ZoneInfo("America/New_York")).date()
+
+
+def _bars_ttl(match: re.Match[str], ttl: float | None) -> float | None:
+    """Closed ranges never change; recent ones may still be completed."""
+
+    try:
+        end = date.fromisoformat(match.group("end"))
+    except ValueError:
+        return ttl
+    if end <= _today() - timedelta(days=CLOSED_BARS_AFTER_DAYS):
+        return None
+    return ttl
+
+
+def request_key(path: str, params: Mapping[str, Any] | None = None) -> tuple[str, str]:
+    """Return ``(endpoint path, cache key)`` for a request.
+
+    Query parameters embedded in ``path`` (pagination ``next_url``) and in
+    ``params`` are merged and sorted; ``apiKey`` is dropped.
+    """
+
+    parts = urlsplit(path)
+    endpoint = parts.path.lstrip("/")
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "apiKey"]
+    query += [(str(k), str(v)) for k, v in (params or {}).items() if k != "apiKey"]
+    query.sort()
+    return endpoint, f"{endpoint}?{urlencode(query)}" if query else endpoint
+
+
+@dataclass
+class CachedResponse:
+    """A cache hit; stale hits carry the validators for revalidation."""
+
+    key: str
+    payload: Any
+    fresh: bool
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def validators(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Size-bounded SQLite cache of Polygon JSON responses.
+
+    Connections are opened per thread, so a cache can be shared freely.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_overrides: Mapping[str, float | None] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max(int(max_bytes), 0)
+        self.ttl_overrides = dict(ttl_overrides or {})
+        self._clock = clock
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def ttl_for(self, path: str, params: Mapping[str, Any] | None = None) -> float | None:
+        """Return the TTL of a request: seconds, ``None`` (forever) or ``0``."""
+
+        endpoint, _ = request_key(path, params)
+        for name, pattern, ttl in TTL_POLICIES:
+            match = pattern.match(endpoint)
+            if match is None:
+                continue
+            if name == "bars":
+                if _bars_ttl(match, ttl) is None:
+                    return self.ttl_overrides.get("bars_closed")
+                return self.ttl_overrides.get("bars", ttl)
+            return self.ttl_overrides.get(name, ttl)
+        return 0.0
+
+    def get(self, path: str, params: Mapping[str, Any] | None = None) -> CachedResponse | None:
+        """Return the cached response, or ``None`` when there is nothing usable.
+
+        Expired entries are only returned (with ``fresh=False``) when they
+        can be revalidated.
+        """
+
+        if self.ttl_for(path, params) == 0:
+            return None
+        _, key = request_key(path, params)
+        row = self._connect().execute(
+            "SELECT payload, etag, last_modified, expires_at FROM responses WHERE key=?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        payload, etag, last_modified, expires_at = row
+        now = self._clock()
+        fresh = expires_at is None or expires_at > now
+        if not fresh and not (etag or last_modified):
+            return None
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.execute("UPDATE responses SET accessed_at=? WHERE key=?", (now, key))
+        return CachedResponse(key, json.loads(payload), fresh, etag, last_modified)
+
+    def put(
+        self,
+        path: str,
+        params: Mapping[str, Any] | None,
+        payload: Any,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> bool:
+        """Store ``payload`` if the endpoint is cacheable; return whether it was."""
+
+        ttl = self.ttl_for(path, params)
+        if ttl == 0:
+            return False
+        _, key = request_key(path, params)
+        body = json.dumps(payload, separators=(",", ":"))
+        now = self._clock()
+        expires_at = None if ttl is None else now + ttl
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.execute(
+                "INSERT INTO responses(key, payload, etag, last_modified, stored_at, "
+                "expires_at, accessed_at, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET payload=excluded.payload, "
+                "etag=excluded.etag, last_modified=excluded.last_modified, "
+                "stored_at=excluded.stored_at, expires_at=excluded.expires_at, "
+                "accessed_at=excluded.accessed_at, size=excluded.size",
+                (key, body, etag, last_modified, now, expires_at, now, len(body)),
+            )
+            self._evict(conn)
+        return True
+
+    def refresh(self, entry: CachedResponse, path: str, params: Mapping[str, Any] | None) -> None:
+        """Extend ``entry`` after the server answered ``304 Not Modified``."""
+
+        ttl = self.ttl_for(path, params)
+        now = self._clock()
+        expires_at = None if ttl is None else now + ttl
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.execute(
+                "UPDATE responses SET expires_at=?, accessed_at=? WHERE key=?",
+                (expires_at, now, entry.key),
+            )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop the least recently used entries until the cache fits.
+
+        The total size is kept in ``cache_size`` by triggers, and the oldest
+        entries are read from the ``(accessed_at, size)`` index only as far
+        as needed.
+        """
+
+        total = int(conn.execute("SELECT total FROM cache_size").fetchone()[0])
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT rowid, size FROM responses ORDER BY accessed_at")
+        evicted = []
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((rowid,))
+            total -= size
+        rows.close()
+        conn.executemany("DELETE FROM responses WHERE rowid=?", evicted)
+        logger.debug(f"Polygon cache: {len(evicted)} responses verwijderd (limiet)")
+
+    def stats(self) -> dict[str, int]:
+        count, size = self._connect().execute(
+            "SELECT COUNT(*), (SELECT total FROM cache_size) FROM responses"
+        ).fetchone()
+        return {"entries": int(count), "bytes": int(size), "max_bytes": self.max_bytes}
+
+    def clear(self) -> None:
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.execute("DELETE FROM responses")
+
+
+_DEFAULT_CACHE: ResponseCache | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the process wide cache, or ``None`` when it is disabled."""
+
+    global _DEFAULT_CACHE
+    if not bool(cfg_get("POLYGON_HTTP_CACHE_ENABLED", False)):
+        return None
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is None:
+            path = cfg_get("POLYGON_HTTP_CACHE_PATH", "tomic/data/polygon_http_cache.sqlite3")
+            max_mb = float(cfg_get("POLYGON_HTTP_CACHE_MAX_MB", 256))
+            _DEFAULT_CACHE = ResponseCache(
+                Path(path).expanduser(),
+                max_bytes=int(max_mb * 1024 * 1024),
+                ttl_overrides=cfg_get("POLYGON_HTTP_CACHE_TTL", {}) or {},
+            )
+        return _DEFAULT_CACHE
+
+
+def set_response_cache(cache: ResponseCache | None) -> None:
+    """Replace the process wide cache (``None`` re-reads the configuration)."""
+
+    global _DEFAULT_CACHE
+    with _DEFAULT_LOCK:
+        _DEFAULT_CACHE = cache
+
+
+__all__ = [
+    "CachedResponse",
+    "ResponseCache",
+    "TTL_POLICIES",
+    "get_response_cache",
+    "request_key",
+    "set_response_cache",
+]
@@ -13,6 +13,7 @@ import requests
 from ... import config as cfg
 from ...logutils import logger
 from ...market_provider import MarketDataProvider
+from .cache import ResponseCache, get_response_cache
 
 
 class CircuitState(Enum):
@@ -145,6 +146,7 @@ class PolygonClient(MarketDataProvider):
         self,
         api_key: str | None = None,
         circuit_breaker: CircuitBreaker | None = None,
+        cache: ResponseCache | None = None,
     ) -> None:
         keys = (
             api_key
@@ -162,6 +164,8 @@ class PolygonClient(MarketDataProvider):
             recovery_timeout=60.0,
             half_open_max_calls=3,
         )
+        # On-disk response cache (``POLYGON_HTTP_CACHE_ENABLED``)
+        self._cache = cache if cache is not None else get_response_cache()
 
     def _next_api_key(self) -> str:
         if not self._api_keys:
@@ -183,6 +187,12 @@ class PolygonClient(MarketDataProvider):
         if self._session is None:
             raise RuntimeError("Client not connected")
 
+        cached = self._cache.get(path, params) if self._cache is not None else None
+        if cached is not None and cached.fresh:
+            logger.debug(f"Polygon cache hit for {path}")
+            return cached.payload
+        headers = cached.validators() if cached is not None else {}
+
         # Check circuit breaker before making request
         if not self._circuit_breaker.allow_request():
             logger.warning(
@@ -209,7 +219,10 @@ class PolygonClient(MarketDataProvider):
                 params["apiKey"] = api_key
                 masked = {**params, "apiKey": "***"}
                 logger.debug(f"GET {url} params={masked}")
-                resp = self._session.get(url, params=params, timeout=10)
+                if headers:
+                    resp = self._session.get(url, params=params, timeout=10, headers=headers)
+                else:
+                    resp = self._session.get(url, params=params, timeout=10)
                 status = getattr(resp, "status_code", "n/a")
                 text = getattr(resp, "text", "")
                 logger.debug(f"Response {status}: {text[:200]}")
@@ -246,14 +259,28 @@ class PolygonClient(MarketDataProvider):
 
                 break
 
+            if status == 304 and cached is not None:
+                self._circuit_breaker.record_success()
+                self._cache.refresh(cached, path, params)
+                return cached.payload
             resp.raise_for_status()
             # Record success for circuit breaker
             self._circuit_breaker.record_success()
             try:
-                return resp.json()
+                data = resp.json()
             except ValueError as exc:  # JSON decode error
                 logger.warning(f"Invalid JSON from Polygon for {path}: {exc}")
                 return {}
+            if self._cache is not None:
+                resp_headers = getattr(resp, "headers", None) or {}
+                self._cache.put(
+                    path,
+                    params,
+                    data,
+                    etag=resp_headers.get("ETag"),
+                    last_modified=resp_headers.get("Last-Modified"),
+                )
+            return data
 
         except requests.exceptions.Timeout as exc:
             self._circuit_breaker.record_failure()
@@ -1,17 +1,132 @@
 import json
+import time
 from pathlib import Path
 
 from tomic.logutils import logger
 
-from tomic.api.margin_calc import calculate_trade_margin
+from tomic.api.margin_calc import calculate_trade_margin, calculate_trade_margins
 from tomic.logutils import setup_logging
 from tomic.config import get as cfg_get
 
 JOURNAL_FILE = Path(cfg_get("JOURNAL_FILE", "journal.json"))
 
 
-def update_all_margins() -> None:
-    """Recalculate and store InitMargin for each trade in journal.json."""
+def leg_set_key(symbol: str, expiry: str, legs: list) -> str:
+    """Return a key identifying the combination of ``legs``, order-insensitive."""
+
+    parts = sorted(
+        f"{str(leg.get('action', '')).upper()}:{float(leg.get('qty') or 0):g}:"
+        f"{str(leg.get('type', '')).upper()}:{float(leg.get('strike') or 0):g}"
+        for leg in legs
+    )
+    return "|".join([str(symbol).upper(), str(expiry).replace("-", ""), *parts])
+
+
+class MarginCache:
+    """IB what-if margins per leg set, stored as JSON.
+
+    Entries older than ``MARGIN_CACHE_TTL_HOURS`` are ignored so margins
+    still follow the underlying over time.
+    """
+
+    def __init__(self, path: Path | None = None, ttl: float | None = None) -> None:
+        self.path = Path(path or cfg_get("MARGIN_CACHE_FILE", "tomic/data/margin_cache.json"))
+        if ttl is None:
+            ttl = float(cfg_get("MARGIN_CACHE_TTL_HOURS", 24)) * 3600
+        self.ttl = max(float(ttl), 0.0)
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        if isinstance(data, dict):
+            self._entries = {k: v for k, v in data.items() if isinstance(v, dict)}
+
+    def get(self, key: str) -> float | None:
+        if self.ttl <= 0:
+            return None
+        entry = self._entries.get(key)
+        if not entry or time.time() - float(entry.get("stored_at", 0)) > self.ttl:
+            return None
+        return entry.get("margin")
+
+    def put(self, key: str, margin: float) -> None:
+        self._entries[key] = {"margin": margin, "stored_at": time.time()}
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty or self.ttl <= 0:
+            return
+        now = time.time()
+        entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if now - float(entry.get("stored_at", 0)) <= self.ttl
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+            self._dirty = False
+        except OSError as exc:
+            logger.warning(f"⚠️ Kon margin cache niet opslaan: {exc}")
+
+
+def estimate_margin(trade: dict) -> float | None:
+    """Return the local margin engine estimate for a journal ``trade``."""
+
+    from tomic.pricing.margin_engine import compute_margin_and_rr
+
+    legs = []
+    for leg in trade.get("Legs") or []:
+        qty = float(leg.get("qty") or 1)
+        sign = -1 if str(leg.get("action", "")).upper() == "SELL" else 1
+        legs.append({**leg, "type": str(leg.get("type", "")).lower(), "position": sign * qty})
+    strategy = str(trade.get("Type") or "").strip().lower().replace(" ", "_")
+    try:
+        result = compute_margin_and_rr(
+            {"strategy": strategy, "legs": legs, "net_credit": trade.get("Premium")}
+        )
+    except Exception as exc:
+        logger.debug(f"Margin schatting mislukt voor {trade.get('TradeID')}: {exc}")
+        return None
+    return round(result.margin, 2) if result.margin is not None else None
+
+
+def _usable_estimate(trade: dict) -> float | None:
+    """Return a positive estimate for ``trade`` or ``None``."""
+
+    margin = estimate_margin(trade)
+    return margin if margin is not None and margin > 0 else None
+
+
+def _keeps_margin(trade: dict) -> bool:
+    """Whether ``trade`` holds a margin an estimate must not replace."""
+
+    return trade.get("InitMargin") is not None and trade.get("InitMarginSource") != "estimate"
+
+
+def _calculate_sequential(requests: list[tuple[str, str, list]]) -> list[float | None]:
+    margins = []
+    for sym, expiry, legs in requests:
+        try:
+            margins.append(calculate_trade_margin(sym, expiry, legs))
+        except Exception as exc:
+            logger.error(f"⚠️ Failed to calculate margin: {exc}")
+            margins.append(None)
+    return margins
+
+
+def update_all_margins(*, batch: bool | None = None) -> None:
+    """Recalculate and store InitMargin for each trade in journal.json.
+
+    Identical leg sets are calculated once and served from
+    :class:`MarginCache` while fresh.  In batch mode (``MARGIN_BATCH_WHATIF``)
+    every remaining trade is priced over one IB connection.  Trades IB did
+    not answer for keep their stored margin; trades without one (or with an
+    earlier estimate) get the local margin engine estimate, marked with
+    ``InitMarginSource: "estimate"``.
+    """
     logger.info(f"🚀 Start margin update voor {JOURNAL_FILE}")
     if not JOURNAL_FILE.exists():
         logger.error("⚠️ journal.json not found.")
@@ -31,7 +146,12 @@ def update_all_margins() -> None:
         logger.error("⚠️ Journal file does not contain a list")
         return
 
+    if batch is None:
+        batch = bool(cfg_get("MARGIN_BATCH_WHATIF", True))
+    cache = MarginCache()
     updated_count = 0
+    groups: dict[str, list[dict]] = {}
+    requests: list[tuple[str, str, list]] = []
     for trade in journal:
         sym = trade.get("Symbool")
         expiry = trade.get("Expiry")
@@ -39,14 +159,52 @@ def update_all_margins() -> None:
         if not sym or not expiry or not legs:
             continue
 
-        logger.info(f"🔄 Calculating margin for TradeID {trade.get('TradeID')}")
         try:
-            margin = calculate_trade_margin(sym, expiry, legs)
-            trade["InitMargin"] = margin
-            logger.info(f"   InitMargin → {margin}")
+            key = leg_set_key(sym, expiry, legs)
+        except (AttributeError, TypeError, ValueError) as exc:
+            logger.error(f"⚠️ Ongeldige legs voor TradeID {trade.get('TradeID')}: {exc}")
+            continue
+        cached = cache.get(key)
+        if cached is not None:
+            trade["InitMargin"] = cached
+            trade.pop("InitMarginSource", None)
+            logger.info(f"   InitMargin (cache) TradeID {trade.get('TradeID')} → {cached}")
             updated_count += 1
-        except Exception as exc:
-            logger.error(f"⚠️ Failed to calculate margin: {exc}")
+            continue
+        if key not in groups:
+            groups[key] = []
+            requests.append((sym, expiry, legs))
+        groups[key].append(trade)
+
+    if requests:
+        logger.info(f"🔄 Calculating margin for {len(requests)} leg set(s) (batch={batch})")
+        margins = calculate_trade_margins(requests) if batch else _calculate_sequential(requests)
+        for key, margin in zip(groups, margins):
+            trades = groups[key]
+            if margin is not None:
+                cache.put(key, margin)
+                for trade in trades:
+                    trade["InitMargin"] = margin
+                    trade.pop("InitMarginSource", None)
+                    logger.info(f"   InitMargin TradeID {trade.get('TradeID')} → {margin}")
+                    updated_count += 1
+                continue
+            estimate = _usable_estimate(trades[0])
+            for trade in trades:
+                if estimate is None or _keeps_margin(trade):
+                    logger.warning(
+                        f"⚠️ Geen IB margin voor TradeID {trade.get('TradeID')}, "
+                        f"InitMargin blijft {trade.get('InitMargin')}"
+                    )
+                    continue
+                trade["InitMargin"] = estimate
+                trade["InitMarginSource"] = "estimate"
+                logger.warning(
+                    f"⚠️ Geen IB margin voor TradeID {trade.get('TradeID')}, "
+                    f"schatting → {estimate}"
+                )
+                updated_count += 1
+        cache.save()
 
     if updated_count:
         try:
@@ -20,10 +20,13 @@ if not JOURNAL_FILE.is_absolute():
     JOURNAL_FILE = config._BASE_DIR / JOURNAL_FILE
 
 
-def load_json(path: PathLike) -> Any:
-    """Return parsed JSON from ``path`` or an empty list."""
+def load_json(path: PathLike, *, copy: bool = True) -> Any:
+    """Return parsed JSON from ``path`` or an empty list.
 
-    data = storage_load_json(path, default_factory=list)
+    Pass ``copy=False`` for read-only access to the shared cached object.
+    """
+
+    data = storage_load_json(path, default_factory=list, copy=copy)
     if not isinstance(data, list):
         return data
     return data
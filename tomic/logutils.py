@@ -2,16 +2,21 @@ from __future__ import annotations
 
 import logging
 import os
+import re
 import sys
+import threading
+from collections import Counter, deque
+from collections.abc import Mapping
 from contextlib import contextmanager
 from contextvars import ContextVar
+from dataclasses import dataclass
 
 from tomic.config import get as cfg_get
 from functools import wraps
 from typing import Any, Callable, Iterator, Optional, TypeVar, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover - type hints only
-    from collections.abc import Iterable, Mapping, Sequence
+    from collections.abc import Iterable, Sequence
     from tomic.core.pricing.mid_tags import MidTagSnapshot
     from tomic.reporting import EvaluationSummary
 from tomic.strategy.reasons import ReasonLike, normalize_reason as _normalize_reason
@@ -206,6 +211,8 @@ def setup_logging(
             stream=stream,
         )
 
+    combo_recorder.verbose = is_debug or level == logging.DEBUG
+
     ib_level = logging.DEBUG if is_debug else logging.WARNING
     logging.getLogger("ibapi").setLevel(ib_level)
     logging.getLogger("ibapi.client").setLevel(ib_level)
@@ -304,18 +311,165 @@ def trace_calls(func: Callable[..., T]) -> Callable[..., T]:
     return wrapper
 
 
-def log_combo_evaluation(
-    strategy: str,
-    desc: str,
-    metrics: Optional[dict],
-    result: str,
-    reason: ReasonLike,
-    *,
-    legs: list[dict] | None = None,
-    extra: dict | None = None,
-) -> None:
-    """Log a strategy combination evaluation on INFO level."""
+@dataclass(slots=True)
+class ComboEvaluation:
+    """Unformatted record of a single strategy combination evaluation."""
+
+    strategy: str
+    desc: str
+    metrics: Optional[dict]
+    result: str
+    reason: ReasonLike
+    legs: list[dict] | None = None
+    extra: dict | None = None
+    symbol: str | None = None
+
+
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+# Fields of a buffered evaluation needed by :func:`format_combo_evaluation`.
+_COMBO_METRIC_FIELDS = ("pos", "max_profit", "max_loss", "ev")
+_COMBO_LEG_FIELDS = ("expiry", "type", "strike", "position")
+
+
+def _reason_key(reason: ReasonLike) -> tuple[str, str]:
+    """Return the ``(code, label)`` under which ``reason`` is counted.
+
+    Reason texts often embed values (``"credit 0.35 < 0.50"``); numbers are
+    masked so every kind of reason gets one counter instead of one per value.
+    """
+
+    if isinstance(reason, str):
+        label = _NUMBER.sub("#", reason.strip())
+        return label.lower(), label
+    detail = _normalize_reason(reason)
+    return _NUMBER.sub("#", detail.code), _NUMBER.sub("#", detail.message)
+
+
+def _buffered(evaluation: ComboEvaluation) -> ComboEvaluation:
+    """Return a copy of ``evaluation`` holding only the fields it renders.
+
+    Callers pass live proposal metrics and leg dicts; the ring buffer must
+    not keep those (and everything they reference) alive.
+    """
+
+    metrics = evaluation.metrics
+    legs = evaluation.legs
+    return ComboEvaluation(
+        evaluation.strategy,
+        evaluation.desc,
+        {key: metrics[key] for key in _COMBO_METRIC_FIELDS if key in metrics}
+        if metrics
+        else None,
+        evaluation.result,
+        evaluation.reason,
+        [
+            {key: leg[key] for key in _COMBO_LEG_FIELDS if key in leg}
+            for leg in legs
+            if isinstance(leg, Mapping)
+        ]
+        if legs
+        else None,
+        dict(evaluation.extra) if evaluation.extra else None,
+        evaluation.symbol,
+    )
+
+
+def _combo_verbose_default() -> bool:
+    debug_env = os.getenv("TOMIC_DEBUG", "0")
+    level_name = os.getenv("TOMIC_LOG_LEVEL", cfg_get("LOG_LEVEL", "INFO")) or ""
+    return debug_env not in {"0", "", "false", "False"} or level_name.upper() == "DEBUG"
+
+
+class ComboEvaluationRecorder:
+    """Bounded in-memory recorder for combo evaluations.
+
+    Evaluations are stored as trimmed :class:`ComboEvaluation` copies in a
+    ring buffer and counted per ``(strategy, result, reason code)``.  Nothing
+    is formatted while recording; log lines are rendered on demand via
+    :meth:`render` or emitted immediately only when ``verbose`` is enabled.
+    """
+
+    def __init__(self, capacity: int = 2000, *, verbose: bool = False) -> None:
+        self._buffer: deque[ComboEvaluation] = deque(maxlen=max(int(capacity), 1))
+        self._counts: Counter[tuple[str, str, str]] = Counter()
+        self._labels: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.verbose = verbose
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.maxlen or 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def record(self, evaluation: ComboEvaluation) -> None:
+        code, label = _reason_key(evaluation.reason)
+        item = _buffered(evaluation)
+        with self._lock:
+            self._buffer.append(item)
+            self._counts[(evaluation.strategy, evaluation.result, code)] += 1
+            self._labels.setdefault(code, label)
+
+    def recent(self, limit: int | None = None) -> list[ComboEvaluation]:
+        """Return buffered evaluations, oldest first."""
+
+        with self._lock:
+            items = list(self._buffer)
+        if limit is not None:
+            items = items[-limit:] if limit > 0 else []
+        return items
+
+    def counts(self) -> dict[tuple[str, str, str], int]:
+        """Return raw counters keyed by ``(strategy, result, reason code)``."""
+
+        with self._lock:
+            return dict(self._counts)
+
+    def reason_counts(self, result: str | None = "reject") -> dict[str, int]:
+        """Return counts per normalized reason message for ``result``."""
+
+        with self._lock:
+            counts = dict(self._counts)
+            labels = dict(self._labels)
+        totals: dict[str, int] = {}
+        for (_strategy, status, code), count in counts.items():
+            if result is not None and status != result:
+                continue
+            message = _normalize_reason(labels[code]).message
+            totals[message] = totals.get(message, 0) + count
+        return totals
+
+    def render(self, limit: int | None = None) -> list[str]:
+        """Return formatted log lines for the most recent evaluations."""
 
+        return [format_combo_evaluation(item) for item in self.recent(limit)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffer.clear()
+            self._counts.clear()
+            self._labels.clear()
+
+
+combo_recorder = ComboEvaluationRecorder(
+    int(cfg_get("COMBO_LOG_BUFFER_SIZE", 2000) or 2000),
+    verbose=_combo_verbose_default(),
+)
+
+
+def _combo_extra(evaluation: ComboEvaluation) -> dict[str, Any]:
+    extra_data: dict[str, Any] = dict(evaluation.extra or {})
+    if evaluation.symbol:
+        extra_data.setdefault("symbol", evaluation.symbol)
+    return extra_data
+
+
+def format_combo_evaluation(evaluation: ComboEvaluation) -> str:
+    """Render ``evaluation`` as the classic single-line combo log message."""
+
+    metrics = evaluation.metrics
     pos = metrics.get("pos") if metrics else None
     reward = metrics.get("max_profit") if metrics else None
     max_loss = metrics.get("max_loss") if metrics else None
@@ -332,11 +486,7 @@ def log_combo_evaluation(
     rr_str = f"{round(rr, 2)}" if isinstance(rr, (float, int)) else "n/a"
     ev_str = f"{round(ev, 4)}" if isinstance(ev, (float, int)) else "n/a"
 
-    extra_data: dict[str, Any] = dict(extra or {})
-    symbol_hint = extra_data.get("symbol") or _combo_symbol.get()
-    if symbol_hint:
-        extra_data.setdefault("symbol", symbol_hint)
-
+    extra_data = _combo_extra(evaluation)
     extra_parts: list[str] = []
     mid_meta = extra_data.get("mid")
     _MidTagSnapshot: type[Any] | None
@@ -358,6 +508,7 @@ def log_combo_evaluation(
         extra_data["mid"] = mid_meta.as_metadata()
     if extra_data:
         extra_parts.extend(f"{k}={v}" for k, v in extra_data.items())
+    legs = evaluation.legs
     if legs:
         expiries = sorted({str(l.get("expiry")) for l in legs if l.get("expiry")})
         if expiries:
@@ -374,13 +525,47 @@ def log_combo_evaluation(
             extra_parts.append(f"{label}={strike}{typ}")
     extra_str = " | " + " | ".join(extra_parts) if extra_parts else ""
 
-    detail = _normalize_reason(reason)
-    logger.info(
-        f"[{strategy}] {desc} — PoS {pos_str}, RR {rr_str}, EV {ev_str} — {result.upper()} ({detail.message}){extra_str}"
+    detail = _normalize_reason(evaluation.reason)
+    return (
+        f"[{evaluation.strategy}] {evaluation.desc} — PoS {pos_str}, RR {rr_str}, "
+        f"EV {ev_str} — {evaluation.result.upper()} ({detail.message}){extra_str}"
+    )
+
+
+def log_combo_evaluation(
+    strategy: str,
+    desc: str,
+    metrics: Optional[dict],
+    result: str,
+    reason: ReasonLike,
+    *,
+    legs: list[dict] | None = None,
+    extra: dict | None = None,
+) -> None:
+    """Record a strategy combination evaluation.
+
+    The evaluation is stored in :data:`combo_recorder` without formatting.
+    A log line is only rendered when the recorder is verbose (debug mode);
+    use :meth:`ComboEvaluationRecorder.render` to inspect recent evaluations.
+    """
+
+    symbol_hint = (extra or {}).get("symbol") or _combo_symbol.get()
+    evaluation = ComboEvaluation(
+        strategy, desc, metrics, result, reason, legs, extra, symbol_hint
     )
+    recorder = combo_recorder
+    recorder.record(evaluation)
+    if recorder.verbose:
+        logger.info(format_combo_evaluation(evaluation))
 
     captured = _combo_capture.get()
     if captured is not None:
+        detail = _normalize_reason(reason)
+        extra_data = _combo_extra(evaluation)
+        mid_meta = extra_data.get("mid")
+        as_metadata = getattr(mid_meta, "as_metadata", None)
+        if callable(as_metadata):
+            extra_data["mid"] = as_metadata()
         record = {
             "strategy": strategy,
             "status": result,
@@ -389,7 +574,7 @@ def log_combo_evaluation(
             "metrics": dict(metrics or {}),
             "raw_reason": detail.message,
             "reason": detail,
-            "meta": dict(extra_data),
+            "meta": extra_data,
         }
         if symbol_hint:
             record["symbol"] = symbol_hint
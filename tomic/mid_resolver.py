@@ -14,6 +14,7 @@ from .core.pricing.mid_tags import (
     normalize_mid_source,
 )
 from .core.pricing.spread_policy import SpreadPolicy
+from .core.data.chain_table import MISSING, ChainTable
 from .helpers.bs_utils import estimate_model_price
 from .helpers.dateutils import dte_between_dates, parse_date
 from .helpers.numeric import safe_float
@@ -187,7 +188,10 @@ class MidResolver:
         interest_rate: float | None,
         config: Mapping[str, Any] | None = None,
     ) -> None:
-        self._raw_chain = [dict(opt) for opt in option_chain]
+        # Records are only read, so share them instead of copying every option.
+        self._raw_chain = (
+            option_chain if isinstance(option_chain, ChainTable) else ChainTable(option_chain)
+        )
         self._spot_price = safe_float(spot_price)
         self._interest_rate = float(interest_rate or 0.0)
         self._config = config or {}
@@ -235,17 +239,27 @@ class MidResolver:
     # ------------------------------------------------------------------
     # Public helpers
     # ------------------------------------------------------------------
-    def enrich_chain(self) -> list[MutableMapping[str, Any]]:
-        """Return option chain augmented with mid metadata."""
-
-        enriched: list[MutableMapping[str, Any]] = []
-        for option, resolution in zip(self._raw_chain, self._resolutions):
-            enriched_opt = dict(option)
-            enriched_opt.update(resolution.as_dict())
-            if resolution.mid_source in {"parity_true", "parity_close"}:
-                enriched_opt["mid_from_parity"] = True
-            enriched.append(enriched_opt)
-        return enriched
+    def enrich_chain(self) -> ChainTable:
+        """Return option chain augmented with mid metadata.
+
+        The result shares the input records; resolution fields are layered on
+        top as overlay columns instead of being copied into each option.
+        """
+
+        columns: dict[str, list[Any]] = {
+            name: [] for name in MidResolution.__slots__
+        }
+        parity: list[Any] = []
+        for resolution in self._resolutions:
+            for name, values in columns.items():
+                values.append(getattr(resolution, name))
+            parity.append(
+                True
+                if resolution.mid_source in {"parity_true", "parity_close"}
+                else MISSING
+            )
+        columns["mid_from_parity"] = parity
+        return self._raw_chain.with_columns(columns)
 
     def resolution_for(self, option: Mapping[str, Any]) -> MidResolution:
         """Return resolution metadata for ``option`` if known."""
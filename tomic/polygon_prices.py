@@ -6,7 +6,7 @@ from datetime import datetime, timedelta, date, time as dt_time
 from pathlib import Path
 from zoneinfo import ZoneInfo
 from types import SimpleNamespace
-from typing import Mapping
+from typing import TYPE_CHECKING, Mapping
 
 try:  # pragma: no cover - optional dependency
     import holidays  # type: ignore
@@ -31,6 +31,9 @@ from tomic.helpers.price_utils import _load_latest_close
 from tomic.helpers.price_meta import load_price_meta
 from tomic.integrations.polygon.client import PolygonClient
 
+if TYPE_CHECKING:  # pragma: no cover - import hints only
+    from tomic.integrations.polygon.async_client import AsyncPolygonClient
+
 
 _US_MARKET_HOLIDAYS = None
 
@@ -75,8 +78,11 @@ def latest_trading_day() -> date:
     return d
 
 
-def request_bars(client: PolygonClient, symbol: str) -> tuple[list[dict], bool]:
-    """Return daily bar records for ``symbol`` and whether a request was made."""
+def _bars_request(symbol: str) -> tuple[str, dict] | None:
+    """Return the aggregates ``(path, params)`` still needed for ``symbol``.
+
+    ``None`` means the stored history is already up to date.
+    """
     end_dt = latest_trading_day()
     _, last_date = _load_latest_close(symbol)
     meta = load_price_meta()
@@ -116,8 +122,6 @@ def request_bars(client: PolygonClient, symbol: str) -> tuple[list[dict], bool]:
             )
     params = {"adjusted": "true"}
     base_path = f"v2/aggs/ticker/{symbol}/range/1/day"
-    path = base_path
-    requested = False
 
     lookback_years = cfg_get("PRICE_HISTORY_LOOKBACK_YEARS", 2)
     try:
@@ -143,7 +147,7 @@ def request_bars(client: PolygonClient, symbol: str) -> tuple[list[dict], bool]:
                 next_expected,
                 end_dt,
             )
-            return [], requested
+            return None
         from_date = next_expected.strftime("%Y-%m-%d")
         to_date = end_dt.strftime("%Y-%m-%d")
         path = f"{base_path}/{from_date}/{to_date}"
@@ -153,17 +157,11 @@ def request_bars(client: PolygonClient, symbol: str) -> tuple[list[dict], bool]:
         path = f"{base_path}/{from_date}/{to_date}"
         approx_trading_days = min(50000, max(lookback_years * 252, 1))
         params.update({"limit": approx_trading_days})
+    return path, params
 
-    requested = True
-    logger.info(f"Fetching bars for {symbol}")
-    try:
-        data = client._request(path, params)
-    except Exception as exc:
-        status = getattr(getattr(exc, "response", None), "status_code", None)
-        if status == 403:
-            logger.warning(f"⚠️ Skipping {symbol} — all keys rejected with 403")
-            return [], requested
-        raise
+
+def _parse_bars(symbol: str, data: Mapping) -> list[dict]:
+    """Return daily records with a running ATR from an aggregates response."""
     bars = data.get("results") or []
     records: list[dict] = []
     for bar in bars:
@@ -194,7 +192,50 @@ def request_bars(client: PolygonClient, symbol: str) -> tuple[list[dict], bool]:
         closes.append(rec.get("close"))
         rec["atr"] = average_true_range(highs, lows, closes, period=14)
         # Keep OHLC for gap-risk simulation and realistic backtesting
-    return records, requested
+    return records
+
+
+def _rejected(exc: Exception) -> bool:
+    status = getattr(exc, "status", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 403
+
+
+def request_bars(client: PolygonClient, symbol: str) -> tuple[list[dict], bool]:
+    """Return daily bar records for ``symbol`` and whether a request was made."""
+    plan = _bars_request(symbol)
+    if plan is None:
+        return [], False
+    path, params = plan
+    logger.info(f"Fetching bars for {symbol}")
+    try:
+        data = client._request(path, params)
+    except Exception as exc:
+        if _rejected(exc):
+            logger.warning(f"⚠️ Skipping {symbol} — all keys rejected with 403")
+            return [], True
+        raise
+    return _parse_bars(symbol, data), True
+
+
+async def request_bars_async(
+    client: "AsyncPolygonClient", symbol: str
+) -> tuple[list[dict], bool]:
+    """:func:`request_bars` for an :class:`AsyncPolygonClient`."""
+    plan = _bars_request(symbol)
+    if plan is None:
+        return [], False
+    path, params = plan
+    logger.info(f"Fetching bars for {symbol}")
+    try:
+        data = await client._request(path, params)
+    except Exception as exc:
+        if _rejected(exc):
+            logger.warning(f"⚠️ Skipping {symbol} — all keys rejected with 403")
+            return [], True
+        raise
+    return _parse_bars(symbol, data), True
 
 
 def merge_price_data(file: Path, records: list[dict]) -> int:
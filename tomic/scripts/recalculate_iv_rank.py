@@ -7,23 +7,27 @@ This script:
 3. Updates field names from (HV) to (IV)
 4. Saves the updated data
 
+Symbols are processed in parallel worker processes (``--workers``).
+
 Usage:
-    python -m tomic.scripts.recalculate_iv_rank [--dry-run] [--symbols SYMBOL1,SYMBOL2,...]
+    python -m tomic.scripts.recalculate_iv_rank [--dry-run] [--symbols SYMBOL1,SYMBOL2,...] [--workers N]
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from tomic.config import get as cfg_get
-from tomic.cli.services.vol_helpers import (
-    iv_rank,
-    iv_percentile,
-    MIN_IV_HISTORY_DAYS,
-)
+from tomic.cli.services.vol_helpers import MIN_IV_HISTORY_DAYS
+from tomic.infrastructure.storage import file_lock, save_json
 from tomic.logutils import logger, setup_logging
 
 
@@ -43,9 +47,64 @@ def load_iv_summary(path: Path) -> list[dict[str, Any]]:
 
 
 def save_iv_summary(path: Path, data: list[dict[str, Any]]) -> None:
-    """Save IV summary data to JSON file."""
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    """Save IV summary data to JSON file (atomic replace)."""
+    save_json(data, path)
+
+
+def _scaled_iv(value: Any) -> float | None:
+    """Return ``value`` as a percentage (decimals are multiplied by 100)."""
+    try:
+        iv_float = float(value)
+    except (TypeError, ValueError):
+        return None
+    return iv_float * 100 if iv_float < 1 else iv_float
+
+
+class IVRankEngine:
+    """IV rank and percentile of every record against the rest of its series.
+
+    Each record is compared with all ATM IV values except those sharing its
+    date.  The values are sorted once; a lookup bisects the sorted values
+    and corrects for the excluded date, so a whole series costs O(n log n)
+    instead of rescanning every record per record.
+    """
+
+    def __init__(self, records: Iterable[dict[str, Any]]) -> None:
+        by_date: dict[Any, list[float]] = defaultdict(list)
+        values: list[float] = []
+        for rec in records:
+            if not isinstance(rec, dict) or rec.get("atm_iv") is None:
+                continue
+            iv_float = _scaled_iv(rec.get("atm_iv"))
+            if iv_float is None:
+                continue
+            values.append(iv_float)
+            by_date[rec.get("date")].append(iv_float)
+        self._values = sorted(values)
+        self._by_date = {d: sorted(v) for d, v in by_date.items()}
+
+    def _extreme(self, excluded: list[float], *, lowest: bool) -> float:
+        """Return the min (or max) of the values left after removing ``excluded``."""
+        pending = Counter(excluded)
+        ordered = self._values if lowest else reversed(self._values)
+        for value in ordered:
+            if pending[value]:
+                pending[value] -= 1
+                continue
+            return value
+        raise ValueError("no values left")  # pragma: no cover - guarded by caller
+
+    def rank_percentile(self, date: Any, value: float) -> tuple[float | None, float | None]:
+        """Return ``(iv_rank, iv_percentile)`` on a 0-100 scale."""
+        excluded = self._by_date.get(date, []) if date else []
+        count = len(self._values) - len(excluded)
+        if count <= 0:
+            return None, None
+        lo = self._extreme(excluded, lowest=True)
+        hi = self._extreme(excluded, lowest=False)
+        rank = None if hi == lo else (value - lo) / (hi - lo) * 100
+        below = bisect_left(self._values, value) - bisect_left(excluded, value)
+        return rank, below / count * 100
 
 
 def get_historical_iv_values(records: list[dict[str, Any]], exclude_date: str | None = None) -> list[float]:
@@ -72,8 +131,14 @@ def get_historical_iv_values(records: list[dict[str, Any]], exclude_date: str |
 def recalculate_record(
     record: dict[str, Any],
     all_records: list[dict[str, Any]],
+    *,
+    engine: IVRankEngine | None = None,
 ) -> dict[str, Any]:
-    """Recalculate IV rank and percentile for a single record."""
+    """Recalculate IV rank and percentile for a single record.
+
+    Pass an ``engine`` built from ``all_records`` when recalculating many
+    records of the same series.
+    """
     result = dict(record)
     date_str = record.get("date")
     atm_iv = record.get("atm_iv")
@@ -82,27 +147,15 @@ def recalculate_record(
     result.pop("iv_rank (HV)", None)
     result.pop("iv_percentile (HV)", None)
 
-    # Calculate new IV-based values
+    # Calculate new IV-based values against the series excluding this date
     iv_rank_value = None
     iv_percentile_value = None
 
     if atm_iv is not None:
-        # Get historical IV values excluding the current date
-        iv_series = get_historical_iv_values(all_records, exclude_date=date_str)
-        if iv_series:
-            # Scale IV to percentage for comparison
-            try:
-                scaled_iv = float(atm_iv) * 100 if float(atm_iv) < 1 else float(atm_iv)
-                iv_rank_value = iv_rank(scaled_iv, iv_series)
-                iv_percentile_value = iv_percentile(scaled_iv, iv_series)
-
-                # Convert to 0-100 scale
-                if isinstance(iv_rank_value, (int, float)):
-                    iv_rank_value *= 100
-                if isinstance(iv_percentile_value, (int, float)):
-                    iv_percentile_value *= 100
-            except (TypeError, ValueError):
-                pass
+        scaled_iv = _scaled_iv(atm_iv)
+        if scaled_iv is not None:
+            engine = engine or IVRankEngine(all_records)
+            iv_rank_value, iv_percentile_value = engine.rank_percentile(date_str, scaled_iv)
 
     result["iv_rank (IV)"] = iv_rank_value
     result["iv_percentile (IV)"] = iv_percentile_value
@@ -126,6 +179,12 @@ def process_symbol(
         logger.warning(f"No IV summary file for {symbol}")
         return 0, 0, 0
 
+    # Hold the file lock so a concurrent daily update is not overwritten
+    with file_lock(summary_file):
+        return _process_file(symbol, summary_file, dry_run=dry_run)
+
+
+def _process_file(symbol: str, summary_file: Path, *, dry_run: bool) -> tuple[int, int, int]:
     records = load_iv_summary(summary_file)
     if not records:
         logger.warning(f"No records in IV summary for {symbol}")
@@ -139,9 +198,10 @@ def process_symbol(
     skipped = 0
 
     # Process each record
+    engine = IVRankEngine(records)
     new_records = []
     for record in records:
-        new_record = recalculate_record(record, records)
+        new_record = recalculate_record(record, records, engine=engine)
         new_records.append(new_record)
 
         # Check if anything changed
@@ -178,6 +238,12 @@ def main(argv: list[str] | None = None) -> None:
         "--symbols",
         help="Comma-separated list of symbols to process (default: all)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count)",
+    )
     args = parser.parse_args(argv)
 
     iv_dir = Path(cfg_get("IV_DAILY_SUMMARY_DIR", "tomic/data/iv_daily_summary"))
@@ -204,8 +270,15 @@ def main(argv: list[str] | None = None) -> None:
     total_updated = 0
     total_skipped = 0
 
-    for symbol in symbols:
-        t, u, s = process_symbol(symbol, iv_dir, dry_run=args.dry_run)
+    workers = max(1, min(args.workers, len(symbols)))
+    if workers == 1:
+        results = [process_symbol(symbol, iv_dir, dry_run=args.dry_run) for symbol in symbols]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            task = partial(process_symbol, iv_dir=iv_dir, dry_run=args.dry_run)
+            results = list(pool.map(task, symbols))
+
+    for t, u, s in results:
         total_total += t
         total_updated += u
         total_skipped += s
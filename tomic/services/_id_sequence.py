@@ -18,5 +18,13 @@ class IncrementingIdMixin:
             self._req_id += 1
             return self._req_id
 
+    def _reserve_ids(self, count: int) -> range:
+        """Reserve ``count`` consecutive ids in a single step."""
+
+        with self._id_lock:
+            start = self._req_id + 1
+            self._req_id += max(int(count), 0)
+            return range(start, self._req_id + 1)
+
 
 __all__ = ["IncrementingIdMixin"]
@@ -24,6 +24,7 @@ from tomic.core.data import (
 from tomic.helpers.price_utils import ClosePriceSnapshot
 from tomic.helpers.interpolation import interpolate_missing_fields
 from tomic.helpers.quality_check import calculate_csv_quality
+from tomic.helpers.stage_profiler import StageProfiler
 from tomic.core.config.strike_selection import load_strategy_rules
 from tomic.logutils import logger
 from tomic.services.pipeline_runner import PipelineRunContext, run_pipeline
@@ -84,6 +85,7 @@ class PreparedChain:
     source: str | None = None
     source_provenance: str | None = None
     schema_version: str | None = None
+    profile: StageProfiler | None = None
 
 
 @dataclass(slots=True)
@@ -146,6 +148,7 @@ class ChainEvaluationResult:
     expiry_counts_before: dict[str, int] = field(default_factory=dict)
     expiry_counts_after: dict[str, int] = field(default_factory=dict)
     skipped_expiries: tuple[str, ...] = ()
+    profile: StageProfiler | None = None
 
 
 def load_and_prepare_chain(
@@ -162,20 +165,23 @@ def load_and_prepare_chain(
     if not path.exists():
         raise ChainPreparationError(f"Chain-bestand ontbreekt: {path}")
 
-    try:
-        df = pd.read_csv(path)
-    except Exception as exc:  # pragma: no cover - depends on pandas internals
-        raise ChainPreparationError(f"Fout bij laden van chain: {exc}") from exc
-
-    df = normalize_chain_dataframe(
-        df,
-        decimal_columns=config.columns_to_normalize,
-        column_aliases=config.column_aliases,
-        date_columns=config.date_columns,
-        date_format=config.date_format,
-    )
+    profiler = StageProfiler(path.name)
+    with profiler.stage("csv_load"):
+        try:
+            df = pd.read_csv(path)
+        except Exception as exc:  # pragma: no cover - depends on pandas internals
+            raise ChainPreparationError(f"Fout bij laden van chain: {exc}") from exc
+
+        df = normalize_chain_dataframe(
+            df,
+            decimal_columns=config.columns_to_normalize,
+            column_aliases=config.column_aliases,
+            date_columns=config.date_columns,
+            date_format=config.date_format,
+        )
 
-    quality = calculate_csv_quality(df)
+    with profiler.stage("quality_check"):
+        quality = calculate_csv_quality(df)
     source_path = path
     interpolated_path = path
     interpolation_applied = False
@@ -184,15 +190,19 @@ def load_and_prepare_chain(
         logger.info(
             "Interpolating missing delta/iv values using linear (delta) and spline (iv)"
         )
-        df = interpolate_missing_fields(df)
-        quality = calculate_csv_quality(df)
-        interpolated_path = path.with_name(path.stem + config.interpolation_suffix + path.suffix)
-        df.to_csv(interpolated_path, index=False)
+        with profiler.stage("interpolation"):
+            df = interpolate_missing_fields(df)
+            quality = calculate_csv_quality(df)
+            interpolated_path = path.with_name(
+                path.stem + config.interpolation_suffix + path.suffix
+            )
+            df.to_csv(interpolated_path, index=False)
         interpolation_applied = True
         logger.debug("Interpolation completed successfully")
         logger.debug(f"Interpolated CSV saved to {interpolated_path}")
 
-    records = normalize_chain_records(dataframe_to_records(df))
+    with profiler.stage("records"):
+        records = normalize_chain_records(dataframe_to_records(df))
 
     logger.debug(f"Loaded {len(df)} rows from {path}")
     logger.debug(f"CSV loaded from {path} with quality {quality:.1f}%")
@@ -207,6 +217,7 @@ def load_and_prepare_chain(
         source=source,
         source_provenance=source_provenance,
         schema_version=schema_version,
+        profile=profiler,
     )
 
 
@@ -324,7 +335,7 @@ def evaluate_chain(
         pipeline=pipeline,
         symbol=config.symbol,
         strategy=config.strategy,
-        option_chain=list(prepared.records),
+        option_chain=prepared.records,
         spot_price=float(config.spot_price or 0.0),
         atr=config.atr,
         config=config.strategy_config or {},
@@ -368,5 +379,20 @@ def evaluate_chain(
         expiry_counts_before=expiry_counts_before,
         expiry_counts_after=expiry_counts_after,
         skipped_expiries=skipped,
+        profile=_combine_profiles(prepared, run_result, config.symbol, config.strategy),
     )
 
+
+def _combine_profiles(
+    prepared: PreparedChain,
+    run_result: PipelineRunResult,
+    symbol: str,
+    strategy: str,
+) -> StageProfiler | None:
+    prepared_profile = getattr(prepared, "profile", None)
+    run_profile = getattr(run_result, "profile", None)
+    if prepared_profile is None and run_profile is None:
+        return None
+    combined = StageProfiler(f"{symbol}/{strategy}")
+    return combined.merge(prepared_profile).merge(run_profile)
+
@@ -0,0 +1,383 @@
+"""On-disk cache for option contract details.
+
+``reqContractDetails`` only resolves identifiers that stay fixed for the life
+of an option: ``conId``, ``tradingClass``, ``primaryExchange`` and the minimum
+tick.  :class:`ContractDetailsCache` keeps those per
+``(symbol, expiry, strike, right, exchange)`` in a JSON file so quote
+refreshes and chain fetches can skip the round trip on warm runs.
+
+The file is shared between processes: it is reloaded when another process
+changed it and writes merge with the current file content before being
+replaced atomically.  Entries are dropped once their TTL
+(``CONTRACT_DETAILS_CACHE_TTL_DAYS``) passed or the option expired.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from tomic.helpers.dateutils import normalize_expiry_code
+from tomic.logutils import logger
+from tomic.services._config import cfg_value
+
+ContractCacheKey = tuple[str, str, float, str, str]
+
+
+@dataclass(slots=True)
+class CachedContractDetails:
+    """Stable contract details returned by IB for a single option."""
+
+    con_id: int
+    trading_class: str | None = None
+    primary_exchange: str | None = None
+    multiplier: str | None = None
+    min_tick: float | None = None
+    stored_at: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "con_id": self.con_id,
+            "trading_class": self.trading_class,
+            "primary_exchange": self.primary_exchange,
+            "multiplier": self.multiplier,
+            "min_tick": self.min_tick,
+            "stored_at": self.stored_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CachedContractDetails":
+        min_tick = data.get("min_tick")
+        return cls(
+            con_id=int(data["con_id"]),
+            trading_class=data.get("trading_class") or None,
+            primary_exchange=data.get("primary_exchange") or None,
+            multiplier=data.get("multiplier") or None,
+            min_tick=float(min_tick) if min_tick not in (None, "") else None,
+            stored_at=float(data.get("stored_at") or 0.0),
+        )
+
+
+def _normalize_right(value: Any) -> str:
+    text = str(value or "").strip().upper()
+    return text[:1] if text else ""
+
+
+def make_key(
+    symbol: Any, expiry: Any, strike: Any, right: Any, exchange: Any = None
+) -> ContractCacheKey | None:
+    """Return the normalised cache key or ``None`` for incomplete input."""
+
+    try:
+        expiry_code = normalize_expiry_code(expiry)
+        strike_value = round(float(strike), 4)
+    except (TypeError, ValueError):
+        return None
+    sym = str(symbol or "").strip().upper()
+    right_code = _normalize_right(right)
+    if not sym or right_code not in {"C", "P"}:
+        return None
+    exch = str(exchange or "SMART").strip().upper() or "SMART"
+    return (sym, expiry_code, strike_value, right_code, exch)
+
+
+def contract_cache_key(contract: Any) -> ContractCacheKey | None:
+    """Build a cache key from an IB ``Contract`` or :class:`OptionContract`."""
+
+    expiry = getattr(contract, "lastTradeDateOrContractMonth", None) or getattr(
+        contract, "expiry", None
+    )
+    return make_key(
+        getattr(contract, "symbol", None),
+        expiry,
+        getattr(contract, "strike", None),
+        getattr(contract, "right", None),
+        getattr(contract, "exchange", None),
+    )
+
+
+def _encode_key(key: ContractCacheKey) -> str:
+    symbol, expiry, strike, right, exchange = key
+    return f"{symbol}|{expiry}|{strike:g}|{right}|{exchange}"
+
+
+def _decode_key(text: str) -> ContractCacheKey | None:
+    parts = text.split("|")
+    if len(parts) != 5:
+        return None
+    return make_key(*parts)
+
+
+class ContractDetailsCache:
+    """Thread-safe, file-backed cache of :class:`CachedContractDetails`."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.time,
+        today: Callable[[], date] = date.today,
+    ) -> None:
+        if path is None:
+            path = cfg_value(
+                "CONTRACT_DETAILS_CACHE_FILE", "tomic/data/contract_details_cache.json"
+            )
+        if ttl is None:
+            ttl = float(cfg_value("CONTRACT_DETAILS_CACHE_TTL_DAYS", 7)) * 86400
+        self.path = Path(path)
+        self.ttl = max(float(ttl), 0.0)
+        self._clock = clock
+        self._today = today
+        self._entries: dict[ContractCacheKey, CachedContractDetails] = {}
+        self._dirty: set[ContractCacheKey] = set()
+        self._mtime: float | None = None
+        self._loaded = False
+        self._deferred = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    # ------------------------------------------------------------------
+    def get(self, key: ContractCacheKey | None) -> CachedContractDetails | None:
+        """Return cached details for ``key`` when present and still valid."""
+
+        if key is None or not self.enabled:
+            return None
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(key)
+            if entry is None or not self._valid(key, entry):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry
+
+    def lookup(self, contract: Any) -> CachedContractDetails | None:
+        return self.get(contract_cache_key(contract))
+
+    def put(
+        self,
+        key: ContractCacheKey | None,
+        *,
+        con_id: Any,
+        trading_class: Any = None,
+        primary_exchange: Any = None,
+        multiplier: Any = None,
+        min_tick: Any = None,
+    ) -> None:
+        """Store details for ``key``; entries without a ``conId`` are ignored."""
+
+        if key is None or not self.enabled:
+            return
+        try:
+            con_id = int(con_id or 0)
+        except (TypeError, ValueError):
+            return
+        if con_id <= 0:
+            return
+        try:
+            tick = float(min_tick) if min_tick not in (None, "") else None
+        except (TypeError, ValueError):
+            tick = None
+        entry = CachedContractDetails(
+            con_id=con_id,
+            trading_class=str(trading_class) if trading_class else None,
+            primary_exchange=str(primary_exchange) if primary_exchange else None,
+            multiplier=str(multiplier) if multiplier else None,
+            min_tick=tick,
+            stored_at=self._clock(),
+        )
+        with self._lock:
+            self._refresh()
+            self._entries[key] = entry
+            self._dirty.add(key)
+            if not self._deferred:
+                self._flush()
+
+    def store(self, contract: Any, details: Any, *, min_tick: Any = None) -> None:
+        """Cache the resolved ``details`` for the requested ``contract``.
+
+        ``details`` may be an IB ``Contract`` or an :class:`OptionContract`.
+        """
+
+        self.put(
+            contract_cache_key(contract),
+            con_id=getattr(details, "conId", None) or getattr(details, "con_id", None),
+            trading_class=getattr(details, "tradingClass", None)
+            or getattr(details, "trading_class", None),
+            primary_exchange=getattr(details, "primaryExchange", None)
+            or getattr(details, "primary_exchange", None),
+            multiplier=getattr(details, "multiplier", None),
+            min_tick=min_tick,
+        )
+
+    @contextmanager
+    def deferred(self) -> Iterator["ContractDetailsCache"]:
+        """Collect writes inside the block and persist them once on exit."""
+
+        with self._lock:
+            self._deferred += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._deferred -= 1
+                if not self._deferred:
+                    self._flush()
+
+    def prune(self) -> int:
+        """Drop expired entries and persist the result; return the count."""
+
+        with self._lock:
+            self._refresh()
+            stale = [k for k, v in self._entries.items() if not self._valid(k, v)]
+            for key in stale:
+                self._entries.pop(key, None)
+            if stale:
+                merged = self._merge_disk(drop=set(stale))
+                self._write(merged)
+                self._entries = merged
+                self._dirty.clear()
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty.clear()
+            self._loaded = True
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            self._mtime = None
+
+    # ------------------------------------------------------------------
+    def _valid(self, key: ContractCacheKey, entry: CachedContractDetails) -> bool:
+        if self._clock() - entry.stored_at > self.ttl:
+            return False
+        return key[1] >= self._today().strftime("%Y%m%d")
+
+    def _file_mtime(self) -> float | None:
+        try:
+            return self.path.stat().st_mtime
+        except OSError:
+            return None
+
+    def _read_disk(self) -> dict[ContractCacheKey, CachedContractDetails]:
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning(f"Contract cache {self.path} onleesbaar: {exc}")
+            return {}
+        entries: dict[ContractCacheKey, CachedContractDetails] = {}
+        if not isinstance(raw, dict):
+            return entries
+        for text, data in raw.items():
+            key = _decode_key(text)
+            if key is None or not isinstance(data, dict):
+                continue
+            try:
+                entries[key] = CachedContractDetails.from_dict(data)
+            except (KeyError, TypeError, ValueError):
+                continue
+        return entries
+
+    def _refresh(self) -> None:
+        mtime = self._file_mtime()
+        if self._loaded and mtime == self._mtime:
+            return
+        disk = self._read_disk()
+        for key in self._dirty:
+            if key in self._entries:
+                disk[key] = self._entries[key]
+        self._entries = disk
+        self._mtime = mtime
+        self._loaded = True
+
+    def _merge_disk(
+        self, drop: set[ContractCacheKey] | None = None
+    ) -> dict[ContractCacheKey, CachedContractDetails]:
+        merged = self._read_disk()
+        for key in self._dirty:
+            entry = self._entries.get(key)
+            if entry is not None:
+                merged[key] = entry
+        for key in drop or ():
+            merged.pop(key, None)
+        return {k: v for k, v in merged.items() if self._valid(k, v)}
+
+    def _flush(self) -> None:
+        if not self._dirty:
+            return
+        merged = self._merge_disk()
+        try:
+            self._write(merged)
+        except OSError as exc:
+            logger.warning(f"Contract cache {self.path} niet opgeslagen: {exc}")
+            return
+        self._entries = merged
+        self._dirty.clear()
+
+    def _write(self, entries: dict[ContractCacheKey, CachedContractDetails]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {_encode_key(k): v.as_dict() for k, v in entries.items()}
+        tmp = self.path.with_name(
+            f"temp_{os.getpid()}_{threading.get_ident()}_{self.path.name}"
+        )
+        with tmp.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._mtime = self._file_mtime()
+
+
+_DEFAULT_CACHE: ContractDetailsCache | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_contract_cache() -> ContractDetailsCache:
+    """Return the process wide :class:`ContractDetailsCache`."""
+
+    global _DEFAULT_CACHE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = ContractDetailsCache()
+        return _DEFAULT_CACHE
+
+
+def set_contract_cache(cache: ContractDetailsCache | None) -> None:
+    """Replace the process wide cache, ``None`` restores the configured one."""
+
+    global _DEFAULT_CACHE
+    with _DEFAULT_LOCK:
+        _DEFAULT_CACHE = cache
+
+
+__all__ = [
+    "CachedContractDetails",
+    "ContractCacheKey",
+    "ContractDetailsCache",
+    "contract_cache_key",
+    "get_contract_cache",
+    "make_key",
+    "set_contract_cache",
+]
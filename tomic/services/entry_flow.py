@@ -399,6 +399,7 @@ def execute_entry_flow(
         spot_from_chain=spot_from_chain,
         atr_loader=latest_atr,
         refresh_snapshot=portfolio_services.refresh_proposal_from_ib if config.ib_refresh else None,
+        refresh_snapshots=portfolio_services.refresh_proposals_from_ib if config.ib_refresh else None,
     )
 
     try:
@@ -8,7 +8,7 @@ import time
 from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pprint import pformat
-from typing import Any, Callable, Mapping
+from typing import Any, Callable, Iterator, Mapping, Sequence
 
 from tomic.helpers.dateutils import normalize_expiry_code
 
@@ -28,13 +28,20 @@ except Exception:  # pragma: no cover
     ContractDetails = object  # type: ignore[assignment]
 
 from tomic.api.base_client import BaseIBApp
-from tomic.api.ib_connection import connect_ib_with_retry
-from tomic.analysis import scoring
+from tomic.api.pacing import Priority, pacing_priority
+from tomic.analysis.incremental_scoring import reevaluate_proposal
 from tomic.logutils import logger
 from tomic.models import OptionContract
 from tomic.services._config import cfg_value
 from tomic.services._id_sequence import IncrementingIdMixin
+from tomic.services.contract_cache import ContractDetailsCache, get_contract_cache
+from tomic.services.ib_session import (
+    IBSessionManager,
+    get_session_manager,
+    marketdata_params,
+)
 from tomic.services.portfolio_service import PortfolioService
+from tomic.services.quote_cache import LiveQuoteCache, get_quote_cache, has_two_sided_quote
 from tomic.services.strategy_pipeline import StrategyProposal
 from tomic.utils import get_leg_qty, get_leg_right, normalize_leg, resolve_symbol
 
@@ -222,6 +229,77 @@ def _governance_payload(
     return payload
 
 
+ContractKey = tuple[Any, ...]
+StreamListener = Callable[[int, dict[str, Any], "int | None"], None]
+
+_CONTRACT_FIELDS = (
+    ("tradingClass", "trading_class"),
+    ("primaryExchange", "primary_exchange"),
+    ("conId", "con_id"),
+)
+
+
+def contract_key(leg: Mapping[str, Any]) -> ContractKey:
+    """Return the identity of the option contract referenced by ``leg``.
+
+    Raises :class:`ValueError` when the leg does not describe a contract.
+    """
+
+    right = get_leg_right(leg)
+    if right not in {"call", "put"}:
+        raise ValueError("Onbekend optietype")
+    return (
+        _normalize_symbol(leg),
+        _parse_expiry(str(leg.get("expiry"))),
+        float(leg.get("strike")),
+        right,
+    )
+
+
+@dataclass
+class QuotePlan:
+    """Legs of one or more proposals grouped by the contract they quote."""
+
+    members: dict[ContractKey, list[dict[str, Any]]] = field(default_factory=dict)
+    keys: list[list[ContractKey]] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, proposals: Sequence[StrategyProposal]) -> "QuotePlan":
+        plan = cls()
+        for prop_idx, proposal in enumerate(proposals):
+            proposal_keys: list[ContractKey] = []
+            for leg_idx, leg in enumerate(proposal.legs or []):
+                try:
+                    key = contract_key(leg)
+                except (TypeError, ValueError):
+                    key = ("invalid", prop_idx, leg_idx)
+                plan.members.setdefault(key, []).append(leg)
+                proposal_keys.append(key)
+            plan.keys.append(proposal_keys)
+        return plan
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    @property
+    def total_legs(self) -> int:
+        return sum(len(legs) for legs in self.members.values())
+
+    def share_contract_fields(self, key: ContractKey) -> None:
+        """Copy enriched contract identifiers from the first leg to the others."""
+
+        legs = self.members.get(key) or []
+        if len(legs) < 2:
+            return
+        source = legs[0]
+        for leg in legs[1:]:
+            for camel, snake in _CONTRACT_FIELDS:
+                value = source.get(camel) or source.get(snake)
+                if value and not (leg.get(camel) or leg.get(snake)):
+                    leg[camel] = value
+                    leg.setdefault(snake, value)
+
+
 class QuoteSnapshotApp(IncrementingIdMixin, BaseIBApp):
     """Light-weight IB client for market data snapshots."""
 
@@ -235,17 +313,28 @@ class QuoteSnapshotApp(IncrementingIdMixin, BaseIBApp):
         self._snapshot_requests: dict[int, bool] = {}
         self._ready = threading.Event()
         self._contract_details: dict[int, list[ContractDetails]] = {}
+        self._stream_listeners: dict[int, StreamListener] = {}
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
-    def _event(self, req_id: int) -> threading.Event:
-        return self._events.setdefault(req_id, threading.Event())
+    def _open(self, req_id: int) -> threading.Event:
+        """Create the response state callbacks for ``req_id`` write into."""
 
-    def _data(self, req_id: int) -> dict[str, Any]:
-        return self._responses.setdefault(req_id, {})
+        with self._lock:
+            self._responses.setdefault(req_id, {})
+            return self._events.setdefault(req_id, threading.Event())
+
+    def _event(self, req_id: int) -> threading.Event | None:
+        return self._events.get(req_id)
+
+    def _data(self, req_id: int) -> dict[str, Any] | None:
+        """Return the response of an open request; late callbacks get ``None``."""
+
+        return self._responses.get(req_id)
 
     def register_request(self, req_id: int, *, snapshot: bool) -> None:
+        self._open(req_id)
         with self._lock:
             if snapshot:
                 self._snapshot_requests[req_id] = True
@@ -260,15 +349,36 @@ class QuoteSnapshotApp(IncrementingIdMixin, BaseIBApp):
         with self._lock:
             self._snapshot_requests.pop(req_id, None)
 
-    def _finalize_request(self, req_id: int) -> None:
-        self._event(req_id).set()
+    def _finalize_request(self, req_id: int, error: int | None = None) -> None:
+        event = self._event(req_id)
+        if event is None:
+            return
+        event.set()
         self._complete_request(req_id)
+        with self._lock:
+            listener = self._stream_listeners.get(req_id)
+        if listener is not None:
+            listener(req_id, dict(self._responses.get(req_id, {})), error)
+
+    def add_stream_listener(self, req_id: int, listener: StreamListener) -> None:
+        """Call ``listener`` with the merged data on every update of ``req_id``."""
+
+        self._open(req_id)
+        with self._lock:
+            self._stream_listeners[req_id] = listener
+
+    def remove_stream_listener(self, req_id: int) -> None:
+        with self._lock:
+            self._stream_listeners.pop(req_id, None)
 
     def clear_request(self, req_id: int) -> None:
-        self._complete_request(req_id)
-        self._events.pop(req_id, None)
-        self._responses.pop(req_id, None)
-        self._contract_details.pop(req_id, None)
+        """Drop the state of ``req_id``; later callbacks for it are ignored."""
+
+        with self._lock:
+            self._snapshot_requests.pop(req_id, None)
+            self._events.pop(req_id, None)
+            self._responses.pop(req_id, None)
+            self._contract_details.pop(req_id, None)
 
     # ------------------------------------------------------------------
     # Ready / metadata helpers
@@ -282,9 +392,9 @@ class QuoteSnapshotApp(IncrementingIdMixin, BaseIBApp):
 
     def request_contract_details(self, contract: Contract, timeout: float = 5.0) -> OptionContract | None:
         req_id = self._next_id()
-        event = self._event(req_id)
-        self.reqContractDetails(req_id, contract)
+        event = self._open(req_id)
         try:
+            self.reqContractDetails(req_id, contract)
             if not event.wait(timeout):
                 logger.debug(
                     "Contract details timeout for "
@@ -311,6 +421,8 @@ class QuoteSnapshotApp(IncrementingIdMixin, BaseIBApp):
     # ------------------------------------------------------------------
     def tickPrice(self, reqId: int, tickType: int, price: float, attrib: Any) -> None:  # noqa: N802 - IB API
         data = self._data(reqId)
+        if data is None:
+            return
         numeric = _is_valid_price(price)
         if tickType == TickTypeEnum.BID and numeric:
             data["bid"] = float(price)
@@ -341,6 +453,8 @@ class QuoteSnapshotApp(IncrementingIdMixin, BaseIBApp):
         lastGreeksUpdateTime: float | None = None,
     ) -> None:  # noqa: N802 - IB API
         data = self._data(reqId)
+        if data is None:
+            return
         updated = False
         if _store_numeric(data, "delta", delta):
             updated = True
@@ -356,15 +470,20 @@ class QuoteSnapshotApp(IncrementingIdMixin, BaseIBApp):
             self._finalize_request(reqId)
 
     def contractDetails(self, reqId: int, details: ContractDetails) -> None:  # noqa: N802 - IB API
-        self._contract_details.setdefault(reqId, []).append(details)
+        with self._lock:
+            if reqId in self._events:
+                self._contract_details.setdefault(reqId, []).append(details)
 
     def contractDetailsEnd(self, reqId: int) -> None:  # noqa: N802 - IB API
-        self._event(reqId).set()
+        event = self._event(reqId)
+        if event is not None:
+            event.set()
 
     def error(self, reqId: int, errorTime: int, errorCode: int, errorString: str, advancedOrderRejectJson: str = "") -> None:  # noqa: N802 - IB API
         super().error(reqId, errorTime, errorCode, errorString, advancedOrderRejectJson)
         if reqId > 0:
-            self._finalize_request(reqId)
+            failed = errorCode not in self.WARNING_ERROR_CODES
+            self._finalize_request(reqId, errorCode if failed else None)
 
 
 class IBMarketDataService:
@@ -376,8 +495,14 @@ class IBMarketDataService:
         app_factory: Callable[[], QuoteSnapshotApp] | None = None,
         generic_ticks: str | None = None,
         use_snapshot: bool | None = None,
+        session_manager: IBSessionManager | None = None,
+        contract_cache: ContractDetailsCache | None = None,
+        quote_cache: LiveQuoteCache | None = None,
     ) -> None:
         self._app_factory = app_factory or QuoteSnapshotApp
+        self._session_manager = session_manager
+        self._contract_cache = contract_cache
+        self._quote_cache = quote_cache
         cfg_ticks = (
             generic_ticks
             if generic_ticks is not None
@@ -391,12 +516,33 @@ class IBMarketDataService:
         self._use_snapshot = bool(use_snapshot)
         self._max_quote_retries = max(int(cfg_value("IB_MAX_QUOTE_RETRIES", 3)), 0)
         self._quote_retry_delay = max(float(cfg_value("IB_QUOTE_RETRY_DELAY", 0.75)), 0.0)
+        self._max_concurrent_quotes = max(int(cfg_value("IB_MAX_CONCURRENT_QUOTES", 50)), 1)
 
     def _should_use_snapshot(self) -> bool:
         """Return ``True`` when snapshot requests can be used safely."""
 
         return self._use_snapshot and not bool(self._generic_ticks)
 
+    @property
+    def session_manager(self) -> IBSessionManager:
+        if self._session_manager is None:
+            self._session_manager = get_session_manager()
+        return self._session_manager
+
+    @property
+    def contract_cache(self) -> ContractDetailsCache:
+        if self._contract_cache is None:
+            self._contract_cache = get_contract_cache()
+        return self._contract_cache
+
+    @property
+    def quote_cache(self) -> LiveQuoteCache | None:
+        """Streaming quote cache, ``None`` unless enabled or passed in."""
+
+        if self._quote_cache is None:
+            self._quote_cache = get_quote_cache()
+        return self._quote_cache
+
     # ------------------------------------------------------------------
     def refresh(
         self,
@@ -409,219 +555,322 @@ class IBMarketDataService:
         trigger: str | None = None,
         log_delta: bool = True,
     ) -> SnapshotResult:
-        import time as _time
-        _t_refresh_start = _time.perf_counter()
-
         if not proposal.legs:
             logger.info("[ib_marketdata] refresh: no legs, skipping")
             return SnapshotResult(proposal, [], True, [])
 
+        return self.refresh_many(
+            [proposal],
+            criteria=criteria,
+            spot_prices=[spot_price],
+            interest_rate=interest_rate,
+            timeout=timeout,
+            trigger=trigger,
+            log_delta=log_delta,
+        )[0]
+
+    def refresh_many(
+        self,
+        proposals: Sequence[StrategyProposal],
+        *,
+        criteria: Any | None = None,
+        spot_prices: Sequence[float | None] | None = None,
+        interest_rate: float | None = None,
+        timeout: float | None = None,
+        trigger: str | None = None,
+        log_delta: bool = True,
+    ) -> list[SnapshotResult]:
+        """Refresh ``proposals`` requesting every unique contract only once.
+
+        Legs are deduplicated across proposals by :func:`contract_key`; the
+        merged snapshot of each contract is applied to every leg sharing it
+        before the proposals are re-scored individually.  ``interest_rate``
+        mirrors :func:`fetch_quote_snapshot`; re-scoring currently takes the
+        rate from ``INTEREST_RATE``.
+        """
+
+        import time as _time
+        _t_refresh_start = _time.perf_counter()
+
+        proposals = list(proposals)
+        spots = list(spot_prices) if spot_prices is not None else []
+        spots.extend([None] * (len(proposals) - len(spots)))
         trigger_label = trigger or "manual"
         timeout = timeout or float(cfg_value("MARKET_DATA_TIMEOUT", 15))
-        port = int(cfg_value("IB_PORT", 4002))
-        if bool(cfg_value("IB_PAPER_MODE", True)):
-            port = int(cfg_value("IB_PORT", 4002))
-        else:
-            port = int(cfg_value("IB_LIVE_PORT", 4001))
-        client_id = int(cfg_value("IB_MARKETDATA_CLIENT_ID", 901))
-        host = str(cfg_value("IB_HOST", "127.0.0.1"))
-
-        app = self._app_factory()
-        logger.info("📡 Ophalen IB quotes voor voorstel trigger=%s (legs=%d, timeout=%.1fs)",
-                    trigger_label, len(proposal.legs), timeout)
-
-        _t_connect_start = _time.perf_counter()
-        # Use a reasonable socket connect timeout (10s) - separate from data timeout
-        socket_timeout = min(10.0, timeout / 2)
-        logger.info("[ib_marketdata] connect_ib: starting host=%s port=%d client_id=%d socket_timeout=%.1fs",
-                    host, port, client_id, socket_timeout)
-        # Use connect_ib_with_retry for automatic recovery from duplicate client ID
-        connect_ib_with_retry(
-            client_id=client_id,
-            host=host,
-            port=port,
-            timeout=int(timeout),
-            app=app,
-            connect_timeout=socket_timeout,
-        )
-        _t_connect_done = _time.perf_counter()
-        logger.info("[ib_marketdata] connect_ib: done in %.0fms",
-                    (_t_connect_done - _t_connect_start) * 1000)
-
-        if hasattr(app, "wait_until_ready"):
-            _t_ready_start = _time.perf_counter()
-            logger.info("[ib_marketdata] wait_until_ready: starting (timeout=1.0s)")
-            ready_ok = app.wait_until_ready(timeout=1.0)
-            _t_ready_done = _time.perf_counter()
-            logger.info("[ib_marketdata] wait_until_ready: done in %.0fms (ready=%s)",
-                        (_t_ready_done - _t_ready_start) * 1000, ready_ok)
+        plan = QuotePlan.build(proposals)
+        before_metrics = [_capture_metric_snapshot(proposal) for proposal in proposals]
+        logger.info("📡 Ophalen IB quotes voor %d voorstel(len) trigger=%s "
+                    "(legs=%d, contracten=%d, timeout=%.1fs)",
+                    len(proposals), trigger_label, plan.total_legs, len(plan), timeout)
+
+        snapshots: dict[ContractKey, dict[str, Any]] = {}
+        complete: set[ContractKey] = set()
+        if len(plan):
+            _t_connect_start = _time.perf_counter()
+            # Interactive refreshes go ahead of chain fetches and backfills.
+            with pacing_priority(Priority.HIGH), self.session_manager.lease(
+                "marketdata", self._app_factory, marketdata_params(timeout)
+            ) as session:
+                logger.info("[ib_marketdata] session lease: done in %.0fms (leases=%d)",
+                            (_time.perf_counter() - _t_connect_start) * 1000, session.leases)
+                snapshots, complete = self._collect_quotes(
+                    session.app,
+                    plan,
+                    timeout=timeout,
+                    request_ids=iter(
+                        session.reserve_ids(len(plan) * (self._max_quote_retries + 1))
+                    ),
+                )
 
-        try:
-            missing: list[str] = []
-            delta_entries: list[dict[str, Any]] = []
-            before_metrics = _capture_metric_snapshot(proposal)
-            generic_ticks = self._generic_ticks or ""
-            use_snapshot = self._should_use_snapshot()
-            if self._use_snapshot and not use_snapshot:
-                logger.debug(
-                    "Snapshot market data not supported with generic ticks "
-                    f"{generic_ticks}; using streaming data instead"
+        results: list[SnapshotResult] = []
+        for index, proposal in enumerate(proposals):
+            if not proposal.legs:
+                results.append(SnapshotResult(proposal, [], True, []))
+                continue
+            results.append(
+                self._finalize_refresh(
+                    proposal,
+                    plan.keys[index],
+                    snapshots,
+                    complete,
+                    criteria=criteria,
+                    spot_price=spots[index],
+                    before_metrics=before_metrics[index],
+                    trigger_label=trigger_label,
+                    log_delta=log_delta,
                 )
-            logger.info("[ib_marketdata] starting leg loop: %d legs, use_snapshot=%s",
-                        len(proposal.legs), use_snapshot)
-            for leg_idx, leg in enumerate(proposal.legs):
-                _t_leg_start = _time.perf_counter()
-                leg_strike = leg.get("strike", "?")
-                logger.info("[ib_marketdata] leg %d/%d (strike=%s): starting",
-                            leg_idx + 1, len(proposal.legs), leg_strike)
+            )
+
+        logger.info("[ib_marketdata] refresh COMPLETE: total=%.0fms, proposals=%d, "
+                    "legs=%d, contracten=%d, missing=%d",
+                    (_time.perf_counter() - _t_refresh_start) * 1000, len(proposals),
+                    plan.total_legs, len(plan), len(plan) - len(complete))
+        return results
+
+    def _collect_quotes(
+        self,
+        app: QuoteSnapshotApp,
+        plan: QuotePlan,
+        *,
+        timeout: float,
+        request_ids: Iterator[int],
+    ) -> tuple[dict[ContractKey, dict[str, Any]], set[ContractKey]]:
+        """Fetch market data for every contract in ``plan``.
+
+        Returns the merged tick data per contract and the contracts for which
+        both a bid and an ask were received.
+        """
+
+        import time as _time
+
+        generic_ticks = self._generic_ticks or ""
+        use_snapshot = self._should_use_snapshot()
+        if self._use_snapshot and not use_snapshot:
+            logger.debug(
+                "Snapshot market data not supported with generic ticks "
+                f"{generic_ticks}; using streaming data instead"
+            )
+        contracts: list[tuple[ContractKey, Contract]] = []
+        with self.contract_cache.deferred():
+            for key, members in plan.members.items():
+                leg = members[0]
+                _t_build_start = _time.perf_counter()
                 try:
-                    _t_build_start = _time.perf_counter()
                     contract = self._build_contract(
                         leg,
                         log=False,
                         warn_missing=False,
                     )
-                    _t_build_done = _time.perf_counter()
-                    logger.info("[ib_marketdata] leg %d: _build_contract done in %.0fms",
-                                leg_idx + 1, (_t_build_done - _t_build_start) * 1000)
-
-                    _t_enrich_start = _time.perf_counter()
                     contract = self._maybe_enrich_contract(app, leg, contract, timeout)
-                    _t_enrich_done = _time.perf_counter()
-                    logger.info("[ib_marketdata] leg %d: _maybe_enrich_contract done in %.0fms",
-                                leg_idx + 1, (_t_enrich_done - _t_enrich_start) * 1000)
                 except Exception as exc:
                     logger.warning(f"⚠️ Contract kon niet worden opgebouwd: {exc}")
                     logger.warning(
                         f"IB leg payload bij fout: {pformat(_loggable_leg_payload(leg))}"
                     )
-                    missing.append(str(leg.get("strike")))
-                    leg["missing_edge"] = True
                     continue
-                attempts = 0
-                quote_received = False
-                retry_delay = self._quote_retry_delay
-                max_retries = self._max_quote_retries
+                plan.share_contract_fields(key)
+                logger.info("[ib_marketdata] contract strike=%s ready in %.0fms (legs=%d)",
+                            leg.get("strike", "?"), (_time.perf_counter() - _t_build_start) * 1000,
+                            len(members))
                 self._log_contract(contract, leg)
-                _t_mktdata_loop_start = _time.perf_counter()
-                logger.info("[ib_marketdata] leg %d: starting reqMktData loop (max_retries=%d, timeout=%.1fs)",
-                            leg_idx + 1, max_retries, timeout)
-                while attempts <= max_retries:
-                    attempts += 1
-                    req_id = app._next_id()
-                    app.register_request(req_id, snapshot=use_snapshot)
-                    event = app._event(req_id)
-                    logger.info(
-                        "[ib_marketdata] leg %d attempt %d/%d: reqMktData req_id=%d strike=%s",
-                        leg_idx + 1, attempts, max_retries + 1, req_id, leg_strike
-                    )
-                    _t_req_start = _time.perf_counter()
-                    app.reqMktData(req_id, contract, generic_ticks, use_snapshot, False, [])
-                    try:
-                        _t_wait_start = _time.perf_counter()
-                        logger.info("[ib_marketdata] leg %d attempt %d: event.wait starting (timeout=%.1fs)",
-                                    leg_idx + 1, attempts, timeout)
-                        wait_result = event.wait(timeout)
-                        _t_wait_done = _time.perf_counter()
-                        logger.info("[ib_marketdata] leg %d attempt %d: event.wait done in %.0fms (result=%s)",
-                                    leg_idx + 1, attempts, (_t_wait_done - _t_wait_start) * 1000, wait_result)
-                        if not wait_result:
-                            logger.warning(
-                                "⏱ Timeout bij ophalen quote voor "
-                                f"strike {leg.get('strike')} (poging {attempts})"
-                            )
-                        else:
-                            snapshot = app._responses.get(req_id, {})
-                            self._apply_snapshot(
-                                leg,
-                                snapshot,
-                                delta_log=delta_entries if log_delta else None,
-                                trigger=trigger_label,
-                            )
-                            bid_ok = _is_valid_price(snapshot.get("bid"))
-                            ask_ok = _is_valid_price(snapshot.get("ask"))
-                            if bid_ok and ask_ok:
-                                quote_received = True
-                                _t_req_done = _time.perf_counter()
-                                logger.info("[ib_marketdata] leg %d attempt %d: quote received in %.0fms (bid=%s, ask=%s)",
-                                            leg_idx + 1, attempts, (_t_req_done - _t_req_start) * 1000,
-                                            snapshot.get("bid"), snapshot.get("ask"))
-                                break
-                            logger.info(
-                                "[ib_marketdata] leg %d attempt %d: missing bid/ask (bid=%s, ask=%s)",
-                                leg_idx + 1, attempts, snapshot.get('bid'), snapshot.get('ask')
-                            )
-                    finally:
-                        try:
-                            app.cancelMktData(req_id)
-                        except Exception:
-                            pass
-                        app.clear_request(req_id)
-
-                    if quote_received:
-                        break
-                    if attempts <= max_retries and retry_delay:
-                        logger.info("[ib_marketdata] leg %d: sleeping %.2fs before retry", leg_idx + 1, retry_delay)
-                        time.sleep(retry_delay)
-
-                _t_mktdata_loop_done = _time.perf_counter()
-                _t_leg_done = _time.perf_counter()
-                logger.info("[ib_marketdata] leg %d/%d done: total=%.0fms, mktdata_loop=%.0fms, quote_received=%s",
-                            leg_idx + 1, len(proposal.legs),
-                            (_t_leg_done - _t_leg_start) * 1000,
-                            (_t_mktdata_loop_done - _t_mktdata_loop_start) * 1000,
-                            quote_received)
-
-                if not quote_received:
-                    missing.append(str(leg.get("strike")))
-                    leg["missing_edge"] = True
-
-            _t_score_start = _time.perf_counter()
-            score, reasons = scoring.calculate_score(
-                proposal.strategy,
-                proposal,
-                spot=spot_price,
-                criteria=criteria,
-                atr=proposal.atr,
-            )
-            _t_score_done = _time.perf_counter()
-            logger.info("[ib_marketdata] calculate_score done in %.0fms",
-                        (_t_score_done - _t_score_start) * 1000)
-
-            accepted = score is not None
-            after_metrics = _capture_metric_snapshot(proposal)
-            metrics_delta = _compute_metric_delta(before_metrics, after_metrics)
-            refreshed_at = datetime.utcnow().isoformat()
-            result = SnapshotResult(
-                proposal=proposal,
-                reasons=reasons,
-                accepted=accepted,
-                missing_quotes=missing,
-                delta_log=list(delta_entries) if log_delta else [],
-                trigger=trigger_label,
-                metrics_delta=metrics_delta if metrics_delta else None,
-                refreshed_at=refreshed_at,
+                contracts.append((key, contract))
+
+        _t_mktdata_start = _time.perf_counter()
+        logger.info("[ib_marketdata] requesting %d contracts concurrently (use_snapshot=%s, max_lines=%d)",
+                    len(contracts), use_snapshot, self._max_concurrent_quotes)
+        snapshots: dict[ContractKey, dict[str, Any]] = {}
+        complete: set[ContractKey] = set()
+        pending = contracts
+        cache = self.quote_cache
+        if cache is not None and contracts:
+            # Streamed contracts are answered from memory; only the ones the
+            # cache could not subscribe fall through to one-off requests.
+            cached, pending = cache.collect(
+                app, contracts, timeout=timeout, generic_ticks=generic_ticks
             )
-            if log_delta and delta_entries:
+            for key, data in cached.items():
+                snapshots[key] = data
+                if has_two_sided_quote(data):
+                    complete.add(key)
+        attempts = 0
+        while pending and attempts <= self._max_quote_retries:
+            if attempts and self._quote_retry_delay:
+                logger.info("[ib_marketdata] %d contracts incomplete, sleeping %.2fs before retry",
+                            len(pending), self._quote_retry_delay)
+                time.sleep(self._quote_retry_delay)
+            attempts += 1
+            incomplete: list[tuple[ContractKey, Contract]] = []
+            limit = self._max_concurrent_quotes
+            for offset in range(0, len(pending), limit):
+                batch = pending[offset:offset + limit]
+                for key, contract, data in self._request_batch(
+                    app,
+                    plan,
+                    batch,
+                    request_ids=request_ids,
+                    generic_ticks=generic_ticks,
+                    use_snapshot=use_snapshot,
+                    timeout=timeout,
+                    attempt=attempts,
+                ):
+                    if data is not None:
+                        snapshots.setdefault(key, {}).update(data)
+                    merged = snapshots.get(key, {})
+                    if _is_valid_price(merged.get("bid")) and _is_valid_price(merged.get("ask")):
+                        complete.add(key)
+                    else:
+                        incomplete.append((key, contract))
+            pending = incomplete
+        logger.info("[ib_marketdata] market data done in %.0fms (attempts=%d, incomplete=%d)",
+                    (_time.perf_counter() - _t_mktdata_start) * 1000, attempts, len(pending))
+        return snapshots, complete
+
+    def _request_batch(
+        self,
+        app: QuoteSnapshotApp,
+        plan: QuotePlan,
+        batch: list[tuple[ContractKey, Contract]],
+        *,
+        request_ids: Iterator[int],
+        generic_ticks: str,
+        use_snapshot: bool,
+        timeout: float,
+        attempt: int,
+    ) -> list[tuple[ContractKey, Contract, dict[str, Any] | None]]:
+        """Request quotes for ``batch`` at once and wait with one deadline.
+
+        Returns ``(key, contract, data)`` per request; ``data`` is ``None``
+        when the request timed out.
+        """
+
+        requests: list[tuple[ContractKey, Contract, int, threading.Event]] = []
+        results: list[tuple[ContractKey, Contract, dict[str, Any] | None]] = []
+        try:
+            # Each request is recorded before it is sent, so a pacing
+            # timeout or socket error mid-batch still cancels the lines
+            # opened so far.
+            for key, contract in batch:
+                req_id = next(request_ids, None) or app._next_id()
+                app.register_request(req_id, snapshot=use_snapshot)
+                event = app._event(req_id)
+                requests.append((key, contract, req_id, event))
                 logger.info(
-                    "[refresh-summary] trigger=%s legs=%d delta_count=%d accepted=%s",
-                    trigger_label,
-                    len(proposal.legs),
-                    len(delta_entries),
-                    accepted,
+                    "[ib_marketdata] attempt %d: reqMktData req_id=%d strike=%s",
+                    attempt, req_id, plan.members[key][0].get("strike", "?")
                 )
-            result.governance = _governance_payload(proposal, result, trigger_label)
+                app.reqMktData(req_id, contract, generic_ticks, use_snapshot, False, [])
 
-            _t_refresh_done = _time.perf_counter()
-            logger.info("[ib_marketdata] refresh COMPLETE: total=%.0fms, legs=%d, missing=%d, accepted=%s",
-                        (_t_refresh_done - _t_refresh_start) * 1000,
-                        len(proposal.legs), len(missing), accepted)
-            return result
+            deadline = time.monotonic() + timeout
+            for key, contract, req_id, event in requests:
+                strike = plan.members[key][0].get("strike")
+                remaining = max(deadline - time.monotonic(), 0.0)
+                if not event.wait(remaining):
+                    logger.warning(
+                        "⏱ Timeout bij ophalen quote voor "
+                        f"strike {strike} (poging {attempt})"
+                    )
+                    results.append((key, contract, None))
+                    continue
+                data = dict(app._responses.get(req_id, {}))
+                logger.info(
+                    "[ib_marketdata] attempt %d: strike %s bid=%s ask=%s",
+                    attempt, strike, data.get("bid"), data.get("ask")
+                )
+                results.append((key, contract, data))
         finally:
-            try:
-                app.disconnect()
-            except Exception:
-                logger.debug("Kon IB verbinding niet netjes sluiten", exc_info=True)
+            for _key, _contract, req_id, _done in requests:
+                try:
+                    app.cancelMktData(req_id)
+                except Exception:
+                    pass
+                app.clear_request(req_id)
+        return results
+
+    def _finalize_refresh(
+        self,
+        proposal: StrategyProposal,
+        keys: Sequence[ContractKey],
+        snapshots: Mapping[ContractKey, Mapping[str, Any]],
+        complete: set[ContractKey],
+        *,
+        criteria: Any | None,
+        spot_price: float | None,
+        before_metrics: Mapping[str, float],
+        trigger_label: str,
+        log_delta: bool,
+    ) -> SnapshotResult:
+        import time as _time
+
+        missing: list[str] = []
+        delta_entries: list[dict[str, Any]] = []
+        for leg, key in zip(proposal.legs, keys):
+            data = snapshots.get(key)
+            if data is not None:
+                self._apply_snapshot(
+                    leg,
+                    data,
+                    delta_log=delta_entries if log_delta else None,
+                    trigger=trigger_label,
+                )
+            if key not in complete:
+                missing.append(str(leg.get("strike")))
+                leg["missing_edge"] = True
+
+        _t_score_start = _time.perf_counter()
+        evaluation = reevaluate_proposal(
+            proposal,
+            spot=spot_price,
+            criteria=criteria,
+            atr=proposal.atr,
+        )
+        score, reasons = evaluation.score, evaluation.reasons
+        logger.info("[ib_marketdata] rescoring (%s) done in %.0fms",
+                    evaluation.mode, (_time.perf_counter() - _t_score_start) * 1000)
+
+        accepted = score is not None
+        after_metrics = _capture_metric_snapshot(proposal)
+        metrics_delta = _compute_metric_delta(before_metrics, after_metrics)
+        refreshed_at = datetime.utcnow().isoformat()
+        result = SnapshotResult(
+            proposal=proposal,
+            reasons=reasons,
+            accepted=accepted,
+            missing_quotes=missing,
+            delta_log=list(delta_entries) if log_delta else [],
+            trigger=trigger_label,
+            metrics_delta=metrics_delta if metrics_delta else None,
+            refreshed_at=refreshed_at,
+        )
+        if log_delta and delta_entries:
+            logger.info(
+                "[refresh-summary] trigger=%s legs=%d delta_count=%d accepted=%s",
+                trigger_label,
+                len(proposal.legs),
+                len(delta_entries),
+                accepted,
+            )
+        result.governance = _governance_payload(proposal, result, trigger_label)
+        return result
 
     # ------------------------------------------------------------------
     def _build_contract(
@@ -675,22 +924,37 @@ class IBMarketDataService:
         if not hasattr(app, "request_contract_details"):
             logger.debug("[_maybe_enrich_contract] app has no request_contract_details, skipping")
             return contract
-        details_timeout = max(1.0, min(float(timeout), 5.0))
-        logger.info("[_maybe_enrich_contract] calling request_contract_details (timeout=%.1fs)", details_timeout)
-        _t_details_start = _time.perf_counter()
-        try:
-            enriched = app.request_contract_details(contract, timeout=details_timeout)
-        except Exception:
+        cache = self.contract_cache
+        cached = cache.lookup(contract)
+        if cached is not None:
+            logger.debug("[_maybe_enrich_contract] contract details from cache")
+            enriched = OptionContract(
+                symbol=str(getattr(contract, "symbol", "")),
+                expiry=str(getattr(contract, "lastTradeDateOrContractMonth", "")),
+                strike=float(getattr(contract, "strike", 0.0) or 0.0),
+                right=str(getattr(contract, "right", "")),
+                trading_class=cached.trading_class,
+                primary_exchange=cached.primary_exchange,
+                con_id=cached.con_id,
+            )
+        else:
+            details_timeout = max(1.0, min(float(timeout), 5.0))
+            logger.info("[_maybe_enrich_contract] calling request_contract_details (timeout=%.1fs)", details_timeout)
+            _t_details_start = _time.perf_counter()
+            try:
+                enriched = app.request_contract_details(contract, timeout=details_timeout)
+            except Exception:
+                _t_details_done = _time.perf_counter()
+                logger.warning("[_maybe_enrich_contract] request_contract_details failed in %.0fms",
+                               (_t_details_done - _t_details_start) * 1000)
+                logger.debug("Contract details request failed", exc_info=True)
+                return contract
             _t_details_done = _time.perf_counter()
-            logger.warning("[_maybe_enrich_contract] request_contract_details failed in %.0fms",
-                           (_t_details_done - _t_details_start) * 1000)
-            logger.debug("Contract details request failed", exc_info=True)
-            return contract
-        _t_details_done = _time.perf_counter()
-        logger.info("[_maybe_enrich_contract] request_contract_details done in %.0fms (enriched=%s)",
-                    (_t_details_done - _t_details_start) * 1000, enriched is not None)
-        if not enriched:
-            return contract
+            logger.info("[_maybe_enrich_contract] request_contract_details done in %.0fms (enriched=%s)",
+                        (_t_details_done - _t_details_start) * 1000, enriched is not None)
+            if not enriched:
+                return contract
+            cache.store(contract, enriched)
 
         updated = False
         if enriched.trading_class and not trading_class:
@@ -794,7 +1058,7 @@ class IBMarketDataService:
                 leg["mid_refresh_trigger"] = trigger
             timestamp = datetime.utcnow().isoformat()
             leg["mid_refresh_timestamp"] = timestamp
-            leg["quote_age_sec"] = 0.0
+            leg["quote_age_sec"] = float(data.get("quote_age_sec") or 0.0)
             previous_mid_val = None
             try:
                 previous_mid_val = float(previous_mid) if previous_mid is not None else None
@@ -863,6 +1127,41 @@ class IBMarketDataService:
         normalize_leg(leg)
 
 
+def _finalize_snapshot(
+    result: SnapshotResult,
+    baseline_metrics: Mapping[str, float],
+    trigger: str | None,
+) -> SnapshotResult:
+    result.trigger = result.trigger or trigger or "manual"
+    if not result.metrics_delta:
+        updated_metrics = _capture_metric_snapshot(result.proposal)
+        metrics_delta = _compute_metric_delta(baseline_metrics, updated_metrics)
+        if metrics_delta:
+            result.metrics_delta = metrics_delta
+    if not result.governance:
+        result.governance = _governance_payload(result.proposal, result, result.trigger)
+
+    metrics_delta = result.metrics_delta or {}
+    if metrics_delta:
+        changed = {
+            key: details
+            for key, details in metrics_delta.items()
+            if details.get("delta") not in {0, 0.0, None}
+        }
+    else:
+        changed = {}
+    if changed:
+        logger.info(
+            "[refresh-metrics] trigger=%s accepted=%s changes=%s",
+            result.trigger,
+            result.accepted,
+            changed,
+        )
+    if result.accepted and result.governance and not result.governance.get("needs_refresh"):
+        result.proposal.needs_refresh = False
+    return result
+
+
 def fetch_quote_snapshot(
     proposal: StrategyProposal,
     *,
@@ -896,33 +1195,7 @@ def fetch_quote_snapshot(
     _t_refresh_done = _time.perf_counter()
     logger.info("[fetch_quote_snapshot] svc.refresh done in %.0fms",
                 (_t_refresh_done - _t_refresh_start) * 1000)
-    result.trigger = result.trigger or trigger or "manual"
-    if not result.metrics_delta:
-        updated_metrics = _capture_metric_snapshot(result.proposal)
-        metrics_delta = _compute_metric_delta(baseline_metrics, updated_metrics)
-        if metrics_delta:
-            result.metrics_delta = metrics_delta
-    if not result.governance:
-        result.governance = _governance_payload(result.proposal, result, result.trigger)
-
-    metrics_delta = result.metrics_delta or {}
-    if metrics_delta:
-        changed = {
-            key: details
-            for key, details in metrics_delta.items()
-            if details.get("delta") not in {0, 0.0, None}
-        }
-    else:
-        changed = {}
-    if changed:
-        logger.info(
-            "[refresh-metrics] trigger=%s accepted=%s changes=%s",
-            result.trigger,
-            result.accepted,
-            changed,
-        )
-    if result.accepted and result.governance and not result.governance.get("needs_refresh"):
-        result.proposal.needs_refresh = False
+    _finalize_snapshot(result, baseline_metrics, trigger)
 
     _t_done = _time.perf_counter()
     logger.info("[fetch_quote_snapshot] COMPLETE: total=%.0fms, accepted=%s, missing=%d",
@@ -930,10 +1203,43 @@ def fetch_quote_snapshot(
     return result
 
 
+def fetch_quote_snapshots(
+    proposals: Sequence[StrategyProposal],
+    *,
+    criteria: Any | None = None,
+    spot_prices: Sequence[float | None] | None = None,
+    interest_rate: float | None = None,
+    timeout: float | None = None,
+    trigger: str | None = None,
+    log_delta: bool = True,
+    service: IBMarketDataService | None = None,
+) -> list[SnapshotResult]:
+    """Refresh several proposals, requesting each shared contract once."""
+
+    svc = service or IBMarketDataService()
+    baselines = [_capture_metric_snapshot(proposal) for proposal in proposals]
+    results = svc.refresh_many(
+        proposals,
+        criteria=criteria,
+        spot_prices=spot_prices,
+        interest_rate=interest_rate,
+        timeout=timeout,
+        trigger=trigger,
+        log_delta=log_delta,
+    )
+    return [
+        _finalize_snapshot(result, baseline, trigger)
+        for result, baseline in zip(results, baselines)
+    ]
+
+
 __all__ = [
     "SnapshotResult",
     "IBMarketDataService",
+    "QuotePlan",
     "QuoteSnapshotApp",
+    "contract_key",
     "fetch_quote_snapshot",
+    "fetch_quote_snapshots",
 ]
 
@@ -0,0 +1,348 @@
+"""Long-lived, shared IB connections for repeated market data requests.
+
+Opening a TWS connection costs a socket handshake, a ``nextValidId`` round
+trip and a fresh reader thread.  Quote refreshes used to pay that price for
+every proposal.  :class:`IBSessionManager` keeps one connected client per
+*role* (e.g. ``"marketdata"``), hands it out to callers with reference
+counting and reconnects transparently when the connection dropped.  Idle
+sessions are closed after ``IB_SESSION_IDLE_TIMEOUT`` seconds.
+
+While a session is open its client id is taken: another process that
+connects with the same id (``IB_MARKETDATA_CLIENT_ID``) is refused by TWS
+with error 326 until the idle timeout expires.  Give such processes their
+own client id, or set ``IB_SESSION_IDLE_TIMEOUT`` to 0 to disconnect after
+every refresh.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from tomic.api.ib_connection import connect_ib_with_retry
+from tomic.logutils import logger
+from tomic.services._config import cfg_value
+
+Connector = Callable[..., Any]
+
+
+@dataclass(frozen=True)
+class SessionParams:
+    """Connection parameters for a session.
+
+    A session is identified by ``host``, ``port`` and ``client_id`` only.
+    The timeouts apply while connecting; callers pass their own request
+    timeout to each request, so leases with different timeouts share the
+    session.
+    """
+
+    host: str
+    port: int
+    client_id: int
+    timeout: float = field(default=5.0, compare=False)
+    connect_timeout: float = field(default=10.0, compare=False)
+    ready_timeout: float = field(default=1.0, compare=False)
+
+
+def marketdata_params(timeout: float | None = None) -> SessionParams:
+    """Return :class:`SessionParams` for the configured market data client."""
+
+    timeout = float(timeout or cfg_value("MARKET_DATA_TIMEOUT", 15))
+    if bool(cfg_value("IB_PAPER_MODE", True)):
+        port = int(cfg_value("IB_PORT", 4002))
+    else:
+        port = int(cfg_value("IB_LIVE_PORT", 4001))
+    return SessionParams(
+        host=str(cfg_value("IB_HOST", "127.0.0.1")),
+        port=port,
+        client_id=int(cfg_value("IB_MARKETDATA_CLIENT_ID", 901)),
+        timeout=timeout,
+        connect_timeout=min(10.0, timeout / 2),
+    )
+
+
+@dataclass
+class IBSession:
+    """A connected IB client shared between callers."""
+
+    role: str
+    params: SessionParams
+    app: Any
+    factory: Callable[[], Any]
+    refs: int = 0
+    connected_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    leases: int = 0
+    _id_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def healthy(self) -> bool:
+        """Return ``True`` when the socket and reader thread are alive."""
+
+        is_connected = getattr(self.app, "isConnected", None)
+        if callable(is_connected):
+            try:
+                if not is_connected():
+                    return False
+            except Exception:
+                return False
+        thread = getattr(self.app, "_thread", None)
+        if thread is not None and not thread.is_alive():
+            return False
+        return True
+
+    def reserve_ids(self, count: int) -> range:
+        """Reserve ``count`` consecutive request ids on the shared client."""
+
+        count = max(int(count), 0)
+        reserve = getattr(self.app, "_reserve_ids", None)
+        if callable(reserve):
+            return reserve(count)
+        with self._id_lock:
+            ids = [self.app._next_id() for _ in range(count)]
+        return range(ids[0], ids[-1] + 1) if ids else range(0)
+
+
+class IBSessionManager:
+    """Own one reference-counted :class:`IBSession` per role."""
+
+    def __init__(
+        self,
+        *,
+        connector: Connector | None = None,
+        idle_timeout: float | None = None,
+    ) -> None:
+        self._connector = connector or connect_ib_with_retry
+        if idle_timeout is None:
+            idle_timeout = float(cfg_value("IB_SESSION_IDLE_TIMEOUT", 300.0))
+        self._idle_timeout = max(float(idle_timeout), 0.0)
+        self._sessions: dict[str, IBSession] = {}
+        self._timers: dict[str, threading.Timer] = {}
+        # role -> event set once the connect in progress for it finishes
+        self._connecting: dict[str, threading.Event] = {}
+        self._lock = threading.RLock()
+        self.connects = 0
+
+    # ------------------------------------------------------------------
+    def acquire(
+        self,
+        role: str,
+        factory: Callable[[], Any],
+        params: SessionParams,
+    ) -> IBSession:
+        """Return a healthy session for ``role`` and take a reference.
+
+        Connecting happens outside the manager lock; concurrent callers for
+        the same role wait for that connect instead of starting their own.
+        """
+
+        while True:
+            stale: IBSession | None = None
+            with self._lock:
+                connecting = self._connecting.get(role)
+                if connecting is None:
+                    self._cancel_timer(role)
+                    session = self._sessions.get(role)
+                    if session is not None and (
+                        session.params != params or session.factory is not factory
+                    ):
+                        if session.refs:
+                            raise RuntimeError(
+                                f"IB sessie '{role}' is in gebruik met andere parameters"
+                            )
+                        stale, session = session, None
+                    elif session is not None and not session.healthy():
+                        logger.warning(
+                            f"[ib_session] {role}: verbinding verbroken, opnieuw verbinden"
+                        )
+                        stale, session = session, None
+                    if session is not None:
+                        self._take(session)
+                        return session
+                    if stale is not None:
+                        self._sessions.pop(role, None)
+                    connecting = self._connecting[role] = threading.Event()
+                    break
+            connecting.wait()
+
+        try:
+            if stale is not None:
+                self._disconnect(stale)
+            session = self._connect(role, factory, params)
+            with self._lock:
+                self._sessions[role] = session
+                self._take(session)
+            return session
+        finally:
+            with self._lock:
+                self._connecting.pop(role, None)
+            connecting.set()
+
+    def release(self, session: IBSession, *, broken: bool = False) -> None:
+        """Drop a reference; idle sessions are closed after the idle timeout."""
+
+        with self._lock:
+            session.refs = max(session.refs - 1, 0)
+            session.last_used = time.monotonic()
+            current = self._sessions.get(session.role)
+            if current is not session:
+                if session.refs == 0:
+                    self._disconnect(session)
+                return
+            if broken and session.refs == 0:
+                self._sessions.pop(session.role, None)
+                self._disconnect(session)
+                return
+            if session.refs == 0:
+                if self._idle_timeout <= 0:
+                    self._sessions.pop(session.role, None)
+                    self._disconnect(session)
+                else:
+                    self._schedule_idle_close(session)
+
+    @contextmanager
+    def lease(
+        self,
+        role: str,
+        factory: Callable[[], Any],
+        params: SessionParams,
+    ) -> Iterator[IBSession]:
+        """Context manager around :meth:`acquire` / :meth:`release`."""
+
+        session = self.acquire(role, factory, params)
+        broken = False
+        try:
+            yield session
+        except (ConnectionError, OSError):
+            broken = True
+            raise
+        finally:
+            self.release(session, broken=broken or not session.healthy())
+
+    def close(self, role: str) -> None:
+        with self._lock:
+            self._cancel_timer(role)
+            session = self._sessions.pop(role, None)
+            if session is not None:
+                self._disconnect(session)
+
+    def close_all(self) -> None:
+        with self._lock:
+            for role in list(self._sessions):
+                self.close(role)
+
+    def session(self, role: str) -> IBSession | None:
+        with self._lock:
+            return self._sessions.get(role)
+
+    # ------------------------------------------------------------------
+    def _connect(
+        self, role: str, factory: Callable[[], Any], params: SessionParams
+    ) -> IBSession:
+        app = factory()
+        start = time.perf_counter()
+        logger.info(
+            "[ib_session] %s: verbinden host=%s port=%d client_id=%d",
+            role,
+            params.host,
+            params.port,
+            params.client_id,
+        )
+        connected = self._connector(
+            client_id=params.client_id,
+            host=params.host,
+            port=params.port,
+            timeout=int(params.timeout),
+            app=app,
+            connect_timeout=params.connect_timeout,
+        )
+        if connected is not None and connected is not app:
+            # After error 326 connect_ib_with_retry connects a fresh IBClient
+            # under a random client id; it lacks the callbacks of ``app``.
+            logger.warning(
+                f"[ib_session] {role}: client_id {params.client_id} is in gebruik, "
+                "opnieuw verbinden met een willekeurige client_id"
+            )
+            try:
+                connected.disconnect()
+            except Exception:
+                logger.debug("Kon IB verbinding niet netjes sluiten", exc_info=True)
+            app = factory()
+            self._connector(
+                client_id=params.client_id,
+                host=params.host,
+                port=params.port,
+                timeout=int(params.timeout),
+                app=app,
+                connect_timeout=params.connect_timeout,
+                unique=True,
+                max_retries=0,
+            )
+        if hasattr(app, "wait_until_ready"):
+            app.wait_until_ready(timeout=params.ready_timeout)
+        self.connects += 1
+        logger.info(
+            "[ib_session] %s: verbonden in %.0fms",
+            role,
+            (time.perf_counter() - start) * 1000,
+        )
+        return IBSession(role=role, params=params, app=app, factory=factory)
+
+    def _take(self, session: IBSession) -> None:
+        session.refs += 1
+        session.leases += 1
+        session.last_used = time.monotonic()
+
+    def _disconnect(self, session: IBSession) -> None:
+        try:
+            session.app.disconnect()
+        except Exception:
+            logger.debug("Kon IB verbinding niet netjes sluiten", exc_info=True)
+
+    def _cancel_timer(self, role: str) -> None:
+        timer = self._timers.pop(role, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _schedule_idle_close(self, session: IBSession) -> None:
+        def _close_if_idle() -> None:
+            with self._lock:
+                if self._timers.get(session.role) is timer:
+                    self._timers.pop(session.role, None)
+                if self._sessions.get(session.role) is session and session.refs == 0:
+                    logger.info(f"[ib_session] {session.role}: idle sessie gesloten")
+                    self._sessions.pop(session.role, None)
+                    self._disconnect(session)
+
+        self._cancel_timer(session.role)
+        timer = threading.Timer(self._idle_timeout, _close_if_idle)
+        timer.daemon = True
+        self._timers[session.role] = timer
+        timer.start()
+
+
+_DEFAULT_MANAGER: IBSessionManager | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_session_manager() -> IBSessionManager:
+    """Return the process wide :class:`IBSessionManager`."""
+
+    global _DEFAULT_MANAGER
+    with _DEFAULT_LOCK:
+        if _DEFAULT_MANAGER is None:
+            _DEFAULT_MANAGER = IBSessionManager()
+            atexit.register(_DEFAULT_MANAGER.close_all)
+        return _DEFAULT_MANAGER
+
+
+__all__ = [
+    "IBSession",
+    "IBSessionManager",
+    "SessionParams",
+    "get_session_manager",
+    "marketdata_params",
+]
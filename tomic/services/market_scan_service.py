@@ -76,6 +76,7 @@ class MarketScanService:
         atr_loader: Callable[[str], float | None] | None = None,
         apply_interpolation: bool = False,
         refresh_snapshot: Callable[..., Any] | None = None,
+        refresh_snapshots: Callable[..., Sequence[Any]] | None = None,
     ) -> None:
         self._pipeline = pipeline
         self._portfolio = portfolio_service
@@ -89,6 +90,7 @@ class MarketScanService:
         self._atr_loader = atr_loader or latest_atr
         self._apply_interpolation = apply_interpolation
         self._refresh_snapshot = refresh_snapshot
+        self._refresh_snapshots = refresh_snapshots
         self._last_scan_failures: list[ScanFailure] = []
 
     @property
@@ -345,27 +347,16 @@ class MarketScanService:
 
         if refresh_quotes:
             refresher = self._refresh_snapshot
-            if refresher is None:
+            if refresher is None and self._refresh_snapshots is None:
                 logger.debug(
                     "Refresh requested but no snapshot refresher configured; skipping"
                 )
             else:
+                results = self._refresh_rows(scan_rows)
                 rejected_indices: list[int] = []
                 for index, row in enumerate(scan_rows):
-                    try:
-                        result = refresher(
-                            row.proposal,
-                            symbol=row.symbol,
-                            spot_price=row.spot,
-                        )
-                    except Exception as exc:  # pragma: no cover - defensive logging
-                        logger.debug(
-                            "Quote refresh failed for %s/%s: %s",
-                            row.symbol,
-                            row.strategy,
-                            exc,
-                            exc_info=True,
-                        )
+                    result = results[index]
+                    if result is None:
                         continue
                     proposal = getattr(result, "proposal", None)
                     accepted = getattr(result, "accepted", True)
@@ -386,6 +377,50 @@ class MarketScanService:
         rules = {"top_n": top_n} if top_n is not None else None
         return self._portfolio.rank_candidates(scan_rows, rules)
 
+    def _refresh_rows(self, scan_rows: Sequence[ScanRow]) -> list[Any | None]:
+        """Refresh quotes for ``scan_rows``; ``None`` marks a failed refresh.
+
+        The batch refresher requests legs shared between rows only once; on
+        failure (or when none is configured) rows are refreshed one by one.
+        """
+
+        if self._refresh_snapshots is not None and len(scan_rows) > 1:
+            try:
+                batch = list(
+                    self._refresh_snapshots(
+                        [row.proposal for row in scan_rows],
+                        spot_prices=[row.spot for row in scan_rows],
+                    )
+                )
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.debug("Batch quote refresh failed: %s", exc, exc_info=True)
+            else:
+                if len(batch) == len(scan_rows):
+                    return batch
+        refresher = self._refresh_snapshot
+        if refresher is None:
+            return [None] * len(scan_rows)
+        results: list[Any | None] = []
+        for row in scan_rows:
+            try:
+                results.append(
+                    refresher(
+                        row.proposal,
+                        symbol=row.symbol,
+                        spot_price=row.spot,
+                    )
+                )
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.debug(
+                    "Quote refresh failed for %s/%s: %s",
+                    row.symbol,
+                    row.strategy,
+                    exc,
+                    exc_info=True,
+                )
+                results.append(None)
+        return results
+
     def _resolve_dte_range(self, strategy: str) -> tuple[int, int]:
         return load_dte_range(
             strategy,
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from datetime import date
 from typing import Sequence
 
-from ...analysis.metrics import historical_volatility
+from ...analysis.metrics import rolling_historical_volatility
 from ...config import get as cfg_get
 from ...logutils import logger
 from ...utils import load_price_history, today
@@ -60,6 +60,7 @@ class HistoricalVolatilityCalculatorService:
             return []
         dates, closes = zip(*price_records)
         end_str = end_date.strftime("%Y-%m-%d")
+        hv_series = rolling_historical_volatility(closes, self.windows)
         new_records: list[dict] = []
         for idx in range(self.max_window, len(dates)):
             date_str = dates[idx]
@@ -69,7 +70,7 @@ class HistoricalVolatilityCalculatorService:
                 continue
             record: dict[str, float | str] = {"date": date_str}
             for window in self.windows:
-                hv_value = historical_volatility(closes[: idx + 1], window=window)
+                hv_value = hv_series[window][idx]
                 if hv_value is not None:
                     record[f"hv{window}"] = round(hv_value / 100, 9)
             if record.get(f"hv{self.max_window}") is None:
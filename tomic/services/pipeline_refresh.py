@@ -11,13 +11,14 @@ from typing import Any, Callable, Mapping, Sequence
 
 from ..logutils import logger
 from ..utils import resolve_symbol
-from .ib_marketdata import SnapshotResult, fetch_quote_snapshot
+from .ib_marketdata import SnapshotResult, fetch_quote_snapshot, fetch_quote_snapshots
 from .proposal_details import ProposalCore, build_proposal_core
 from .strategy_pipeline import StrategyProposal
 from ._config import cfg_value
 
 ProposalBuilder = Callable[[Mapping[str, Any]], StrategyProposal | None]
 SnapshotFetcher = Callable[..., SnapshotResult]
+BatchSnapshotFetcher = Callable[..., Sequence[SnapshotResult]]
 SortKeyCallable = Callable[[StrategyProposal | None, Mapping[str, Any]], tuple[Any, ...]]
 
 
@@ -47,6 +48,8 @@ class RefreshParams:
     max_workers: int | None = None
     executor: Executor | None = None
     fetch_snapshot: SnapshotFetcher | None = None
+    fetch_snapshots: BatchSnapshotFetcher | None = None
+    batch: bool | None = None
     proposal_builder: ProposalBuilder | None = None
     sort_key: SortKeyCallable | None = None
     throttle_inflight: int | None = None
@@ -184,6 +187,7 @@ class RefreshRuntimeSettings:
     parallel: bool
     max_workers: int | None
     throttle: RefreshThrottle
+    batch: bool = False
 
 
 def refresh_pipeline(
@@ -218,22 +222,33 @@ def refresh_pipeline(
     builder = params.proposal_builder or build_proposal_from_entry
     fetcher = params.fetch_snapshot or fetch_quote_snapshot
     runtime = _resolve_runtime_settings(params)
-    use_parallel = (runtime.parallel or params.executor is not None) and len(entries) > 1
+    batch_fetcher = params.fetch_snapshots
+    if batch_fetcher is None and params.fetch_snapshot is None and runtime.batch:
+        batch_fetcher = fetch_quote_snapshots
+    use_batch = batch_fetcher is not None and len(entries) > 1
+    use_parallel = (
+        not use_batch
+        and (runtime.parallel or params.executor is not None)
+        and len(entries) > 1
+    )
 
     logger.info(
-        "refresh_pipeline start total=%d trace_id=%s attempts=%d retry=%.2fs parallel=%s throttle=%s",
+        "refresh_pipeline start total=%d trace_id=%s attempts=%d retry=%.2fs parallel=%s batch=%s throttle=%s",
         len(entries),
         context.trace_id,
         runtime.max_attempts,
         runtime.retry_delay,
         use_parallel,
+        use_batch,
         runtime.throttle.describe(),
     )
 
     start = time.monotonic()
     outcomes: list[_ProcessingOutcome] = []
 
-    if use_parallel:
+    if use_batch:
+        outcomes = _process_batch(entries, builder, batch_fetcher, runtime, params)
+    elif use_parallel:
         executor = params.executor
         owns_executor = False
         if executor is None:
@@ -458,6 +473,13 @@ def _resolve_runtime_settings(params: RefreshParams) -> RefreshRuntimeSettings:
     except Exception:
         interval = 0.0
 
+    if params.batch is not None:
+        batch = bool(params.batch)
+    else:
+        # A caller explicitly asking for parallel refreshes gets them.
+        explicit_parallel = bool(params.parallel) or params.executor is not None
+        batch = bool(cfg_value("PIPELINE_REFRESH_BATCH", True)) and not explicit_parallel
+
     throttle = RefreshThrottle(inflight, interval)
     return RefreshRuntimeSettings(
         timeout=timeout,
@@ -466,20 +488,15 @@ def _resolve_runtime_settings(params: RefreshParams) -> RefreshRuntimeSettings:
         parallel=parallel,
         max_workers=max_workers,
         throttle=throttle,
+        batch=batch,
     )
 
 
-def _process_entry(
+def _build_entry(
     index: int,
     entry: Mapping[str, Any],
     builder: ProposalBuilder,
-    fetcher: SnapshotFetcher,
-    timeout: float,
-    max_attempts: int,
-    retry_delay: float,
-    throttle: RefreshThrottle,
-    params: RefreshParams,
-) -> _ProcessingOutcome:
+) -> StrategyProposal | _ProcessingOutcome:
     try:
         proposal = builder(entry)
     except Exception as exc:  # pragma: no cover - defensive
@@ -495,6 +512,129 @@ def _process_entry(
             0,
             IncompleteData("entry lacks proposal data"),
         )
+    return proposal
+
+
+def _process_batch(
+    entries: Sequence[Mapping[str, Any]],
+    builder: ProposalBuilder,
+    fetcher: BatchSnapshotFetcher,
+    runtime: RefreshRuntimeSettings,
+    params: RefreshParams,
+) -> list[_ProcessingOutcome]:
+    """Refresh all entries with deduplicated batch requests.
+
+    Each attempt requests only the entries still without a snapshot.  When a
+    batch request raises, its entries are requested one by one (concurrently
+    when parallel refreshes are configured) so one bad proposal only fails
+    itself.
+    """
+
+    outcomes: list[_ProcessingOutcome] = []
+    built: list[tuple[int, Mapping[str, Any], StrategyProposal]] = []
+    for index, entry in enumerate(entries):
+        proposal = _build_entry(index, entry, builder)
+        if isinstance(proposal, _ProcessingOutcome):
+            outcomes.append(proposal)
+        else:
+            built.append((index, entry, proposal))
+    if not built:
+        return outcomes
+
+    snapshots: list[SnapshotResult | None] = [None] * len(built)
+    errors: list[PipelineError | None] = [None] * len(built)
+    attempts = [0] * len(built)
+
+    def fetch(positions: Sequence[int]) -> None:
+        for position in positions:
+            attempts[position] += 1
+        proposals = [built[position][2] for position in positions]
+        try:
+            with runtime.throttle:
+                results = fetcher(
+                    proposals,
+                    criteria=params.criteria,
+                    spot_prices=[params.spot_price] * len(proposals),
+                    interest_rate=params.interest_rate,
+                    timeout=runtime.timeout,
+                )
+        except Exception as exc:  # pragma: no cover - network dependent
+            error = _map_exception(exc)
+            for position in positions:
+                errors[position] = error
+            raise
+        results = list(results or [])
+        for offset, position in enumerate(positions):
+            snapshot = results[offset] if offset < len(results) else None
+            if snapshot is None:
+                errors[position] = UpstreamError("batch refresh returned no result")
+            else:
+                snapshots[position] = snapshot
+                errors[position] = None
+
+    def fetch_isolated(position: int) -> None:
+        try:
+            fetch([position])
+        except Exception:  # pragma: no cover - network dependent
+            pass
+
+    executor = params.executor
+    owns_executor = False
+    pending = list(range(len(built)))
+    try:
+        for attempt in range(runtime.max_attempts):
+            if attempt and runtime.retry_delay:
+                time.sleep(runtime.retry_delay)
+            try:
+                fetch(pending)
+            except Exception:  # pragma: no cover - network dependent
+                if len(pending) > 1:
+                    if executor is None and runtime.parallel:
+                        max_workers = runtime.max_workers or min(32, len(pending))
+                        executor = ThreadPoolExecutor(max_workers=max_workers)
+                        owns_executor = True
+                    if executor is None:
+                        for position in pending:
+                            fetch_isolated(position)
+                    else:
+                        list(executor.map(fetch_isolated, pending))
+            pending = [position for position in pending if snapshots[position] is None]
+            if not pending:
+                break
+    finally:
+        if owns_executor and executor is not None:
+            executor.shutdown(wait=True)
+
+    for position, (index, entry, proposal) in enumerate(built):
+        snapshot = snapshots[position]
+        if snapshot is None:
+            error = errors[position] or UpstreamError("batch refresh returned no result")
+            outcomes.append(
+                _ProcessingOutcome(index, entry, proposal, None, attempts[position], error)
+            )
+        else:
+            outcomes.append(
+                _ProcessingOutcome(
+                    index, entry, snapshot.proposal, snapshot, attempts[position], None
+                )
+            )
+    return outcomes
+
+
+def _process_entry(
+    index: int,
+    entry: Mapping[str, Any],
+    builder: ProposalBuilder,
+    fetcher: SnapshotFetcher,
+    timeout: float,
+    max_attempts: int,
+    retry_delay: float,
+    throttle: RefreshThrottle,
+    params: RefreshParams,
+) -> _ProcessingOutcome:
+    proposal = _build_entry(index, entry, builder)
+    if isinstance(proposal, _ProcessingOutcome):
+        return proposal
 
     attempts = 0
     last_error: PipelineError | None = None
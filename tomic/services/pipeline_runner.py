@@ -44,7 +44,7 @@ def run_pipeline(context: PipelineRunContext) -> PipelineRunResult:
             context.pipeline,
             symbol=context.symbol,
             strategy=strategy_name,
-            option_chain=list(context.option_chain),
+            option_chain=context.option_chain,
             spot_price=float(context.spot_price or 0.0),
             atr=float(context.atr or 0.0),
             config=context.config,
@@ -66,7 +66,8 @@ def run_pipeline(context: PipelineRunContext) -> PipelineRunResult:
         context=result.context,
         proposals=list(result.proposals),
         summary=result.summary,
-        filtered_chain=list(result.filtered_chain),
+        filtered_chain=result.filtered_chain,
+        profile=getattr(result, "profile", None),
     )
 
 
@@ -0,0 +1,464 @@
+"""In-memory cache of streaming IB option quotes.
+
+Proposal refreshes, the exit flow and the portfolio view often quote the same
+contracts within seconds of each other.  :class:`LiveQuoteCache` keeps a
+streaming ``reqMktData`` subscription open for every contract of the active
+working set on the shared market data session and records the last bid, ask
+and greeks with the time they arrived.  :class:`IBMarketDataService` serves
+contracts from memory while their subscription is live and only subscribes
+the ones it has not seen yet.  IB sends ticks on change only, so a quiet
+subscription still holds the current quote; ``IB_QUOTE_CACHE_MAX_AGE`` bounds
+the age of quotes read after the session went away.
+
+Subscriptions unused for ``IB_QUOTE_CACHE_IDLE_TTL`` seconds are cancelled and
+at most ``IB_QUOTE_CACHE_MAX_LINES`` are kept open, least recently used first
+out, so the cache stays well inside the market data line limit.  A new
+subscription gets ``IB_QUOTE_CACHE_FIRST_QUOTE_WAIT`` seconds for its first
+bid and ask.  Contracts that never show one (a deep OTM leg without an ask)
+fall through to one-off requests without another wait.  They lose their
+subscription once they stay incomplete for more than
+``IB_QUOTE_CACHE_MAX_INCOMPLETE`` refreshes and are not subscribed again for
+the idle TTL.  The cache
+does not own a connection: when the session is closed or replaced all
+entries are dropped and the next refresh subscribes again.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Sequence
+
+from tomic.logutils import logger
+from tomic.services._config import cfg_value
+
+QuoteKey = tuple[Any, ...]
+ClockFunc = Callable[[], float]
+
+
+def _is_price(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return False
+    return not math.isnan(number) and number >= 0.0
+
+
+def has_two_sided_quote(data: Mapping[str, Any]) -> bool:
+    """Return ``True`` when ``data`` holds a valid bid and ask."""
+
+    return _is_price(data.get("bid")) and _is_price(data.get("ask"))
+
+
+@dataclass
+class LiveQuote:
+    """Streaming subscription for one contract and its latest tick data."""
+
+    key: QuoteKey
+    contract: Any
+    req_id: int
+    subscribed_at: float
+    last_used: float
+    data: dict[str, Any] = field(default_factory=dict)
+    updated_at: float | None = None
+    error: int | None = None
+    misses: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return has_two_sided_quote(self.data)
+
+    def age(self, now: float) -> float | None:
+        """Seconds since the last tick, ``None`` before the first one."""
+
+        if self.updated_at is None:
+            return None
+        return max(now - self.updated_at, 0.0)
+
+
+@dataclass
+class QuoteCacheStats:
+    """Counters describing how refreshes were served."""
+
+    hits: int = 0
+    subscribed: int = 0
+    resubscribed: int = 0
+    evicted: int = 0
+    rejected: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "subscribed": self.subscribed,
+            "resubscribed": self.resubscribed,
+            "evicted": self.evicted,
+            "rejected": self.rejected,
+        }
+
+
+class LiveQuoteCache:
+    """Serve repeated quote requests from streaming subscriptions."""
+
+    def __init__(
+        self,
+        *,
+        max_age: float | None = None,
+        idle_ttl: float | None = None,
+        max_lines: int | None = None,
+        max_incomplete: int | None = None,
+        first_quote_wait: float | None = None,
+        clock: ClockFunc | None = None,
+    ) -> None:
+        if max_age is None:
+            max_age = float(cfg_value("IB_QUOTE_CACHE_MAX_AGE", 30.0))
+        if idle_ttl is None:
+            idle_ttl = float(cfg_value("IB_QUOTE_CACHE_IDLE_TTL", 120.0))
+        if max_lines is None:
+            max_lines = int(cfg_value("IB_QUOTE_CACHE_MAX_LINES", 40))
+        if max_incomplete is None:
+            max_incomplete = int(cfg_value("IB_QUOTE_CACHE_MAX_INCOMPLETE", 3))
+        if first_quote_wait is None:
+            first_quote_wait = float(cfg_value("IB_QUOTE_CACHE_FIRST_QUOTE_WAIT", 2.0))
+        self.max_age = max(float(max_age), 0.0)
+        self.idle_ttl = max(float(idle_ttl), 0.0)
+        self.max_lines = max(int(max_lines), 0)
+        self.max_incomplete = max(int(max_incomplete), 0)
+        self.first_quote_wait = max(float(first_quote_wait), 0.0)
+        self._clock: ClockFunc = clock or time.monotonic
+        self._entries: dict[QuoteKey, LiveQuote] = {}
+        self._by_req: dict[int, QuoteKey] = {}
+        self._one_sided: dict[QuoteKey, float] = {}
+        self._app: Any = None
+        self._cond = threading.Condition(threading.RLock())
+        self._timer: threading.Timer | None = None
+        self.stats = QuoteCacheStats()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def _fresh(self, entry: LiveQuote, now: float, max_age: float, *, live: bool) -> bool:
+        """Return ``True`` when ``entry`` can be served as the current quote.
+
+        IB only sends ticks when a value changes, so a quiet but live
+        subscription still holds the current quote.  ``max_age`` only
+        applies once the session is gone.
+        """
+
+        if entry.error is not None or not entry.complete:
+            return False
+        if live:
+            return True
+        age = entry.age(now)
+        return age is not None and age <= max_age
+
+    def _served(self, entry: LiveQuote, now: float) -> dict[str, Any]:
+        data = dict(entry.data)
+        data["quote_age_sec"] = round(entry.age(now) or 0.0, 3)
+        return data
+
+    def get(self, key: QuoteKey, *, max_age: float | None = None) -> dict[str, Any] | None:
+        """Return the cached quote for ``key`` when it is fresh enough."""
+
+        limit = self.max_age if max_age is None else max_age
+        with self._cond:
+            entry = self._entries.get(key)
+            now = self._clock()
+            live = self._app is not None and self._connected(self._app)
+            if entry is None or not self._fresh(entry, now, limit, live=live):
+                return None
+            entry.last_used = now
+            return self._served(entry, now)
+
+    def snapshot(self) -> dict[QuoteKey, dict[str, Any]]:
+        """Return every cached quote, fresh or not, with its age."""
+
+        with self._cond:
+            now = self._clock()
+            return {key: self._served(entry, now) for key, entry in self._entries.items()}
+
+    # ------------------------------------------------------------------
+    # Refresh integration
+    # ------------------------------------------------------------------
+    def collect(
+        self,
+        app: Any,
+        contracts: Sequence[tuple[QuoteKey, Any]],
+        *,
+        timeout: float,
+        generic_ticks: str = "",
+    ) -> tuple[dict[QuoteKey, dict[str, Any]], list[tuple[QuoteKey, Any]]]:
+        """Serve ``contracts`` from streaming subscriptions on ``app``.
+
+        Quotes of live subscriptions are returned straight from memory.
+        Unknown contracts are subscribed and failed ones resubscribed, after
+        which the call waits up to ``timeout`` seconds, capped at
+        :attr:`first_quote_wait`, for a bid and ask.  Returns the complete
+        quotes per contract and the contracts the cache could not serve: no
+        line was available, IB rejected the subscription or no two-sided
+        quote arrived.  A live subscription still without one goes to the
+        fallback at once.  A subscription incomplete for more than
+        :attr:`max_incomplete` calls is cancelled and its contract left to
+        one-off requests for the idle TTL.
+        """
+
+        if not contracts:
+            return {}, []
+        with self._cond:
+            self._bind(app)
+            now = self._clock()
+            self._evict_idle(now)
+            wanted = {key for key, _contract in contracts}
+            served: dict[QuoteKey, dict[str, Any]] = {}
+            requests: list[LiveQuote] = []
+            fallback: list[tuple[QuoteKey, Any]] = []
+            for key, contract in contracts:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.last_used = now
+                    if self._fresh(entry, now, self.max_age, live=True):
+                        entry.misses = 0
+                        served[key] = self._served(entry, now)
+                        self.stats.hits += 1
+                        continue
+                    if entry.error is None:
+                        # Waiting again would cost every refresh a timeout.
+                        entry.misses += 1
+                        if entry.misses > self.max_incomplete:
+                            self._cancel(entry)
+                            self._one_sided[key] = now + self.idle_ttl
+                            self.stats.evicted += 1
+                        fallback.append((key, contract))
+                        continue
+                    self._cancel(entry)
+                    self.stats.resubscribed += 1
+                elif self._one_sided.get(key, now) > now:
+                    fallback.append((key, contract))
+                    continue
+                elif not self._make_room(wanted):
+                    fallback.append((key, contract))
+                    self.stats.rejected += 1
+                    continue
+                else:
+                    self.stats.subscribed += 1
+                requests.append(self._subscribe(app, key, contract, now))
+        if requests:
+            logger.info(
+                "[quote_cache] %d uit cache, %d nieuw/verlopen abonnement(en)",
+                len(served),
+                len(requests),
+            )
+        # Outside the lock: ``reqMktData`` may wait for a free line while
+        # the reader thread delivers ticks for the other subscriptions.
+        for entry in requests:
+            self._send_request(app, entry, generic_ticks)
+
+        deadline = self._clock() + min(max(float(timeout), 0.0), self.first_quote_wait)
+        with self._cond:
+            self._cond.wait_for(
+                lambda: all(entry.error is not None or entry.complete for entry in requests),
+                timeout=max(deadline - self._clock(), 0.0),
+            )
+            now = self._clock()
+            for entry in requests:
+                live = self._entries.get(entry.key) is entry
+                if entry.error is not None:
+                    self._cancel(entry)
+                elif live and entry.complete:
+                    served[entry.key] = self._served(entry, now)
+                    continue
+                elif live:
+                    entry.misses = 1
+                fallback.append((entry.key, entry.contract))
+            self._schedule_sweep()
+        return served, fallback
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+    def _bind(self, app: Any) -> None:
+        """Attach to ``app``; entries of a previous connection are dropped."""
+
+        if app is self._app and self._connected(app):
+            return
+        if self._entries:
+            logger.info(
+                f"[quote_cache] sessie gewijzigd, {len(self._entries)} abonnement(en) vervallen"
+            )
+        previous = self._app
+        for entry in list(self._entries.values()):
+            if previous is not None and self._connected(previous):
+                self._cancel(entry)
+            self._forget(entry)
+        self._app = app
+
+    @staticmethod
+    def _connected(app: Any) -> bool:
+        is_connected = getattr(app, "isConnected", None)
+        if not callable(is_connected):
+            return True
+        try:
+            return bool(is_connected())
+        except Exception:
+            return False
+
+    def _make_room(self, protected: set[QuoteKey]) -> bool:
+        if self.max_lines <= 0:
+            return False
+        while len(self._entries) >= self.max_lines:
+            victims = [e for e in self._entries.values() if e.key not in protected]
+            if not victims:
+                return False
+            self._cancel(min(victims, key=lambda e: e.last_used))
+            self.stats.evicted += 1
+        return True
+
+    def _subscribe(self, app: Any, key: QuoteKey, contract: Any, now: float) -> LiveQuote:
+        req_id = app._next_id()
+        entry = LiveQuote(key=key, contract=contract, req_id=req_id, subscribed_at=now, last_used=now)
+        self._entries[key] = entry
+        self._by_req[req_id] = key
+        app.add_stream_listener(req_id, self._on_tick)
+        return entry
+
+    def _send_request(self, app: Any, entry: LiveQuote, generic_ticks: str) -> None:
+        try:
+            app.reqMktData(entry.req_id, entry.contract, generic_ticks, False, False, [])
+        except Exception as exc:
+            logger.warning(f"[quote_cache] abonnement mislukt: {exc}")
+            with self._cond:
+                entry.error = -1
+                self._cond.notify_all()
+
+    def _cancel(self, entry: LiveQuote) -> None:
+        app = self._app
+        self._forget(entry)
+        if app is None:
+            return
+        remove = getattr(app, "remove_stream_listener", None)
+        if callable(remove):
+            remove(entry.req_id)
+        try:
+            app.cancelMktData(entry.req_id)
+        except Exception:
+            logger.debug("cancelMktData mislukt", exc_info=True)
+        clear = getattr(app, "clear_request", None)
+        if callable(clear):
+            clear(entry.req_id)
+
+    def _forget(self, entry: LiveQuote) -> None:
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+        self._by_req.pop(entry.req_id, None)
+
+    def _on_tick(self, req_id: int, data: Mapping[str, Any], error: int | None = None) -> None:
+        """Stream listener called from the IB reader thread."""
+
+        with self._cond:
+            key = self._by_req.get(req_id)
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None or entry.req_id != req_id:
+                return
+            if error is not None:
+                entry.error = error
+            else:
+                entry.data.update(data)
+                entry.updated_at = self._clock()
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Idle handling
+    # ------------------------------------------------------------------
+    def _evict_idle(self, now: float) -> int:
+        for key in [k for k, until in self._one_sided.items() if until <= now]:
+            del self._one_sided[key]
+        if self.idle_ttl <= 0:
+            return 0
+        idle = [e for e in self._entries.values() if now - e.last_used > self.idle_ttl]
+        for entry in idle:
+            self._cancel(entry)
+        self.stats.evicted += len(idle)
+        return len(idle)
+
+    def evict_idle(self) -> int:
+        """Cancel subscriptions unused for longer than the idle TTL."""
+
+        with self._cond:
+            removed = self._evict_idle(self._clock())
+            if removed:
+                logger.info(f"[quote_cache] {removed} idle abonnement(en) opgezegd")
+            return removed
+
+    def _schedule_sweep(self) -> None:
+        if self._timer is not None or not self._entries or self.idle_ttl <= 0:
+            return
+
+        def _sweep() -> None:
+            with self._cond:
+                self._timer = None
+            self.evict_idle()
+            with self._cond:
+                self._schedule_sweep()
+
+        self._timer = threading.Timer(self.idle_ttl / 2, _sweep)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def close(self) -> None:
+        """Cancel every subscription and stop the idle sweeper."""
+
+        with self._cond:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            connected = self._app is not None and self._connected(self._app)
+            for entry in list(self._entries.values()):
+                if connected:
+                    self._cancel(entry)
+                else:
+                    self._forget(entry)
+            self._app = None
+
+
+_DEFAULT_CACHE: LiveQuoteCache | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_quote_cache() -> LiveQuoteCache | None:
+    """Return the process wide cache, or ``None`` when it is disabled.
+
+    The cache is opt-in through ``IB_QUOTE_CACHE_ENABLED``.
+    """
+
+    global _DEFAULT_CACHE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is None and bool(cfg_value("IB_QUOTE_CACHE_ENABLED", False)):
+            _DEFAULT_CACHE = LiveQuoteCache()
+        return _DEFAULT_CACHE
+
+
+def set_quote_cache(cache: LiveQuoteCache | None) -> None:
+    """Replace the process wide cache (``None`` re-reads the configuration)."""
+
+    global _DEFAULT_CACHE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is not None and _DEFAULT_CACHE is not cache:
+            _DEFAULT_CACHE.close()
+        _DEFAULT_CACHE = cache
+
+
+__all__ = [
+    "LiveQuote",
+    "LiveQuoteCache",
+    "QuoteCacheStats",
+    "get_quote_cache",
+    "has_two_sided_quote",
+    "set_quote_cache",
+]
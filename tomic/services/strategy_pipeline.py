@@ -25,6 +25,7 @@ from ..core.pricing.mid_tags import MidTagSnapshot
 from ..mid_resolver import MidUsageSummary
 from ..utils import normalize_leg, resolve_symbol
 from ..helpers.numeric import safe_float
+from ..helpers.stage_profiler import StageProfiler
 from ..helpers.bs_utils import estimate_model_price
 from ..helpers.dateutils import parse_date
 from ..helpers.strategy_config import (
@@ -61,6 +62,7 @@ class PipelineRunResult:
     proposals: list[StrategyProposal]
     summary: RejectionSummary
     filtered_chain: list[MutableMapping[str, Any]]
+    profile: StageProfiler | None = None
 
 
 class PipelineRunError(RuntimeError):
@@ -88,14 +90,20 @@ def run(
     if pipeline is None:
         raise PipelineRunError("pipeline is required")
 
+    # Option records are shared read-only with the pipeline; only the outer
+    # list is rebuilt so callers keep ownership of their own sequence.
     try:
-        records = list(option_chain)
+        records = (
+            option_chain
+            if isinstance(option_chain, Sequence)
+            else list(option_chain)
+        )
     except TypeError as exc:  # pragma: no cover - defensive guard
         raise PipelineRunError("option_chain must be iterable") from exc
 
     if dte_range is not None:
         try:
-            filtered_chain = filter_by_expiry(list(records), dte_range)
+            filtered_chain = filter_by_expiry(records, dte_range)
         except Exception as exc:
             raise PipelineRunError("failed to filter option chain by DTE range") from exc
     else:
@@ -127,7 +135,8 @@ def run(
         context=context,
         proposals=list(proposals),
         summary=summary,
-        filtered_chain=list(filtered_chain),
+        filtered_chain=filtered_chain,
+        profile=getattr(pipeline, "last_profile", None),
     )
 
 
@@ -158,6 +167,7 @@ class StrategyPipeline:
         self.last_selected: list[MutableMapping[str, Any]] = []
         self.last_evaluated: list[dict[str, Any]] = []
         self.last_rejections: dict[str, Any] = {}
+        self.last_profile: StageProfiler | None = None
         self._earnings_data: dict[str, list[str]] | None = None
         self._earnings_cache: dict[str, date | None] = {}
 
@@ -174,6 +184,14 @@ class StrategyPipeline:
         )
         self.last_context = context
         self._mid_context = None
+        profiler = StageProfiler(f"{context.symbol}/{context.strategy}")
+        self.last_profile = profiler
+        with profiler.activate():
+            return self._build_proposals(context, profiler)
+
+    def _build_proposals(
+        self, context: StrategyContext, profiler: StageProfiler
+    ) -> tuple[list[StrategyProposal], RejectionSummary]:
         canonical_strategy = self._canonical_strategy(context.strategy)
         rules = self._load_rules(canonical_strategy, context.config)
         filter_config = load_filter_config(criteria=context.criteria, rules=rules)
@@ -183,25 +201,28 @@ class StrategyPipeline:
             criteria=context.criteria,
         )
         resolver_cfg = self._config_getter("MID_RESOLVER", {})
-        self._mid_context = self._mid_service.build_context(
-            context.option_chain,
-            spot_price=context.spot_price,
-            interest_rate=context.interest_rate,
-            config=resolver_cfg,
-        )
-        resolved_chain = self._mid_context.enrich_chain()
-
-        selected, by_reason, by_filter = selector.select(
-            list(resolved_chain),
-            dte_range=dte_range,
-            debug_csv=context.debug_path,
-            return_info=True,
-        )
+        with profiler.stage("mid_context"):
+            self._mid_context = self._mid_service.build_context(
+                context.option_chain,
+                spot_price=context.spot_price,
+                interest_rate=context.interest_rate,
+                config=resolver_cfg,
+            )
+            resolved_chain = self._mid_context.enrich_chain()
+
+        with profiler.stage("selection"):
+            selected, by_reason, by_filter = selector.select(
+                resolved_chain,
+                dte_range=dte_range,
+                debug_csv=context.debug_path,
+                return_info=True,
+            )
         self.last_selected = list(selected)
-        evaluated = [
-            self._evaluate_leg(opt, context.spot_price, context.interest_rate)
-            for opt in self.last_selected
-        ]
+        with profiler.stage("leg_evaluation"):
+            evaluated = [
+                self._evaluate_leg(opt, context.spot_price, context.interest_rate)
+                for opt in self.last_selected
+            ]
         self.last_evaluated = evaluated
         self.last_rejections = {
             "by_filter": dict(by_filter),
@@ -213,7 +234,7 @@ class StrategyPipeline:
         reasons: list[ReasonDetail] = []
         if context.spot_price and self.last_selected:
             try:
-                with combo_symbol_context(context.symbol):
+                with combo_symbol_context(context.symbol), profiler.stage("generation"):
                     raw_props, reasons = self._strategy_generator(
                         context.symbol,
                         canonical_strategy,
@@ -226,15 +247,17 @@ class StrategyPipeline:
             except Exception as exc:  # pragma: no cover - defensive logging
                 logger.exception("Strategy generation failed: %s", exc)
                 raw_props, reasons = [], []
-            proposals = [
-                self._convert_proposal(canonical_strategy, proposal)
-                for proposal in raw_props
-            ]
+            with profiler.stage("conversion"):
+                proposals = [
+                    self._convert_proposal(canonical_strategy, proposal)
+                    for proposal in raw_props
+                ]
         earnings_reasons: list[ReasonDetail] = []
         if proposals:
-            proposals, earnings_reasons = self._apply_earnings_filter(
-                canonical_strategy, context, proposals
-            )
+            with profiler.stage("earnings_filter"):
+                proposals, earnings_reasons = self._apply_earnings_filter(
+                    canonical_strategy, context, proposals
+                )
         if earnings_reasons:
             reason_counts = self.last_rejections.get("by_reason", {})
             for reason in earnings_reasons:
@@ -480,7 +503,6 @@ class StrategyPipeline:
     def _evaluate_leg(
         self, option: MutableMapping[str, Any], spot_price: float, interest_rate: float
     ) -> dict[str, Any]:
-        option = dict(option)
         quote = self._mid_context.quote_for(option) if self._mid_context else None
         if quote and quote.mid is not None:
             mid = quote.mid
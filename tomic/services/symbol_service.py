@@ -18,6 +18,7 @@ from tomic.config import (
     _is_valid_symbol,
     _normalize_symbols,
 )
+from tomic.infrastructure.series_index import SeriesIndex
 from tomic.logutils import logger
 
 
@@ -349,32 +350,22 @@ class SymbolService:
         result = DataValidationResult(symbol=symbol)
         files = self.get_symbol_data_files(symbol)
 
-        # Check spot prices
+        # Check spot prices (record counts come from the series index)
         spot_path = files["spot_prices"]
-        if spot_path.exists():
-            try:
-                with open(spot_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if isinstance(data, list) and len(data) > 0:
-                    result.has_spot_prices = True
-                    result.spot_price_days = len(data)
-            except (json.JSONDecodeError, OSError):
-                pass
+        entry = SeriesIndex(spot_path.parent).entry(spot_path.stem)
+        if entry and entry.get("count"):
+            result.has_spot_prices = True
+            result.spot_price_days = int(entry["count"])
 
         if not result.has_spot_prices:
             result.missing_files.append("spot_prices")
 
         # Check IV summary
         iv_path = files["iv_summary"]
-        if iv_path.exists():
-            try:
-                with open(iv_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if isinstance(data, list) and len(data) > 0:
-                    result.has_iv_summary = True
-                    result.iv_summary_days = len(data)
-            except (json.JSONDecodeError, OSError):
-                pass
+        entry = SeriesIndex(iv_path.parent).entry(iv_path.stem)
+        if entry and entry.get("count"):
+            result.has_iv_summary = True
+            result.iv_summary_days = int(entry["count"])
 
         if not result.has_iv_summary:
             result.missing_files.append("iv_summary")
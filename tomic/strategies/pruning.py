@@ -0,0 +1,183 @@
+"""Cheap upper bounds used to skip hopeless strike combinations.
+
+Generators enumerate strike combinations and hand every candidate to
+:func:`tomic.analysis.scoring.calculate_score`.  For credit structures the
+acceptance gates in scoring (positive credit, risk/reward and EV) are all
+monotone in the net credit, so an optimistic credit estimate derived from the
+leg mids is enough to prove that a combination can never pass.  Only combos
+that are *guaranteed* to be rejected are pruned; anything the bounds cannot
+decide is scored as before.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Sequence
+
+from ..criteria import RULES, CriteriaConfig, load_criteria
+from ..helpers.numeric import safe_float
+from ..metrics import calculate_pos
+from ..utils import get_leg_right
+from . import StrategyName
+
+WING_STRATEGIES = frozenset(
+    {StrategyName.IRON_CONDOR.value, StrategyName.ATM_IRON_BUTTERFLY.value}
+)
+
+_RR_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class ComboBounds:
+    """Optimistic metrics for a strike combination (per share)."""
+
+    credit: float | None
+    width: float | None = None
+    rom: float | None = None
+    ev: float | None = None
+    risk_reward: float | None = None
+
+
+@dataclass
+class ComboPruner:
+    """Decide whether a combination can be skipped before full scoring."""
+
+    strategy: str
+    min_risk_reward: float = 0.0
+    require_positive_credit: bool = False
+    enabled: bool = True
+    checked: int = 0
+    pruned: int = 0
+    by_reason: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def for_strategy(
+        cls,
+        strategy: Any,
+        *,
+        criteria: CriteriaConfig | None = None,
+        enabled: bool = True,
+    ) -> "ComboPruner":
+        """Build a pruner using the same thresholds as ``calculate_score``."""
+
+        from ..analysis.scoring_helpers import (
+            resolve_min_risk_reward,
+            resolve_strategy_config,
+        )
+
+        name = str(getattr(strategy, "value", strategy))
+        crit = criteria or load_criteria()
+        min_rr = resolve_min_risk_reward(resolve_strategy_config(name), crit)
+        positive = {
+            str(getattr(item, "value", item))
+            for item in RULES.strategy.acceptance.require_positive_credit_for
+        }
+        return cls(
+            strategy=name,
+            min_risk_reward=min_rr,
+            require_positive_credit=name in positive,
+            enabled=enabled,
+        )
+
+    # ------------------------------------------------------------------
+    # Bounds
+    # ------------------------------------------------------------------
+    def bounds(self, legs: Sequence[tuple[Mapping[str, Any], int]]) -> ComboBounds:
+        """Return optimistic metrics for ``legs`` given as ``(option, position)``.
+
+        Short legs contribute their mid; an unknown short mid makes the credit
+        unbounded (``None``).  Long legs contribute their mid or zero when it
+        is unknown, since any fallback price is non-negative.
+        """
+
+        credit = 0.0
+        for option, position in legs:
+            mid = safe_float(option.get("mid"))
+            if mid is not None and mid <= 0:
+                mid = None
+            if position < 0:
+                if mid is None:
+                    return ComboBounds(credit=None)
+                credit += mid * abs(position)
+            elif mid is not None:
+                credit -= mid * abs(position)
+
+        if self.strategy not in WING_STRATEGIES:
+            return ComboBounds(credit=credit)
+
+        width = _wing_width(legs)
+        if width is None or width <= 0:
+            return ComboBounds(credit=credit)
+        capped = min(credit, width)
+        loss = width - capped
+        rom = (capped / loss) * 100 if loss > 0 else None
+        risk_reward = loss / capped if capped > 0 else None
+        ev: float | None = None
+        deltas = [
+            abs(value)
+            for option, position in legs
+            if position < 0
+            for value in (safe_float(option.get("delta")),)
+            if value is not None
+        ]
+        if len(deltas) == sum(1 for _opt, pos in legs if pos < 0) and deltas:
+            prob = calculate_pos(sum(deltas) / len(deltas)) / 100
+            ev = (prob * capped - (1 - prob) * loss) * 100
+        return ComboBounds(
+            credit=credit,
+            width=width,
+            rom=rom,
+            ev=ev,
+            risk_reward=risk_reward,
+        )
+
+    def check(self, legs: Sequence[tuple[Mapping[str, Any], int]]) -> str | None:
+        """Return a rejection reason when ``legs`` can never pass scoring."""
+
+        if not self.enabled:
+            return None
+        self.checked += 1
+        reason = self._reason_for(self.bounds(legs))
+        if reason is not None:
+            self.pruned += 1
+            self.by_reason[reason] = self.by_reason.get(reason, 0) + 1
+        return reason
+
+    def summary(self) -> str:
+        """Return a short human readable pruning summary."""
+
+        return f"{self.pruned}/{self.checked} combinaties gepruned op bovengrenzen"
+
+    def _reason_for(self, bounds: ComboBounds) -> str | None:
+        if bounds.credit is None:
+            return None
+        if self.require_positive_credit and bounds.credit <= 0:
+            return "bovengrens credit niet positief"
+        if bounds.width is None:
+            return None
+        if self.min_risk_reward > 0:
+            if bounds.risk_reward is None:
+                return "bovengrens risk/reward onhaalbaar"
+            if bounds.risk_reward > self.min_risk_reward + _RR_TOLERANCE:
+                return "bovengrens risk/reward onhaalbaar"
+        if bounds.ev is not None and bounds.ev < 0:
+            return "bovengrens EV negatief"
+        return None
+
+
+def _wing_width(legs: Iterable[tuple[Mapping[str, Any], int]]) -> float | None:
+    strikes: dict[str, list[float]] = {}
+    for option, _position in legs:
+        strike = safe_float(option.get("strike"))
+        if strike is None:
+            return None
+        strikes.setdefault(get_leg_right(option), []).append(strike)
+    widths = [
+        abs(values[0] - values[1]) for values in strikes.values() if len(values) == 2
+    ]
+    if not widths:
+        return None
+    return max(widths)
+
+
+__all__ = ["ComboBounds", "ComboPruner", "WING_STRATEGIES"]
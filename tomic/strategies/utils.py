@@ -10,6 +10,7 @@ from tomic.core.data import normalize_chain_records
 from tomic.helpers.dateutils import dte_between_dates, filter_by_dte
 
 from . import StrategyName
+from .pruning import ComboPruner
 from ..utils import normalize_right, get_leg_right, today
 
 
@@ -603,6 +604,12 @@ def generate_wing_spread(
 
     call_range = resolve_delta_range(ctx, spec.call_leg) if spec.call_leg else None
     put_range = resolve_delta_range(ctx, spec.put_leg) if spec.put_leg else None
+    # Bounds mirror the gates of the default scorer only.
+    pruner = ComboPruner.for_strategy(
+        strategy_name,
+        enabled=bool(ctx.config.get("bound_pruning", True))
+        and score_func in (None, _calculate_score),
+    )
 
     # Butterfly mode when centers are provided
     if spec.centers is not None:
@@ -704,6 +711,13 @@ def generate_wing_spread(
                     )
                     rejected_reasons.append(reason)
                     continue
+                reason = pruner.check([(sc_opt, -1), (lc_opt, 1), (sp_opt, -1), (lp_opt, 1)])
+                if reason is not None:
+                    log_combo_evaluation(
+                        strategy_name, desc, None, "reject", reason, legs=base_legs
+                    )
+                    rejected_reasons.append(reason)
+                    continue
                 legs = [
                     build_leg({**sc_opt, "spot": ctx.spot}, "short"),
                     build_leg({**lc_opt, "spot": ctx.spot}, "long"),
@@ -866,6 +880,18 @@ def generate_wing_spread(
                     )
                     rejected_reasons.append(reason)
                     continue
+                reason = pruner.check([(sc_opt, -1), (lc_opt, 1), (sp_opt, -1), (lp_opt, 1)])
+                if reason is not None:
+                    log_combo_evaluation(
+                        strategy_name,
+                        desc,
+                        None,
+                        "reject",
+                        reason,
+                        legs=base_legs + long_leg_info,
+                    )
+                    rejected_reasons.append(reason)
+                    continue
                 legs = [
                     build_leg({**sc_opt, "spot": ctx.spot}, "short"),
                     build_leg({**lc_opt, "spot": ctx.spot}, "long"),
@@ -904,6 +930,8 @@ def generate_wing_spread(
                 if reached_limit(proposals):
                     break
 
+    if pruner.pruned:
+        logger.info(f"[{strat_label}] {pruner.summary()}")
     proposals.sort(key=lambda p: p.score or 0, reverse=True)
     if not proposals:
         return [], sorted(set(rejected_reasons))
@@ -958,7 +986,6 @@ def generate_ratio_like(
     option_type = spec.short_leg.normalized_option_type
     delta_range = resolve_delta_range(ctx, spec.short_leg)
     leg_right = "call" if option_type == "C" else "put"
-
     tol_value = ctx.rules.get("long_wing_strike_tolerance_percent")
     long_wing_tolerance = float(tol_value) if tol_value is not None else 5.0
 
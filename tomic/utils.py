@@ -162,14 +162,9 @@ def load_price_history(symbol: str) -> list[dict]:
     """Return price history records for ``symbol`` sorted by date."""
 
     base = Path(cfg_get("PRICE_HISTORY_DIR", "tomic/data/spot_prices"))
-    path = base / f"{symbol}.json"
-    from tomic.journal.utils import load_json
-
-    data = load_json(path)
-    if isinstance(data, list):
-        data.sort(key=lambda r: r.get("date", ""))
-        return data
-    return []
+    from tomic.infrastructure.timeseries import read_series
+
+    return read_series(base / f"{symbol}.json")
 
 
 def latest_close_date(symbol: str) -> str | None:
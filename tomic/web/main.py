@@ -42,6 +42,7 @@ from .models import (
 )
 from .backtest_api import router as backtest_router
 from ..analysis.greeks import compute_portfolio_greeks
+from ..infrastructure.storage import load_json
 from ..services.trade_management_service import build_management_summary
 
 # Track running batch jobs and their errors
@@ -74,9 +75,10 @@ def get_project_root() -> Path:
 
 
 def load_json_file(filename: str) -> Any:
-    """Load a JSON file from the project."""
-    import json
+    """Load a JSON file from the project.
 
+    The result is the shared cached object; callers only read from it.
+    """
     # Try multiple locations
     paths_to_try = [
         get_project_root() / filename,
@@ -86,8 +88,7 @@ def load_json_file(filename: str) -> Any:
 
     for path in paths_to_try:
         if path.exists():
-            with open(path) as f:
-                return json.load(f)
+            return load_json(path, default_factory=lambda: None, copy=False)
 
     return None
 